@@ -9,6 +9,8 @@ from weaviate import WeaviateClient
 
 from config import conf
 from core.auth.auth_exceptions import credentials_exception
+from core.auth.principal_cache import read_cached_principal, store_cached_principal
+from core.auth.principal_dto import Principal
 from core.auth.security import decode_jwt
 from core.user.user_crud import crud_user
 from core.user.user_orm import UserORM
@@ -58,17 +60,11 @@ async def get_db_session() -> AsyncGenerator[Session, None]:
 
 
 async def get_weaviate_session() -> AsyncGenerator[WeaviateClient, None]:
-    session = WeaviateRepo().weaviate_session()
-    try:
+    async with WeaviateRepo().weaviate_async_session() as session:
         yield session
-    finally:
-        if session is not None:
-            session.close()
 
 
-def get_current_user(
-    db: Session = Depends(get_db_session), token: str = Depends(reusable_oauth2_scheme)
-) -> UserORM:
+def get_current_email(token: str = Depends(reusable_oauth2_scheme)) -> str:
     try:
         payload = decode_jwt(token=token)
         email: str | None = payload.get("sub")
@@ -76,7 +72,30 @@ def get_current_user(
             raise credentials_exception
     except (JWTError, ValidationError):
         raise credentials_exception
+    return email
+
 
+def get_current_principal(
+    db: Session = Depends(get_db_session), email: str = Depends(get_current_email)
+) -> Principal:
+    """Like get_current_user, but served from the principal cache (without a database query)"""
+    principal = read_cached_principal(email=email)
+    if principal is not None:
+        return principal
+
+    user = crud_user.read_by_email(db=db, email=email)
+    principal = Principal(
+        id=user.id,
+        email=user.email,
+        project_ids={project.id for project in user.projects},
+    )
+    store_cached_principal(principal)
+    return principal
+
+
+def get_current_user(
+    db: Session = Depends(get_db_session), email: str = Depends(get_current_email)
+) -> UserORM:
     user = crud_user.read_by_email(db=db, email=email)
 
     if user is None:
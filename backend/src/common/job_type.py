@@ -20,6 +20,9 @@ class JobType(str, Enum):
     TEXT_SENTENCE_EMBEDDING = "text_sentence_embedding"
     TEXT_HTML_MAPPING = "text_html_mapping"
 
+    # html (optional, not tracked in the sdoc status)
+    TEXT_DUPLICATE_DETECTION = "text_duplicate_detection"
+
     # image
     IMAGE_CAPTION = "image_caption"
     IMAGE_EMBEDDING = "image_embedding"
@@ -41,6 +44,8 @@ class JobType(str, Enum):
     DUPLICATE_FINDER = "duplicate_finder"
     EXPORT = "export"
     IMPORT = "import"
+    ES_REINDEX = "es_reindex"
+    LOCAL_KNN_INDEX = "local_knn_index"
 
     # on demand jobs (long-lived)
     ML = "ml"
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
@@ -123,12 +123,22 @@ class OidcConfig(BaseModel):
         return values
 
 
+class PrincipalCacheConfig(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    enabled: bool
+    ttl_s: int = Field(gt=0)
+    redis_ttl_s: int = Field(ge=0)
+    max_entries: int = Field(gt=0)
+
+
 class AuthConfig(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     jwt: JwtConfig
     session: SessionConfig
     oidc: OidcConfig
+    principal_cache: PrincipalCacheConfig
 
 
 class PersonConfig(BaseModel):
@@ -164,6 +174,26 @@ class FilesystemConfig(BaseModel):
     content_server: ContentServerConfig
 
 
+class WeaviatePoolConfig(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    max_size: int = Field(gt=0)
+    checkout_timeout: float = Field(gt=0)
+    health_check_timeout: float = Field(gt=0)
+    health_check_after_idle_s: float = Field(ge=0)
+
+
+class WeaviateLocalKnnConfig(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    enabled: bool
+    dtype: Literal["float16", "float32"]
+    max_rows: int = Field(gt=0)
+    block_rows: int = Field(gt=0)
+    rebuild_delay_s: float = Field(ge=0)
+    build_request_ttl_s: float = Field(gt=0)
+
+
 class WeaviateConfig(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -171,6 +201,8 @@ class WeaviateConfig(BaseModel):
     port: int = Field(gt=0, lt=65536)
     collection_postfix: str
     grpc_port: int = Field(gt=0, lt=65536)
+    pool: WeaviatePoolConfig
+    local_knn: WeaviateLocalKnnConfig
 
 
 class PostgresPoolConfig(BaseModel):
@@ -246,6 +278,16 @@ class LoggingConfig(BaseModel):
     level: str = Field(min_length=1)
 
 
+class ElasticsearchBulkConfig(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    chunk_size: int = Field(gt=0)
+    max_chunk_bytes: int = Field(gt=0)
+    flush_interval_s: float = Field(gt=0)
+    thread_count: int = Field(gt=0)
+    refresh_interval: str = Field(min_length=1)
+
+
 class ElasticsearchConfig(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -257,6 +299,7 @@ class ElasticsearchConfig(BaseModel):
     sniff_on_start: bool
     sniff_on_connection_fail: bool
     sniffer_timeout: int = Field(gt=0)
+    bulk: ElasticsearchBulkConfig
 
 
 class APIConnectionConfig(BaseModel):
@@ -267,6 +310,14 @@ class APIConnectionConfig(BaseModel):
     api_key: str = Field()
 
 
+class LlmCacheConfig(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    enabled: bool
+    ttl_s: int = Field(gt=0)
+    max_entries: int = Field(gt=0)
+
+
 class DoclingConfig(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -285,6 +336,8 @@ class RqConfig(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     gpu_memory_limit: int = Field(gt=0)
+    pipeline_batch_size: int = Field(gt=0)
+    project_import_workers: int = Field(gt=0)
 
 
 class LlmAssistantConfig(BaseModel):
@@ -339,6 +392,7 @@ class BackendConfigSchema(BaseModel):
     elasticsearch: ElasticsearchConfig
     llm_provider: APIConnectionConfig
     emb_provider: APIConnectionConfig
+    llm_cache: LlmCacheConfig
     docling: DoclingConfig
     glitchtip: GlitchtipConfig
     rq: RqConfig
@@ -1,5 +1,6 @@
 import datetime
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from core.annotation.annotation_document_dto import (
@@ -7,12 +8,41 @@ from core.annotation.annotation_document_dto import (
     AnnotationDocumentUpdate,
 )
 from core.annotation.annotation_document_orm import AnnotationDocumentORM
-from repos.db.crud_base import CRUDBase, NoSuchElementError
+from repos.db.crud_base import BATCH_SIZE, CRUDBase, NoSuchElementError
 
 
 class CRUDAnnotationDocument(
     CRUDBase[AnnotationDocumentORM, AnnotationDocumentCreate, AnnotationDocumentUpdate]
 ):
+    ### CREATE OPERATIONS ###
+
+    def create_missing(
+        self, db: Session, *, user_sdoc_ids: list[tuple[int, int]]
+    ) -> int:
+        """
+        Creates the annotation documents (user_id, sdoc_id) that do not exist yet and returns their number.
+        Safe to run in concurrent transactions: the rows are inserted in a fixed order, ignoring conflicts.
+        """
+        from sqlalchemy.dialects.postgresql import insert
+
+        unique_ids = sorted(set(user_sdoc_ids))
+        created = 0
+        for i in range(0, len(unique_ids), BATCH_SIZE):
+            insert_stmt = (
+                insert(self.model).on_conflict_do_nothing().returning(self.model.id)
+            )
+            created += len(
+                db.execute(
+                    insert_stmt,
+                    [
+                        {"user_id": user_id, "source_document_id": sdoc_id}
+                        for user_id, sdoc_id in unique_ids[i : i + BATCH_SIZE]
+                    ],
+                ).fetchall()
+            )
+        db.flush()
+        return created
+
     ### READ OPERATIONS ###
 
     def read_by_user(self, db: Session, *, user_id: int) -> list[AnnotationDocumentORM]:
@@ -48,6 +78,23 @@ class CRUDAnnotationDocument(
             update_dto=AnnotationDocumentUpdate(updated=datetime.datetime.now()),
         )
 
+    def update_timestamps(
+        self,
+        db: Session,
+        *,
+        ids: list[int],
+    ) -> None:
+        """Set-based variant of update_timestamp for many annotation documents"""
+        now = datetime.datetime.now()
+        unique_ids = sorted(set(ids))
+        for i in range(0, len(unique_ids), BATCH_SIZE):
+            db.execute(
+                update(self.model)
+                .where(self.model.id.in_(unique_ids[i : i + BATCH_SIZE]))
+                .values(updated=now)
+            )
+        db.flush()
+
     ### DELETE OPERATIONS ###
 
     def delete_by_sdoc(self, db: Session, *, sdoc_id: int) -> list[int]:
@@ -57,20 +57,32 @@ class CRUDBBoxAnnotation(
         create_dtos: list[BBoxAnnotationCreateIntern],
     ) -> list[BBoxAnnotationORM]:
         # update all affected annotation documents' timestamp
-        adoc_ids = list(
-            set([create_dto.annotation_document_id for create_dto in create_dtos])
+        crud_adoc.update_timestamps(
+            db=db,
+            ids=[create_dto.annotation_document_id for create_dto in create_dtos],
         )
-        for adoc_id in adoc_ids:
-            crud_adoc.update_timestamp(
-                db=db,
-                id=adoc_id,
-            )
 
         return super().create_multi(
             db=db,
             create_dtos=create_dtos,
         )
 
+    def create_multi_ids(
+        self,
+        db: Session,
+        *,
+        create_dtos: list[BBoxAnnotationCreateIntern],
+    ) -> list[int]:
+        ids = super().create_multi_ids(db=db, create_dtos=create_dtos)
+
+        # update all affected annotation documents' timestamp
+        crud_adoc.update_timestamps(
+            db=db,
+            ids=[create_dto.annotation_document_id for create_dto in create_dtos],
+        )
+
+        return ids
+
     def create_bulk(
         self, db: Session, *, user_id: int, create_dtos: list[BBoxAnnotationCreate]
     ) -> list[BBoxAnnotationORM]:
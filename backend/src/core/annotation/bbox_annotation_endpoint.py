@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from common.crud_enum import Crud
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.annotation.bbox_annotation_crud import crud_bbox_anno
 from core.annotation.bbox_annotation_dto import (
     BBoxAnnotationCreate,
@@ -14,7 +14,9 @@ from core.auth.authz_user import AuthzUser
 from core.auth.validation import Validate
 
 router = APIRouter(
-    prefix="/bbox", dependencies=[Depends(get_current_user)], tags=["bboxAnnotation"]
+    prefix="/bbox",
+    dependencies=[Depends(get_current_principal)],
+    tags=["bboxAnnotation"],
 )
 
 
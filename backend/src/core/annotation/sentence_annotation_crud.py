@@ -50,6 +50,22 @@ class CRUDSentenceAnnotation(
 
         return db_obj
 
+    def create_multi_ids(
+        self,
+        db: Session,
+        *,
+        create_dtos: list[SentenceAnnotationCreateIntern],
+    ) -> list[int]:
+        ids = super().create_multi_ids(db=db, create_dtos=create_dtos)
+
+        # update all affected annotation documents' timestamp
+        crud_adoc.update_timestamps(
+            db=db,
+            ids=[create_dto.annotation_document_id for create_dto in create_dtos],
+        )
+
+        return ids
+
     def create_bulk(
         self, db: Session, *, user_id: int, create_dtos: list[SentenceAnnotationCreate]
     ) -> list[SentenceAnnotationORM]:
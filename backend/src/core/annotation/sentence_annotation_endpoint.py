@@ -3,7 +3,7 @@ from loguru import logger
 from sqlalchemy.orm import Session
 
 from common.crud_enum import Crud
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.annotation.sentence_annotation_crud import crud_sentence_anno
 from core.annotation.sentence_annotation_dto import (
     SentenceAnnotationCreate,
@@ -18,7 +18,7 @@ from core.doc.source_document_data_crud import crud_sdoc_data
 
 router = APIRouter(
     prefix="/sentence",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
     tags=["sentenceAnnotation"],
 )
 
@@ -90,14 +90,44 @@ class CRUDSpanAnnotation(
         db.flush()
 
         # update all affected annotation documents' timestamp
-        adoc_ids = list(
-            set([create_dto.annotation_document_id for create_dto in create_dtos])
+        crud_adoc.update_timestamps(
+            db=db,
+            ids=[create_dto.annotation_document_id for create_dto in create_dtos],
         )
-        for adoc_id in adoc_ids:
-            crud_adoc.update_timestamp(db=db, id=adoc_id)
 
         return db_objs
 
+    def create_multi_ids(
+        self,
+        db: Session,
+        *,
+        create_dtos: list[SpanAnnotationCreateIntern],
+    ) -> list[int]:
+        # first get or create the SpanTexts
+        span_text_ids = crud_span_text.read_or_create_ids(
+            db=db, texts=[create_dto.span_text for create_dto in create_dtos]
+        )
+
+        # create the SpanAnnotations (and link the SpanTexts via FK)
+        ids = self._create_rows(
+            db,
+            rows=[
+                {
+                    **create_dto.model_dump(exclude={"span_text"}),
+                    "span_text_id": span_text_id,
+                }
+                for create_dto, span_text_id in zip(create_dtos, span_text_ids)
+            ],
+        )
+
+        # update all affected annotation documents' timestamp
+        crud_adoc.update_timestamps(
+            db=db,
+            ids=[create_dto.annotation_document_id for create_dto in create_dtos],
+        )
+
+        return ids
+
     def create_bulk(
         self, db: Session, *, user_id: int, create_dtos: list[SpanAnnotationCreate]
     ) -> list[SpanAnnotationORM]:
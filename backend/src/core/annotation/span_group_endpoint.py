@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from common.crud_enum import Crud
-from common.dependencies import get_current_user, get_db_session, skip_limit_params
+from common.dependencies import get_current_principal, get_db_session, skip_limit_params
 from core.annotation.span_annotation_dto import SpanAnnotationRead
 from core.annotation.span_group_crud import crud_span_group
 from core.annotation.span_group_dto import (
@@ -14,7 +14,9 @@ from core.annotation.span_group_dto import (
 from core.auth.authz_user import AuthzUser
 
 router = APIRouter(
-    prefix="/spangroup", dependencies=[Depends(get_current_user)], tags=["spanGroup"]
+    prefix="/spangroup",
+    dependencies=[Depends(get_current_principal)],
+    tags=["spanGroup"],
 )
 
 
@@ -1,5 +1,6 @@
 import tenacity
 from psycopg2.errors import UniqueViolation
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from config import conf
@@ -62,6 +63,44 @@ class CRUDSpanText(CRUDBase[SpanTextORM, SpanTextCreate, UpdateNotAllowed]):
 
         return [text_to_db_obj_map[create_dto.text] for create_dto in create_dtos]
 
+    def read_or_create_ids(self, db: Session, *, texts: list[str]) -> list[int]:
+        """
+        Bulk variant of create_multi, that does not construct ORM objects:
+        Returns the ids of the SpanTexts (in the order of the texts), missing SpanTexts are created.
+        Concurrent imports of the same texts are safe (ON CONFLICT DO NOTHING).
+        """
+        unique_texts = list(dict.fromkeys(texts))
+        text_to_id: dict[str, int] = {}
+        for i in range(0, len(unique_texts), BATCH_SIZE):
+            batch_texts = unique_texts[i : i + BATCH_SIZE]
+            text_to_id.update(
+                db.query(self.model.text, self.model.id)
+                .filter(self.model.text.in_(batch_texts))
+                .all()
+            )
+
+        missing_texts = [text for text in unique_texts if text not in text_to_id]
+        for i in range(0, len(missing_texts), BATCH_SIZE):
+            batch_texts = missing_texts[i : i + BATCH_SIZE]
+            text_to_id.update(
+                db.execute(
+                    insert(self.model)
+                    .values([{"text": text} for text in batch_texts])
+                    .on_conflict_do_nothing(index_elements=[self.model.text])
+                    .returning(self.model.text, self.model.id)
+                ).all()
+            )
+            # texts that were created concurrently are not returned
+            conflicting_texts = [text for text in batch_texts if text not in text_to_id]
+            if len(conflicting_texts) > 0:
+                text_to_id.update(
+                    db.query(self.model.text, self.model.id)
+                    .filter(self.model.text.in_(conflicting_texts))
+                    .all()
+                )
+
+        return [text_to_id[text] for text in texts]
+
     ### READ OPERATIONS ###
 
     def read_by_text(self, db: Session, *, text: str) -> SpanTextORM | None:
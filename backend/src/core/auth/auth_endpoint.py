@@ -7,10 +7,16 @@ from fastapi.responses import HTMLResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
-from common.dependencies import get_current_user, get_db_session, reusable_oauth2_scheme
+from common.dependencies import (
+    get_current_email,
+    get_current_principal,
+    get_db_session,
+    reusable_oauth2_scheme,
+)
 from core.auth.auth_exceptions import credentials_exception
 from core.auth.authz_user import AuthzUser
 from core.auth.oauth_service import OAuthService
+from core.auth.principal_dto import Principal
 from core.auth.refresh_token_crud import crud_refresh_token
 from core.auth.refresh_token_dto import RefreshAccessTokenData
 from core.auth.security import decode_jwt, generate_jwt
@@ -21,7 +27,6 @@ from core.user.user_dto import (
     UserLogin,
     UserRead,
 )
-from core.user.user_orm import UserORM
 from repos.db.crud_base import NoSuchElementError
 from repos.mail_repo import MailRepo
 
@@ -164,7 +169,7 @@ async def auth_content(
 ) -> None:
     # returns None on purpose
     token = request.cookies[AUTHORIZATION]
-    a = AuthzUser(request, get_current_user(db, token), db)
+    a = AuthzUser(request, get_current_principal(db, get_current_email(token)), db)
     if x_original_uri is None or not x_original_uri.startswith(CONTENT_PREFIX):
         return
 
@@ -234,7 +239,7 @@ async def oidc_callback(
 @router.post("/sync-session")
 async def sync_session(
     response: Response,
-    current_user: UserORM = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     token: str = Depends(reusable_oauth2_scheme),
 ) -> None:
     payload = decode_jwt(token=token)
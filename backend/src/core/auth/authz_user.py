@@ -5,9 +5,9 @@ from loguru import logger
 from sqlalchemy.orm import Session
 
 from common.crud_enum import Crud
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from common.exception_handler import exception_handler
-from core.user.user_orm import UserORM
+from core.auth.principal_dto import Principal
 from repos.db.crud_base import NoSuchElementError
 from repos.db.orm_base import ORMBase
 
@@ -23,14 +23,14 @@ class AuthzUser:
     for authorization logic in our fastapi endpoint functions.
     """
 
-    user: UserORM
+    user: Principal
     db: Session
     request: Request
 
     def __init__(
         self,
         request: Request,
-        user: UserORM = Depends(get_current_user),
+        user: Principal = Depends(get_current_principal),
         db: Session = Depends(get_db_session),
     ):
         self.request = request
@@ -68,10 +68,8 @@ class AuthzUser:
         if None in required_project_ids:
             self.deny_access("One or several objects have no parent project")
 
-        # Since we pre-load user projects, this should require no db query
-        user_project_ids = {proj.id for proj in self.user.projects}
-
-        self.assert_true(required_project_ids.issubset(user_project_ids))
+        # The principal holds the project ids, this requires no db query
+        self.assert_true(required_project_ids.issubset(self.user.project_ids))
 
     def assert_object_has_same_user_id(self, crud: Crud, object_id: int | str):
         orm_object = self.read_crud(crud, object_id)
@@ -86,14 +84,10 @@ class AuthzUser:
         self.assert_true(self.user.id == other_user_id)
 
     def assert_in_project(self, project_id: int):
-        # Since we're eager-loading user projects in crud_user.read_by_email,
-        # this statement is faster than sending a custom query
-        authorized_project = next(
-            (proj for proj in self.user.projects if proj.id == project_id), None
-        )
-
+        # The principal holds the project ids, this requires no db query
         self.assert_true(
-            authorized_project is not None, f"User needs to be in project {project_id}"
+            project_id in self.user.project_ids,
+            f"User needs to be in project {project_id}",
         )
 
     def assert_true(self, is_authorized: bool, note: str = ""):
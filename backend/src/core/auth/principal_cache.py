@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict
+
+from loguru import logger
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from config import conf
+from core.auth.principal_dto import Principal
+from repos.redis_repo import RedisRepo
+
+CACHE_KEY_PREFIX = "principal"
+
+# in-process LRU cache: email -> (expiry timestamp, principal)
+_local_cache: OrderedDict[str, tuple[float, Principal]] = OrderedDict()
+_local_cache_lock = threading.Lock()
+
+
+def _cache_key(email: str) -> str:
+    return f"{CACHE_KEY_PREFIX}:{email}"
+
+
+def read_cached_principal(email: str) -> Principal | None:
+    """Returns the cached principal of the user with the given email (None if not cached)"""
+    if not conf.auth.principal_cache.enabled:
+        return None
+
+    # 1. in-process cache
+    with _local_cache_lock:
+        entry = _local_cache.get(email)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                _local_cache.move_to_end(email)
+                return entry[1]
+            del _local_cache[email]
+
+    # 2. shared cache
+    if conf.auth.principal_cache.redis_ttl_s == 0:
+        return None
+    try:
+        data = RedisRepo().redis_connection().get(_cache_key(email))
+    except RedisError as e:
+        logger.warning(f"Could not read the cached principal: {e}")
+        return None
+    if data is None:
+        return None
+
+    principal = Principal.model_validate_json(data)
+    __store_local(principal)
+    return principal
+
+
+def store_cached_principal(principal: Principal) -> None:
+    """Caches the principal in-process and (if enabled) in Redis"""
+    if not conf.auth.principal_cache.enabled:
+        return
+
+    __store_local(principal)
+
+    if conf.auth.principal_cache.redis_ttl_s == 0:
+        return
+    try:
+        RedisRepo().redis_connection().set(
+            _cache_key(principal.email),
+            principal.model_dump_json(),
+            ex=conf.auth.principal_cache.redis_ttl_s,
+        )
+    except RedisError as e:
+        logger.warning(f"Could not cache the principal: {e}")
+
+
+def invalidate_cached_principal(email: str) -> None:
+    """
+    Removes the principal from the in-process cache and from Redis.
+    The in-process caches of the other API processes expire after ttl_s.
+    """
+    with _local_cache_lock:
+        _local_cache.pop(email, None)
+
+    if not conf.auth.principal_cache.enabled:
+        return
+    if conf.auth.principal_cache.redis_ttl_s == 0:
+        return
+    try:
+        RedisRepo().redis_connection().delete(_cache_key(email))
+    except RedisError as e:
+        logger.warning(f"Could not invalidate the cached principal: {e}")
+
+
+def invalidate_cached_principal_on_commit(db: Session, email: str) -> None:
+    """
+    Invalidates the principal when the access of the user changes (e.g. project membership).
+    It is invalidated now and once more after the commit,
+    so that concurrent requests cannot cache the principal as it was before the change.
+    """
+    invalidate_cached_principal(email)
+    event.listen(
+        db,
+        "after_commit",
+        lambda session: invalidate_cached_principal(email),
+        once=True,
+    )
+
+
+def __store_local(principal: Principal) -> None:
+    expiry = time.monotonic() + conf.auth.principal_cache.ttl_s
+    with _local_cache_lock:
+        _local_cache[principal.email] = (expiry, principal)
+        _local_cache.move_to_end(principal.email)
+        while len(_local_cache) > conf.auth.principal_cache.max_entries:
+            _local_cache.popitem(last=False)
@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+
+
+class Principal(BaseModel):
+    """The authenticated User, reduced to what the authorization needs"""
+
+    id: int = Field(description="ID of the User")
+    email: str = Field(description="E-Mail of the User")
+    project_ids: set[int] = Field(description="IDs of the Projects of the User")
@@ -2,14 +2,14 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from common.crud_enum import Crud
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.auth.authz_user import AuthzUser
 from core.code.code_crud import crud_code
 from core.code.code_dto import CodeCreate, CodeRead, CodeUpdate
 from core.project.project_crud import crud_project
 
 router = APIRouter(
-    prefix="/code", dependencies=[Depends(get_current_user)], tags=["code"]
+    prefix="/code", dependencies=[Depends(get_current_principal)], tags=["code"]
 )
 
 
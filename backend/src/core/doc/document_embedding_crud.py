@@ -4,6 +4,7 @@ from weaviate.classes.query import Filter
 from core.doc.document_collection import DocumentCollection
 from core.doc.document_embedding_dto import DocumentObjectIdentifier
 from repos.vector.embedding_crud_base import CRUDBase
+from repos.vector.weaviate_models import SimSearchResult
 from systems.event_system.events import source_document_deleted
 
 
@@ -12,6 +13,8 @@ class CRUDDocumentEmbedding(CRUDBase[DocumentObjectIdentifier, DocumentCollectio
     CRUD operations for document embeddings in Weaviate
     """
 
+    local_knn = True
+
     def search_near_sdoc(
         self,
         client: WeaviateClient,
@@ -48,6 +51,42 @@ class CRUDDocumentEmbedding(CRUDBase[DocumentObjectIdentifier, DocumentCollectio
             threshold=threshold,
         )
 
+    def search_near_sdocs(
+        self,
+        client: WeaviateClient,
+        project_id: int,
+        sdoc_ids: list[int],
+        k: int,
+        threshold: float,
+        filter_sdoc_ids: list[int] | None = None,
+    ) -> list[list[SimSearchResult[DocumentObjectIdentifier]]]:
+        """
+        Search for documents near each of the given SourceDocuments (batched)
+        Args:
+            project_id: The project ID
+            sdoc_ids: The SourceDocument IDs to search near
+            k: The number of nearest neighbors to return per SourceDocument
+            threshold: The minimum distance for a match
+            filter_sdoc_ids: List of SourceDocument IDs to search in
+        Returns:
+            List of SimSearchResult[DocumentObjectIdentifier] per SourceDocument
+        """
+        filters = (
+            Filter.by_property(
+                self.collection_class.properties["sdoc_id"].name
+            ).contains_any(filter_sdoc_ids)
+            if filter_sdoc_ids
+            else None
+        )
+        return self.search_near_objects(
+            client=client,
+            project_id=project_id,
+            ids=[DocumentObjectIdentifier(sdoc_id=sdoc_id) for sdoc_id in sdoc_ids],
+            filters=filters,
+            k=k,
+            threshold=threshold,
+        )
+
     def remove_by_sdoc_id(
         self, client: WeaviateClient, project_id: int, sdoc_id: int
     ) -> None:
@@ -64,6 +103,7 @@ class CRUDDocumentEmbedding(CRUDBase[DocumentObjectIdentifier, DocumentCollectio
                     self.collection_class.properties["sdoc_id"].name
                 ).equal(sdoc_id)
             )
+            self._invalidate_local_index(project_id)
 
 
 crud_document_embedding = CRUDDocumentEmbedding(
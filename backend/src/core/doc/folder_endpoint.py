@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from common.crud_enum import Crud
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from common.doc_type import DocType
 from core.auth.authz_user import AuthzUser
 from core.doc.folder_crud import crud_folder
@@ -14,7 +14,7 @@ from core.doc.folder_dto import (
 )
 
 router = APIRouter(
-    prefix="/folder", dependencies=[Depends(get_current_user)], tags=["folder"]
+    prefix="/folder", dependencies=[Depends(get_current_principal)], tags=["folder"]
 )
 
 
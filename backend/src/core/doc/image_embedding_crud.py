@@ -12,6 +12,8 @@ class CRUDImageEmbedding(CRUDBase[ImageObjectIdentifier, ImageCollection]):
     CRUD operations for image embeddings in Weaviate
     """
 
+    local_knn = True
+
     def search_near_vector_in_sdoc_ids(
         self,
         client: WeaviateClient,
@@ -64,6 +66,7 @@ class CRUDImageEmbedding(CRUDBase[ImageObjectIdentifier, ImageCollection]):
                     self.collection_class.properties["sdoc_id"].name
                 ).equal(sdoc_id)
             )
+            self._invalidate_local_index(project_id)
 
 
 crud_image_embedding = CRUDImageEmbedding(
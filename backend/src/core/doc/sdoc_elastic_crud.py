@@ -1,3 +1,5 @@
+from typing import Any
+
 from elasticsearch import Elasticsearch
 
 from core.doc.sdoc_elastic_dto import (
@@ -6,7 +8,7 @@ from core.doc.sdoc_elastic_dto import (
     ElasticSearchDocumentUpdate,
 )
 from core.doc.sdoc_elastic_index import SdocIndex
-from repos.elastic.elastic_crud_base import ElasticCrudBase
+from repos.elastic.elastic_crud_base import ElasticCrudBase, terms_filter
 from repos.elastic.elastic_dto_base import PaginatedElasticSearchHits
 from systems.event_system.events import (
     source_document_deleted,
@@ -21,6 +23,8 @@ class CRUDElasticSdoc(
         ElasticSearchDocumentUpdate,
     ]
 ):
+    ### OTHER OPERATIONS ###
+
     def search_sdocs_by_content_query(
         self,
         *,
@@ -48,15 +52,14 @@ class CRUDElasticSdoc(
 
         # the sdoc_ids parameter is for filtering the search results
         # if it is None, all documents are searched
-        bool_must_query = [q]
+        bool_query: dict[str, Any] = {"must": [q]}
         if sdoc_ids is not None:
-            # the terms query has an allowed maximum of 65536 terms
-            bool_must_query.append({"terms": {"sdoc_id": list(sdoc_ids)[:65536]}})
+            bool_query["filter"] = [terms_filter("sdoc_id", sorted(sdoc_ids))]
 
         return self.search(
             client=client,
             proj_id=proj_id,
-            query={"bool": {"must": bool_must_query}},
+            query={"bool": bool_query},
             limit=limit,
             skip=skip,
             highlight=highlight_query,
@@ -1,10 +1,11 @@
+import numpy as np
 from weaviate import WeaviateClient
 from weaviate.classes.query import Filter
 
 from core.doc.sentence_collection import SentenceCollection
 from core.doc.sentence_embedding_dto import SentenceObjectIdentifier
 from repos.vector.embedding_crud_base import CRUDBase
-from repos.vector.weaviate_models import EmbeddingSearchResult
+from repos.vector.weaviate_models import EmbeddingSearchResult, SimSearchResult
 from systems.event_system.events import source_document_deleted
 
 
@@ -13,6 +14,8 @@ class CRUDSentenceEmbedding(CRUDBase[SentenceObjectIdentifier, SentenceCollectio
     CRUD operations for sentence embeddings in Weaviate
     """
 
+    local_knn = True
+
     def search_near_sentence(
         self,
         client: WeaviateClient,
@@ -39,6 +42,32 @@ class CRUDSentenceEmbedding(CRUDBase[SentenceObjectIdentifier, SentenceCollectio
             threshold=threshold,
         )
 
+    def search_near_sentences(
+        self,
+        client: WeaviateClient,
+        project_id: int,
+        ids: list[SentenceObjectIdentifier],
+        k: int,
+        threshold: float,
+    ) -> list[list[SimSearchResult[SentenceObjectIdentifier]]]:
+        """
+        Search for sentences near each of the given sentences (batched)
+        Args:
+            project_id: The project ID
+            ids: The sentences to search near
+            k: The number of nearest neighbors to return per sentence
+            threshold: The minimum distance for a match
+        Returns:
+            List of SimSearchResult[SentenceObjectIdentifier] per sentence
+        """
+        return self.search_near_objects(
+            client=client,
+            project_id=project_id,
+            ids=ids,
+            k=k,
+            threshold=threshold,
+        )
+
     def search_near_vector_in_sdoc_ids(
         self,
         client: WeaviateClient,
@@ -95,6 +124,38 @@ class CRUDSentenceEmbedding(CRUDBase[SentenceObjectIdentifier, SentenceCollectio
             ).equal(sdoc_id),
         )
 
+    def get_embeddings_by_sdoc_ids(
+        self, client: WeaviateClient, project_id: int, sdoc_ids: list[int]
+    ) -> dict[int, np.ndarray]:
+        """
+        Get all sentence embeddings of multiple SourceDocuments with one (paged) query
+        Args:
+            project_id: The project ID
+            sdoc_ids: The SourceDocument IDs
+        Returns:
+            Mapping from sdoc_id to the float32 embeddings of its sentences (ordered by sentence_id)
+        """
+        if len(sdoc_ids) == 0:
+            return {}
+        sdoc_id2rows: dict[int, list[tuple[int, np.ndarray]]] = {}
+        for block in self.iter_embeddings(
+            client=client,
+            project_id=project_id,
+            filters=Filter.by_property(
+                self.collection_class.properties["sdoc_id"].name
+            ).contains_any(sdoc_ids),
+        ):
+            for id, embedding in zip(block.ids, block.embeddings):
+                sdoc_id2rows.setdefault(id.sdoc_id, []).append(
+                    (id.sentence_id, embedding)
+                )
+        return {
+            sdoc_id: np.stack(
+                [embedding for _, embedding in sorted(rows, key=lambda r: r[0])]
+            )
+            for sdoc_id, rows in sdoc_id2rows.items()
+        }
+
     def remove_by_sdoc_id(
         self, client: WeaviateClient, project_id: int, sdoc_id: int
     ) -> None:
@@ -111,6 +172,7 @@ class CRUDSentenceEmbedding(CRUDBase[SentenceObjectIdentifier, SentenceCollectio
                     self.collection_class.properties["sdoc_id"].name
                 ).equal(sdoc_id)
             )
+            self._invalidate_local_index(project_id)
 
 
 crud_sentence_embedding = CRUDSentenceEmbedding(
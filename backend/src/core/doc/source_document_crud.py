@@ -65,6 +65,34 @@ class CRUDSourceDocument(
             db.rollback()
             raise e
 
+    def create_multi_ids(
+        self,
+        db: Session,
+        *,
+        create_dtos: list[SourceDocumentCreate],
+        update_dtos: list[SourceDocumentUpdate] | None = None,
+    ) -> list[int]:
+        """
+        Bulk variant of create: Inserts the SourceDocuments with multi-row INSERT statements.
+        In contrast to create, the folders have to exist already (folder_id is required).
+        The (optional) update_dtos, e.g. the processing status, are written with the same INSERT.
+        """
+        if update_dtos is not None and len(update_dtos) != len(create_dtos):
+            raise ValueError(
+                f"The number of Create and Update DTO objects must equal! {len(create_dtos)} Create DTOs and {len(update_dtos)} Update DTOs received."
+            )
+        rows = []
+        for i, create_dto in enumerate(create_dtos):
+            if create_dto.folder_id is None:
+                raise ValueError(
+                    f"SourceDocument {create_dto.filename} has no folder_id, cannot bulk create."
+                )
+            row = create_dto.model_dump(mode="json")
+            if update_dtos is not None:
+                row.update(update_dtos[i].model_dump(mode="json", exclude_unset=True))
+            rows.append(row)
+        return self._create_rows(db, rows=rows)
+
     ### READ OPERATIONS ###
 
     def read_status(
@@ -140,6 +168,14 @@ class CRUDSourceDocument(
 
         return query.all()
 
+    def read_ids_by_project(self, db: Session, *, proj_id: int) -> list[int]:
+        return [
+            row[0]
+            for row in db.query(self.model.id)
+            .filter(self.model.project_id == proj_id)
+            .order_by(self.model.id)
+        ]
+
     def read_by_filename(
         self, db: Session, *, proj_id: int, only_finished: bool = True, filename: str
     ) -> SourceDocumentORM | None:
@@ -157,6 +193,36 @@ class CRUDSourceDocument(
             )
         return query.first()
 
+    def read_existing_filenames(
+        self, db: Session, *, proj_id: int, filenames: list[str]
+    ) -> set[str]:
+        """Returns the given filenames that already exist in the project (regardless of the status)"""
+        existing: set[str] = set()
+        for i in range(0, len(filenames), BATCH_SIZE):
+            existing.update(
+                row[0]
+                for row in db.query(self.model.filename).filter(
+                    self.model.project_id == proj_id,
+                    self.model.filename.in_(filenames[i : i + BATCH_SIZE]),
+                )
+            )
+        return existing
+
+    def read_ids_by_filenames(
+        self, db: Session, *, proj_id: int, filenames: list[str]
+    ) -> dict[str, int]:
+        """Maps the given filenames that exist in the project (regardless of the status) to their ids"""
+        ids: dict[str, int] = {}
+        for i in range(0, len(filenames), BATCH_SIZE):
+            ids.update(
+                (row[1], row[0])
+                for row in db.query(self.model.id, self.model.filename).filter(
+                    self.model.project_id == proj_id,
+                    self.model.filename.in_(filenames[i : i + BATCH_SIZE]),
+                )
+            )
+        return ids
+
     def read_all_without_tags(
         self, db: Session, *, project_id: int, tag_ids: list[int] = []
     ) -> list[SourceDocumentORM]:
@@ -1,9 +1,13 @@
+from sqlalchemy import Integer, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import QueryableAttribute, Session, load_only
+
 from core.doc.source_document_data_dto import (
     SourceDocumentDataCreate,
     SourceDocumentDataUpdate,
 )
 from core.doc.source_document_data_orm import SourceDocumentDataORM
-from repos.db.crud_base import CRUDBase
+from repos.db.crud_base import BATCH_SIZE, CRUDBase, NoSuchElementError
 
 
 class CRUDSourceDocumentData(
@@ -13,7 +17,87 @@ class CRUDSourceDocumentData(
         SourceDocumentDataUpdate,
     ]
 ):
-    pass
+    ### READ OPERATIONS ###
+
+    def read_by_ids_with_columns(
+        self,
+        db: Session,
+        *,
+        ids: list[int],
+        columns: list[QueryableAttribute],
+    ) -> list[SourceDocumentDataORM]:
+        """
+        Like read_by_ids, but only the given columns are loaded (e.g. not the html).
+        Other columns are loaded lazily, when they are accessed.
+        """
+        if not ids:
+            return []
+
+        db_objects: list[SourceDocumentDataORM] = []
+        for i in range(0, len(ids), BATCH_SIZE):
+            batch_ids = ids[i : i + BATCH_SIZE]
+            db_objects.extend(
+                db.query(self.model)
+                .options(load_only(*columns))
+                .filter(self.model.id.in_(batch_ids))
+                .all()
+            )
+
+        # Maintain the order of the input IDs
+        id_map = {db_obj.id: db_obj for db_obj in db_objects}
+        for id in ids:
+            if id not in id_map:
+                raise NoSuchElementError(self.model, id=id)
+        return [id_map[id] for id in ids]
+
+    def read_sentences(
+        self,
+        db: Session,
+        *,
+        sentence_ids: list[tuple[int, int]],
+    ) -> dict[tuple[int, int], str]:
+        """
+        Reads individual sentences, identified by (sdoc_id, sentence_id), without loading the documents:
+        the sentences are cut out of the content in the database using the sentence offsets.
+        Sentences that do not exist are missing in the result.
+        """
+        if not sentence_ids:
+            return {}
+
+        requested = (
+            func.unnest(
+                bindparam("sdoc_ids", type_=ARRAY(Integer)),
+                bindparam("sentence_ids", type_=ARRAY(Integer)),
+            )
+            .table_valued("sdoc_id", "sentence_id")
+            .render_derived(name="requested")
+        )
+        # postgres arrays and strings are 1-indexed
+        start = self.model.sentence_starts[requested.c.sentence_id + 1]
+        end = self.model.sentence_ends[requested.c.sentence_id + 1]
+        stmt = (
+            select(
+                requested.c.sdoc_id,
+                requested.c.sentence_id,
+                func.substr(self.model.content, start + 1, end - start),
+            )
+            .join(self.model, self.model.id == requested.c.sdoc_id)
+            .where(start.is_not(None), end.is_not(None))
+        )
+
+        result: dict[tuple[int, int], str] = {}
+        for i in range(0, len(sentence_ids), BATCH_SIZE):
+            batch = sentence_ids[i : i + BATCH_SIZE]
+            rows = db.execute(
+                stmt,
+                {
+                    "sdoc_ids": [sdoc_id for sdoc_id, _ in batch],
+                    "sentence_ids": [sentence_id for _, sentence_id in batch],
+                },
+            )
+            for sdoc_id, sentence_id, sentence in rows:
+                result[(sdoc_id, sentence_id)] = sentence
+        return result
 
 
 crud_sdoc_data = CRUDSourceDocumentData(SourceDocumentDataORM)
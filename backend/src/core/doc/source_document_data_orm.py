@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
 
 from sqlalchemy import ForeignKey, Integer, String
 from sqlalchemy.dialects.postgresql import ARRAY
@@ -10,6 +10,8 @@ from repos.db.orm_base import ORMBase
 if TYPE_CHECKING:
     from core.doc.source_document_orm import SourceDocumentORM
 
+T = TypeVar("T")
+
 
 class SourceDocumentDataORM(ORMBase):
     id: Mapped[int] = mapped_column(
@@ -49,41 +51,95 @@ class SourceDocumentDataORM(ORMBase):
     def project_id(self) -> int:
         return self.source_document.project_id
 
+    def _cached(self, name: str, compute: Callable[[], T], *dependencies: Any) -> T:
+        """
+        Caches a derived value (e.g. the sentences) on this object.
+        The value is recomputed if one of the columns it is derived from is replaced.
+        """
+        cache: dict[str, tuple[tuple[Any, ...], Any]] = self.__dict__.setdefault(
+            "_derived_cache", {}
+        )
+        cached = cache.get(name)
+        if cached is not None and all(a is b for a, b in zip(cached[0], dependencies)):
+            return cached[1]
+        value = compute()
+        cache[name] = (dependencies, value)
+        return value
+
     @property
-    def tokens(self):
-        return [self.content[s:e] for s, e in zip(self.token_starts, self.token_ends)]
+    def tokens(self) -> list[str]:
+        return self._cached(
+            "tokens",
+            lambda: [
+                self.content[s:e] for s, e in zip(self.token_starts, self.token_ends)
+            ],
+            self.content,
+            self.token_starts,
+            self.token_ends,
+        )
 
     @property
     def token_character_offsets(self):
         return [(s, e) for s, e in zip(self.token_starts, self.token_ends)]
 
     @property
-    def sentences(self):
-        return [
-            self.content[s:e] for s, e in zip(self.sentence_starts, self.sentence_ends)
-        ]
+    def sentences(self) -> list[str]:
+        return self._cached(
+            "sentences",
+            lambda: [
+                self.content[s:e]
+                for s, e in zip(self.sentence_starts, self.sentence_ends)
+            ],
+            self.content,
+            self.sentence_starts,
+            self.sentence_ends,
+        )
 
     @property
     def sentence_character_offsets(self):
         return [(s, e) for s, e in zip(self.sentence_starts, self.sentence_ends)]
 
     @property
-    def sentence_token_starts(self):
-        char2tok = {c: i for i, c in enumerate(self.token_starts)}
-        return [char2tok[s] for s in self.sentence_starts]
+    def sentence_token_starts(self) -> list[int]:
+        def compute():
+            char2tok = {c: i for i, c in enumerate(self.token_starts)}
+            return [char2tok[s] for s in self.sentence_starts]
+
+        return self._cached(
+            "sentence_token_starts",
+            compute,
+            self.token_starts,
+            self.sentence_starts,
+        )
 
     @property
-    def sentence_token_ends(self):
-        char2tok = {c: i for i, c in enumerate(self.token_ends)}
-        return [char2tok[e] for e in self.sentence_ends]
+    def sentence_token_ends(self) -> list[int]:
+        def compute():
+            char2tok = {c: i for i, c in enumerate(self.token_ends)}
+            return [char2tok[e] for e in self.sentence_ends]
+
+        return self._cached(
+            "sentence_token_ends",
+            compute,
+            self.token_ends,
+            self.sentence_ends,
+        )
 
     @property
-    def tokenized_sentences(self):
+    def tokenized_sentences(self) -> list[list[str]]:
         tokens = self.tokens
-        return [
-            tokens[s : e + 1]
-            for s, e in zip(self.sentence_token_starts, self.sentence_token_ends)
-        ]
+        sentence_token_starts = self.sentence_token_starts
+        sentence_token_ends = self.sentence_token_ends
+        return self._cached(
+            "tokenized_sentences",
+            lambda: [
+                tokens[s : e + 1]
+                for s, e in zip(sentence_token_starts, sentence_token_ends)
+            ],
+            tokens,
+            sentence_token_starts,
+            sentence_token_ends,
+        )
 
     @property
     def word_level_transcriptions(self) -> list[WordLevelTranscription] | None:
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from common.crud_enum import Crud
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.auth.authz_user import AuthzUser
 from core.doc.source_document_crud import crud_sdoc
 from core.doc.source_document_data_crud import crud_sdoc_data
@@ -11,7 +11,9 @@ from core.doc.source_document_dto import SourceDocumentRead, SourceDocumentUpdat
 from repos.filesystem_repo import FilesystemRepo
 
 router = APIRouter(
-    prefix="/sdoc", dependencies=[Depends(get_current_user)], tags=["sourceDocument"]
+    prefix="/sdoc",
+    dependencies=[Depends(get_current_principal)],
+    tags=["sourceDocument"],
 )
 
 
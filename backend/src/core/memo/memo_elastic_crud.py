@@ -6,7 +6,7 @@ from core.memo.memo_elastic_dto import (
     ElasticSearchMemoUpdate,
 )
 from core.memo.memo_elastic_index import MemoIndex
-from repos.elastic.elastic_crud_base import ElasticCrudBase
+from repos.elastic.elastic_crud_base import ElasticCrudBase, terms_filter
 from repos.elastic.elastic_dto_base import PaginatedElasticSearchHits
 from systems.event_system.events import (
     source_document_deleted,
@@ -39,9 +39,9 @@ class CRUDElasticMemo(
             query={
                 "bool": {
                     "must": [
-                        {"terms": {"memo_id": list(memo_ids)}},
                         {"match": {"title": {"query": query, "fuzziness": 1}}},
-                    ]
+                    ],
+                    "filter": [terms_filter("memo_id", sorted(memo_ids))],
                 }
             },
             limit=limit,
@@ -65,9 +65,9 @@ class CRUDElasticMemo(
             query={
                 "bool": {
                     "must": [
-                        {"terms": {"memo_id": list(memo_ids)}},
                         {"match": {"content": {"query": query, "fuzziness": 1}}},
-                    ]
+                    ],
+                    "filter": [terms_filter("memo_id", sorted(memo_ids))],
                 }
             },
             limit=limit,
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from common.crud_enum import Crud, MemoCrud
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.auth.authz_user import AuthzUser
 from core.auth.validation import Validate
 from core.memo.memo_crud import crud_memo
@@ -20,7 +20,7 @@ from core.memo.memo_generation_service import generate_memo_llm
 from core.memo.memo_utils import get_object_memo_for_user, get_object_memos
 
 router = APIRouter(
-    prefix="/memo", dependencies=[Depends(get_current_user)], tags=["memo"]
+    prefix="/memo", dependencies=[Depends(get_current_principal)], tags=["memo"]
 )
 
 
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from common.crud_enum import Crud
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.auth.authz_user import AuthzUser
 from core.metadata.project_metadata_crud import crud_project_meta
 from core.metadata.project_metadata_dto import (
@@ -13,7 +13,7 @@ from core.metadata.project_metadata_dto import (
 
 router = APIRouter(
     prefix="/projmeta",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
     tags=["projectMetadata"],
 )
 
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from common.crud_enum import Crud
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.auth.authz_user import AuthzUser
 from core.doc.source_document_crud import crud_sdoc
 from core.metadata.source_document_metadata_crud import crud_sdoc_meta
@@ -13,7 +13,9 @@ from core.metadata.source_document_metadata_dto import (
 )
 
 router = APIRouter(
-    prefix="/sdocmeta", dependencies=[Depends(get_current_user)], tags=["sdocMetadata"]
+    prefix="/sdocmeta",
+    dependencies=[Depends(get_current_principal)],
+    tags=["sdocMetadata"],
 )
 
 
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 
+from core.auth.principal_cache import invalidate_cached_principal_on_commit
 from core.project.project_dto import ProjectCreate, ProjectUpdate
 from core.project.project_orm import ProjectORM
 from core.user.user_crud import (
@@ -22,6 +23,9 @@ class CRUDProject(CRUDBase[ProjectORM, ProjectCreate, ProjectUpdate]):
         db.add(proj_db_obj)
         db.flush()
 
+        # 3) the cached principal of the user is outdated
+        invalidate_cached_principal_on_commit(db=db, email=user_db_obj.email)
+
         return user_db_obj
 
     def dissociate_user(self, db: Session, *, proj_id: int, user_id: int) -> UserORM:
@@ -34,6 +38,9 @@ class CRUDProject(CRUDBase[ProjectORM, ProjectCreate, ProjectUpdate]):
         db.add(proj_db_obj)
         db.flush()
 
+        # 3) the cached principal of the user is outdated
+        invalidate_cached_principal_on_commit(db=db, email=user_db_obj.email)
+
         return user_db_obj
 
     def exists_by_title(self, db: Session, title: str) -> bool:
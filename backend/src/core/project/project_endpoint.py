@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_current_user, get_db_session
 from common.sdoc_status_enum import SDocStatus
 from core.auth.authz_user import AuthzUser
 from core.doc.source_document_crud import crud_sdoc
@@ -19,7 +19,7 @@ from repos.db.crud_base import NoSuchElementError
 
 router = APIRouter(
     prefix="/project",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
     tags=["project"],
 )
 
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from src.modules.perspectives.cluster_embedding_crud import crud_cluster_embedding
 
 from common.singleton_meta import SingletonMeta
+from core.auth.principal_cache import invalidate_cached_principal_on_commit
 from core.code.code_crud import crud_code
 from core.doc.document_embedding_crud import crud_document_embedding
 from core.doc.image_embedding_crud import crud_image_embedding
@@ -124,7 +125,12 @@ class ProjectService(metaclass=SingletonMeta):
 
     def delete_project(self, db: Session, *, proj_id: int) -> ProjectORM:
         # 1) delete the project and all connected data via cascading delete
+        user_emails = [
+            user.email for user in crud_project.read(db=db, id=proj_id).users
+        ]
         proj_db_obj = crud_project.delete(db=db, id=proj_id)
+        for email in user_emails:
+            invalidate_cached_principal_on_commit(db=db, email=email)
 
         # 2) delete the files from filesystem
         self.fsr.purge_project_data(proj_id=proj_id)
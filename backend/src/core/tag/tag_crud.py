@@ -197,6 +197,31 @@ class CRUDTag(CRUDBase[TagORM, TagCreate, TagUpdate]):
 
         return len(new_rows)
 
+    def link_tags_batch(self, db: Session, *, links: dict[int, list[int]]) -> int:
+        """
+        Links each SDoc with its DocTags (sdoc_id -> tag_ids) using a single INSERT
+        """
+        from sqlalchemy.dialects.postgresql import insert
+
+        insert_values = [
+            {"source_document_id": sdoc_id, "tag_id": tag_id}
+            for sdoc_id, tag_ids in links.items()
+            for tag_id in tag_ids
+        ]
+        if len(insert_values) == 0:
+            return 0
+
+        insert_stmt = (
+            insert(SourceDocumentTagLinkTable)
+            .on_conflict_do_nothing()
+            .returning(SourceDocumentTagLinkTable.source_document_id)
+        )
+
+        new_rows = db.execute(insert_stmt, insert_values).fetchall()
+        db.flush()
+
+        return len(new_rows)
+
     def unlink_multiple_tags(
         self, db: Session, *, sdoc_ids: list[int], tag_ids: list[int]
     ) -> int:
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from common.crud_enum import Crud
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.auth.authz_user import AuthzUser
 from core.auth.validation import Validate
 from core.doc.source_document_crud import crud_sdoc
@@ -17,7 +17,7 @@ from core.tag.tag_dto import (
 )
 
 router = APIRouter(
-    prefix="/tag", dependencies=[Depends(get_current_user)], tags=["tag"]
+    prefix="/tag", dependencies=[Depends(get_current_principal)], tags=["tag"]
 )
 
 
@@ -1,6 +1,7 @@
 from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
 
+from core.auth.principal_cache import invalidate_cached_principal_on_commit
 from core.auth.security import generate_password_hash, verify_password
 from core.user.user_dto import UserCreate, UserLogin, UserUpdate
 from core.user.user_orm import UserORM
@@ -78,8 +79,20 @@ class CRUDUser(CRUDBase[UserORM, UserCreate, UserUpdate]):
         if update_dto.password:
             hashed_pwd = generate_password_hash(update_dto.password)
             update_dto.password = hashed_pwd
+        # the principal is cached by email
+        if update_dto.email:
+            invalidate_cached_principal_on_commit(
+                db=db, email=self.read(db=db, id=id).email
+            )
         return super().update(db=db, id=id, update_dto=update_dto)
 
+    ### DELETE OPERATIONS ###
+
+    def delete(self, db: Session, *, id: int) -> UserORM:
+        db_obj = super().delete(db=db, id=id)
+        invalidate_cached_principal_on_commit(db=db, email=db_obj.email)
+        return db_obj
+
     ### OTHER OPERATIONS ###
 
     def authenticate(self, db: Session, user_login: UserLogin) -> UserORM | None:
@@ -1,7 +1,12 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from common.dependencies import get_current_user, get_db_session, skip_limit_params
+from common.dependencies import (
+    get_current_principal,
+    get_current_user,
+    get_db_session,
+    skip_limit_params,
+)
 from core.auth.authz_user import AuthzUser
 from core.project.project_crud import crud_project
 from core.project.project_service import ProjectService
@@ -10,7 +15,7 @@ from core.user.user_dto import ProjectAddUser, PublicUserRead, UserRead, UserUpd
 from core.user.user_orm import UserORM
 
 router = APIRouter(
-    prefix="/user", dependencies=[Depends(get_current_user)], tags=["user"]
+    prefix="/user", dependencies=[Depends(get_current_principal)], tags=["user"]
 )
 
 
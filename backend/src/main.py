@@ -42,7 +42,7 @@ from config import conf
 from repos.elastic.elastic_repo import ElasticSearchRepo
 from repos.filesystem_repo import FilesystemRepo
 from repos.llm_repo import LLMRepo
-from utils.import_utils import import_by_suffix
+from utils.import_utils import import_by_suffix, log_startup_profile
 
 # import all jobs dynamically
 import_by_suffix("_job.py")
@@ -136,6 +136,8 @@ endpoint_modules.sort(key=lambda x: x.__name__.split(".")[-1])
 for em in endpoint_modules:
     app.include_router(em.router)
 
+log_startup_profile("API")
+
 
 # register all exception handlers in fastAPI
 exception_handler(
@@ -0,0 +1,49 @@
+"""add minhash signature
+
+Revision ID: a1c5e7d9b3f2
+Revises: 781d4852a256
+Create Date: 2026-10-18 10:12:41.204518
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a1c5e7d9b3f2"
+down_revision: str | None = "781d4852a256"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "minhashsignature",
+        sa.Column("sdoc_id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("fingerprint", sa.BigInteger(), nullable=False),
+        sa.Column("signature", sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["project.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["sdoc_id"], ["sourcedocument.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("sdoc_id"),
+    )
+    op.create_index(
+        op.f("ix_minhashsignature_project_id"),
+        "minhashsignature",
+        ["project_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_minhashsignature_sdoc_id"),
+        "minhashsignature",
+        ["sdoc_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_minhashsignature_sdoc_id"), table_name="minhashsignature")
+    op.drop_index(op.f("ix_minhashsignature_project_id"), table_name="minhashsignature")
+    op.drop_table("minhashsignature")
@@ -0,0 +1,46 @@
+"""add minhash band
+
+Revision ID: c4e8f2a6d1b7
+Revises: a1c5e7d9b3f2
+Create Date: 2026-10-18 14:03:12.887105
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e8f2a6d1b7"
+down_revision: str | None = "a1c5e7d9b3f2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "minhashband",
+        sa.Column("sdoc_id", sa.Integer(), nullable=False),
+        sa.Column("band", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("bucket", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["project.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["sdoc_id"], ["sourcedocument.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("sdoc_id", "band"),
+    )
+    op.create_index(
+        "ix_minhashband_project_id_band_bucket",
+        "minhashband",
+        ["project_id", "band", "bucket"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_minhashband_sdoc_id"), "minhashband", ["sdoc_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_minhashband_sdoc_id"), table_name="minhashband")
+    op.drop_index("ix_minhashband_project_id_band_bucket", table_name="minhashband")
+    op.drop_table("minhashband")
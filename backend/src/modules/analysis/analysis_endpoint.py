@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from common.doc_type import DocType
 from core.auth.authz_user import AuthzUser
 from modules.analysis.analysis_dto import (
@@ -19,7 +19,7 @@ from modules.analysis.count_metadata import (
 from modules.analysis.document_sampler import document_sampler_by_tags
 
 router = APIRouter(
-    prefix="/analysis", dependencies=[Depends(get_current_user)], tags=["analysis"]
+    prefix="/analysis", dependencies=[Depends(get_current_principal)], tags=["analysis"]
 )
 
 
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.auth.authz_user import AuthzUser
 from modules.annoscaling.annoscaling_dto import (
     AnnoscalingConfirmSuggest,
@@ -13,7 +13,7 @@ from modules.annoscaling.annoscaling_service import AnnoScalingService
 router = APIRouter(
     prefix="/annoscaling",
     tags=["annoscaling"],
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
 )
 
 ass: AnnoScalingService = AnnoScalingService()
@@ -12,6 +12,7 @@ from core.annotation.span_annotation_orm import SpanAnnotationORM
 from core.doc.sentence_embedding_crud import crud_sentence_embedding
 from core.doc.sentence_embedding_dto import SentenceObjectIdentifier
 from core.doc.source_document_data_crud import crud_sdoc_data
+from core.doc.source_document_data_orm import SourceDocumentDataORM
 from core.doc.source_document_orm import SourceDocumentORM
 from modules.simsearch.simsearch_dto import SimSearchSentenceHit
 from modules.simsearch.simsearch_service import SimSearchService
@@ -41,7 +42,17 @@ class AnnoScalingService(metaclass=SingletonMeta):
         reject: list[tuple[int, int]],
     ):
         sdoc_ids = list({sdoc for sdoc, _ in accept + reject})
-        sdoc_data = crud_sdoc_data.read_by_ids(db, ids=sdoc_ids)
+        sdoc_data = crud_sdoc_data.read_by_ids_with_columns(
+            db,
+            ids=sdoc_ids,
+            columns=[
+                SourceDocumentDataORM.content,
+                SourceDocumentDataORM.token_starts,
+                SourceDocumentDataORM.token_ends,
+                SourceDocumentDataORM.sentence_starts,
+                SourceDocumentDataORM.sentence_ends,
+            ],
+        )
         sdocs = {sdoc.id: sdoc for sdoc in sdoc_data}
 
         to_create = []
@@ -89,24 +100,27 @@ class AnnoScalingService(metaclass=SingletonMeta):
         hits: list[SimSearchSentenceHit] = []
 
         with self.weaviate.weaviate_session() as client:
-            for sdoc_id, sent_id in pos_sdoc_sent_ids:
-                search_result = crud_sentence_embedding.search_near_sentence(
-                    client=client,
-                    project_id=proj_id,
-                    id=SentenceObjectIdentifier(sdoc_id=sdoc_id, sentence_id=sent_id),
-                    k=top_k,
-                    threshold=0.0,
-                )
-                hits.extend(
-                    [
-                        SimSearchSentenceHit(
-                            sdoc_id=r.id.sdoc_id,
-                            sentence_id=r.id.sentence_id,
-                            score=r.score,
-                        )
-                        for r in search_result
-                    ]
-                )
+            search_results = crud_sentence_embedding.search_near_sentences(
+                client=client,
+                project_id=proj_id,
+                ids=[
+                    SentenceObjectIdentifier(sdoc_id=sdoc_id, sentence_id=sent_id)
+                    for sdoc_id, sent_id in pos_sdoc_sent_ids
+                ],
+                k=top_k,
+                threshold=0.0,
+            )
+            hits.extend(
+                [
+                    SimSearchSentenceHit(
+                        sdoc_id=r.id.sdoc_id,
+                        sentence_id=r.id.sentence_id,
+                        score=r.score,
+                    )
+                    for search_result in search_results
+                    for r in search_result
+                ]
+            )
 
             marked_sdoc_sent_ids = {
                 entry for entry in pos_sdoc_sent_ids + neg_sdoc_sent_ids
@@ -123,25 +137,25 @@ class AnnoScalingService(metaclass=SingletonMeta):
             candidates = [(h.sdoc_id, h.sentence_id) for h in hits]
 
             # suggest
-            nearest: list[SimSearchSentenceHit] = []
-            for sdoc_id, sent_id in candidates:
-                search_result = crud_sentence_embedding.search_near_sentence(
-                    client=client,
-                    project_id=proj_id,
-                    id=SentenceObjectIdentifier(sdoc_id=sdoc_id, sentence_id=sent_id),
-                    k=1,
-                    threshold=0.0,
-                )
-                nearest.extend(
-                    [
-                        SimSearchSentenceHit(
-                            sdoc_id=r.id.sdoc_id,
-                            sentence_id=r.id.sentence_id,
-                            score=r.score,
-                        )
-                        for r in search_result
-                    ]
+            search_results = crud_sentence_embedding.search_near_sentences(
+                client=client,
+                project_id=proj_id,
+                ids=[
+                    SentenceObjectIdentifier(sdoc_id=sdoc_id, sentence_id=sent_id)
+                    for sdoc_id, sent_id in candidates
+                ],
+                k=1,
+                threshold=0.0,
+            )
+            nearest: list[SimSearchSentenceHit] = [
+                SimSearchSentenceHit(
+                    sdoc_id=r.id.sdoc_id,
+                    sentence_id=r.id.sentence_id,
+                    score=r.score,
                 )
+                for search_result in search_results
+                for r in search_result
+            ]
 
             results = []
             for hit, near in zip(hits, nearest):
@@ -259,7 +273,15 @@ class AnnoScalingService(metaclass=SingletonMeta):
     def __get_sentences(
         self, db: Session, sdoc_ids: Iterable[int]
     ) -> dict[int, tuple[list[int], list[int], str]]:
-        sdoc_datas = crud_sdoc_data.read_by_ids(db, ids=list(sdoc_ids))
+        sdoc_datas = crud_sdoc_data.read_by_ids_with_columns(
+            db,
+            ids=list(sdoc_ids),
+            columns=[
+                SourceDocumentDataORM.content,
+                SourceDocumentDataORM.sentence_starts,
+                SourceDocumentDataORM.sentence_ends,
+            ],
+        )
         result: dict[int, tuple[list[int], list[int], str]] = {}
         for sdoc in sdoc_datas:
             result[sdoc.id] = (
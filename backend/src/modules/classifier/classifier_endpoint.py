@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from common.crud_enum import Crud
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.auth.authz_user import AuthzUser
 from core.project.project_crud import crud_project
 from modules.classifier.classifier_crud import crud_classifier
@@ -15,7 +15,9 @@ from modules.classifier.classifier_dto import (
 from modules.classifier.classifier_service import ClassifierService
 
 router = APIRouter(
-    prefix="/classifier", dependencies=[Depends(get_current_user)], tags=["classifier"]
+    prefix="/classifier",
+    dependencies=[Depends(get_current_principal)],
+    tags=["classifier"],
 )
 
 
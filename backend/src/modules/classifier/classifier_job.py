@@ -17,6 +17,12 @@ sqlr = SQLRepo()
     device="gpu",
     result_ttl=JobTiming.NINETY_DAYS,
     timeout=JobTiming.ONE_DAY,
+    preload_modules=[
+        "modules.classifier.classifier_service",
+        "modules.classifier.models.doc_class_model_service",
+        "modules.classifier.models.sent_class_model_service",
+        "modules.classifier.models.span_class_model_service",
+    ],
 )
 def handle_classifier_job(
     payload: ClassifierJobInput,
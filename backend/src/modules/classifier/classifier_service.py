@@ -13,15 +13,6 @@ from modules.classifier.classifier_dto import (
     ClassifierTask,
 )
 from modules.classifier.classifier_exceptions import UnsupportedClassifierJobError
-from modules.classifier.models.doc_class_model_service import (
-    DocClassificationModelService,
-)
-from modules.classifier.models.sent_class_model_service import (
-    SentClassificationModelService,
-)
-from modules.classifier.models.span_class_model_service import (
-    SpanClassificationModelService,
-)
 from modules.classifier.models.text_class_model_service import (
     TextClassificationModelService,
 )
@@ -65,14 +56,26 @@ class ClassifierService(metaclass=SingletonMeta):
             status_message="Started ClassifierJob!",
         )
 
-        # get the correct classifier service
+        # get the correct classifier service (imported lazily, they depend on torch & transformers)
         tcs: TextClassificationModelService
         match payload.model_type:
             case ClassifierModel.DOCUMENT:
+                from modules.classifier.models.doc_class_model_service import (
+                    DocClassificationModelService,
+                )
+
                 tcs = DocClassificationModelService()
             case ClassifierModel.SENTENCE:
+                from modules.classifier.models.sent_class_model_service import (
+                    SentClassificationModelService,
+                )
+
                 tcs = SentClassificationModelService()
             case ClassifierModel.SPAN:
+                from modules.classifier.models.span_class_model_service import (
+                    SpanClassificationModelService,
+                )
+
                 tcs = SpanClassificationModelService()
             case _:
                 raise UnsupportedClassifierJobError(  # type: ignore
@@ -271,7 +271,13 @@ class DocClassificationModelService(TextClassificationModelService):
 
         # Get source document data
         # Some documents may be erroneous and do not have data
-        sdoc_datas = crud_sdoc_data.read_by_ids(db=db, ids=sdoc_ids)
+        sdoc_datas = crud_sdoc_data.read_by_ids_with_columns(
+            db=db,
+            ids=sdoc_ids,
+            columns=[
+                SourceDocumentDataORM.content,
+            ],
+        )
         sdocid2data: dict[int, SourceDocumentDataORM | None] = {
             sdoc_id: None for sdoc_id in sdoc_ids
         }
@@ -730,7 +736,13 @@ class DocClassificationModelService(TextClassificationModelService):
         # 2. Create dataset
         job.update(current_step=2)
         # Get source document data
-        sdoc_datas = crud_sdoc_data.read_by_ids(db=db, ids=parameters.sdoc_ids)
+        sdoc_datas = crud_sdoc_data.read_by_ids_with_columns(
+            db=db,
+            ids=parameters.sdoc_ids,
+            columns=[
+                SourceDocumentDataORM.content,
+            ],
+        )
         inference_dataset: list[InferenceDatasetRow] = [
             {"sdoc_id": sdoc_data.id, "text": sdoc_data.content}
             for sdoc_data in sdoc_datas
@@ -26,6 +26,7 @@ from core.annotation.sentence_annotation_orm import SentenceAnnotationORM
 from core.code.code_crud import crud_code
 from core.doc.source_document_crud import crud_sdoc
 from core.doc.source_document_data_crud import crud_sdoc_data
+from core.doc.source_document_data_orm import SourceDocumentDataORM
 from core.user.user_crud import ASSISTANT_TRAINED_ID
 from modules.classifier.classifier_crud import crud_classifier
 from modules.classifier.classifier_dto import (
@@ -294,7 +295,15 @@ class SentClassificationModelService(TextClassificationModelService):
                 ].append(annotation)
 
         # Get source document data
-        sdoc_datas = crud_sdoc_data.read_by_ids(db=db, ids=sdoc_ids)
+        sdoc_datas = crud_sdoc_data.read_by_ids_with_columns(
+            db=db,
+            ids=sdoc_ids,
+            columns=[
+                SourceDocumentDataORM.content,
+                SourceDocumentDataORM.sentence_starts,
+                SourceDocumentDataORM.sentence_ends,
+            ],
+        )
         sdocid2data = {sdoc_data.id: sdoc_data for sdoc_data in sdoc_datas}
 
         # Create a labeled, embedded dataset
@@ -781,7 +790,15 @@ class SentClassificationModelService(TextClassificationModelService):
         # 2. Create dataset
         job.update(current_step=2)
         # Get source document data
-        sdoc_datas = crud_sdoc_data.read_by_ids(db=db, ids=parameters.sdoc_ids)
+        sdoc_datas = crud_sdoc_data.read_by_ids_with_columns(
+            db=db,
+            ids=parameters.sdoc_ids,
+            columns=[
+                SourceDocumentDataORM.content,
+                SourceDocumentDataORM.sentence_starts,
+                SourceDocumentDataORM.sentence_ends,
+            ],
+        )
 
         # Constructing dataset
         embedding_model = SentenceTransformer(classifier.base_model)
@@ -27,6 +27,7 @@ from core.annotation.span_annotation_orm import SpanAnnotationORM
 from core.code.code_crud import crud_code
 from core.doc.source_document_crud import crud_sdoc
 from core.doc.source_document_data_crud import crud_sdoc_data
+from core.doc.source_document_data_orm import SourceDocumentDataORM
 from core.user.user_crud import ASSISTANT_TRAINED_ID
 from modules.classifier.classifier_crud import crud_classifier
 from modules.classifier.classifier_dto import (
@@ -295,7 +296,15 @@ class SpanClassificationModelService(TextClassificationModelService):
                 ].append(annotation)
 
         # Get source document data
-        sdoc_datas = crud_sdoc_data.read_by_ids(db=db, ids=sdoc_ids)
+        sdoc_datas = crud_sdoc_data.read_by_ids_with_columns(
+            db=db,
+            ids=sdoc_ids,
+            columns=[
+                SourceDocumentDataORM.content,
+                SourceDocumentDataORM.token_starts,
+                SourceDocumentDataORM.token_ends,
+            ],
+        )
         sdocid2data = {sdoc_data.id: sdoc_data for sdoc_data in sdoc_datas}
 
         # Create a labeled dataset
@@ -798,7 +807,15 @@ class SpanClassificationModelService(TextClassificationModelService):
         # 2. Create dataset
         job.update(current_step=2)
         # Get source document data
-        sdoc_datas = crud_sdoc_data.read_by_ids(db=db, ids=parameters.sdoc_ids)
+        sdoc_datas = crud_sdoc_data.read_by_ids_with_columns(
+            db=db,
+            ids=parameters.sdoc_ids,
+            columns=[
+                SourceDocumentDataORM.content,
+                SourceDocumentDataORM.token_starts,
+                SourceDocumentDataORM.token_ends,
+            ],
+        )
         sdoc_id2data = {sdoc_data.id: sdoc_data for sdoc_data in sdoc_datas}
         inference_dataset: list[InferenceDatasetRow] = [
             {"sdoc_id": sdoc_data.id, "words": sdoc_data.tokens}
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from common.crud_enum import Crud
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.auth.authz_user import AuthzUser
 from modules.concept_over_time_analysis.cota_crud import crud_cota
 from modules.concept_over_time_analysis.cota_dto import (
@@ -22,7 +22,7 @@ js = JobService()
 
 router = APIRouter(
     prefix="/cota",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
     tags=["conceptOverTimeAnalysis"],
 )
 
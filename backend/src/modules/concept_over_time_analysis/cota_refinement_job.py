@@ -8,9 +8,6 @@ from modules.concept_over_time_analysis.cota_dto import (
     COTARefinementJobInput,
     COTAUpdateIntern,
 )
-from modules.concept_over_time_analysis.refinement_steps.finetune_apply_compute import (
-    finetune_apply_compute,
-)
 from modules.concept_over_time_analysis.refinement_steps.init_search_space import (
     init_search_space,
 )
@@ -28,8 +25,15 @@ sqlr = SQLRepo()
     device="gpu",
     result_ttl=JobTiming.INFINITY,
     timeout=JobTiming.ONE_DAY,
+    preload_modules=[
+        "modules.concept_over_time_analysis.refinement_steps.finetune_apply_compute"
+    ],
 )
 def cota_refinement(payload: COTARefinementJobInput, job: Job) -> None:
+    from modules.concept_over_time_analysis.refinement_steps.finetune_apply_compute import (
+        finetune_apply_compute,
+    )
+
     # init steps / current_step
     job.update(
         steps=[
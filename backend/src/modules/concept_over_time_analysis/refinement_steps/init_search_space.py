@@ -5,7 +5,6 @@ from sqlalchemy.orm import Session
 
 from config import conf
 from core.doc.source_document_data_crud import crud_sdoc_data
-from core.doc.source_document_data_orm import SourceDocumentDataORM
 from core.doc.source_document_orm import SourceDocumentORM
 from core.metadata.source_document_metadata_orm import SourceDocumentMetadataORM
 from modules.concept_over_time_analysis.cota_dto import (
@@ -81,31 +80,22 @@ def __add_sentences_to_search_space(
     db: Session,
     search_space: list[COTASentence],
 ) -> list[COTASentence]:
-    sdoc_ids = list(set([cota_sent.sdoc_id for cota_sent in search_space]))
-
-    # get the data from the database
-    sdoc_datas = crud_sdoc_data.read_by_ids(db=db, ids=sdoc_ids)
-
-    # map the data
-    sdoc_id2sdocdata: dict[int, SourceDocumentDataORM] = {
-        sdoc_data_read.id: sdoc_data_read
-        for sdoc_data_read in sdoc_datas
-        if sdoc_data_read is not None
-    }
+    # get only the required sentences from the database
+    sentence_id2text = crud_sdoc_data.read_sentences(
+        db=db,
+        sentence_ids=list(
+            {(cota_sent.sdoc_id, cota_sent.sentence_id) for cota_sent in search_space}
+        ),
+    )
 
     sentences = []
     for cota_sent in search_space:
-        if cota_sent.sdoc_id not in sdoc_id2sdocdata:
-            raise ValueError(
-                f"Could not find SourceDocumentDataORM for sdoc_id {cota_sent.sdoc_id}!"
-            )
-        sdoc_data_read = sdoc_id2sdocdata[cota_sent.sdoc_id]
-
-        if cota_sent.sentence_id >= len(sdoc_data_read.sentences):
+        sentence = sentence_id2text.get((cota_sent.sdoc_id, cota_sent.sentence_id))
+        if sentence is None:
             raise ValueError(
-                f"Could not find sentence with id {cota_sent.sentence_id} in SourceDocumentDataORM with id {sdoc_data_read.id}!"
+                f"Could not find sentence with id {cota_sent.sentence_id} in SourceDocumentDataORM with id {cota_sent.sdoc_id}!"
             )
-        sentences.append(sdoc_data_read.sentences[cota_sent.sentence_id])
+        sentences.append(sentence)
 
     # add the sentences
     assert len(sentences) == len(search_space)
@@ -26,6 +26,10 @@ class ProcessingSettings(BaseModel):
     )
     language: Language = Field(description="Language of the documents: 'de', 'en', ...")
     model: str = Field(description="Large Language Model to use for processing")
+    duplicate_max_different_words: int | None = Field(
+        description="If set, documents that differ from an existing document in at most this many words are tagged as duplicates",
+        default=None,
+    )
 
 
 class ProcessingJobInput(JobInputBase):
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from sqlalchemy.orm import Session
 
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from common.doc_type import DocType
 from common.sdoc_status_enum import SDocStatus
 from core.auth.authz_user import AuthzUser
@@ -17,7 +17,7 @@ from modules.doc_processing.doc_processing_steps import PROCESSING_JOBS
 
 router = APIRouter(
     prefix="/docprocessing",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
     tags=["docprocessing"],
 )
 
@@ -1,11 +1,15 @@
+from collections import defaultdict
+
 from common.doc_type import DocType
 from common.job_type import JobType
 from common.sdoc_status_enum import SDocStatus
+from config import conf
 from core.doc.source_document_crud import crud_sdoc
 from core.doc.source_document_dto import SourceDocumentUpdate
 from modules.doc_processing.doc_processing_dto import SdocProcessingJobInput
 from modules.doc_processing.pipeline import pipeline_transitions as t
 from modules.doc_processing.pipeline.pipeline_operators import (
+    ConditionalBranchOperator,
     LoopBranchOperator,
     SwitchCaseBranchOperator,
 )
@@ -87,6 +91,11 @@ PIPELINE_GRAPH = {
     JobType.TEXT_SPACY: [
         (t.spacy_to_html_mapping, JobType.TEXT_HTML_MAPPING),
         (t.spacy_to_sentence_embedding, JobType.TEXT_SENTENCE_EMBEDDING),
+        # duplicate detection is optional
+        ConditionalBranchOperator(
+            condition=lambda input, output: input.settings.duplicate_max_different_words is not None,
+            next_jobs=[(t.spacy_to_duplicate_detection, JobType.TEXT_DUPLICATE_DETECTION)],
+        ),
     ],
     # VIDEO -> AUDIO
     JobType.VIDEO_AUDIO_EXTRACTION: [
@@ -104,64 +113,111 @@ PIPELINE_GRAPH = {
 # fmt: on
 
 
-def execute_pipeline_step(job_type: JobType, input, output, job_service):
+def collect_next_jobs(
+    job_type: JobType, input, output
+) -> list[tuple[JobType, JobInputBase]]:
+    next_jobs: list[tuple[JobType, JobInputBase]] = []
     steps = PIPELINE_GRAPH.get(job_type, [])
     for step in steps:
-        if isinstance(step, SwitchCaseBranchOperator):
-            next_jobs = step.get_next_jobs(input, output)
-            for transition_fn, next_job_type in next_jobs:
-                job_input = transition_fn(input, output)
-                job_service.start_job(next_job_type, job_input)
+        if isinstance(step, (SwitchCaseBranchOperator, ConditionalBranchOperator)):
+            for transition_fn, next_job_type in step.get_next_jobs(input, output):
+                next_jobs.append((next_job_type, transition_fn(input, output)))
         elif isinstance(step, LoopBranchOperator):
-            jobs = step.get_next_jobs(input, output)
-            for transition_fn, next_job_type, idx in jobs:
-                job_input = transition_fn(input, output, idx)
-                job_service.start_job(next_job_type, job_input)
+            for transition_fn, next_job_type, idx in step.get_next_jobs(input, output):
+                next_jobs.append((next_job_type, transition_fn(input, output, idx)))
         else:
             transition_fn, next_job_type = step
-            job_input = transition_fn(input, output)
-            job_service.start_job(next_job_type, job_input)
+            next_jobs.append((next_job_type, transition_fn(input, output)))
+    return next_jobs
+
+
+def start_next_jobs(
+    next_jobs: list[tuple[JobType, JobInputBase]], job_service: JobService
+):
+    # group sibling transitions by job type (and project), so that they can be coalesced into micro-batches
+    grouped: dict[tuple[JobType, int], list[JobInputBase]] = defaultdict(list)
+    for next_job_type, job_input in next_jobs:
+        grouped[(next_job_type, job_input.project_id)].append(job_input)
+
+    batch_size = conf.rq.pipeline_batch_size
+    for (next_job_type, _), job_inputs in grouped.items():
+        if batch_size <= 1 or not job_service.supports_batching(next_job_type):
+            for job_input in job_inputs:
+                job_service.start_job(next_job_type, job_input)
+            continue
+
+        for i in range(0, len(job_inputs), batch_size):
+            batch = job_inputs[i : i + batch_size]
+            if len(batch) == 1:
+                job_service.start_job(next_job_type, batch[0])
+            else:
+                job_service.start_batch_job(next_job_type, batch)
+
+
+def execute_pipeline_step(job_type: JobType, input, output, job_service):
+    start_next_jobs(collect_next_jobs(job_type, input, output), job_service)
 
 
 js = JobService()
 sqlr = SQLRepo()
 
 
+def update_sdoc_status(
+    job_type: JobType, inputs: list[JobInputBase], status: SDocStatus
+):
+    sdoc_ids = [
+        input.sdoc_id for input in inputs if isinstance(input, SdocProcessingJobInput)
+    ]
+    # optional steps do not have a status column
+    if len(sdoc_ids) == 0 or job_type.value not in SourceDocumentUpdate.model_fields:
+        return
+
+    with sqlr.transaction() as db:
+        crud_sdoc.update_multi(
+            db,
+            ids=sdoc_ids,
+            update_dtos=[
+                SourceDocumentUpdate(**{job_type.value: status})  # type: ignore
+                for _ in sdoc_ids
+            ],
+        )
+
+
 def handle_job_started(jobtype: JobType, input: JobInputBase):
-    if isinstance(input, SdocProcessingJobInput):
-        with sqlr.transaction() as db:
-            crud_sdoc.update(
-                db,
-                id=input.sdoc_id,
-                update_dto=SourceDocumentUpdate(
-                    **{jobtype.value: SDocStatus.processing},  # type: ignore
-                ),
-            )
+    update_sdoc_status(jobtype, [input], SDocStatus.processing)
 
 
 def handle_job_error(job_type: JobType, input: JobInputBase):
-    if isinstance(input, SdocProcessingJobInput):
-        with sqlr.transaction() as db:
-            crud_sdoc.update(
-                db,
-                id=input.sdoc_id,
-                update_dto=SourceDocumentUpdate(
-                    **{job_type.value: SDocStatus.erroneous}  # type: ignore
-                ),
-            )
+    update_sdoc_status(job_type, [input], SDocStatus.erroneous)
 
 
 def handle_job_finished(
     job_type: JobType, input: JobInputBase, output: JobOutputBase | None
 ):
-    if isinstance(input, SdocProcessingJobInput):
-        with sqlr.transaction() as db:
-            crud_sdoc.update(
-                db,
-                id=input.sdoc_id,
-                update_dto=SourceDocumentUpdate(
-                    **{job_type.value: SDocStatus.finished}  # type: ignore
-                ),
-            )
+    update_sdoc_status(job_type, [input], SDocStatus.finished)
 
     execute_pipeline_step(job_type=job_type, input=input, output=output, job_service=js)
+
+
+def handle_batch_job_started(job_type: JobType, inputs: list[JobInputBase]):
+    update_sdoc_status(job_type, inputs, SDocStatus.processing)
+
+
+def handle_batch_job_error(job_type: JobType, inputs: list[JobInputBase]):
+    # batch handlers are all-or-nothing, so every payload can safely be re-run on its own.
+    # This way, failing documents end up as single failed jobs in the sdoc health view.
+    for input in inputs:
+        js.start_job(job_type, input)
+
+
+def handle_batch_job_finished(
+    job_type: JobType,
+    inputs: list[JobInputBase],
+    outputs: list[JobOutputBase | None],
+):
+    update_sdoc_status(job_type, inputs, SDocStatus.finished)
+
+    next_jobs: list[tuple[JobType, JobInputBase]] = []
+    for input, output in zip(inputs, outputs):
+        next_jobs.extend(collect_next_jobs(job_type, input, output))
+    start_next_jobs(next_jobs, js)
@@ -1,6 +1,7 @@
 from pathlib import Path
 
 from loguru import logger
+from sqlalchemy.orm import Session
 
 from common.doc_type import DocType
 from common.job_type import JobType
@@ -13,7 +14,7 @@ from modules.doc_processing.doc_processing_dto import ProcessingJobInput
 from repos.db.sql_repo import SQLRepo
 from repos.filesystem_repo import FilesystemRepo
 from systems.job_system.job_dto import Job, JobOutputBase
-from systems.job_system.job_register_decorator import register_job
+from systems.job_system.job_register_decorator import register_batch_job, register_job
 
 sqlr = SQLRepo()
 fsr = FilesystemRepo()
@@ -38,48 +39,61 @@ class SdocInitJobOutput(JobOutputBase):
 )
 def handle_init_sdoc_job(payload: SdocInitJobInput, job: Job) -> SdocInitJobOutput:
     with sqlr.transaction() as db:
-        # create sdoc (& optionally the corresponding folder)
-        logger.info(f"Persisting SourceDocument for {payload.filepath.name}...")
-        create_dto = SourceDocumentCreate(
-            filename=payload.filepath.name,
-            name=payload.filepath.name,
-            doctype=payload.doctype,
-            project_id=payload.project_id,
-            folder_id=payload.folder_id,
-        )
-        sdoc_db_obj = crud_sdoc.create(db=db, create_dto=create_dto)
-
-        # find repo path
-        repo_url = FilesystemRepo().get_sdoc_url(
-            sdoc=SourceDocumentRead.model_validate(sdoc_db_obj),
-        )
-
-        # create empty sdoc data
-        crud_sdoc_data.create(
-            db=db,
-            create_dto=SourceDocumentDataCreate(
-                id=sdoc_db_obj.id,
-                repo_url=repo_url,
-                content="",
-                raw_html="",
-                html="",
-                token_starts=[],
-                token_ends=[],
-                sentence_starts=[],
-                sentence_ends=[],
-            ),
-        )
-
-        # create sdoc metadata
-        crud_sdoc_meta.create_initial_metadata(
-            db=db,
-            project_id=payload.project_id,
-            sdoc_id=sdoc_db_obj.id,
-            doctype=payload.doctype,
-        )
-
-        return SdocInitJobOutput(
-            sdoc_id=sdoc_db_obj.id,
-            folder_id=sdoc_db_obj.folder_id,
-            doctype=DocType(sdoc_db_obj.doctype),
-        )
+        return init_sdoc(db=db, payload=payload)
+
+
+@register_batch_job(job_type=JobType.SDOC_INIT)
+def handle_init_sdoc_batch_job(
+    payloads: list[SdocInitJobInput], job: Job
+) -> list[SdocInitJobOutput]:
+    # all sdocs are created in one transaction, so the batch is all-or-nothing
+    with sqlr.transaction() as db:
+        return [init_sdoc(db=db, payload=payload) for payload in payloads]
+
+
+def init_sdoc(db: Session, payload: SdocInitJobInput) -> SdocInitJobOutput:
+    # create sdoc (& optionally the corresponding folder)
+    logger.info(f"Persisting SourceDocument for {payload.filepath.name}...")
+    create_dto = SourceDocumentCreate(
+        filename=payload.filepath.name,
+        name=payload.filepath.name,
+        doctype=payload.doctype,
+        project_id=payload.project_id,
+        folder_id=payload.folder_id,
+    )
+    sdoc_db_obj = crud_sdoc.create(db=db, create_dto=create_dto)
+
+    # find repo path
+    repo_url = FilesystemRepo().get_sdoc_url(
+        sdoc=SourceDocumentRead.model_validate(sdoc_db_obj),
+    )
+
+    # create empty sdoc data
+    crud_sdoc_data.create(
+        db=db,
+        create_dto=SourceDocumentDataCreate(
+            id=sdoc_db_obj.id,
+            repo_url=repo_url,
+            content="",
+            raw_html="",
+            html="",
+            token_starts=[],
+            token_ends=[],
+            sentence_starts=[],
+            sentence_ends=[],
+        ),
+    )
+
+    # create sdoc metadata
+    crud_sdoc_meta.create_initial_metadata(
+        db=db,
+        project_id=payload.project_id,
+        sdoc_id=sdoc_db_obj.id,
+        doctype=payload.doctype,
+    )
+
+    return SdocInitJobOutput(
+        sdoc_id=sdoc_db_obj.id,
+        folder_id=sdoc_db_obj.folder_id,
+        doctype=DocType(sdoc_db_obj.doctype),
+    )
@@ -8,7 +8,7 @@ from repos.db.sql_repo import SQLRepo
 from repos.ray.dto.glotlid import GlotLIDInput, GlotLIDOutput
 from repos.ray.ray_repo import RayRepo
 from systems.job_system.job_dto import Job, JobOutputBase
-from systems.job_system.job_register_decorator import register_job
+from systems.job_system.job_register_decorator import register_batch_job, register_job
 
 sqlr = SQLRepo()
 ray = RayRepo()
@@ -58,6 +58,45 @@ def enrich_for_recompute(
 def handle_text_language_detection_job(
     payload: TextLanguageDetectionJobInput, job: Job
 ) -> TextLanguageDetectionJobOutput:
+    lang = detect_language(payload)
+
+    with sqlr.transaction() as db:
+        # Store language in db
+        crud_sdoc_meta.update_multi_with_doctype(
+            db=db,
+            project_id=payload.project_id,
+            sdoc_id=payload.sdoc_id,
+            doctype=payload.doctype,
+            keys=["language"],
+            values=[lang],
+        )
+    return TextLanguageDetectionJobOutput(language=lang, text=payload.text)
+
+
+@register_batch_job(job_type=JobType.TEXT_LANGUAGE_DETECTION)
+def handle_text_language_detection_batch_job(
+    payloads: list[TextLanguageDetectionJobInput], job: Job
+) -> list[TextLanguageDetectionJobOutput]:
+    langs = [detect_language(payload) for payload in payloads]
+
+    with sqlr.transaction() as db:
+        # Store all languages in db
+        for payload, lang in zip(payloads, langs):
+            crud_sdoc_meta.update_multi_with_doctype(
+                db=db,
+                project_id=payload.project_id,
+                sdoc_id=payload.sdoc_id,
+                doctype=payload.doctype,
+                keys=["language"],
+                values=[lang],
+            )
+    return [
+        TextLanguageDetectionJobOutput(language=lang, text=payload.text)
+        for payload, lang in zip(payloads, langs)
+    ]
+
+
+def detect_language(payload: TextLanguageDetectionJobInput) -> str:
     if payload.settings.language != Language.auto:
         lang = payload.settings.language
     else:
@@ -83,15 +122,4 @@ def handle_text_language_detection_job(
             raise LanguageNotSupportedError(
                 detected_language=glotlid_output.best_match.lang_code
             )
-
-    with sqlr.transaction() as db:
-        # Store language in db
-        crud_sdoc_meta.update_multi_with_doctype(
-            db=db,
-            project_id=payload.project_id,
-            sdoc_id=payload.sdoc_id,
-            doctype=payload.doctype,
-            keys=["language"],
-            values=[lang],
-        )
-    return TextLanguageDetectionJobOutput(language=lang, text=payload.text)
+    return lang
@@ -0,0 +1,150 @@
+from collections import Counter
+
+from loguru import logger
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from common.job_type import JobType
+from core.tag.tag_crud import crud_tag
+from core.tag.tag_dto import TagCreate
+from modules.doc_processing.doc_processing_dto import SdocProcessingJobInput
+from modules.duplicate_finder.minhash_band_crud import crud_minhash_band
+from modules.duplicate_finder.minhash_signature_crud import crud_minhash_signature
+from modules.duplicate_finder.minhash_signature_dto import MinHashSignatureCreate
+from modules.duplicate_finder.minhash_utils import (
+    band_keys,
+    fingerprint,
+    hash_words,
+    minhash_signature,
+    signature_to_bytes,
+)
+from modules.word_frequency.word_frequency_crud import crud_word_frequency
+from repos.db.sql_repo import SQLRepo
+from systems.job_system.job_dto import Job, JobOutputBase
+from systems.job_system.job_register_decorator import register_job
+
+sqlr = SQLRepo()
+
+DUPLICATE_TAG_NAME = "duplicate"
+# first key of the advisory lock that serializes the LSH index updates of a project
+LSH_INDEX_LOCK_CLASS = 1
+
+
+class TextDuplicateDetectionJobInput(SdocProcessingJobInput):
+    pass
+
+
+class TextDuplicateDetectionJobOutput(JobOutputBase):
+    duplicate_sdoc_ids: list[int]
+
+
+def _read_word_counts(db: Session, sdoc_ids: list[int]) -> dict[int, Counter[str]]:
+    sdoc_id2counts: dict[int, Counter[str]] = {
+        sdoc_id: Counter() for sdoc_id in sdoc_ids
+    }
+    for wf in crud_word_frequency.read_by_sdoc_ids(db, sdoc_ids=sdoc_ids):
+        sdoc_id2counts[wf.sdoc_id][wf.word.lower()] += wf.count
+    return sdoc_id2counts
+
+
+def _l1_distance(a: Counter[str], b: Counter[str]) -> int:
+    return sum(abs(a[word] - b[word]) for word in a.keys() | b.keys())
+
+
+def _lock_lsh_index(db: Session, project_id: int) -> None:
+    """
+    Locks the LSH index of the project until the end of the transaction.
+    Otherwise, two near-duplicates processed concurrently would not see each other's (uncommitted) bands.
+    """
+    db.execute(select(func.pg_advisory_xact_lock(LSH_INDEX_LOCK_CLASS, project_id)))
+
+
+def _read_or_create_duplicate_tag(db: Session, project_id: int) -> int:
+    tag = crud_tag.read_by_name_and_project(
+        db, name=DUPLICATE_TAG_NAME, project_id=project_id
+    )
+    if tag is not None:
+        return tag.id
+
+    try:
+        # another worker may create the tag concurrently
+        with db.begin_nested():
+            tag = crud_tag.create(
+                db,
+                create_dto=TagCreate(
+                    name=DUPLICATE_TAG_NAME,
+                    description="Documents that were detected as (near-)duplicates during processing",
+                    project_id=project_id,
+                ),
+            )
+        return tag.id
+    except IntegrityError:
+        tag = crud_tag.read_by_name_and_project(
+            db, name=DUPLICATE_TAG_NAME, project_id=project_id
+        )
+        assert tag is not None, "Duplicate tag must exist"
+        return tag.id
+
+
+@register_job(
+    job_type=JobType.TEXT_DUPLICATE_DETECTION,
+    input_type=TextDuplicateDetectionJobInput,
+    output_type=TextDuplicateDetectionJobOutput,
+)
+def handle_text_duplicate_detection_job(
+    payload: TextDuplicateDetectionJobInput, job: Job
+) -> TextDuplicateDetectionJobOutput:
+    max_different_words = payload.settings.duplicate_max_different_words
+    if max_different_words is None:
+        return TextDuplicateDetectionJobOutput(duplicate_sdoc_ids=[])
+
+    with sqlr.transaction() as db:
+        # 1. compute the signature of the new document & add it to the project's LSH index
+        word_counts = _read_word_counts(db, [payload.sdoc_id])[payload.sdoc_id]
+        hashes = hash_words(word_counts.keys())
+        signature = minhash_signature(hashes)
+        keys = band_keys(signature)
+        _lock_lsh_index(db, payload.project_id)
+        crud_minhash_signature.create_or_replace_multi(
+            db,
+            create_dtos=[
+                MinHashSignatureCreate(
+                    sdoc_id=payload.sdoc_id,
+                    project_id=payload.project_id,
+                    fingerprint=fingerprint(hashes),
+                    signature=signature_to_bytes(signature),
+                )
+            ],
+        )
+        crud_minhash_band.create_or_replace_multi(
+            db,
+            project_id=payload.project_id,
+            sdoc_id2band_keys={payload.sdoc_id: keys},
+        )
+
+        # 2. find candidates sharing an LSH bucket & verify them with the exact L1 distance
+        candidate_sdoc_ids = crud_minhash_band.read_candidate_sdoc_ids(
+            db,
+            project_id=payload.project_id,
+            sdoc_id=payload.sdoc_id,
+            band_keys=keys,
+        )
+        duplicate_sdoc_ids = [
+            sdoc_id
+            for sdoc_id, counts in _read_word_counts(db, candidate_sdoc_ids).items()
+            if _l1_distance(word_counts, counts) <= max_different_words
+        ]
+
+        # 3. flag the new document as duplicate
+        if len(duplicate_sdoc_ids) > 0:
+            logger.info(
+                f"SourceDocument {payload.sdoc_id} is a duplicate of {duplicate_sdoc_ids}"
+            )
+            crud_tag.link_multiple_tags(
+                db,
+                sdoc_ids=[payload.sdoc_id],
+                tag_ids=[_read_or_create_duplicate_tag(db, payload.project_id)],
+            )
+
+    return TextDuplicateDetectionJobOutput(duplicate_sdoc_ids=duplicate_sdoc_ids)
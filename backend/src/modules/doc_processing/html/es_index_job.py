@@ -1,12 +1,31 @@
+from datetime import datetime
+
+from elasticsearch import Elasticsearch, NotFoundError
+from loguru import logger
+from pydantic import Field
+from sqlalchemy import func, select
+
 from common.job_type import JobType
+from common.sdoc_status_enum import SDocStatus
+from config import conf
 from core.doc.sdoc_elastic_crud import crud_elastic_sdoc
 from core.doc.sdoc_elastic_dto import ElasticSearchDocumentCreate
+from core.doc.sdoc_elastic_index import SdocIndex
+from core.doc.source_document_crud import crud_sdoc
 from core.doc.source_document_data_crud import crud_sdoc_data
+from core.doc.source_document_data_orm import SourceDocumentDataORM
+from core.doc.source_document_orm import SourceDocumentORM
 from modules.doc_processing.doc_processing_dto import SdocProcessingJobInput
 from repos.db.sql_repo import SQLRepo
 from repos.elastic.elastic_repo import ElasticSearchRepo
-from systems.job_system.job_dto import Job
-from systems.job_system.job_register_decorator import register_job
+from systems.job_system.job_dto import (
+    EndpointGeneration,
+    Job,
+    JobInputBase,
+    JobOutputBase,
+    JobPriority,
+)
+from systems.job_system.job_register_decorator import register_batch_job, register_job
 
 sqlr = SQLRepo()
 
@@ -51,3 +70,142 @@ def handle_text_es_index_job(payload: TextESIndexJobInput, job: Job) -> None:
         create_dto=esdoc,
         proj_id=payload.project_id,
     )
+
+
+@register_batch_job(job_type=JobType.TEXT_ES_INDEX)
+def handle_text_es_index_batch_job(
+    payloads: list[TextESIndexJobInput], job: Job
+) -> list[None]:
+    # all payloads of a batch job share one project.
+    # The batch is sent as one bulk request; if any document fails, create_multi raises,
+    # the batch fails as a whole and is retried per document (indexing by id is idempotent).
+    crud_elastic_sdoc.create_multi(
+        client=ElasticSearchRepo().client,
+        create_dtos=[
+            ElasticSearchDocumentCreate(
+                filename=payload.filename,
+                content=payload.text,
+                sdoc_id=payload.sdoc_id,
+                project_id=payload.project_id,
+            )
+            for payload in payloads
+        ],
+        proj_id=payloads[0].project_id,
+        chunk_size=len(payloads),
+    )
+    return [None] * len(payloads)
+
+
+class ESReindexJobInput(JobInputBase):
+    pass
+
+
+class ESReindexJobOutput(JobOutputBase):
+    num_indexed: int = Field(description="Number of indexed source documents")
+
+
+@register_job(
+    job_type=JobType.ES_REINDEX,
+    input_type=ESReindexJobInput,
+    output_type=ESReindexJobOutput,
+    priority=JobPriority.LOW,
+    generate_endpoints=EndpointGeneration.MINIMAL,
+)
+def handle_es_reindex_job(payload: ESReindexJobInput, job: Job) -> ESReindexJobOutput:
+    """
+    Rebuilds the ElasticSearch index of a project from the database without downtime:
+    all indexed source documents are streamed from the database (with a server-side cursor)
+    to a new index, the index name of the project is switched to it atomically,
+    and the old index is deleted. Searches use the old index until the switch.
+    Documents indexed or deleted during the rebuild are only written to / deleted from the old index,
+    so they are indexed again, respectively deleted from the new index after the switch.
+    """
+    client = ElasticSearchRepo().client
+    with sqlr.transaction() as db:
+        rebuild_started = db.scalar(select(func.now()))
+
+    job.update(status_message="Indexing the source documents")
+    with SdocIndex.rebuild_index(
+        client=client, proj_id=payload.project_id
+    ) as index_name:
+        num_indexed = __index_sdocs(
+            client=client, proj_id=payload.project_id, index_name=index_name
+        )
+
+    job.update(status_message="Indexing the source documents updated meanwhile")
+    __index_sdocs(
+        client=client,
+        proj_id=payload.project_id,
+        index_name=None,
+        updated_since=rebuild_started,
+    )
+
+    job.update(status_message="Removing the source documents deleted meanwhile")
+    __delete_removed_sdocs(client=client, proj_id=payload.project_id)
+
+    job.update(status_message=f"Indexed {num_indexed} source documents")
+    return ESReindexJobOutput(num_indexed=num_indexed)
+
+
+def __index_sdocs(
+    client: Elasticsearch,
+    proj_id: int,
+    index_name: str | None,
+    updated_since: datetime | None = None,
+) -> int:
+    query = (
+        select(
+            SourceDocumentORM.id,
+            SourceDocumentORM.filename,
+            SourceDocumentDataORM.content,
+        )
+        .join(
+            SourceDocumentDataORM,
+            SourceDocumentDataORM.id == SourceDocumentORM.id,
+        )
+        .where(
+            SourceDocumentORM.project_id == proj_id,
+            SourceDocumentORM.text_es_index == SDocStatus.finished,
+        )
+    )
+    if updated_since is not None:
+        query = query.where(SourceDocumentORM.updated >= updated_since)
+
+    with sqlr.transaction() as db:
+        rows = db.execute(query.execution_options(yield_per=conf.postgres.batch_size))
+        return crud_elastic_sdoc.create_multi(
+            client=client,
+            create_dtos=(
+                ElasticSearchDocumentCreate(
+                    filename=filename,
+                    content=content,
+                    sdoc_id=sdoc_id,
+                    project_id=proj_id,
+                )
+                for sdoc_id, filename, content in rows
+            ),
+            proj_id=proj_id,
+            index_name=index_name,
+        )
+
+
+def __delete_removed_sdocs(client: Elasticsearch, proj_id: int) -> None:
+    with sqlr.transaction() as db:
+        sdoc_ids = set(crud_sdoc.read_ids_by_project(db, proj_id=proj_id))
+    removed_sdoc_ids = [
+        hit.id
+        for hit in crud_elastic_sdoc.search_iter(
+            client=client, proj_id=proj_id, query={"match_all": {}}
+        )
+        if hit.id not in sdoc_ids
+    ]
+    for sdoc_id in removed_sdoc_ids:
+        try:
+            crud_elastic_sdoc.delete(client=client, id=sdoc_id, proj_id=proj_id)
+        except NotFoundError:
+            # deleted concurrently
+            pass
+    if len(removed_sdoc_ids) > 0:
+        logger.info(
+            f"Removed {len(removed_sdoc_ids)} source documents deleted during the reindexing"
+        )
@@ -7,7 +7,7 @@ from modules.doc_processing.doc_processing_dto import SdocProcessingJobInput
 from modules.doc_processing.html.html_mapping_utils import HTMLTextMapper, StringBuilder
 from repos.db.sql_repo import SQLRepo
 from systems.job_system.job_dto import Job
-from systems.job_system.job_register_decorator import register_job
+from systems.job_system.job_register_decorator import register_batch_job, register_job
 
 sqlr = SQLRepo()
 
@@ -45,6 +45,37 @@ def enrich_for_recompute(
     enricher=enrich_for_recompute,
 )
 def handle_text_html_mapping_job(payload: TextHTMLMappingJobInput, job: Job) -> None:
+    html = map_html(payload)
+
+    with sqlr.transaction() as db:
+        # update source document data in db
+        crud_sdoc_data.update(
+            db=db,
+            id=payload.sdoc_id,
+            update_dto=SourceDocumentDataUpdate(
+                html=html,
+            ),
+        )
+
+
+@register_batch_job(job_type=JobType.TEXT_HTML_MAPPING)
+def handle_text_html_mapping_batch_job(
+    payloads: list[TextHTMLMappingJobInput], job: Job
+) -> list[None]:
+    htmls = [map_html(payload) for payload in payloads]
+
+    with sqlr.transaction() as db:
+        # update all source document data in db
+        crud_sdoc_data.update_multi(
+            db=db,
+            ids=[payload.sdoc_id for payload in payloads],
+            update_dtos=[SourceDocumentDataUpdate(html=html) for html in htmls],
+        )
+
+    return [None] * len(payloads)
+
+
+def map_html(payload: TextHTMLMappingJobInput) -> str:
     # parse html
     parser = HTMLTextMapper()
     html_parse = parser(payload.raw_html)
@@ -87,13 +118,4 @@ def handle_text_html_mapping_job(payload: TextHTMLMappingJobInput, job: Job) ->
 
         current_position = html_end
     new_html += payload.raw_html[current_position:]
-
-    with sqlr.transaction() as db:
-        # update source document data in db
-        crud_sdoc_data.update(
-            db=db,
-            id=payload.sdoc_id,
-            update_dto=SourceDocumentDataUpdate(
-                html=new_html.build(),
-            ),
-        )
+    return new_html.build()
@@ -9,7 +9,7 @@ from modules.ml.embedding_service import EmbeddingService
 from repos.db.sql_repo import SQLRepo
 from repos.vector.weaviate_repo import WeaviateRepo
 from systems.job_system.job_dto import Job
-from systems.job_system.job_register_decorator import register_job
+from systems.job_system.job_register_decorator import register_batch_job, register_job
 
 sqlr = SQLRepo()
 
@@ -63,3 +63,36 @@ def handle_text_sentence_embedding_job(
                 ],
                 embeddings=embeddings,
             )
+
+
+@register_batch_job(job_type=JobType.TEXT_SENTENCE_EMBEDDING)
+def handle_text_sentence_embedding_batch_job(
+    payloads: list[TextSentenceEmbeddingJobInput], job: Job
+) -> list[None]:
+    # embed the sentences of all documents at once
+    ids: list[SentenceObjectIdentifier] = []
+    sentences: list[str] = []
+    for payload in payloads:
+        ids.extend(
+            SentenceObjectIdentifier(sdoc_id=payload.sdoc_id, sentence_id=i)
+            for i in range(len(payload.sentences))
+        )
+        sentences.extend(payload.sentences)
+
+    if len(sentences) > 0:
+        embeddings = EmbeddingService().encode_sentences(sentences=sentences).tolist()
+
+        # store the embeddings
+        logger.debug(
+            f"Adding {len(embeddings)} sentences "
+            f"from {len(payloads)} SDocs in project {payloads[0].project_id} to index ..."
+        )
+        with WeaviateRepo().weaviate_session() as client:
+            crud_sentence_embedding.add_embedding_batch(
+                client=client,
+                project_id=payloads[0].project_id,
+                ids=ids,
+                embeddings=embeddings,
+            )
+
+    return [None] * len(payloads)
@@ -2,6 +2,7 @@ from typing import Counter
 from uuid import uuid4
 
 import yake
+from sqlalchemy.orm import Session
 
 from common.doc_type import DocType
 from common.job_type import JobType
@@ -20,10 +21,15 @@ from modules.doc_processing.doc_processing_dto import SdocProcessingJobInput
 from modules.word_frequency.word_frequency_crud import crud_word_frequency
 from modules.word_frequency.word_frequency_dto import WordFrequencyCreate
 from repos.db.sql_repo import SQLRepo
-from repos.ray.dto.spacy import SpacyInput, SpacyPipelineOutput
+from repos.ray.dto.spacy import (
+    SpacyBatchInput,
+    SpacyColumnarOutput,
+    SpacyInput,
+    SpacyTokenFlag,
+)
 from repos.ray.ray_repo import RayRepo
 from systems.job_system.job_dto import Job, JobOutputBase
-from systems.job_system.job_register_decorator import register_job
+from systems.job_system.job_register_decorator import register_batch_job, register_job
 
 sqlr = SQLRepo()
 ray = RayRepo()
@@ -78,7 +84,7 @@ def enrich_for_recompute(
 )
 def handle_text_spacy_job(payload: SpacyJobInput, job: Job) -> SpacyJobOutput:
     # 1. call spacy in ray
-    spacy_output = ray.spacy_pipline(
+    spacy_output = ray.spacy_pipeline_columnar(
         SpacyInput(
             text=payload.text,
             language=payload.language,
@@ -87,87 +93,140 @@ def handle_text_spacy_job(payload: SpacyJobInput, job: Job) -> SpacyJobOutput:
 
     with sqlr.transaction() as trans:
         # query required data from db
-        system_code_ids = {
-            code.name: code.id
-            for code in crud_code.read_system_codes_by_project(
-                db=trans, proj_id=payload.project_id
-            )
-        }
-        adoc = crud_adoc.exists_or_create(
+        system_code_ids = read_system_code_ids(db=trans, project_id=payload.project_id)
+
+        # 2. store outputs in db
+        return store_spacy_output(
             db=trans,
-            user_id=SYSTEM_USER_ID,
-            sdoc_id=payload.sdoc_id,
+            payload=payload,
+            spacy_output=spacy_output,
+            system_code_ids=system_code_ids,
         )
 
-        # tokens & offsets & sentences
-        sdoc_data = extract_tok_sent_data(spacy_output)
 
-        # keywords
-        # if payload does not have keywords:
-        keywords = extract_keywords(payload, spacy_output)
-
-        # word frequencies
-        word_frequencies = extract_word_frequencies(payload, spacy_output)
-
-        # span annotations
-        span_annotations = extract_span_annotations(
-            payload, spacy_output, system_code_ids, adoc.id
+@register_batch_job(job_type=JobType.TEXT_SPACY)
+def handle_text_spacy_batch_job(
+    payloads: list[SpacyJobInput], job: Job
+) -> list[SpacyJobOutput]:
+    # 1. call spacy in ray (all documents with one request)
+    spacy_outputs = ray.spacy_pipeline_batch_columnar(
+        SpacyBatchInput(
+            documents=[
+                SpacyInput(
+                    text=payload.text,
+                    language=payload.language,
+                )
+                for payload in payloads
+            ]
         )
+    ).outputs
 
-        # store outputs in db
-        crud_sdoc_meta.update_multi_with_doctype(
-            db=trans,
-            project_id=payload.project_id,
-            sdoc_id=payload.sdoc_id,
-            doctype=payload.doctype,
-            keys=["keywords"],
-            values=[keywords],
-        )
-        crud_word_frequency.delete_by_sdoc_id(
-            db=trans,
-            sdoc_id=payload.sdoc_id,
-        )
-        crud_word_frequency.create_multi(
-            db=trans,
-            create_dtos=word_frequencies,
-        )
-        crud_span_anno.delete_by_sdoc(
-            db=trans,
-            sdoc_id=payload.sdoc_id,
-        )
-        crud_sentence_anno.delete_by_sdoc(
-            db=trans,
-            sdoc_id=payload.sdoc_id,
-        )
-        crud_span_anno.create_multi(
-            trans,
-            create_dtos=span_annotations,
+    with sqlr.transaction() as trans:
+        # query required data from db (all payloads of a batch share the project)
+        system_code_ids = read_system_code_ids(
+            db=trans, project_id=payloads[0].project_id
         )
 
-        if payload.doctype in {DocType.text, DocType.image}:
-            crud_sdoc_data.update(
-                db=trans,
-                id=payload.sdoc_id,
-                update_dto=SourceDocumentDataUpdate(
-                    token_starts=sdoc_data["token_starts"],
-                    token_ends=sdoc_data["token_ends"],
-                    sentence_starts=sdoc_data["sentence_starts"],
-                    sentence_ends=sdoc_data["sentence_ends"],
-                ),
-            )
-        else:
-            # if coming from audio or video pipeline, we are only interested in sentence splitting (tokenization already done by whisper)
-            existing_sdoc_data = crud_sdoc_data.read(db=trans, id=payload.sdoc_id)
-            sdoc_data["token_starts"] = existing_sdoc_data.token_starts
-            sdoc_data["token_ends"] = existing_sdoc_data.token_ends
-            crud_sdoc_data.update(
+        # 2. store all outputs in db
+        return [
+            store_spacy_output(
                 db=trans,
-                id=payload.sdoc_id,
-                update_dto=SourceDocumentDataUpdate(
-                    sentence_starts=sdoc_data["sentence_starts"],
-                    sentence_ends=sdoc_data["sentence_ends"],
-                ),
+                payload=payload,
+                spacy_output=spacy_output,
+                system_code_ids=system_code_ids,
             )
+            for payload, spacy_output in zip(payloads, spacy_outputs)
+        ]
+
+
+def read_system_code_ids(db: Session, project_id: int) -> dict[str, int]:
+    return {
+        code.name: code.id
+        for code in crud_code.read_system_codes_by_project(db=db, proj_id=project_id)
+    }
+
+
+def store_spacy_output(
+    db: Session,
+    payload: SpacyJobInput,
+    spacy_output: SpacyColumnarOutput,
+    system_code_ids: dict[str, int],
+) -> SpacyJobOutput:
+    adoc = crud_adoc.exists_or_create(
+        db=db,
+        user_id=SYSTEM_USER_ID,
+        sdoc_id=payload.sdoc_id,
+    )
+
+    # tokens & offsets & sentences
+    sdoc_data = extract_tok_sent_data(spacy_output)
+
+    # keywords
+    # if payload does not have keywords:
+    keywords = extract_keywords(payload, spacy_output)
+
+    # word frequencies
+    word_frequencies = extract_word_frequencies(payload, spacy_output)
+
+    # span annotations
+    span_annotations = extract_span_annotations(
+        payload, spacy_output, system_code_ids, adoc.id
+    )
+
+    # store outputs in db
+    crud_sdoc_meta.update_multi_with_doctype(
+        db=db,
+        project_id=payload.project_id,
+        sdoc_id=payload.sdoc_id,
+        doctype=payload.doctype,
+        keys=["keywords"],
+        values=[keywords],
+    )
+    crud_word_frequency.delete_by_sdoc_id(
+        db=db,
+        sdoc_id=payload.sdoc_id,
+    )
+    crud_word_frequency.create_multi_copy(
+        db=db,
+        create_dtos=word_frequencies,
+    )
+    crud_span_anno.delete_by_sdoc(
+        db=db,
+        sdoc_id=payload.sdoc_id,
+    )
+    crud_sentence_anno.delete_by_sdoc(
+        db=db,
+        sdoc_id=payload.sdoc_id,
+    )
+    crud_span_anno.create_multi_ids(
+        db,
+        create_dtos=span_annotations,
+    )
+
+    if payload.doctype in {DocType.text, DocType.image}:
+        crud_sdoc_data.update(
+            db=db,
+            id=payload.sdoc_id,
+            update_dto=SourceDocumentDataUpdate(
+                token_starts=sdoc_data["token_starts"],
+                token_ends=sdoc_data["token_ends"],
+                sentence_starts=sdoc_data["sentence_starts"],
+                sentence_ends=sdoc_data["sentence_ends"],
+            ),
+        )
+    else:
+        # if coming from audio or video pipeline, we are only interested in sentence splitting (tokenization already done by whisper)
+        existing_sdoc_data = crud_sdoc_data.read(db=db, id=payload.sdoc_id)
+        sdoc_data["token_starts"] = existing_sdoc_data.token_starts
+        sdoc_data["token_ends"] = existing_sdoc_data.token_ends
+        crud_sdoc_data.update(
+            db=db,
+            id=payload.sdoc_id,
+            update_dto=SourceDocumentDataUpdate(
+                sentence_starts=sdoc_data["sentence_starts"],
+                sentence_ends=sdoc_data["sentence_ends"],
+            ),
+        )
 
     return SpacyJobOutput(
         sentence_starts=sdoc_data["sentence_starts"],
@@ -183,7 +242,7 @@ def handle_text_spacy_job(payload: SpacyJobInput, job: Job) -> SpacyJobOutput:
 
 def extract_keywords(
     payload: SpacyJobInput,
-    spacy_output: SpacyPipelineOutput,
+    spacy_output: SpacyColumnarOutput,
 ) -> list[str]:
     kw_extractor = yake.KeywordExtractor(
         lan=payload.language,
@@ -219,28 +278,34 @@ def extract_keywords(
 
 def extract_span_annotations(
     payload: SpacyJobInput,
-    spacy_output: SpacyPipelineOutput,
+    spacy_output: SpacyColumnarOutput,
     system_code_ids: dict[str, int],
     adoc_id: int,
 ) -> list[SpanAnnotationCreateIntern]:
     create_dtos: list[SpanAnnotationCreateIntern] = []
     # create AutoSpans for NER
-    for ne in spacy_output.ents:
+    for start, end, start_token, end_token, label_idx in zip(
+        spacy_output.ent_starts,
+        spacy_output.ent_ends,
+        spacy_output.ent_start_tokens,
+        spacy_output.ent_end_tokens,
+        spacy_output.ent_labels,
+    ):
         # FIXME Flo: hacky solution for German NER model, which only contains ('LOC', 'MISC', 'ORG', 'PER')
-        code_name = f"{ne.label}"
+        code_name = spacy_output.label_vocab[label_idx]
         if code_name == "PER":
             code_name = "PERSON"
 
         auto = SpanAnnotationCreateIntern(
-            begin=ne.start_char,
-            begin_token=ne.start_token,
+            begin=start,
+            begin_token=start_token,
             project_id=payload.project_id,
             uuid=str(uuid4()),
             code_id=system_code_ids[code_name],
             annotation_document_id=adoc_id,
-            end=ne.end_char,
-            span_text=ne.text,
-            end_token=ne.end_token,
+            end=end,
+            span_text=payload.text[start:end],
+            end_token=end_token,
         )
         create_dtos.append(auto)
 
@@ -248,37 +313,31 @@ def extract_span_annotations(
 
 
 def extract_tok_sent_data(
-    spacy_output: SpacyPipelineOutput,
+    spacy_output: SpacyColumnarOutput,
 ) -> dict:
-    token_starts: list[int] = []
-    token_ends: list[int] = []
-    for token in spacy_output.tokens:
-        token_starts.append(token.start_char)
-        token_ends.append(token.end_char)
-
-    sentence_starts: list[int] = []
-    sentence_ends: list[int] = []
-    for s in spacy_output.sents:
-        sentence_starts.append(s.start_char)
-        sentence_ends.append(s.end_char)
-
+    # the columnar output already contains the offset lists
     return {
-        "token_starts": token_starts,
-        "token_ends": token_ends,
-        "sentence_starts": sentence_starts,
-        "sentence_ends": sentence_ends,
+        "token_starts": spacy_output.token_starts,
+        "token_ends": spacy_output.token_ends,
+        "sentence_starts": spacy_output.sent_starts,
+        "sentence_ends": spacy_output.sent_ends,
     }
 
 
 def extract_word_frequencies(
-    payload: SpacyJobInput, spacy_output: SpacyPipelineOutput
+    payload: SpacyJobInput, spacy_output: SpacyColumnarOutput
 ) -> list[WordFrequencyCreate]:
-    word_freqs = Counter()
-    for token in spacy_output.tokens:
-        if not (token.is_stopword or token.is_punctuation) and (
-            token.is_alpha or token.is_digit
-        ):
-            word_freqs.update((token.text,))
+    skip_flags = SpacyTokenFlag.STOPWORD | SpacyTokenFlag.PUNCTUATION
+    keep_flags = SpacyTokenFlag.ALPHA | SpacyTokenFlag.DIGIT
+    word_freqs = Counter(
+        payload.text[start:end]
+        for start, end, flags in zip(
+            spacy_output.token_starts,
+            spacy_output.token_ends,
+            spacy_output.token_flags,
+        )
+        if not (flags & skip_flags) and (flags & keep_flags)
+    )
 
     return [
         WordFrequencyCreate(
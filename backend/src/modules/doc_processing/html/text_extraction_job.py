@@ -6,7 +6,7 @@ from modules.doc_processing.doc_processing_dto import SdocProcessingJobInput
 from modules.doc_processing.html.html_mapping_utils import HTMLTextMapper
 from repos.db.sql_repo import SQLRepo
 from systems.job_system.job_dto import Job, JobOutputBase
-from systems.job_system.job_register_decorator import register_job
+from systems.job_system.job_register_decorator import register_batch_job, register_job
 
 sqlr = SQLRepo()
 
@@ -48,9 +48,7 @@ def handle_text_extraction_job(
     payload: TextExtractionJobInput,
     job: Job,
 ) -> TextExtractionJobOutput:
-    parser = HTMLTextMapper()
-    results = parser(payload.raw_html)
-    text = " ".join([str(r["text"]) for r in results])
+    text = extract_text(payload.raw_html)
 
     # Store text in sdoc data
     with sqlr.transaction() as db:
@@ -63,3 +61,27 @@ def handle_text_extraction_job(
         )
 
     return TextExtractionJobOutput(text=text)
+
+
+@register_batch_job(job_type=JobType.TEXT_EXTRACTION)
+def handle_text_extraction_batch_job(
+    payloads: list[TextExtractionJobInput],
+    job: Job,
+) -> list[TextExtractionJobOutput]:
+    texts = [extract_text(payload.raw_html) for payload in payloads]
+
+    # Store all texts in sdoc data
+    with sqlr.transaction() as db:
+        crud_sdoc_data.update_multi(
+            db=db,
+            ids=[payload.sdoc_id for payload in payloads],
+            update_dtos=[SourceDocumentDataUpdate(content=text) for text in texts],
+        )
+
+    return [TextExtractionJobOutput(text=text) for text in texts]
+
+
+def extract_text(raw_html: str) -> str:
+    parser = HTMLTextMapper()
+    results = parser(raw_html)
+    return " ".join([str(r["text"]) for r in results])
@@ -17,6 +17,21 @@ class SwitchCaseBranchOperator:
         return self.cases.get(key, [])
 
 
+class ConditionalBranchOperator:
+    def __init__(
+        self,
+        condition: Callable[[Any, Any], bool],
+        next_jobs: List[Tuple[Callable, JobType]],
+    ):
+        self.condition = condition
+        self.next_jobs = next_jobs
+
+    def get_next_jobs(self, input, output):
+        if self.condition(input, output):
+            return self.next_jobs
+        return []
+
+
 class LoopBranchOperator:
     def __init__(
         self,
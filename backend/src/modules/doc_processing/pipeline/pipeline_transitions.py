@@ -26,6 +26,9 @@ from modules.doc_processing.html.detect_language_job import (
     TextLanguageDetectionJobInput,
     TextLanguageDetectionJobOutput,
 )
+from modules.doc_processing.html.duplicate_detection_job import (
+    TextDuplicateDetectionJobInput,
+)
 from modules.doc_processing.html.es_index_job import TextESIndexJobInput
 from modules.doc_processing.html.html_mapping_job import (
     TextHTMLMappingJobInput,
@@ -199,6 +202,16 @@ def spacy_to_sentence_embedding(input, output):
     )
 
 
+def spacy_to_duplicate_detection(input, output):
+    assert isinstance(input, SpacyJobInput), "Expected SpacyJobInput"
+    assert isinstance(output, SpacyJobOutput), "Expected SpacyJobOutput"
+    return TextDuplicateDetectionJobInput(
+        project_id=input.project_id,
+        sdoc_id=input.sdoc_id,
+        settings=input.settings,
+    )
+
+
 def video_audio_extraction_to_audio_transcription(input, output):
     assert isinstance(input, VideoAudioExtractionJobInput), (
         "Expected VideoAudioExtractionJobInput"
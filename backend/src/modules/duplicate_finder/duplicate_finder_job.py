@@ -1,12 +1,24 @@
 import time
 
-import networkx as nx
-import torch
+import numpy as np
 from loguru import logger
 from pydantic import Field
 
 from common.doc_type import DocType
 from common.job_type import JobType
+from modules.duplicate_finder.minhash_band_crud import crud_minhash_band
+from modules.duplicate_finder.minhash_signature_crud import crud_minhash_signature
+from modules.duplicate_finder.minhash_signature_dto import MinHashSignatureCreate
+from modules.duplicate_finder.minhash_utils import (
+    NUM_PERM,
+    band_keys,
+    find_duplicate_groups,
+    fingerprint,
+    hash_word,
+    minhash_signature,
+    signature_from_bytes,
+    signature_to_bytes,
+)
 from modules.word_frequency.word_frequency_crud import crud_word_frequency
 from repos.db.sql_repo import SQLRepo
 from systems.job_system.job_dto import (
@@ -18,7 +30,6 @@ from systems.job_system.job_dto import (
 from systems.job_system.job_register_decorator import register_job
 
 sqlr = SQLRepo()
-BATCH_SIZE = 1024
 
 
 class DuplicateFinderInput(JobInputBase):
@@ -41,7 +52,7 @@ class DuplicateFinderOutput(JobOutputBase):
     input_type=DuplicateFinderInput,
     output_type=DuplicateFinderOutput,
     generate_endpoints=EndpointGeneration.MINIMAL,
-    device="gpu",
+    preload_modules=["scipy.sparse"],
 )
 def find_duplicates_job(
     payload: DuplicateFinderInput,
@@ -66,80 +77,99 @@ def find_duplicates_job(
     t1 = time.time()
     logger.info(f"query took: {t1 - t0}")
 
-    # Create document vectors
+    # Create sparse document vectors (documents x words)
     job.update(status_message="Creating document word vectors")
     t0 = time.time()
-    # unique words in project
-    words = set([r.word.lower() for r in result])
-    word2idx = {w: i for i, w in enumerate(words)}
-    vocab_size = len(words)
-
-    # process result to map
-    sdoc_id2word_id2word_freq = {}
+    word2idx: dict[str, int] = {}
+    sdoc_id2idx: dict[int, int] = {}
+    rows: list[int] = []
+    cols: list[int] = []
+    counts: list[int] = []
     for wf in result:
-        word_id2_word_freq = sdoc_id2word_id2word_freq.get(wf.sdoc_id, {})
-        word_id2_word_freq[word2idx[wf.word.lower()]] = wf.count
-        sdoc_id2word_id2word_freq[wf.sdoc_id] = word_id2_word_freq
-
-    # create document vectors
-    idx2sdoc_id = {}
-    N = len(sdoc_id2word_id2word_freq)
-    document_vectors = torch.zeros(
-        (N, vocab_size), dtype=torch.float32, device="cuda:0"
+        rows.append(sdoc_id2idx.setdefault(wf.sdoc_id, len(sdoc_id2idx)))
+        cols.append(word2idx.setdefault(wf.word.lower(), len(word2idx)))
+        counts.append(wf.count)
+    idx2sdoc_id = list(sdoc_id2idx.keys())
+    N = len(idx2sdoc_id)
+    vocab_size = len(word2idx)
+    # duplicate entries (words that only differ in casing) are summed up
+    import scipy.sparse as sp
+
+    document_vectors = sp.csr_matrix(
+        (np.array(counts, dtype=np.float32), (rows, cols)), shape=(N, vocab_size)
     )
-    for idx, sdoc_id in enumerate(sdoc_id2word_id2word_freq.keys()):
-        idx2sdoc_id[idx] = sdoc_id
-        word_id2_word_freq = sdoc_id2word_id2word_freq[sdoc_id]
-        for word_idx, freq in word_id2_word_freq.items():
-            document_vectors[idx, word_idx] = freq
-
+    document_vectors.sum_duplicates()
     t1 = time.time()
     logger.info(f"document vector creation took: {t1 - t0}")
     logger.info(f"vocab size: {vocab_size}")
     logger.info(f"document_vectors shape: {document_vectors.shape}")
 
-    # compute distances to identify duplicates
+    # compute MinHash signatures, reusing the persisted signatures of unchanged documents
+    job.update(status_message="Computing document signatures")
     t0 = time.time()
-    duplicate_pairs = []
-    num_batches = (N + BATCH_SIZE - 1) // BATCH_SIZE
-    for i in range(0, N, BATCH_SIZE):
-        job.update(
-            status_message=f"Finding duplicates! (Batch {i // BATCH_SIZE + 1}/{num_batches})",
+    word_hashes = np.array([hash_word(w) for w in word2idx.keys()], dtype=np.uint64)
+    with sqlr.transaction() as db:
+        stored = {
+            s.sdoc_id: s
+            for s in crud_minhash_signature.read_by_sdoc_ids(db, sdoc_ids=idx2sdoc_id)
+        }
+        banded = crud_minhash_band.read_banded_sdoc_ids(
+            db, sdoc_ids=list(stored.keys())
         )
-        a_batch = document_vectors[i : i + BATCH_SIZE]
-        a_indices = list(range(i, min(i + BATCH_SIZE, N)))
-        b_batch = document_vectors[: i + BATCH_SIZE]
-        b_indices = list(range(0, min(i + BATCH_SIZE, N)))
-
-        dists = torch.cdist(a_batch, b_batch, p=1).cpu().numpy()
-        for bi, doc_i in enumerate(a_indices):
-            for bj, doc_j in enumerate(b_indices):
-                # Avoid self-pairs and duplicate pairs
-                if doc_i < doc_j:
-                    if dists[bi, bj] <= payload.max_different_words:
-                        duplicate_pairs.append([doc_i, doc_j])
+    signatures = []
+    updated: list[MinHashSignatureCreate] = []
+    # LSH index entries of new & changed signatures, and of stored signatures without entries
+    sdoc_id2band_keys: dict[int, list[int]] = {}
+    for idx, sdoc_id in enumerate(idx2sdoc_id):
+        row = document_vectors.indices[
+            document_vectors.indptr[idx] : document_vectors.indptr[idx + 1]
+        ]
+        hashes = np.unique(word_hashes[row])
+        fp = fingerprint(hashes)
+        if sdoc_id in stored and stored[sdoc_id].fingerprint == fp:
+            signature = signature_from_bytes(stored[sdoc_id].signature)
+            signatures.append(signature)
+            if sdoc_id not in banded:
+                sdoc_id2band_keys[sdoc_id] = band_keys(signature)
+            continue
+        signature = minhash_signature(hashes)
+        signatures.append(signature)
+        sdoc_id2band_keys[sdoc_id] = band_keys(signature)
+        updated.append(
+            MinHashSignatureCreate(
+                sdoc_id=sdoc_id,
+                project_id=payload.project_id,
+                fingerprint=fp,
+                signature=signature_to_bytes(signature),
+            )
+        )
+    if len(updated) > 0 or len(sdoc_id2band_keys) > 0:
+        with sqlr.transaction() as db:
+            crud_minhash_signature.create_or_replace_multi(db, create_dtos=updated)
+            crud_minhash_band.create_or_replace_multi(
+                db,
+                project_id=payload.project_id,
+                sdoc_id2band_keys=sdoc_id2band_keys,
+            )
     t1 = time.time()
-    logger.info(f"finding duplicates took: {t1 - t0}")
-
-    # map back to sdoc_ids
-    duplicate_sdoc_id_pairs = [
-        (idx2sdoc_id[pair[0]], idx2sdoc_id[pair[1]]) for pair in duplicate_pairs
-    ]
+    logger.info(
+        f"signature computation took: {t1 - t0} ({len(updated)}/{N} (re)computed, {len(sdoc_id2band_keys)}/{N} banded)"
+    )
 
-    # we now create a graph with sdocs as nodes and edges between duplicates
-    # we will use this graph to identify connected components, each subgraph is a group of duplicates
-    job.update(status_message="Grouping duplicates...")
+    # find candidates with LSH, verify them with the exact L1 distance & group them
+    job.update(status_message="Finding duplicates...")
     t0 = time.time()
-    G = nx.Graph()
-    G.add_edges_from(duplicate_sdoc_id_pairs)
-    G.to_undirected()
-    subgraph_nodes = [list(subgraph) for subgraph in nx.connected_components(G)]
+    groups = find_duplicate_groups(
+        vectors=document_vectors,
+        signatures=np.stack(signatures)
+        if N > 0
+        else np.empty((0, NUM_PERM), np.uint32),
+        max_distance=payload.max_different_words,
+    )
     t1 = time.time()
-    logger.info(f"graph grouping took: {t1 - t0}")
-
-    # Free memory
-    del document_vectors
-    torch.cuda.empty_cache()
+    logger.info(f"finding duplicates took: {t1 - t0}")
 
     job.update(status_message="Finished finding duplicates!")
-    return DuplicateFinderOutput(duplicates=subgraph_nodes)
+    return DuplicateFinderOutput(
+        duplicates=[[idx2sdoc_id[idx] for idx in group] for group in groups]
+    )
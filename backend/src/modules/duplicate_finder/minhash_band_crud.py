@@ -0,0 +1,79 @@
+from sqlalchemy import delete, tuple_
+from sqlalchemy.orm import Session
+
+from modules.duplicate_finder.minhash_band_dto import MinHashBandCreate
+from modules.duplicate_finder.minhash_band_orm import MinHashBandORM
+from repos.db.crud_base import BATCH_SIZE, CRUDBase, UpdateNotAllowed
+
+
+class CRUDMinHashBand(
+    CRUDBase[
+        MinHashBandORM,
+        MinHashBandCreate,
+        UpdateNotAllowed,
+    ]
+):
+    ### CREATE OPERATIONS ###
+
+    def create_or_replace_multi(
+        self, db: Session, *, project_id: int, sdoc_id2band_keys: dict[int, list[int]]
+    ) -> None:
+        """Replaces the LSH index entries of the given SourceDocuments"""
+        sdoc_ids = list(sdoc_id2band_keys.keys())
+        for i in range(0, len(sdoc_ids), BATCH_SIZE):
+            db.execute(
+                delete(MinHashBandORM).where(
+                    MinHashBandORM.sdoc_id.in_(sdoc_ids[i : i + BATCH_SIZE])
+                )
+            )
+
+        values = [
+            {"sdoc_id": sdoc_id, "band": band, "project_id": project_id, "bucket": key}
+            for sdoc_id, band_keys in sdoc_id2band_keys.items()
+            for band, key in enumerate(band_keys)
+        ]
+        for i in range(0, len(values), BATCH_SIZE):
+            db.execute(
+                MinHashBandORM.__table__.insert(),  # type: ignore
+                values[i : i + BATCH_SIZE],
+            )
+        db.flush()
+
+    ### READ OPERATIONS ###
+
+    def read_banded_sdoc_ids(self, db: Session, *, sdoc_ids: list[int]) -> set[int]:
+        """Returns the given SourceDocuments that have LSH index entries"""
+        banded: set[int] = set()
+        for i in range(0, len(sdoc_ids), BATCH_SIZE):
+            banded.update(
+                row[0]
+                for row in db.query(MinHashBandORM.sdoc_id)
+                .filter(MinHashBandORM.sdoc_id.in_(sdoc_ids[i : i + BATCH_SIZE]))
+                .distinct()
+            )
+        return banded
+
+    def read_candidate_sdoc_ids(
+        self, db: Session, *, project_id: int, sdoc_id: int, band_keys: list[int]
+    ) -> list[int]:
+        """Returns the SourceDocuments that share at least one LSH bucket with the given band keys"""
+        query = (
+            db.query(MinHashBandORM.sdoc_id)
+            .filter(
+                MinHashBandORM.project_id == project_id,
+                MinHashBandORM.sdoc_id != sdoc_id,
+                tuple_(MinHashBandORM.band, MinHashBandORM.bucket).in_(
+                    list(enumerate(band_keys))
+                ),
+            )
+            .distinct()
+        )
+        return [row[0] for row in query.all()]
+
+    ### UPDATE OPERATIONS ###
+
+    def update(self, db: Session, *, id: int, update_dto):
+        raise NotImplementedError()
+
+
+crud_minhash_band = CRUDMinHashBand(MinHashBandORM)
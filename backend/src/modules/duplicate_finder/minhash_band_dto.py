@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+
+
+# Properties for creation
+class MinHashBandCreate(BaseModel):
+    sdoc_id: int = Field(description="ID of the SourceDocument")
+    band: int = Field(description="Index of the LSH band")
+    project_id: int = Field(description="ID of the Project")
+    bucket: int = Field(description="Hash of the signature rows of this band")
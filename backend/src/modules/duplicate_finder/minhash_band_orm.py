@@ -0,0 +1,29 @@
+from sqlalchemy import BigInteger, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from repos.db.orm_base import ORMBase
+
+
+class MinHashBandORM(ORMBase):
+    """One row per SourceDocument and LSH band: the persistent LSH index of a project"""
+
+    sdoc_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("sourcedocument.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    band: Mapped[int] = mapped_column(Integer, primary_key=True)
+    project_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("project.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    bucket: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index("ix_minhashband_project_id_band_bucket", "project_id", "band", "bucket"),
+    )
+
+    def get_project_id(self) -> int:
+        return self.project_id
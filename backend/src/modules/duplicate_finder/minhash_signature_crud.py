@@ -0,0 +1,61 @@
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from modules.duplicate_finder.minhash_signature_dto import (
+    MinHashSignatureCreate,
+    MinHashSignatureRead,
+)
+from modules.duplicate_finder.minhash_signature_orm import MinHashSignatureORM
+from repos.db.crud_base import BATCH_SIZE, CRUDBase, UpdateNotAllowed
+
+
+class CRUDMinHashSignature(
+    CRUDBase[
+        MinHashSignatureORM,
+        MinHashSignatureCreate,
+        UpdateNotAllowed,
+    ]
+):
+    ### CREATE OPERATIONS ###
+
+    def create_or_replace_multi(
+        self, db: Session, *, create_dtos: list[MinHashSignatureCreate]
+    ) -> None:
+        """Inserts the signatures, replacing existing signatures of the same SourceDocuments"""
+        for i in range(0, len(create_dtos), BATCH_SIZE):
+            values = [dto.model_dump() for dto in create_dtos[i : i + BATCH_SIZE]]
+            insert_stmt = insert(MinHashSignatureORM)
+            db.execute(
+                insert_stmt.on_conflict_do_update(
+                    index_elements=[MinHashSignatureORM.sdoc_id],
+                    set_={
+                        "fingerprint": insert_stmt.excluded.fingerprint,
+                        "signature": insert_stmt.excluded.signature,
+                    },
+                ),
+                values,
+            )
+        db.flush()
+
+    ### READ OPERATIONS ###
+
+    def read_by_sdoc_ids(
+        self, db: Session, *, sdoc_ids: list[int]
+    ) -> list[MinHashSignatureRead]:
+        result: list[MinHashSignatureRead] = []
+        for i in range(0, len(sdoc_ids), BATCH_SIZE):
+            result.extend(
+                MinHashSignatureRead.model_validate(s)
+                for s in db.query(MinHashSignatureORM)
+                .filter(MinHashSignatureORM.sdoc_id.in_(sdoc_ids[i : i + BATCH_SIZE]))
+                .all()
+            )
+        return result
+
+    ### UPDATE OPERATIONS ###
+
+    def update(self, db: Session, *, id: int, update_dto):
+        raise NotImplementedError()
+
+
+crud_minhash_signature = CRUDMinHashSignature(MinHashSignatureORM)
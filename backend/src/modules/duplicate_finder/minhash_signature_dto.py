@@ -0,0 +1,19 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class MinHashSignatureBase(BaseModel):
+    sdoc_id: int = Field(description="ID of the SourceDocument")
+    project_id: int = Field(description="ID of the Project")
+    fingerprint: int = Field(
+        description="Fingerprint of the word set the signature was computed from"
+    )
+    signature: bytes = Field(description="MinHash signature (little-endian uint32)")
+
+
+class MinHashSignatureRead(MinHashSignatureBase):
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Properties for creation
+class MinHashSignatureCreate(MinHashSignatureBase):
+    pass
@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, ForeignKey, Integer, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+
+from repos.db.orm_base import ORMBase
+
+
+class MinHashSignatureORM(ORMBase):
+    sdoc_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("sourcedocument.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    project_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("project.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    # fingerprint of the word set the signature was computed from
+    fingerprint: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    signature: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    def get_project_id(self) -> int:
+        return self.project_id
@@ -0,0 +1,163 @@
+import hashlib
+from collections import defaultdict
+from typing import TYPE_CHECKING, Iterable
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import scipy.sparse as sp
+
+# MinHash parameters. NUM_PERM = NUM_BANDS * ROWS_PER_BAND
+# With 32 bands of 4 rows, pairs with a Jaccard similarity of 0.6 become candidates with a probability of ~99%.
+NUM_PERM = 128
+NUM_BANDS = 32
+ROWS_PER_BAND = NUM_PERM // NUM_BANDS
+SEED = 42
+
+# universal hashing (a * h + b) % p: the product is exact in uint64, because a, b, h < p < 2^31
+MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+
+_rng = np.random.RandomState(SEED)
+_PERM_A = _rng.randint(1, (1 << 31) - 1, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, (1 << 31) - 1, size=NUM_PERM, dtype=np.uint64)
+
+
+def hash_word(word: str) -> int:
+    """Stable 32-bit hash of a word (Python's hash() is randomized per process)"""
+    return int.from_bytes(
+        hashlib.blake2b(word.encode("utf-8"), digest_size=4).digest(), "little"
+    )
+
+
+def hash_words(words: Iterable[str]) -> np.ndarray:
+    """Sorted, unique hashes of the (lower-cased) words"""
+    return np.unique(np.array([hash_word(w.lower()) for w in words], dtype=np.uint64))
+
+
+def fingerprint(word_hashes: np.ndarray) -> int:
+    """Order independent fingerprint of a word set, used to detect stale signatures"""
+    if len(word_hashes) == 0:
+        return 0
+    return int(
+        np.bitwise_xor.reduce(word_hashes.astype(np.uint64) * np.uint64(2654435761))
+        & np.uint64((1 << 63) - 1)
+    )
+
+
+def minhash_signature(word_hashes: np.ndarray) -> np.ndarray:
+    """Computes the MinHash signature (NUM_PERM uint32 values) of a set of word hashes"""
+    if len(word_hashes) == 0:
+        return np.full(NUM_PERM, MERSENNE_PRIME, dtype=np.uint32)
+    h = (word_hashes.astype(np.uint64) % MERSENNE_PRIME)[np.newaxis, :]
+    permuted = (_PERM_A[:, np.newaxis] * h + _PERM_B[:, np.newaxis]) % MERSENNE_PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def signature_to_bytes(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def signature_from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4").astype(np.uint32)
+
+
+def band_keys(signature: np.ndarray) -> list[int]:
+    """Returns one stable 63-bit bucket key per LSH band"""
+    bands = signature.astype("<u4").reshape(NUM_BANDS, ROWS_PER_BAND)
+    return [
+        int.from_bytes(
+            hashlib.blake2b(band.tobytes(), digest_size=8).digest(), "little"
+        )
+        & ((1 << 63) - 1)
+        for band in bands
+    ]
+
+
+def lsh_candidate_pairs(signatures: np.ndarray) -> Iterable[np.ndarray]:
+    """
+    Yields the candidate pairs (as an array of shape [n, 2] with row indices a < b) band by band.
+    Documents are candidates if all rows of at least one band are equal.
+    """
+    n = signatures.shape[0]
+    bands = signatures.reshape(n, NUM_BANDS, ROWS_PER_BAND)
+    for band_idx in range(NUM_BANDS):
+        buckets: dict[bytes, list[int]] = defaultdict(list)
+        band = np.ascontiguousarray(bands[:, band_idx, :])
+        for row_idx in range(n):
+            buckets[band[row_idx].tobytes()].append(row_idx)
+
+        pairs: list[tuple[int, int]] = []
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    pairs.append((members[i], members[j]))
+        if len(pairs) > 0:
+            yield np.array(pairs, dtype=np.int64)
+
+
+def l1_distances(
+    vectors: "sp.csr_matrix", a: np.ndarray, b: np.ndarray, batch_size: int = 65536
+) -> np.ndarray:
+    """Exact L1 distances between the rows a[i] and b[i] of a sparse matrix"""
+    distances = np.empty(len(a), dtype=np.float32)
+    for i in range(0, len(a), batch_size):
+        diff = vectors[a[i : i + batch_size]] - vectors[b[i : i + batch_size]]
+        distances[i : i + batch_size] = np.asarray(abs(diff).sum(axis=1)).ravel()
+    return distances
+
+
+class UnionFind:
+    def __init__(self, n: int):
+        self.parent = np.arange(n, dtype=np.int64)
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # path halving
+            x = parent[x]
+        return int(x)
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+    def groups(self) -> list[list[int]]:
+        """Returns all groups with at least two members"""
+        groups: dict[int, list[int]] = defaultdict(list)
+        for x in range(len(self.parent)):
+            groups[self.find(x)].append(x)
+        return [g for g in groups.values() if len(g) > 1]
+
+
+def find_duplicate_groups(
+    vectors: "sp.csr_matrix",
+    signatures: np.ndarray,
+    max_distance: float,
+) -> list[list[int]]:
+    """
+    Groups the rows of the sparse count matrix whose L1 distance is <= max_distance.
+    Candidate pairs come from MinHash LSH, every candidate is verified with the exact L1 distance.
+    Returns groups of row indices.
+    """
+    n = vectors.shape[0]
+    uf = UnionFind(n)
+    totals = np.asarray(vectors.sum(axis=1)).ravel()
+    for pairs in lsh_candidate_pairs(signatures):
+        # skip pairs that are already connected (they do not change the groups)
+        roots_a = np.array([uf.find(a) for a in pairs[:, 0]])
+        roots_b = np.array([uf.find(b) for b in pairs[:, 1]])
+        pairs = pairs[roots_a != roots_b]
+
+        # the difference of the total word counts is a lower bound of the L1 distance
+        pairs = pairs[np.abs(totals[pairs[:, 0]] - totals[pairs[:, 1]]) <= max_distance]
+        if len(pairs) == 0:
+            continue
+
+        distances = l1_distances(vectors, pairs[:, 0], pairs[:, 1])
+        for a, b in pairs[distances <= max_distance]:
+            uf.union(int(a), int(b))
+
+    return uf.groups()
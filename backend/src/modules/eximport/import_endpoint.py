@@ -2,7 +2,7 @@ from typing import TypedDict
 
 from fastapi import APIRouter, Depends, UploadFile
 
-from common.dependencies import get_current_user
+from common.dependencies import get_current_principal
 from common.job_type import JobType
 from core.auth.authz_user import AuthzUser
 from modules.eximport.import_job_dto import ImportJobInput, ImportJobRead, ImportJobType
@@ -11,7 +11,7 @@ from repos.filesystem_repo import FilesystemRepo
 from systems.job_system.job_service import JobService
 
 router = APIRouter(
-    prefix="/import", dependencies=[Depends(get_current_user)], tags=["import"]
+    prefix="/import", dependencies=[Depends(get_current_principal)], tags=["import"]
 )
 
 ims: ImportService = ImportService()
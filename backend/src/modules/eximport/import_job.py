@@ -13,4 +13,5 @@ def import_data(payload: ImportJobInput, job: Job) -> None:
         return ImportService().handle_import_job(
             db=db,
             payload=payload,
+            job=job,
         )
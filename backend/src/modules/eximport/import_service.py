@@ -38,6 +38,7 @@ from modules.eximport.timeline_analysis.import_timeline_analysis import (
 from modules.eximport.user.import_users import import_users_to_proj
 from modules.eximport.whiteboards.import_whiteboards import import_whiteboards_to_proj
 from repos.filesystem_repo import FilesystemRepo
+from systems.job_system.job_dto import Job
 
 
 class ImportService(metaclass=SingletonMeta):
@@ -65,7 +66,9 @@ class ImportService(metaclass=SingletonMeta):
         with zipfile.ZipFile(path_to_zip_file, "r") as zip_ref:
             zip_ref.extractall(unzip_target)
 
-    def handle_import_job(self, db: Session, payload: ImportJobInput) -> None:
+    def handle_import_job(
+        self, db: Session, payload: ImportJobInput, job: Job | None = None
+    ) -> None:
         # Check project exists
         crud_project.exists(
             db=db,
@@ -91,12 +94,14 @@ class ImportService(metaclass=SingletonMeta):
             self=self,
             db=db,
             payload=payload,
+            job=job,
         )
 
     def _import_codes_to_proj(
         self,
         db: Session,
         payload: ImportJobInput,
+        job: Job | None,
     ) -> None:
         """Import codes to a project"""
         path_to_file = self.fsr.get_dst_path_for_temp_file(payload.file_name)
@@ -107,6 +112,7 @@ class ImportService(metaclass=SingletonMeta):
         self,
         db: Session,
         payload: ImportJobInput,
+        job: Job | None,
     ) -> None:
         """Import folders to a project"""
         path_to_file = self.fsr.get_dst_path_for_temp_file(payload.file_name)
@@ -117,6 +123,7 @@ class ImportService(metaclass=SingletonMeta):
         self,
         db: Session,
         payload: ImportJobInput,
+        job: Job | None,
     ) -> None:
         """Import tags to a project"""
         path_to_file = self.fsr.get_dst_path_for_temp_file(payload.file_name)
@@ -127,6 +134,7 @@ class ImportService(metaclass=SingletonMeta):
         self,
         db: Session,
         payload: ImportJobInput,
+        job: Job | None,
     ) -> None:
         """Import bbox annotations to a project"""
         path_to_file = self.fsr.get_dst_path_for_temp_file(payload.file_name)
@@ -137,6 +145,7 @@ class ImportService(metaclass=SingletonMeta):
         self,
         db: Session,
         payload: ImportJobInput,
+        job: Job | None,
     ) -> None:
         """Import span annotations to a project"""
         path_to_file = self.fsr.get_dst_path_for_temp_file(payload.file_name)
@@ -147,6 +156,7 @@ class ImportService(metaclass=SingletonMeta):
         self,
         db: Session,
         payload: ImportJobInput,
+        job: Job | None,
     ) -> None:
         """Import sent annotations to a project"""
         path_to_file = self.fsr.get_dst_path_for_temp_file(payload.file_name)
@@ -157,6 +167,7 @@ class ImportService(metaclass=SingletonMeta):
         self,
         db: Session,
         payload: ImportJobInput,
+        job: Job | None,
     ) -> None:
         """Import whiteboards to a project"""
         path_to_file = self.fsr.get_dst_path_for_temp_file(payload.file_name)
@@ -167,6 +178,7 @@ class ImportService(metaclass=SingletonMeta):
         self,
         db: Session,
         payload: ImportJobInput,
+        job: Job | None,
     ) -> None:
         """Import timeline analyses to a project"""
         path_to_file = self.fsr.get_dst_path_for_temp_file(payload.file_name)
@@ -177,6 +189,7 @@ class ImportService(metaclass=SingletonMeta):
         self,
         db: Session,
         payload: ImportJobInput,
+        job: Job | None,
     ) -> None:
         """Import cota to a project"""
         path_to_file = self.fsr.get_dst_path_for_temp_file(payload.file_name)
@@ -187,6 +200,7 @@ class ImportService(metaclass=SingletonMeta):
         self,
         db: Session,
         payload: ImportJobInput,
+        job: Job | None,
     ) -> None:
         """Import memos to a project"""
         path_to_file = self.fsr.get_dst_path_for_temp_file(payload.file_name)
@@ -197,6 +211,7 @@ class ImportService(metaclass=SingletonMeta):
         self,
         db: Session,
         payload: ImportJobInput,
+        job: Job | None,
     ) -> None:
         """Import users annotations to a project"""
         path_to_file = self.fsr.get_dst_path_for_temp_file(payload.file_name)
@@ -207,6 +222,7 @@ class ImportService(metaclass=SingletonMeta):
         self,
         db: Session,
         payload: ImportJobInput,
+        job: Job | None,
     ) -> None:
         """Import project metadata to a project"""
         path_to_file = self.fsr.get_dst_path_for_temp_file(payload.file_name)
@@ -217,6 +233,7 @@ class ImportService(metaclass=SingletonMeta):
         self,
         db: Session,
         payload: ImportJobInput,
+        job: Job | None,
     ) -> None:
         """Import source documents to a project"""
         # unzip file
@@ -236,12 +253,14 @@ class ImportService(metaclass=SingletonMeta):
             db=db,
             path_to_dir=path_to_temp_import_dir,
             project_id=payload.project_id,
+            job=job,
         )
 
     def _import_project(
         self,
         db: Session,
         payload: ImportJobInput,
+        job: Job | None,
     ) -> None:
         """Import an entire project"""
         # unzip file
@@ -258,8 +277,8 @@ class ImportService(metaclass=SingletonMeta):
             raise e
 
         import_project(
-            db=db,
             fsr=self.fsr,
             path_to_dir=path_to_temp_import_dir,
             proj_id=payload.project_id,
+            job=job,
         )
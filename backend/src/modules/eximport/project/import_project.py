@@ -1,5 +1,7 @@
+import multiprocessing as mp
 import re
 import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from enum import Enum
 from os import listdir
 from os.path import isfile
@@ -9,6 +11,10 @@ import pandas as pd
 from loguru import logger
 from sqlalchemy.orm import Session
 
+from config import conf
+from core.annotation.annotation_document_crud import crud_adoc
+from core.doc.source_document_crud import crud_sdoc
+from core.user.user_crud import crud_user
 from modules.eximport.bbox_annotations.import_bbox_annotations import (
     import_bbox_annotations_to_proj,
 )
@@ -32,7 +38,10 @@ from modules.eximport.timeline_analysis.import_timeline_analysis import (
 )
 from modules.eximport.user.import_users import import_users_to_proj
 from modules.eximport.whiteboards.import_whiteboards import import_whiteboards_to_proj
+from repos.db.sql_repo import SQLRepo
 from repos.filesystem_repo import FilesystemRepo
+from systems.job_system.job_dto import Job
+from systems.job_system.job_service import JobService
 
 
 class ExportEntity(Enum):
@@ -79,7 +88,9 @@ class ExportEntity(Enum):
             case ExportEntity.WHITEBOARD:
                 return r"project_\d+_all_whiteboards.csv"
 
-    def import_entity(self, db: Session, data, project_id: int) -> None:
+    def import_entity(
+        self, db: Session, data, project_id: int, job: Job | None = None
+    ) -> None:
         match self:
             case ExportEntity.BBOX_ANNOTATION:
                 import_bbox_annotations_to_proj(db=db, df=data, project_id=project_id)
@@ -94,7 +105,9 @@ class ExportEntity(Enum):
             case ExportEntity.PROJECT_METADATA:
                 import_project_metadata_to_proj(db=db, df=data, project_id=project_id)
             case ExportEntity.SDOC:
-                import_sdocs_to_proj(db=db, path_to_dir=data, project_id=project_id)
+                import_sdocs_to_proj(
+                    db=db, path_to_dir=data, project_id=project_id, job=job
+                )
             case ExportEntity.SENT_ANNOTATION:
                 import_sentence_annotations_to_proj(
                     db=db, df=data, project_id=project_id
@@ -111,20 +124,63 @@ class ExportEntity(Enum):
                 import_whiteboards_to_proj(db=db, df=data, project_id=project_id)
 
 
-IMPORT_ORDER = [
-    ExportEntity.PROJECT_METADATA,
-    ExportEntity.USER,
-    ExportEntity.CODE,
-    ExportEntity.TAG,
-    ExportEntity.FOLDER,
-    ExportEntity.SDOC,
+IMPORT_DEPENDENCIES: dict[ExportEntity, list[ExportEntity]] = {
+    ExportEntity.PROJECT_METADATA: [],
+    ExportEntity.USER: [],
+    ExportEntity.CODE: [],
+    ExportEntity.TAG: [],
+    ExportEntity.FOLDER: [],
+    ExportEntity.SDOC: [
+        ExportEntity.PROJECT_METADATA,
+        ExportEntity.TAG,
+        ExportEntity.FOLDER,
+    ],
+    ExportEntity.BBOX_ANNOTATION: [
+        ExportEntity.USER,
+        ExportEntity.CODE,
+        ExportEntity.SDOC,
+    ],
+    ExportEntity.SPAN_ANNOTATION: [
+        ExportEntity.USER,
+        ExportEntity.CODE,
+        ExportEntity.SDOC,
+    ],
+    ExportEntity.SENT_ANNOTATION: [
+        ExportEntity.USER,
+        ExportEntity.CODE,
+        ExportEntity.SDOC,
+    ],
+    ExportEntity.MEMO: [
+        ExportEntity.USER,
+        ExportEntity.CODE,
+        ExportEntity.TAG,
+        ExportEntity.SDOC,
+        ExportEntity.BBOX_ANNOTATION,
+        ExportEntity.SPAN_ANNOTATION,
+        ExportEntity.SENT_ANNOTATION,
+    ],
+    ExportEntity.COTA: [],
+    ExportEntity.TIMELINE_ANALYSIS: [
+        ExportEntity.PROJECT_METADATA,
+        ExportEntity.USER,
+        ExportEntity.CODE,
+        ExportEntity.TAG,
+    ],
+    ExportEntity.WHITEBOARD: [
+        ExportEntity.CODE,
+        ExportEntity.TAG,
+        ExportEntity.SDOC,
+        ExportEntity.BBOX_ANNOTATION,
+        ExportEntity.SPAN_ANNOTATION,
+        ExportEntity.SENT_ANNOTATION,
+    ],
+}
+"""The entities (stages) that have to be imported before an entity can be imported"""
+
+ANNOTATION_ENTITIES = [
     ExportEntity.BBOX_ANNOTATION,
     ExportEntity.SPAN_ANNOTATION,
     ExportEntity.SENT_ANNOTATION,
-    ExportEntity.MEMO,
-    ExportEntity.COTA,
-    ExportEntity.TIMELINE_ANALYSIS,
-    ExportEntity.WHITEBOARD,
 ]
 
 
@@ -153,16 +209,71 @@ def __organize_import_files(import_dir: Path) -> dict[ExportEntity, Path]:
     return organized_files
 
 
+def __create_annotation_documents(db: Session, df: pd.DataFrame, project_id: int):
+    """
+    Creates the annotation documents required by the annotations to import.
+    The annotation stages run in parallel, so they must not create the same annotation documents themselves.
+    Unknown users and documents are skipped, the import of the annotations reports them.
+    """
+    user_ids = {
+        user.email: user.id
+        for user in crud_user.read_by_emails(
+            db=db, emails=df["user_email"].unique().tolist()
+        )
+    }
+    sdoc_ids = crud_sdoc.read_ids_by_filenames(
+        db=db, proj_id=project_id, filenames=df["sdoc_name"].unique().tolist()
+    )
+    crud_adoc.create_missing(
+        db=db,
+        user_sdoc_ids=[
+            (user_ids[user_email], sdoc_ids[sdoc_name])
+            for user_email, sdoc_name in df[["user_email", "sdoc_name"]]
+            .drop_duplicates()
+            .itertuples(index=False)
+            if user_email in user_ids and sdoc_name in sdoc_ids
+        ],
+    )
+
+
+def __import_stage(
+    entity: ExportEntity, data_path: Path, project_id: int, job_id: str | None
+) -> None:
+    """
+    Imports one entity in a worker process, using its own (committed) transaction.
+    The job is fetched by its id to report the progress from the worker process.
+    """
+    job = JobService().get_job(job_id) if job_id is not None else None
+    if entity == ExportEntity.SDOC:
+        data = data_path
+    else:
+        data = pd.read_csv(data_path)
+
+    if entity in ANNOTATION_ENTITIES:
+        with SQLRepo().transaction() as db:
+            __create_annotation_documents(db=db, df=data, project_id=project_id)
+
+    with SQLRepo().transaction() as db:
+        entity.import_entity(db=db, data=data, project_id=project_id, job=job)
+
+
 def import_project(
-    db: Session,
     fsr: FilesystemRepo,
     path_to_dir: Path,
     proj_id: int,
+    job: Job | None = None,
 ) -> None:
+    """
+    Imports the project entities stage by stage, following IMPORT_DEPENDENCIES.
+    Independent stages run in parallel processes, each one commits on its own.
+    Hence, the import is not atomic: if a stage fails, the stages completed before stay imported.
+    Completed stages are checkpointed in the job, so that a retried job resumes after the last completed stage
+    (the failed stage is imported again from the start).
+    """
     organized_files = __organize_import_files(import_dir=path_to_dir)
 
-    # read data
-    organized_data = {}
+    # read data (the csv files are read by the stages)
+    organized_data: dict[ExportEntity, Path] = {}
     for entity, file_path in organized_files.items():
         if entity == ExportEntity.SDOC:
             # read zip (unzip file)
@@ -180,13 +291,70 @@ def import_project(
             except Exception as e:
                 raise e
         else:
-            # read csv
-            organized_data[entity] = pd.read_csv(file_path)
+            organized_data[entity] = file_path
+
+    # resume from the checkpoint, stages without data count as completed
+    stages = [entity for entity in IMPORT_DEPENDENCIES if entity in organized_data]
+    completed_stages = [
+        entity.value
+        for entity in stages
+        if job is not None and entity.value in job.get_completed_stages()
+    ]
+    done = {entity for entity in IMPORT_DEPENDENCIES if entity not in stages} | {
+        ExportEntity(stage) for stage in completed_stages
+    }
+    if len(completed_stages) > 0:
+        logger.info(f"Resuming project import, completed stages: {completed_stages}")
 
     # import data
-    for entity in IMPORT_ORDER:
-        if entity not in organized_files:
-            continue
+    running: dict[Future, ExportEntity] = {}
+    error: Exception | None = None
+    with ProcessPoolExecutor(
+        max_workers=conf.rq.project_import_workers,
+        mp_context=mp.get_context("fork"),
+    ) as executor:
+        while True:
+            # submit all stages whose dependencies are completed
+            if error is None:
+                for entity in stages:
+                    if (
+                        entity not in done
+                        and entity not in running.values()
+                        and all(dep in done for dep in IMPORT_DEPENDENCIES[entity])
+                    ):
+                        logger.info(f"Importing {entity.value} ...")
+                        running[
+                            executor.submit(
+                                __import_stage,
+                                entity,
+                                organized_data[entity],
+                                proj_id,
+                                job.get_id() if job is not None else None,
+                            )
+                        ] = entity
+            if len(running) == 0:
+                break
+
+            # wait for the next stage to finish
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                entity = running.pop(future)
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Failed to import {entity.value}: {e}")
+                    error = error or e
+                    continue
+
+                done.add(entity)
+                completed_stages.append(entity.value)
+                if job is not None:
+                    job.update(
+                        steps=[entity.value for entity in stages],
+                        current_step=len(completed_stages),
+                        status_message=f"Imported {entity.value}",
+                        completed_stages=completed_stages,
+                    )
 
-        data = organized_data[entity]
-        entity.import_entity(db=db, data=data, project_id=proj_id)
+    if error is not None:
+        raise error
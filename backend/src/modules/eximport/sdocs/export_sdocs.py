@@ -1,9 +1,15 @@
 from pathlib import Path
 
-from sqlalchemy.orm import Session
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from loguru import logger
+from sqlalchemy.orm import Session, joinedload, selectinload
+from weaviate import WeaviateClient
 
 from core.doc.document_embedding_crud import crud_document_embedding
 from core.doc.document_embedding_dto import DocumentObjectIdentifier
+from core.doc.folder_orm import FolderORM
 from core.doc.image_embedding_crud import crud_image_embedding
 from core.doc.image_embedding_dto import ImageObjectIdentifier
 from core.doc.sentence_embedding_crud import crud_sentence_embedding
@@ -13,14 +19,20 @@ from core.doc.source_document_orm import SourceDocumentORM
 from core.metadata.source_document_metadata_dto import (
     SourceDocumentMetadataReadResolved,
 )
+from core.metadata.source_document_metadata_orm import SourceDocumentMetadataORM
 from modules.eximport.export_exceptions import NoDataToExportError
 from modules.eximport.sdocs.sdoc_export_schema import (
-    SourceDocumentExportCollection,
-    SourceDocumentExportSchema,
+    SDOC_EXPORT_ARROW_SCHEMA,
+    sdoc_export_arrow_row,
 )
+from repos.db.crud_base import NoSuchElementError
 from repos.filesystem_repo import FilesystemRepo
 from repos.vector.weaviate_repo import WeaviateRepo
 
+# number of source documents that are loaded & written together (one parquet row group)
+EXPORT_CHUNK_SIZE = 256
+EXPORT_DATA_FILENAME = "document_export_data.parquet"
+
 
 def export_selected_sdocs(
     db: Session,
@@ -28,12 +40,12 @@ def export_selected_sdocs(
     project_id: int,
     sdoc_ids: list[int],
 ) -> Path:
-    sdocs = crud_sdoc.read_by_ids(db=db, ids=sdoc_ids)
     return __export_sdocs(
         db=db,
         fsr=fsr,
         fn=f"project_{project_id}_selected_docs",
-        sdocs=sdocs,
+        project_id=project_id,
+        sdoc_ids=sdoc_ids,
     )
 
 
@@ -42,12 +54,12 @@ def export_all_sdocs(
     fsr: FilesystemRepo,
     project_id: int,
 ) -> Path:
-    sdocs = crud_sdoc.read_by_project(db=db, proj_id=project_id, only_finished=False)
     return __export_sdocs(
         db=db,
         fsr=fsr,
         fn=f"project_{project_id}_all_docs",
-        sdocs=sdocs,
+        project_id=project_id,
+        sdoc_ids=crud_sdoc.read_ids_by_project(db=db, proj_id=project_id),
     )
 
 
@@ -55,9 +67,10 @@ def __export_sdocs(
     db: Session,
     fsr: FilesystemRepo,
     fn: str,
-    sdocs: list[SourceDocumentORM],
+    project_id: int,
+    sdoc_ids: list[int],
 ) -> Path:
-    if len(sdocs) == 0:
+    if len(sdoc_ids) == 0:
         raise NoDataToExportError("No source documents to export.")
 
     # We export these things for each source document:
@@ -72,101 +85,139 @@ def __export_sdocs(
     # 4. Embeddings of the source document
     # 4.1. Document Embeddings
     # 4.2. Sentence Embeddings
+    # 4.3. Image Embeddings
+    # Everything is streamed into the zip file in chunks, so that the memory usage is bounded.
+    chunks = [
+        sdoc_ids[i : i + EXPORT_CHUNK_SIZE]
+        for i in range(0, len(sdoc_ids), EXPORT_CHUNK_SIZE)
+    ]
 
-    # Collect all files to be included in the export
-    all_files = []
-
-    # 1. The source document itself (the raw file)
-    sdoc_files = [
-        fsr.get_path_to_sdoc_file(
-            SourceDocumentRead.model_validate(sdoc), raise_if_not_exists=True
+    with fsr.open_temp_zip_file(fn=fn) as (zip_file, zipf):
+        # 1. The source document itself (the raw file)
+        for chunk in chunks:
+            for sdoc in __read_sdocs(db=db, sdoc_ids=chunk):
+                sdoc_file = fsr.get_path_to_sdoc_file(
+                    SourceDocumentRead.model_validate(sdoc), raise_if_not_exists=True
+                )
+                zipf.write(sdoc_file, sdoc_file.name)
+
+        # 2. - 4. The data of the source documents, one row group per chunk
+        with (
+            zipf.open(EXPORT_DATA_FILENAME, mode="w", force_zip64=True) as data_file,
+            pq.ParquetWriter(data_file, SDOC_EXPORT_ARROW_SCHEMA) as writer,
+            WeaviateRepo().weaviate_session() as client,
+        ):
+            for i, chunk in enumerate(chunks):
+                sdocs = __read_sdocs(db=db, sdoc_ids=chunk, eager=True)
+                rows = __export_rows(client=client, project_id=project_id, sdocs=sdocs)
+                writer.write_table(
+                    pa.Table.from_pylist(rows, schema=SDOC_EXPORT_ARROW_SCHEMA)
+                )
+                logger.info(f"Exported chunk {i + 1}/{len(chunks)} of {fn}")
+
+    return zip_file
+
+
+def __read_sdocs(
+    db: Session, sdoc_ids: list[int], eager: bool = False
+) -> list[SourceDocumentORM]:
+    query = db.query(SourceDocumentORM).filter(SourceDocumentORM.id.in_(sdoc_ids))
+    if eager:
+        # load all attached data with a constant number of queries per chunk
+        query = query.options(
+            joinedload(SourceDocumentORM.data),
+            joinedload(SourceDocumentORM.folder).joinedload(FolderORM.parent),
+            selectinload(SourceDocumentORM.tags),
+            selectinload(SourceDocumentORM.word_frequencies),
+            selectinload(SourceDocumentORM.metadata_).joinedload(
+                SourceDocumentMetadataORM.project_metadata
+            ),
         )
-        for sdoc in sdocs
-    ]
-    all_files.extend(sdoc_files)
+    id2sdoc = {sdoc.id: sdoc for sdoc in query.all()}
+    for sdoc_id in sdoc_ids:
+        if sdoc_id not in id2sdoc:
+            raise NoSuchElementError(SourceDocumentORM, id=sdoc_id)
+    return [id2sdoc[sdoc_id] for sdoc_id in sdoc_ids]
+
+
+def __export_rows(
+    client: WeaviateClient, project_id: int, sdocs: list[SourceDocumentORM]
+) -> list[dict]:
+    sdoc_ids = [sdoc.id for sdoc in sdocs]
+    image_sdoc_ids = [sdoc.id for sdoc in sdocs if sdoc.doctype == "image"]
+
+    # Get the embeddings of all documents of the chunk at once
+    doc_embeddings = crud_document_embedding.get_embeddings(
+        client=client,
+        project_id=project_id,
+        ids=[DocumentObjectIdentifier(sdoc_id=sdoc_id) for sdoc_id in sdoc_ids],
+    )
+    sentence_embeddings = crud_sentence_embedding.get_embeddings_by_sdoc_ids(
+        client=client, project_id=project_id, sdoc_ids=sdoc_ids
+    )
+    image_embeddings = dict(
+        zip(
+            image_sdoc_ids,
+            crud_image_embedding.get_embeddings(
+                client=client,
+                project_id=project_id,
+                ids=[
+                    ImageObjectIdentifier(sdoc_id=sdoc_id) for sdoc_id in image_sdoc_ids
+                ],
+            )
+            if len(image_sdoc_ids) > 0
+            else [],
+        )
+    )
 
-    # Create a collection of export data
-    export_collection = []
-    for sdoc in sdocs:
+    rows = []
+    for sdoc, doc_embedding in zip(sdocs, doc_embeddings):
         sdoc_data = sdoc.data
         if sdoc_data is None:
             raise ValueError(f"SourceDocument {sdoc.id} has no data, cannot export.")
 
-        # Document tags
-        tags = [tag.name for tag in sdoc.tags]
-
         # Document metadata
         sdoc_metadata_dtos = [
             SourceDocumentMetadataReadResolved.model_validate(sdoc_metadata)
             for sdoc_metadata in sdoc.metadata_
         ]
-        metadata_list = []
-        for metadata in sdoc_metadata_dtos:
-            metadata_list.append(
-                (metadata.project_metadata.key, metadata.get_value_serializable())
-            )
 
-        # Word frequencies
-        word_frequencies = [(wf.word, wf.count) for wf in sdoc.word_frequencies]
-
-        with WeaviateRepo().weaviate_session() as client:
-            # Get document embeddings
-            doc_embedding = crud_document_embedding.get_embedding(
-                client=client,
-                project_id=sdoc.project_id,
-                id=DocumentObjectIdentifier(sdoc_id=sdoc.id),
+        image_embedding = image_embeddings.get(sdoc.id)
+        rows.append(
+            sdoc_export_arrow_row(
+                filename=sdoc.filename,
+                name=sdoc.name,
+                doctype=sdoc.doctype,
+                status=sdoc.processed_status.value,
+                folder_name=sdoc.folder.name,
+                folder_parent_name=sdoc.folder.parent.name
+                if sdoc.folder.parent
+                else None,
+                tags=[tag.name for tag in sdoc.tags],
+                word_frequencies=[(wf.word, wf.count) for wf in sdoc.word_frequencies],
+                metadata=[
+                    (metadata.project_metadata.key, metadata.get_value_serializable())
+                    for metadata in sdoc_metadata_dtos
+                ],
+                content=sdoc_data.content,
+                html=sdoc_data.html,
+                raw_html=sdoc_data.raw_html,
+                token_starts=sdoc_data.token_starts,
+                token_ends=sdoc_data.token_ends,
+                sentence_starts=sdoc_data.sentence_starts,
+                sentence_ends=sdoc_data.sentence_ends,
+                token_time_starts=sdoc_data.token_time_starts,
+                token_time_ends=sdoc_data.token_time_ends,
+                document_embedding=np.asarray(doc_embedding, dtype=np.float32),
+                image_embedding=np.asarray(image_embedding, dtype=np.float32)
+                if image_embedding is not None
+                else None,
+                # one float32 array per sentence
+                sentence_embeddings=list(
+                    sentence_embeddings.get(
+                        sdoc.id, np.empty((0, len(doc_embedding)), np.float32)
+                    )
+                ),
             )
-
-            # Get sentence embeddings
-            sentence_embeddings = crud_sentence_embedding.get_embeddings_by_sdoc_id(
-                client=client, project_id=sdoc.project_id, sdoc_id=sdoc.id
-            )
-            sentence_embeddings = [se.embedding for se in sentence_embeddings]
-
-            # Get image embeddings
-            image_embedding = None
-            if sdoc.doctype == "image":
-                image_embedding = crud_image_embedding.get_embedding(
-                    client=client,
-                    project_id=sdoc.project_id,
-                    id=ImageObjectIdentifier(sdoc_id=sdoc.id),
-                )
-
-        # Create export schema for the document
-        export_schema = SourceDocumentExportSchema(
-            filename=sdoc.filename,
-            name=sdoc.name,
-            doctype=sdoc.doctype,
-            status=sdoc.processed_status.value,
-            folder_name=sdoc.folder.name,
-            folder_parent_name=sdoc.folder.parent.name if sdoc.folder.parent else None,
-            tags=tags,
-            word_frequencies=word_frequencies,
-            metadata=metadata_list,
-            content=sdoc_data.content,
-            html=sdoc_data.html,
-            raw_html=sdoc_data.raw_html,
-            token_starts=sdoc_data.token_starts,
-            token_ends=sdoc_data.token_ends,
-            sentence_starts=sdoc_data.sentence_starts,
-            sentence_ends=sdoc_data.sentence_ends,
-            token_time_starts=sdoc_data.token_time_starts,
-            token_time_ends=sdoc_data.token_time_ends,
-            document_embedding=doc_embedding,
-            sentence_embeddings=sentence_embeddings,
-            image_embedding=image_embedding,
         )
-
-        export_collection.append(export_schema)
-
-    # Create a DataFrame from all export schemas and write to a file
-    export_collection_obj = SourceDocumentExportCollection(
-        source_documents=export_collection
-    )
-    export_df_file = fsr.write_df_to_temp_file(
-        df=export_collection_obj.to_dataframe(), fn="document_export_data"
-    )
-    all_files.append(export_df_file)
-
-    # Create and return a zip file with all exported files
-    return fsr.write_files_to_temp_zip_file(files=all_files, fn=fn)
+    return rows
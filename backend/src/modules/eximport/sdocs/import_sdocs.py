@@ -1,8 +1,12 @@
 from pathlib import Path
+from typing import Iterator
 
 import pandas as pd
+import pyarrow.parquet as pq
+from elasticsearch import Elasticsearch
 from loguru import logger
 from sqlalchemy.orm import Session
+from weaviate import WeaviateClient
 
 from common.doc_type import DocType
 from core.doc.document_embedding_crud import crud_document_embedding
@@ -13,6 +17,7 @@ from core.doc.image_embedding_crud import crud_image_embedding
 from core.doc.image_embedding_dto import ImageObjectIdentifier
 from core.doc.sdoc_elastic_crud import crud_elastic_sdoc
 from core.doc.sdoc_elastic_dto import ElasticSearchDocumentCreate
+from core.doc.sdoc_elastic_index import SdocIndex
 from core.doc.sentence_embedding_crud import crud_sentence_embedding
 from core.doc.sentence_embedding_dto import SentenceObjectIdentifier
 from core.doc.source_document_crud import crud_sdoc
@@ -24,20 +29,29 @@ from core.metadata.source_document_metadata_crud import crud_sdoc_meta
 from core.metadata.source_document_metadata_dto import SourceDocumentMetadataCreate
 from core.project.project_crud import crud_project
 from core.tag.tag_crud import crud_tag
+from core.tag.tag_orm import TagORM
 from modules.doc_processing.doc_processing_steps import PROCESSING_JOBS
 from modules.doc_processing.image.image_thumbnail_generation_job import (
     generate_thumbnails,
 )
-from modules.eximport.sdocs.sdoc_export_schema import SourceDocumentExportCollection
+from modules.eximport.sdocs.sdoc_export_schema import (
+    SourceDocumentExportSchema,
+    sdoc_export_records_from_arrow,
+    sdoc_export_records_from_dataframe,
+)
 from modules.word_frequency.word_frequency_crud import crud_word_frequency
 from modules.word_frequency.word_frequency_dto import WordFrequencyCreate
 from repos.elastic.elastic_repo import ElasticSearchRepo
 from repos.filesystem_repo import FilesystemRepo
 from repos.vector.weaviate_repo import WeaviateRepo
+from systems.job_system.job_dto import Job
 
 es = ElasticSearchRepo()
 fsr = FilesystemRepo()
 
+# number of source documents that are imported together (one bulk INSERT per table, one Weaviate batch)
+IMPORT_CHUNK_SIZE = 256
+
 
 class ImportSourceDocumentsError(Exception):
     def __init__(self, errors: list[str]) -> None:
@@ -48,14 +62,18 @@ def import_sdocs_to_proj(
     db: Session,
     path_to_dir: Path,
     project_id: int,
+    job: Job | None = None,
 ) -> list[int]:
     """
     Import source documents from a zip file into a project.
     Validates input data and ensures all required references exist.
+    The data file is streamed twice: First, all source documents are validated, then they are imported
+    in chunks of IMPORT_CHUNK_SIZE with bulk operations, so that the memory usage is bounded.
 
     Args:
         db: Database session
         project_id: ID of the project to import documents into
+        job: The running job, used to report the progress (optional)
 
     Returns:
         List of imported source document IDs
@@ -64,35 +82,46 @@ def import_sdocs_to_proj(
         ImportSourceDocumentsError: If validation fails or any required references are missing
     """
 
-    # Find the data file (CSV) and the source files in the import directory
+    # Find the data file (Parquet, or CSV for older exports) and the source files in the import directory
     data_file = None
     source_files = []
     for file_path in path_to_dir.glob("**/*"):
         if file_path.is_file():
-            if file_path.name.endswith(".csv"):
+            if file_path.name.endswith((".parquet", ".csv")):
                 data_file = file_path
             else:
                 source_files.append(file_path)
 
     if not data_file:
         raise ImportSourceDocumentsError(
-            errors=["No data file (.csv) found in the zip archive"]
+            errors=["No data file (.parquet or .csv) found in the zip archive"]
         )
 
-    df = pd.read_csv(data_file)
-
-    # Validate input data with our schema
+    # Validate input data with our schema and collect everything the documents refer to
+    filenames: list[str] = []
+    needed_tags: set[str] = set()
+    needed_parent_folders: set[str] = set()
+    sdoc_folder_names: set[str] = set()
+    needed_metadata_keys: dict[DocType, set[str]] = {}
     try:
-        sdoc_collection = SourceDocumentExportCollection.from_dataframe(df)
+        for sdoc_exports in __iter_sdoc_exports(data_file=data_file, validate=True):
+            for sdoc in sdoc_exports:
+                filenames.append(sdoc.filename)
+                needed_tags.update(sdoc.tags)
+                if sdoc.folder_parent_name:
+                    needed_parent_folders.add(sdoc.folder_parent_name)
+                sdoc_folder_names.add(sdoc.folder_name)
+                for key, _ in sdoc.metadata:
+                    needed_metadata_keys.setdefault(DocType(sdoc.doctype), set()).add(
+                        key
+                    )
     except Exception as e:
         logger.error(f"Failed to load document export data: {e}")
         raise ImportSourceDocumentsError(
             errors=[f"Invalid data format for source documents: {e}"]
         )
 
-    logger.info(
-        f"Importing {len(sdoc_collection.source_documents)} source documents..."
-    )
+    logger.info(f"Importing {len(filenames)} source documents...")
 
     # 0. Get the project
     error_messages = []
@@ -103,26 +132,21 @@ def import_sdocs_to_proj(
     for source_file in source_files:
         source_file_by_name[source_file.name] = source_file
 
-    for sdoc in sdoc_collection.source_documents:
-        if sdoc.filename not in source_file_by_name:
-            error_messages.append(
-                f"Source file not found for document '{sdoc.filename}'"
-            )
+    for filename in filenames:
+        if filename not in source_file_by_name:
+            error_messages.append(f"Source file not found for document '{filename}'")
 
     # 2. Check if documents with the same filename already exist in the project
-    for sdoc in sdoc_collection.source_documents:
-        existing_sdoc = crud_sdoc.read_by_filename(
-            db=db, proj_id=project_id, filename=sdoc.filename, only_finished=False
+    for filename in sorted(
+        crud_sdoc.read_existing_filenames(
+            db=db, proj_id=project_id, filenames=filenames
+        )
+    ):
+        error_messages.append(
+            f"Source document with filename '{filename}' already exists in project {project_id}"
         )
-        if existing_sdoc is not None:
-            error_messages.append(
-                f"Source document with filename '{sdoc.filename}' already exists in project {project_id}"
-            )
 
     # 3. Check if all tags exist
-    needed_tags: set[str] = set()
-    for sdoc in sdoc_collection.source_documents:
-        needed_tags.update(sdoc.tags)
     existing_tags = {tag.name: tag for tag in project.tags}
     for tag_name in needed_tags:
         if tag_name not in existing_tags:
@@ -131,10 +155,6 @@ def import_sdocs_to_proj(
             )
 
     # 4.1 Check if all parent folders exist
-    needed_parent_folders: set[str] = set()
-    for sdoc in sdoc_collection.source_documents:
-        if sdoc.folder_parent_name:
-            needed_parent_folders.add(sdoc.folder_parent_name)
     existing_folders = {
         folder.name
         for folder in project.folders
@@ -147,28 +167,23 @@ def import_sdocs_to_proj(
             )
 
     # 4.2 Check sdoc folders
-    sdoc_folder_names: set[str] = set()
-    for sdoc in sdoc_collection.source_documents:
-        sdoc_folder_names.add(sdoc.folder_name)
+    folder_id_by_name: dict[str, int] = {}
+    folder_type_by_name: dict[str, FolderType] = {}
+    for folder in crud_folder.read_by_project(db=db, proj_id=project_id):
+        if folder.name not in folder_id_by_name:
+            folder_id_by_name[folder.name] = folder.id
+            folder_type_by_name[folder.name] = folder.folder_type
     for sdoc_folder_name in sdoc_folder_names:
-        existing_folder = crud_folder.read_by_name_and_project(
-            db=db, folder_name=sdoc_folder_name, proj_id=project_id
-        )
+        existing_folder_type = folder_type_by_name.get(sdoc_folder_name)
         if (
-            existing_folder is not None
-            and existing_folder.folder_type != FolderType.NORMAL
+            existing_folder_type is not None
+            and existing_folder_type != FolderType.NORMAL
         ):
             error_messages.append(
                 f"Folder '{sdoc_folder_name}' is not a normal folder in project {project_id}"
             )
 
     # 5. Check if all metadata keys exist
-    needed_metadata_keys: dict[DocType, set[str]] = {}
-    for sdoc in sdoc_collection.source_documents:
-        for key, _ in sdoc.metadata:
-            if DocType(sdoc.doctype) not in needed_metadata_keys:
-                needed_metadata_keys[DocType(sdoc.doctype)] = set()
-            needed_metadata_keys[DocType(sdoc.doctype)].add(key)
     existing_metadata: dict[tuple[DocType, str], ProjectMetadataORM] = {}
     for metadata in project.metadata_:
         existing_metadata[(DocType(metadata.doctype), metadata.key)] = metadata
@@ -187,143 +202,250 @@ def import_sdocs_to_proj(
         )
         raise ImportSourceDocumentsError(errors=error_messages)
 
-    # Everything is valid, proceed with the import
-    imported_sdoc_ids = []
-    filename_to_id_map = {}
-    for sdoc_export in sdoc_collection.source_documents:
-        # 1. Move the source files to the project repository
-        source_file = source_file_by_name[sdoc_export.filename]
+    # Everything is valid, proceed with the import (chunk by chunk)
+    imported_sdoc_ids: list[int] = []
+    es_client = es.client
+    with (
+        WeaviateRepo().weaviate_session() as client,
+        SdocIndex.bulk_indexing(client=es_client, proj_id=project_id),
+    ):
+        for sdoc_exports in __iter_sdoc_exports(data_file=data_file, validate=False):
+            imported_sdoc_ids.extend(
+                __import_chunk(
+                    db=db,
+                    client=client,
+                    es_client=es_client,
+                    project_id=project_id,
+                    sdoc_exports=sdoc_exports,
+                    source_file_by_name=source_file_by_name,
+                    folder_id_by_name=folder_id_by_name,
+                    existing_tags=existing_tags,
+                    existing_metadata=existing_metadata,
+                )
+            )
+            status_message = (
+                f"Imported {len(imported_sdoc_ids)}/{len(filenames)} source documents"
+            )
+            logger.info(status_message)
+            if job is not None:
+                job.update(status_message=status_message)
+
+    logger.info(
+        f"Successfully imported {len(imported_sdoc_ids)} source documents into project {project_id}"
+    )
+    return imported_sdoc_ids
+
+
+def __iter_sdoc_exports(
+    data_file: Path, validate: bool
+) -> Iterator[list[SourceDocumentExportSchema]]:
+    """
+    Streams the source documents of the data file (Parquet, or CSV for older exports) in chunks of IMPORT_CHUNK_SIZE.
+    Without validation, the source documents are constructed as they are (they must have been validated before).
+    """
+    if data_file.suffix == ".parquet":
+        chunks = (
+            sdoc_export_records_from_arrow(batch)
+            for batch in pq.ParquetFile(data_file).iter_batches(
+                batch_size=IMPORT_CHUNK_SIZE
+            )
+        )
+    else:
+        chunks = (
+            sdoc_export_records_from_dataframe(df)
+            for df in pd.read_csv(data_file, chunksize=IMPORT_CHUNK_SIZE)
+        )
+
+    for records in chunks:
+        if validate:
+            yield [SourceDocumentExportSchema(**record) for record in records]
+        else:
+            yield [
+                SourceDocumentExportSchema.model_construct(**record)
+                for record in records
+            ]
+
+
+def __import_chunk(
+    db: Session,
+    client: WeaviateClient,
+    es_client: Elasticsearch,
+    project_id: int,
+    sdoc_exports: list[SourceDocumentExportSchema],
+    source_file_by_name: dict[str, Path],
+    folder_id_by_name: dict[str, int],
+    existing_tags: dict[str, TagORM],
+    existing_metadata: dict[tuple[DocType, str], ProjectMetadataORM],
+) -> list[int]:
+    # 1. Move the source files to the project repository
+    relative_urls: list[str] = []
+    for sdoc_export in sdoc_exports:
         repo_path = fsr.move_file_to_project_sdoc_files(
-            proj_id=project_id, src_file=source_file
+            proj_id=project_id, src_file=source_file_by_name[sdoc_export.filename]
         )
-        relative_url = str(repo_path.relative_to(fsr.root_dir))
+        relative_urls.append(str(repo_path.relative_to(fsr.root_dir)))
         # generate thumbnail if needed
         if DocType(sdoc_export.doctype) == DocType.image:
             generate_thumbnails(repo_path)
 
-        # 2.1 Create the sdoc folder (if it does not already exist)
-        sdoc_folder = crud_folder.read_by_name_and_project(
-            db=db, folder_name=sdoc_export.folder_name, proj_id=project_id
+    # 2.1 Create the sdoc folders (if they do not already exist)
+    new_folder_names = list(
+        dict.fromkeys(
+            sdoc_export.folder_name
+            for sdoc_export in sdoc_exports
+            if sdoc_export.folder_name not in folder_id_by_name
         )
-        if sdoc_folder is None:
-            sdoc_folder = crud_folder.create(
-                db=db,
-                create_dto=FolderCreate(
-                    name=sdoc_export.folder_name,
-                    project_id=project_id,
-                    folder_type=FolderType.SDOC_FOLDER,
-                ),
+    )
+    new_folder_ids = crud_folder.create_multi_ids(
+        db=db,
+        create_dtos=[
+            FolderCreate(
+                name=folder_name,
+                project_id=project_id,
+                folder_type=FolderType.SDOC_FOLDER,
             )
+            for folder_name in new_folder_names
+        ],
+    )
+    folder_id_by_name.update(zip(new_folder_names, new_folder_ids))
+
+    # 2.2 Create the source documents in the database, with the status set to success
+    sdoc_ids = crud_sdoc.create_multi_ids(
+        db=db,
+        create_dtos=[
+            SourceDocumentCreate(
+                filename=sdoc_export.filename,
+                name=sdoc_export.name or sdoc_export.filename,
+                doctype=DocType(sdoc_export.doctype),
+                project_id=project_id,
+                folder_id=folder_id_by_name[sdoc_export.folder_name],
+            )
+            for sdoc_export in sdoc_exports
+        ],
+        update_dtos=[
+            SourceDocumentUpdate(
+                **{
+                    step: sdoc_export.status
+                    for step in PROCESSING_JOBS[DocType(sdoc_export.doctype)]
+                },  # type: ignore
+            )
+            for sdoc_export in sdoc_exports
+        ],
+    )
 
-        # 2.2 Create the source documents in the database
-        sdoc_create = SourceDocumentCreate(
-            filename=sdoc_export.filename,
-            name=sdoc_export.name or sdoc_export.filename,
-            doctype=DocType(sdoc_export.doctype),
-            project_id=project_id,
-            folder_id=sdoc_folder.id,
-        )
-
-        # 2.3 Set the source document status to success
-        jobs = PROCESSING_JOBS[DocType(sdoc_export.doctype)]
-        sdoc_update = SourceDocumentUpdate(
-            **{job: sdoc_export.status for job in jobs},  # type: ignore
-        )
-
-        created_sdoc = crud_sdoc.create(db=db, create_dto=sdoc_create)
-        crud_sdoc.update(db=db, id=created_sdoc.id, update_dto=sdoc_update)
-        imported_sdoc_ids.append(created_sdoc.id)
-        filename_to_id_map[created_sdoc.filename] = created_sdoc.id
-
-        # 3. Create the source document data in the database
-        sdoc_data_create = SourceDocumentDataCreate(
-            id=created_sdoc.id,
-            repo_url=relative_url,
-            content=sdoc_export.content if sdoc_export.content else "",
-            html=sdoc_export.html,
-            raw_html=sdoc_export.raw_html,
-            token_starts=sdoc_export.token_starts,
-            token_ends=sdoc_export.token_ends,
-            sentence_starts=sdoc_export.sentence_starts,
-            sentence_ends=sdoc_export.sentence_ends,
-            token_time_starts=sdoc_export.token_time_starts,
-            token_time_ends=sdoc_export.token_time_ends,
-        )
-        crud_sdoc_data.create(db=db, create_dto=sdoc_data_create)
+    # 3. Create the source document data in the database
+    crud_sdoc_data.create_multi_ids(
+        db=db,
+        create_dtos=[
+            SourceDocumentDataCreate(
+                id=sdoc_id,
+                repo_url=relative_url,
+                content=sdoc_export.content if sdoc_export.content else "",
+                html=sdoc_export.html,
+                raw_html=sdoc_export.raw_html,
+                token_starts=sdoc_export.token_starts,
+                token_ends=sdoc_export.token_ends,
+                sentence_starts=sdoc_export.sentence_starts,
+                sentence_ends=sdoc_export.sentence_ends,
+                token_time_starts=sdoc_export.token_time_starts,
+                token_time_ends=sdoc_export.token_time_ends,
+            )
+            for sdoc_id, relative_url, sdoc_export in zip(
+                sdoc_ids, relative_urls, sdoc_exports
+            )
+        ],
+    )
 
-        # 4. Link the source documents with the attached data (tags, metadata, word frequencies)
-        # Tags
-        tag_ids = [existing_tags[tag_name].id for tag_name in sdoc_export.tags]
-        crud_tag.link_multiple_tags(db=db, sdoc_ids=[created_sdoc.id], tag_ids=tag_ids)
+    # 4. Link the source documents with the attached data (tags, metadata, word frequencies)
+    # Tags
+    crud_tag.link_tags_batch(
+        db=db,
+        links={
+            sdoc_id: [existing_tags[tag_name].id for tag_name in sdoc_export.tags]
+            for sdoc_id, sdoc_export in zip(sdoc_ids, sdoc_exports)
+        },
+    )
 
-        # Word frequencies
-        wf_create_dtos = [
-            WordFrequencyCreate(sdoc_id=created_sdoc.id, word=word, count=count)
+    # Word frequencies
+    crud_word_frequency.create_multi_copy(
+        db=db,
+        create_dtos=[
+            WordFrequencyCreate(sdoc_id=sdoc_id, word=word, count=count)
+            for sdoc_id, sdoc_export in zip(sdoc_ids, sdoc_exports)
             for word, count in sdoc_export.word_frequencies
-        ]
-        crud_word_frequency.create_multi(db=db, create_dtos=wf_create_dtos)
+        ],
+    )
 
-        # Metadata
-        metadata_create_dtos = []
+    # Metadata
+    metadata_create_dtos = []
+    for sdoc_id, sdoc_export in zip(sdoc_ids, sdoc_exports):
         for key, value in sdoc_export.metadata:
             # Find project metadata to get the ID
             project_metadata = existing_metadata[(DocType(sdoc_export.doctype), key)]
-
-            metadata_create = SourceDocumentMetadataCreate.with_metatype(
-                metatype=project_metadata.metatype,
-                source_document_id=created_sdoc.id,
-                project_metadata_id=project_metadata.id,
-                value=value,
-            )
-            metadata_create_dtos.append(metadata_create)
-        crud_sdoc_meta.create_multi(db=db, create_dtos=metadata_create_dtos)
-
-        # 5. Add embeddings to the vector database
-        with WeaviateRepo().weaviate_session() as client:
-            # Document embeddings
-            crud_document_embedding.add_embedding(
-                client=client,
-                project_id=project_id,
-                id=DocumentObjectIdentifier(sdoc_id=created_sdoc.id),
-                embedding=sdoc_export.document_embedding,
+            metadata_create_dtos.append(
+                SourceDocumentMetadataCreate.with_metatype(
+                    metatype=project_metadata.metatype,
+                    source_document_id=sdoc_id,
+                    project_metadata_id=project_metadata.id,
+                    value=value,
+                )
             )
+    crud_sdoc_meta.create_multi_ids(db=db, create_dtos=metadata_create_dtos)
+
+    # 5. Add the embeddings to the vector database, one batch per collection
+    # Document embeddings
+    crud_document_embedding.add_embedding_batch(
+        client=client,
+        project_id=project_id,
+        ids=[DocumentObjectIdentifier(sdoc_id=sdoc_id) for sdoc_id in sdoc_ids],
+        embeddings=[sdoc_export.document_embedding for sdoc_export in sdoc_exports],
+    )
 
-            # Sentence embeddings
-            crud_sentence_embedding.add_embedding_batch(
-                client=client,
-                project_id=project_id,
-                ids=[
-                    SentenceObjectIdentifier(sdoc_id=created_sdoc.id, sentence_id=i)
-                    for i in range(len(sdoc_export.sentence_embeddings))
-                ],
-                embeddings=[se for se in sdoc_export.sentence_embeddings],
+    # Sentence embeddings
+    sentence_ids: list[SentenceObjectIdentifier] = []
+    sentence_embeddings: list[list[float]] = []
+    for sdoc_id, sdoc_export in zip(sdoc_ids, sdoc_exports):
+        for i, sentence_embedding in enumerate(sdoc_export.sentence_embeddings):
+            sentence_ids.append(
+                SentenceObjectIdentifier(sdoc_id=sdoc_id, sentence_id=i)
             )
+            sentence_embeddings.append(sentence_embedding)
+    if len(sentence_ids) > 0:
+        crud_sentence_embedding.add_embedding_batch(
+            client=client,
+            project_id=project_id,
+            ids=sentence_ids,
+            embeddings=sentence_embeddings,
+        )
 
-            # Image embedding
-            if (
-                sdoc_export.image_embedding is not None
-                and DocType(sdoc_export.doctype) == DocType.image
-            ):
-                crud_image_embedding.add_embedding(
-                    client=client,
-                    project_id=project_id,
-                    id=ImageObjectIdentifier(sdoc_id=created_sdoc.id),
-                    embedding=sdoc_export.image_embedding,
-                )
+    # Image embeddings
+    images = [
+        (sdoc_id, sdoc_export.image_embedding)
+        for sdoc_id, sdoc_export in zip(sdoc_ids, sdoc_exports)
+        if sdoc_export.image_embedding is not None
+        and DocType(sdoc_export.doctype) == DocType.image
+    ]
+    if len(images) > 0:
+        crud_image_embedding.add_embedding_batch(
+            client=client,
+            project_id=project_id,
+            ids=[ImageObjectIdentifier(sdoc_id=sdoc_id) for sdoc_id, _ in images],
+            embeddings=[image_embedding for _, image_embedding in images],
+        )
 
-        # 6. Add the source documents to the Elasticsearch index
-        crud_elastic_sdoc.create(
-            client=ElasticSearchRepo().client,
-            proj_id=project_id,
-            create_dto=ElasticSearchDocumentCreate(
+    # 6. Add the source documents to the Elasticsearch index in bulk
+    crud_elastic_sdoc.create_multi(
+        client=es_client,
+        create_dtos=(
+            ElasticSearchDocumentCreate(
                 project_id=project_id,
-                sdoc_id=created_sdoc.id,
-                filename=created_sdoc.filename,
+                sdoc_id=sdoc_id,
+                filename=sdoc_export.filename,
                 content=sdoc_export.content if sdoc_export.content else "",
-            ),
-        )
-
-    logger.info(
-        f"Successfully imported {len(imported_sdoc_ids)} source documents into project {project_id}"
+            )
+            for sdoc_id, sdoc_export in zip(sdoc_ids, sdoc_exports)
+        ),
+        proj_id=project_id,
     )
-    return imported_sdoc_ids
+
+    return sdoc_ids
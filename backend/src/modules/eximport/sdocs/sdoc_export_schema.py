@@ -1,9 +1,125 @@
+from typing import Any
+
 import pandas as pd
+import pyarrow as pa
+import srsly
 from pydantic import BaseModel, Field, field_validator
 
 from common.doc_type import DocType
 from common.sdoc_status_enum import SDocStatus
 
+# Parquet schema of the source document export data, see SourceDocumentExportSchema.
+# Embeddings are stored as native float32 lists, (word, count) and (key, value) pairs as structs.
+# Metadata values have different types, so they are stored JSON encoded.
+SDOC_EXPORT_ARROW_SCHEMA = pa.schema(
+    [
+        ("filename", pa.string()),
+        ("name", pa.string()),
+        ("doctype", pa.string()),
+        ("status", pa.int32()),
+        ("folder_name", pa.string()),
+        ("folder_parent_name", pa.string()),
+        ("tags", pa.list_(pa.string())),
+        (
+            "word_frequencies",
+            pa.list_(pa.struct([("word", pa.string()), ("count", pa.int64())])),
+        ),
+        (
+            "metadata",
+            pa.list_(pa.struct([("key", pa.string()), ("value", pa.string())])),
+        ),
+        ("content", pa.large_string()),
+        ("html", pa.large_string()),
+        ("raw_html", pa.large_string()),
+        ("token_starts", pa.list_(pa.int32())),
+        ("token_ends", pa.list_(pa.int32())),
+        ("sentence_starts", pa.list_(pa.int32())),
+        ("sentence_ends", pa.list_(pa.int32())),
+        ("token_time_starts", pa.list_(pa.int32())),
+        ("token_time_ends", pa.list_(pa.int32())),
+        ("document_embedding", pa.list_(pa.float32())),
+        ("image_embedding", pa.list_(pa.float32())),
+        ("sentence_embeddings", pa.list_(pa.list_(pa.float32()))),
+    ]
+)
+
+
+def sdoc_export_arrow_row(
+    *,
+    word_frequencies: list[tuple[str, int]],
+    metadata: list[tuple[str, Any]],
+    **values: Any,
+) -> dict[str, Any]:
+    """
+    Returns a row of the SDOC_EXPORT_ARROW_SCHEMA.
+    Embeddings can be passed as (lists of) numpy arrays, so that they are converted without python floats.
+    """
+    return {
+        **values,
+        "word_frequencies": [
+            {"word": word, "count": count} for word, count in word_frequencies
+        ],
+        "metadata": [
+            {"key": key, "value": srsly.json_dumps(value)} for key, value in metadata
+        ],
+    }
+
+
+def sdoc_export_records_from_arrow(
+    table: pa.Table | pa.RecordBatch,
+) -> list[dict[str, Any]]:
+    """
+    Converts a table of the SDOC_EXPORT_ARROW_SCHEMA to records of the SourceDocumentExportSchema.
+    The table may contain only some of the columns.
+    """
+    records = table.to_pylist()
+    for record in records:
+        if "word_frequencies" in record:
+            record["word_frequencies"] = [
+                (wf["word"], wf["count"]) for wf in record["word_frequencies"]
+            ]
+        if "metadata" in record:
+            record["metadata"] = [
+                (m["key"], srsly.json_loads(m["value"])) for m in record["metadata"]
+            ]
+    return records
+
+
+def sdoc_export_records_from_dataframe(df: pd.DataFrame) -> list[dict[str, Any]]:
+    """
+    Converts a DataFrame of the (legacy) CSV export to records of the SourceDocumentExportSchema.
+    The DataFrame may contain only some of the columns.
+    """
+    # Replace NaN values with None before converting to dict
+    df_cleaned = df.replace({pd.NA: None, float("nan"): None, "nan": None})
+    records = df_cleaned.to_dict("records")
+
+    # Process each record to convert string representations back to Python objects
+    for record in records:
+        # Convert string representations of lists and tuples back to Python objects
+        for field in [
+            "tags",
+            "token_starts",
+            "token_ends",
+            "sentence_starts",
+            "sentence_ends",
+            "document_embedding",
+            "sentence_embeddings",
+            "image_embedding",
+            "token_time_starts",
+            "token_time_ends",
+            "word_frequencies",
+            "metadata",
+        ]:
+            if field in record and isinstance(record[field], str):
+                try:
+                    # Safe evaluation of string representation to Python object
+                    record[field] = eval(record[field])
+                except (SyntaxError, NameError, ValueError):
+                    # If eval fails, keep as is - validation will catch it later
+                    pass
+    return records
+
 
 class SourceDocumentExportSchema(BaseModel):
     """Schema definition for source document info export/import operations."""
@@ -240,40 +356,9 @@ class SourceDocumentExportCollection(BaseModel):
     @classmethod
     def from_dataframe(cls, df: pd.DataFrame) -> "SourceDocumentExportCollection":
         """Convert a DataFrame to a SourceDocumentExportCollection."""
-        # Replace NaN values with None before converting to dict
-        df_cleaned = df.replace({pd.NA: None, float("nan"): None, "nan": None})
-        records = df_cleaned.to_dict("records")
-
-        # Process each record to convert string representations back to Python objects
-        processed_records = []
-        for record in records:
-            # Convert string representations of lists and tuples back to Python objects
-            for field in [
-                "tags",
-                "token_starts",
-                "token_ends",
-                "sentence_starts",
-                "sentence_ends",
-                "document_embedding",
-                "sentence_embeddings",
-                "image_embedding",
-                "token_time_starts",
-                "token_time_ends",
-                "word_frequencies",
-                "metadata",
-            ]:
-                if field in record and isinstance(record[field], str):
-                    try:
-                        # Safe evaluation of string representation to Python object
-                        record[field] = eval(record[field])
-                    except (SyntaxError, NameError, ValueError):
-                        # If eval fails, keep as is - validation will catch it later
-                        pass
-
-            processed_records.append(record)
-
         source_documents = [
-            SourceDocumentExportSchema(**record) for record in processed_records
+            SourceDocumentExportSchema(**record)
+            for record in sdoc_export_records_from_dataframe(df)
         ]  # type: ignore
         return cls(source_documents=source_documents)
 
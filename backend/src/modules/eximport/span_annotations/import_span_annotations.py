@@ -150,11 +150,10 @@ def import_span_annotations_to_proj(
         )
 
     # we can bulk create the annotations
-    created_annos = crud_span_anno.create_multi(
+    imported_anno_ids = crud_span_anno.create_multi_ids(
         db=db,
         create_dtos=create_dtos,
     )
-    imported_anno_ids = [anno.id for anno in created_annos]
 
     logger.info(
         f"Successfully imported {len(imported_anno_ids)} span annotations into project {project_id}"
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.auth.authz_user import AuthzUser
 from modules.llm_assistant.llm_job_dto import (
     ApproachRecommendation,
@@ -13,7 +13,7 @@ from modules.llm_assistant.llm_job_dto import (
 from modules.llm_assistant.llm_service import LLMAssistantService
 
 router = APIRouter(
-    prefix="/llm", dependencies=[Depends(get_current_user)], tags=["llm"]
+    prefix="/llm", dependencies=[Depends(get_current_principal)], tags=["llm"]
 )
 
 llms: LLMAssistantService = LLMAssistantService()
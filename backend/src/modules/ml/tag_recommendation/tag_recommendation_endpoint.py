@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.auth.authz_user import AuthzUser
 from core.tag.tag_crud import crud_tag
 from modules.ml.tag_recommendation.tag_recommendation_crud import (
@@ -23,7 +23,7 @@ dcs: DocumentClassificationService = DocumentClassificationService()
 
 router = APIRouter(
     prefix="/tagrecommendation",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
     tags=["TagRecommendation"],
 )
 
@@ -119,14 +119,15 @@ class DocumentClassificationService(metaclass=SingletonMeta):
 
         # suggest
         hits: list[SimSearchDocumentHit] = []
-        for sdoc_id in pos_sdoc_ids:
-            search_result = crud_document_embedding.search_near_sdoc(
-                client=client,
-                project_id=proj_id,
-                sdoc_id=sdoc_id,
-                k=top_k,
-                threshold=0.0,
-            )
+        pos_sdoc_ids_list = list(pos_sdoc_ids)
+        search_results = crud_document_embedding.search_near_sdocs(
+            client=client,
+            project_id=proj_id,
+            sdoc_ids=pos_sdoc_ids_list,
+            k=top_k,
+            threshold=0.0,
+        )
+        for sdoc_id, search_result in zip(pos_sdoc_ids_list, search_results):
             hits.extend(
                 [
                     SimSearchDocumentHit(
@@ -145,18 +146,18 @@ class DocumentClassificationService(metaclass=SingletonMeta):
                 hits, key=lambda x: (x.sdoc_id, x.compared_sdoc_id)
             )
         if len(neg_sdoc_ids) > 0:
-            candidates = {h.sdoc_id for h in hits}
+            candidates = list({h.sdoc_id for h in hits})
 
             # suggest
             nearest: list[SimSearchDocumentHit] = []
-            for sdoc_id in candidates:
-                search_result = crud_document_embedding.search_near_sdoc(
-                    client=client,
-                    project_id=proj_id,
-                    sdoc_id=sdoc_id,
-                    k=1,
-                    threshold=0.0,
-                )
+            search_results = crud_document_embedding.search_near_sdocs(
+                client=client,
+                project_id=proj_id,
+                sdoc_ids=candidates,
+                k=1,
+                threshold=0.0,
+            )
+            for sdoc_id, search_result in zip(candidates, search_results):
                 nearest.extend(
                     [
                         SimSearchDocumentHit(
@@ -249,19 +250,17 @@ class DocumentClassificationService(metaclass=SingletonMeta):
         )
         sdoc_ids_to_classify = [sdoc.id for sdoc in sdocs_without_tags]
 
-        nns: list[list[SimSearchResult[DocumentObjectIdentifier]]] = []
-
-        for sdoc_id in sdoc_ids_to_classify:
-            # 1. Find k-nearest neighbors for the current sdoc_id
-            result = crud_document_embedding.search_near_sdoc(
+        # 1. Find k-nearest neighbors for all sdoc_ids to classify
+        nns: list[list[SimSearchResult[DocumentObjectIdentifier]]] = (
+            crud_document_embedding.search_near_sdocs(
                 client=client,
                 project_id=project_id,
-                sdoc_id=sdoc_id,
+                sdoc_ids=sdoc_ids_to_classify,
                 k=5,
                 threshold=0.0,
-                sdoc_ids=list(sdoc_ids),
+                filter_sdoc_ids=list(sdoc_ids),
             )
-            nns.append(result)
+        )
 
         for nn, sdoc in zip(nns, sdoc_ids_to_classify):
             pairs = [
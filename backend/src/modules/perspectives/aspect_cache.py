@@ -0,0 +1,180 @@
+import hashlib
+import os
+from typing import Any
+
+import joblib
+import numpy as np
+from loguru import logger
+
+from modules.perspectives.aspect_dto import PipelineSettings
+from repos.filesystem_repo import FilesystemRepo
+
+
+def _hash(*parts: Any) -> str:
+    return hashlib.blake2b(
+        "\x00".join(str(p) for p in parts).encode("utf-8"), digest_size=8
+    ).hexdigest()
+
+
+class AspectCache:
+    """
+    On-disk cache of the intermediate results of the perspectives clustering pipeline of one aspect:
+    - the document embeddings (per embedding model), so that re-clustering does not need to fetch them from Weaviate
+    - the UMAP reducer and the reduced embeddings (per embedding model, UMAP settings and document set),
+      so that re-clustering with different HDBSCAN settings does not need to refit UMAP
+    - the fitted vectorizer and bag-of-words rows of the c-TF-IDF computation (per cluster)
+
+    Arrays are stored as .npy files and loaded memory-mapped.
+    Every array is stored together with the sdoc ids of its rows.
+    """
+
+    def __init__(self, project_id: int, aspect_id: int):
+        self.cache_dir = FilesystemRepo().get_model_dir(
+            proj_id=project_id,
+            model_prefix="cache_",
+            model_name=f"aspect_{aspect_id}",
+        )
+
+    def clear(self) -> None:
+        FilesystemRepo().remove_dir(self.cache_dir)
+
+    def _save_array(self, name: str, sdoc_ids: list[int], array: np.ndarray) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for suffix, data in [("ids", np.asarray(sdoc_ids)), ("data", array)]:
+            path = self.cache_dir / f"{name}.{suffix}.npy"
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                np.save(f, data)
+            os.replace(tmp_path, path)
+
+    def _load_array(self, name: str) -> tuple[np.ndarray, np.ndarray] | None:
+        ids_path = self.cache_dir / f"{name}.ids.npy"
+        data_path = self.cache_dir / f"{name}.data.npy"
+        if not ids_path.exists() or not data_path.exists():
+            return None
+        try:
+            return np.load(ids_path), np.load(data_path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load cached {name} of {self.cache_dir}: {e}")
+            return None
+
+    @staticmethod
+    def _select_rows(
+        cached: tuple[np.ndarray, np.ndarray], sdoc_ids: list[int]
+    ) -> np.ndarray | None:
+        """Returns the rows of the given sdoc ids (in this order) or None if any is missing"""
+        cached_ids, data = cached
+        sdoc_id2row = {int(sdoc_id): row for row, sdoc_id in enumerate(cached_ids)}
+        rows = [sdoc_id2row.get(sdoc_id) for sdoc_id in sdoc_ids]
+        if any(row is None for row in rows):
+            return None
+        return np.asarray(data[rows])
+
+    # --- EMBEDDINGS --- #
+
+    def _embeddings_name(self, embedding_model: str | None) -> str:
+        return f"embeddings_{_hash(embedding_model)}"
+
+    def store_embeddings(
+        self,
+        embedding_model: str | None,
+        sdoc_ids: list[int],
+        embeddings: np.ndarray,
+        replace: bool,
+        invalidate_reduced: bool = True,
+    ) -> None:
+        """
+        Stores the embeddings of the given documents.
+        If replace is False, the embeddings are merged with the already cached embeddings.
+        If the embeddings were (re-)computed, all reduced embeddings must be invalidated,
+        because they were computed from the old embeddings.
+        """
+        name = self._embeddings_name(embedding_model)
+        cached = None if replace else self._load_array(name)
+        if cached is not None:
+            cached_ids, data = cached
+            new_ids = set(sdoc_ids)
+            keep = [i for i, sdoc_id in enumerate(cached_ids) if sdoc_id not in new_ids]
+            sdoc_ids = [int(cached_ids[i]) for i in keep] + list(sdoc_ids)
+            embeddings = np.concatenate([np.asarray(data[keep]), embeddings])
+
+        if invalidate_reduced:
+            self.invalidate_reduced_embeddings()
+        self._save_array(name, sdoc_ids, embeddings)
+
+    def load_embeddings(
+        self, embedding_model: str | None, sdoc_ids: list[int]
+    ) -> np.ndarray | None:
+        cached = self._load_array(self._embeddings_name(embedding_model))
+        if cached is None:
+            return None
+        return self._select_rows(cached, sdoc_ids)
+
+    # --- REDUCED EMBEDDINGS --- #
+
+    def _reduced_name(
+        self, embedding_model: str | None, settings: PipelineSettings, scope: str
+    ) -> str:
+        return "reduced_" + _hash(
+            embedding_model,
+            settings.umap_n_neighbors,
+            settings.umap_n_components,
+            settings.umap_min_dist,
+            settings.umap_metric,
+            scope,
+        )
+
+    def invalidate_reduced_embeddings(self) -> None:
+        if not self.cache_dir.exists():
+            return
+        for path in self.cache_dir.glob("reduced_*"):
+            path.unlink(missing_ok=True)
+
+    def store_reduced_embeddings(
+        self,
+        embedding_model: str | None,
+        settings: PipelineSettings,
+        scope: str,
+        sdoc_ids: list[int],
+        reducer: Any,
+        reduced_embeddings: np.ndarray,
+    ) -> None:
+        name = self._reduced_name(embedding_model, settings, scope)
+        self._save_array(name, sdoc_ids, reduced_embeddings)
+        joblib.dump(reducer, self.cache_dir / f"{name}.reducer.joblib")
+
+    def load_reduced_embeddings(
+        self,
+        embedding_model: str | None,
+        settings: PipelineSettings,
+        scope: str,
+    ) -> tuple[Any, np.ndarray, np.ndarray] | None:
+        """Returns the fitted reducer, the sdoc ids and the reduced embeddings"""
+        name = self._reduced_name(embedding_model, settings, scope)
+        reducer_path = self.cache_dir / f"{name}.reducer.joblib"
+        cached = self._load_array(name)
+        if cached is None or not reducer_path.exists():
+            return None
+        return joblib.load(reducer_path), cached[0], cached[1]
+
+    # --- C-TF-IDF --- #
+
+    def store_ctfidf(self, ctfidf_cache: dict[str, Any]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / "ctfidf.joblib"
+        tmp_path = path.with_suffix(".tmp")
+        joblib.dump(ctfidf_cache, tmp_path)
+        os.replace(tmp_path, path)
+
+    def load_ctfidf(self) -> dict[str, Any] | None:
+        path = self.cache_dir / "ctfidf.joblib"
+        if not path.exists():
+            return None
+        return joblib.load(path)
+
+
+def reduction_scope(sdoc_ids: list[int] | None) -> str:
+    """The UMAP reduction of all documents can be extended, reductions of subsets (e.g. splits) are keyed by the subset"""
+    if sdoc_ids is None or len(sdoc_ids) == 0:
+        return "all"
+    return "subset_" + _hash(*sorted(sdoc_ids))
@@ -1,9 +1,12 @@
+from typing import Generator
+
 from weaviate import WeaviateClient
 from weaviate.classes.query import Filter
 
 from modules.perspectives.aspect_collection import AspectCollection
 from modules.perspectives.aspect_embedding_dto import AspectObjectIdentifier
 from repos.vector.embedding_crud_base import CRUDBase
+from repos.vector.weaviate_models import EmbeddingBlock
 from systems.event_system.events import source_document_deleted
 
 
@@ -49,6 +52,22 @@ class CRUDAspectEmbedding(CRUDBase[AspectObjectIdentifier, AspectCollection]):
 
     ### OTHER OPERATIONS ###
 
+    def iter_embeddings_by_aspect(
+        self, client: WeaviateClient, project_id: int, aspect_id: int
+    ) -> Generator[EmbeddingBlock[AspectObjectIdentifier], None, None]:
+        """
+        Iterate over all document aspect embeddings of a certain Aspect in blocks
+        :param project_id: The project ID
+        :param aspect_id: The Aspect ID
+        """
+        return self.iter_embeddings(
+            client=client,
+            project_id=project_id,
+            filters=Filter.by_property(
+                self.collection_class.properties["aspect_id"].name
+            ).equal(aspect_id),
+        )
+
     def search_near_vector_in_aspect(
         self,
         client: WeaviateClient,
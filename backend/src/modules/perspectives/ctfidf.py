@@ -124,3 +124,31 @@ class ClassTfidfTransformer(TfidfTransformer):
             X = X * self._idf_diag
 
         return X
+
+
+def top_k_per_row(X: sp.csr_matrix, k: int) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Find the top-k columns of each row of a sparse matrix without densifying it.
+
+    Arguments:
+        X: A sparse (c-TF-IDF) matrix
+        k: The number of columns to return per row
+
+    Returns:
+        A (column indices, values) tuple per row, sorted by value descending.
+        Ties are broken by the column index (ascending).
+        Rows with less than k non-zero values return less than k columns.
+    """
+    X = sp.csr_matrix(X)
+    result: list[tuple[np.ndarray, np.ndarray]] = []
+    for i in range(X.shape[0]):
+        start, end = X.indptr[i], X.indptr[i + 1]
+        data = X.data[start:end]
+        indices = X.indices[start:end]
+        if len(data) > k:
+            # keep all values >= the k-th largest value, so that ties at the boundary are resolved by the sort
+            candidates = np.flatnonzero(data >= np.partition(data, -k)[-k])
+        else:
+            candidates = np.arange(len(data))
+        topk_idx = candidates[np.lexsort((indices[candidates], -data[candidates]))][:k]
+        result.append((indices[topk_idx], data[topk_idx]))
+    return result
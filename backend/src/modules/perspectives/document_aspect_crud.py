@@ -1,4 +1,3 @@
-from fastapi.encoders import jsonable_encoder
 from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session
 
@@ -199,22 +198,10 @@ class CRUDDocumentAspect(
     ) -> list[DocumentAspectORM]:
         """
         Update multiple DocumentAspectORMs by a list of (sdoc_id, aspect_id) tuples and corresponding update DTOs.
+        The rows are updated with UPDATE ... FROM unnest (see update_multi_values).
         """
-        if len(ids) != len(update_dtos):
-            raise ValueError(
-                f"The number of IDs and Update DTO objects must equal! {len(ids)} IDs and {len(update_dtos)} Update DTOs received."
-            )
-        db_objects = self.read_by_ids(db, ids)
-
-        for db_obj, update_dto in zip(db_objects, update_dtos):
-            obj_data = jsonable_encoder(db_obj.as_dict())
-            update_data = update_dto.model_dump(exclude_unset=True)
-            for field in obj_data:
-                if field in update_data:
-                    setattr(db_obj, field, update_data[field])
-        db.add_all(db_objects)
-        db.flush()
-        return db_objects
+        self.update_multi_values_from_dtos(db, ids=ids, update_dtos=update_dtos)
+        return self.read_by_ids(db, ids)
 
 
 crud_document_aspect = CRUDDocumentAspect(DocumentAspectORM)
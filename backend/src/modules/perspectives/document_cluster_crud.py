@@ -131,22 +131,23 @@ class CRUDDocumentCluster(
     ) -> list[DocumentClusterORM]:
         """
         Update multiple DocumentClusterORMs by a list of (sdoc_id, cluster_id) tuples and corresponding update DTOs.
+        The rows are updated with UPDATE ... FROM unnest (see update_multi_values).
+        Returns the updated objects, identified by their new cluster_id if it was updated.
         """
-        if len(ids) != len(update_dtos):
-            raise ValueError(
-                f"The number of IDs and Update DTO objects must equal! {len(ids)} IDs and {len(update_dtos)} Update DTOs received."
-            )
-        db_objects = self.read_by_ids(db, ids)
-
-        for db_obj, update_dto in zip(db_objects, update_dtos):
-            obj_data = jsonable_encoder(db_obj.as_dict())
-            update_data = update_dto.model_dump(exclude_unset=True)
-            for field in obj_data:
-                if field in update_data:
-                    setattr(db_obj, field, update_data[field])
-        db.add_all(db_objects)
-        db.flush()
-        return db_objects
+        self.update_multi_values_from_dtos(db, ids=ids, update_dtos=update_dtos)
+        return self.read_by_ids(
+            db,
+            [
+                (
+                    sdoc_id,
+                    update_dto.cluster_id
+                    if "cluster_id" in update_dto.model_fields_set
+                    and update_dto.cluster_id is not None
+                    else cluster_id,
+                )
+                for (sdoc_id, cluster_id), update_dto in zip(ids, update_dtos)
+            ],
+        )
 
     ### OTHER OPERATIONS ###
 
@@ -4,10 +4,15 @@ from sqlalchemy.orm import Session
 from weaviate import WeaviateClient
 
 from common.crud_enum import Crud
-from common.dependencies import get_current_user, get_db_session, get_weaviate_session
+from common.dependencies import (
+    get_current_principal,
+    get_db_session,
+    get_weaviate_session,
+)
 from common.job_type import JobType
 from core.auth.authz_user import AuthzUser
 from core.project.project_crud import crud_project
+from modules.perspectives.aspect_cache import AspectCache
 from modules.perspectives.aspect_crud import crud_aspect
 from modules.perspectives.aspect_dto import (
     AspectCreate,
@@ -46,7 +51,7 @@ from systems.search_system.sorting import Sort
 
 router = APIRouter(
     prefix="/perspectives",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
     tags=["perspectives"],
 )
 
@@ -254,6 +259,7 @@ def remove_aspect_by_id(
     crud_aspect_embedding.delete_embeddings_by_aspect(
         client=weaviate, project_id=aspect.project_id, aspect_id=aspect_id
     )
+    AspectCache(project_id=aspect.project_id, aspect_id=aspect_id).clear()
     db_obj = crud_aspect.delete(db=db, id=aspect_id)
     return AspectRead.model_validate(db_obj)
 
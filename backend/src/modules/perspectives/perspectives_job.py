@@ -13,6 +13,7 @@ sqlr = SQLRepo()
     device="gpu",
     result_ttl=JobTiming.INFINITY,
     timeout=JobTiming.ONE_DAY,
+    preload_modules=["modules.perspectives.perspectives_service"],
 )
 def perspectives_job(payload: PerspectivesJobInput, job: Job) -> None:
     from modules.perspectives.perspectives_service import PerspectivesService
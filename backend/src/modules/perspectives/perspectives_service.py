@@ -1,3 +1,4 @@
+import hashlib
 import re
 from collections import Counter, defaultdict
 from datetime import datetime
@@ -6,6 +7,7 @@ from typing import Callable
 import joblib
 import matplotlib.pyplot as plt
 import numpy as np
+import scipy.sparse as sp
 from hdbscan import HDBSCAN
 from loguru import logger
 from matplotlib.axes import Axes
@@ -19,6 +21,7 @@ from weaviate import WeaviateClient
 from common.doc_type import DocType
 from core.doc.source_document_crud import crud_sdoc
 from core.doc.source_document_dto import SourceDocumentRead
+from modules.perspectives.aspect_cache import AspectCache, reduction_scope
 from modules.perspectives.aspect_crud import crud_aspect
 from modules.perspectives.aspect_dto import AspectRead, AspectUpdateIntern
 from modules.perspectives.aspect_embedding_crud import crud_aspect_embedding
@@ -27,17 +30,15 @@ from modules.perspectives.cluster_crud import crud_cluster
 from modules.perspectives.cluster_dto import ClusterCreateIntern, ClusterUpdateIntern
 from modules.perspectives.cluster_embedding_crud import crud_cluster_embedding
 from modules.perspectives.cluster_embedding_dto import ClusterObjectIdentifier
-from modules.perspectives.ctfidf import ClassTfidfTransformer
+from modules.perspectives.ctfidf import ClassTfidfTransformer, top_k_per_row
 from modules.perspectives.document_aspect_crud import crud_document_aspect
 from modules.perspectives.document_aspect_dto import (
     DocumentAspectCreate,
-    DocumentAspectUpdate,
 )
 from modules.perspectives.document_aspect_orm import DocumentAspectORM
 from modules.perspectives.document_cluster_crud import crud_document_cluster
 from modules.perspectives.document_cluster_dto import (
     DocumentClusterCreate,
-    DocumentClusterUpdate,
 )
 from modules.perspectives.document_cluster_orm import DocumentClusterORM
 from modules.perspectives.perspectives_job_dto import (
@@ -62,6 +63,7 @@ from modules.perspectives.prompt_embedder import (
 )
 from repos.filesystem_repo import FilesystemRepo
 from repos.llm_repo import LLMMessage, LLMRepo
+from repos.vector.embedding_crud_base import ITER_PAGE_SIZE
 from repos.vector.weaviate_repo import WeaviateRepo
 from systems.job_system.job_dto import Job
 
@@ -452,17 +454,25 @@ class PerspectivesService:
                 embeddings=embeddings,
             )
 
+            # Cache the embeddings for re-clustering
+            AspectCache(
+                project_id=aspect.project_id, aspect_id=aspect.id
+            ).store_embeddings(
+                aspect.embedding_model,
+                [da.sdoc_id for da in doc_aspects],
+                np.array(embeddings),
+                replace=sdoc_ids is None or len(sdoc_ids) == 0,
+            )
+
             # Store coordinates in the DB
-            crud_document_aspect.update_multi(
+            coords_arr = np.asarray(coords, dtype=np.float64)
+            crud_document_aspect.update_multi_values(
                 db=db,
                 ids=[(da.sdoc_id, da.aspect_id) for da in doc_aspects],
-                update_dtos=[
-                    DocumentAspectUpdate(
-                        x=float(coord[0]),
-                        y=float(coord[1]),
-                    )
-                    for coord in coords
-                ],
+                values_by_column={
+                    "x": coords_arr[:, 0].tolist(),
+                    "y": coords_arr[:, 1].tolist(),
+                },
             )
             self._log_status_msg(
                 f"Stored embeddings and coordinates for {len(doc_aspects)} document aspects."
@@ -499,6 +509,148 @@ class PerspectivesService:
 
         return final_mapping
 
+    def __read_embeddings(
+        self,
+        client: WeaviateClient,
+        cache: AspectCache,
+        aspect_dto: AspectRead,
+        sdoc_ids: list[int],
+    ) -> np.ndarray:
+        """Reads the embeddings of the given documents from the cache, falling back to Weaviate"""
+        embeddings = cache.load_embeddings(aspect_dto.embedding_model, sdoc_ids)
+        if embeddings is not None:
+            self._log_status_msg(f"Loaded {len(sdoc_ids)} cached embeddings.")
+            return embeddings
+
+        if len(sdoc_ids) <= ITER_PAGE_SIZE:
+            embeddings = np.array(
+                crud_aspect_embedding.get_embeddings(
+                    client=client,
+                    project_id=aspect_dto.project_id,
+                    ids=[
+                        AspectObjectIdentifier(aspect_id=aspect_dto.id, sdoc_id=sdoc_id)
+                        for sdoc_id in sdoc_ids
+                    ],
+                )
+            )
+        else:
+            # stream all embeddings of the aspect block by block
+            blocks = list(
+                crud_aspect_embedding.iter_embeddings_by_aspect(
+                    client=client,
+                    project_id=aspect_dto.project_id,
+                    aspect_id=aspect_dto.id,
+                )
+            )
+            all_sdoc_ids = [id.sdoc_id for block in blocks for id in block.ids]
+            all_embeddings = np.concatenate([block.embeddings for block in blocks])
+            del blocks
+            sdoc_id2row = {sdoc_id: row for row, sdoc_id in enumerate(all_sdoc_ids)}
+            missing = [sdoc_id for sdoc_id in sdoc_ids if sdoc_id not in sdoc_id2row]
+            if len(missing) > 0:
+                raise ValueError(
+                    f"Aspect {aspect_dto.id} has no embeddings for {len(missing)} documents, e.g. {missing[:5]}"
+                )
+            embeddings = all_embeddings[[sdoc_id2row[sdoc_id] for sdoc_id in sdoc_ids]]
+
+        # the embeddings did not change, so the cached reductions stay valid
+        cache.store_embeddings(
+            aspect_dto.embedding_model,
+            sdoc_ids,
+            embeddings,
+            replace=False,
+            invalidate_reduced=False,
+        )
+        self._log_status_msg(f"Fetched {len(sdoc_ids)} embeddings from Weaviate.")
+        return embeddings
+
+    def __reduce_embeddings(
+        self,
+        client: WeaviateClient,
+        aspect_dto: AspectRead,
+        sdoc_ids: list[int],
+        scope: str,
+    ) -> np.ndarray:
+        """
+        Reduces the dimensionality of the document embeddings with UMAP.
+        The fitted reducer and the reduced embeddings are cached per embedding model, UMAP settings and scope.
+        If the cached reduction of all documents lacks some documents, they are transformed with the cached reducer.
+        :return: The reduced embeddings in the order of the given sdoc_ids
+        """
+        settings = aspect_dto.pipeline_settings
+        cache = AspectCache(project_id=aspect_dto.project_id, aspect_id=aspect_dto.id)
+
+        cached = cache.load_reduced_embeddings(
+            aspect_dto.embedding_model, settings, scope
+        )
+        if cached is not None:
+            reducer, cached_sdoc_ids, cached_reduced = cached
+            sdoc_id2row = {
+                int(sdoc_id): row for row, sdoc_id in enumerate(cached_sdoc_ids)
+            }
+            missing_sdoc_ids = [
+                sdoc_id for sdoc_id in sdoc_ids if sdoc_id not in sdoc_id2row
+            ]
+            if len(missing_sdoc_ids) == 0:
+                self._log_status_msg(
+                    f"Reusing the cached UMAP reduction of {len(sdoc_ids)} embeddings."
+                )
+                return np.asarray(
+                    cached_reduced[[sdoc_id2row[sdoc_id] for sdoc_id in sdoc_ids]]
+                )
+
+            if scope == "all":
+                self._log_status_msg(
+                    f"Transforming {len(missing_sdoc_ids)} new embeddings with the cached UMAP model..."
+                )
+                new_reduced = np.array(
+                    reducer.transform(
+                        self.__read_embeddings(
+                            client, cache, aspect_dto, missing_sdoc_ids
+                        )
+                    )
+                )
+                all_sdoc_ids = [
+                    int(sdoc_id) for sdoc_id in cached_sdoc_ids
+                ] + missing_sdoc_ids
+                all_reduced = np.concatenate([np.asarray(cached_reduced), new_reduced])
+                cache.store_reduced_embeddings(
+                    aspect_dto.embedding_model,
+                    settings,
+                    scope,
+                    all_sdoc_ids,
+                    reducer,
+                    all_reduced,
+                )
+                sdoc_id2row = {sdoc_id: row for row, sdoc_id in enumerate(all_sdoc_ids)}
+                return all_reduced[[sdoc_id2row[sdoc_id] for sdoc_id in sdoc_ids]]
+
+        # No (usable) cached reduction, fit a new UMAP model
+        embeddings = self.__read_embeddings(client, cache, aspect_dto, sdoc_ids)
+        self._log_status_msg(
+            f"Reducing the dimensionality of the embeddings from {embeddings.shape} to {settings.umap_n_components} dimensions..."
+        )
+        reducer = UMAP(
+            n_neighbors=settings.umap_n_neighbors,
+            n_components=settings.umap_n_components,
+            metric=settings.umap_metric,
+            min_dist=settings.umap_min_dist,
+            low_memory=False,
+        )
+        reduced_embeddings = np.array(reducer.fit_transform(embeddings))
+        cache.store_reduced_embeddings(
+            aspect_dto.embedding_model,
+            settings,
+            scope,
+            sdoc_ids,
+            reducer,
+            reduced_embeddings,
+        )
+        self._log_status_msg(
+            f"Reduced the dimensionality of the embeddings from {embeddings.shape} to {reduced_embeddings.shape}."
+        )
+        return reduced_embeddings
+
     def _cluster_documents(
         self,
         db: Session,
@@ -528,35 +680,12 @@ class PerspectivesService:
                 db=db, aspect_id=aspect_id, sdoc_ids=sdoc_ids
             )
 
-        # ... and their embeddings
-        embeddings = np.array(
-            crud_aspect_embedding.get_embeddings(
-                client=client,
-                project_id=aspect.project_id,
-                ids=[
-                    AspectObjectIdentifier(aspect_id=da.aspect_id, sdoc_id=da.sdoc_id)
-                    for da in doc_aspects
-                ],
-            )
-        )
-        self._log_status_msg(
-            f"Found {len(doc_aspects)} document aspects with embeddings for clustering."
-        )
-
-        # 2. Reduce the dimensionality of the embeddings
-        self._log_status_msg(
-            f"Reducing the dimensionality of the embeddings from {embeddings.shape} to 10 dimensions..."
-        )
-        reducer = UMAP(
-            n_neighbors=aspect_dto.pipeline_settings.umap_n_neighbors,
-            n_components=aspect_dto.pipeline_settings.umap_n_components,
-            metric=aspect_dto.pipeline_settings.umap_metric,
-            min_dist=aspect_dto.pipeline_settings.umap_min_dist,
-            low_memory=False,
-        )
-        reduced_embeddings = np.array(reducer.fit_transform(embeddings))
-        self._log_status_msg(
-            f"Reduced the dimensionality of the embeddings from {embeddings.shape} to {reduced_embeddings.shape}."
+        # 2. Reduce the dimensionality of the embeddings (reusing cached reductions, if possible)
+        reduced_embeddings = self.__reduce_embeddings(
+            client=client,
+            aspect_dto=aspect_dto,
+            sdoc_ids=[da.sdoc_id for da in doc_aspects],
+            scope=reduction_scope(sdoc_ids),
         )
 
         # 3. Cluster the reduced embeddings
@@ -602,8 +731,8 @@ class PerspectivesService:
                 db=db, aspect_id=aspect_id
             )
             sdoc_id2doccluster = {dt.sdoc_id: dt for dt in doc_clusters}
-            update_dtos: list[DocumentClusterUpdate] = []
             update_ids: list[tuple[int, int]] = []
+            update_cluster_ids: list[int] = []
             for da, hdb_cluster in zip(doc_aspects, hdb_clusters):
                 if da.sdoc_id in train_doc_ids:
                     continue  # Skip documents that were used for training!
@@ -623,17 +752,13 @@ class PerspectivesService:
                         dt.cluster_id,
                     )
                 )
-                update_dtos.append(
-                    DocumentClusterUpdate(
-                        cluster_id=new_cluster_id,
-                    )
-                )
+                update_cluster_ids.append(new_cluster_id)
 
             # Update!
-            crud_document_cluster.update_multi(
+            crud_document_cluster.update_multi_values(
                 db=db,
                 ids=update_ids,
-                update_dtos=update_dtos,
+                values_by_column={"cluster_id": update_cluster_ids},
             )
             self._log_status_msg(
                 f"Updated {len(update_ids)}/{len(doc_clusters)} document cluster assignments."
@@ -715,42 +840,115 @@ class PerspectivesService:
 
     def __c_tf_idf(
         self,
-        documents_per_cluster: list[str],
-    ) -> tuple[np.ndarray, list[str]]:
-        """Calculate a class-based TF-IDF where m is the number of total documents.
+        project_id: int,
+        aspect_id: int,
+        cluster_ids: list[int],
+        cluster_doc_aspects: dict[int, list[DocumentAspectORM]],
+    ) -> tuple[sp.csr_matrix, list[str]]:
+        """Calculate a class-based TF-IDF, keeping the matrix sparse.
+
+        The fitted CountVectorizer and the bag-of-words row of every cluster are cached per aspect.
+        As long as the documents of the aspect do not change, the vocabulary is reused and only
+        the rows of clusters whose membership changed are re-vectorized.
 
         Arguments:
-            documents_per_cluster: The joined documents per cluster such that each cluster has a single
-                                 string made out of multiple documents
-            m: The total number of documents (unjoined)
-            fit: Whether to fit a new vectorizer or use the fitted self.vectorizer_model
-            partial_fit: Whether to run `partial_fit` for online learning
+            project_id: The ID of the project
+            aspect_id: The ID of the aspect
+            cluster_ids: The clusters, one row per cluster in this order
+            cluster_doc_aspects: The documents of each cluster
 
         Returns:
-            tf_idf: The resulting matrix giving a value (importance score) for each word per cluster
+            tf_idf: The resulting sparse matrix giving a value (importance score) for each word per cluster
             words: The names of the words to which values were given
         """
-        documents = self.__preprocess_text(documents_per_cluster)
+        # 1. Compute the cache keys: the vocabulary depends on all documents, a row on the cluster members
+        corpus_hash = hashlib.blake2b(digest_size=16)
+        for da in sorted(
+            (da for das in cluster_doc_aspects.values() for da in das),
+            key=lambda da: da.sdoc_id,
+        ):
+            corpus_hash.update(f"{da.sdoc_id}:{da.content}\x00".encode("utf-8"))
+        corpus_key = corpus_hash.hexdigest()
+        cluster_keys = {
+            cid: hashlib.blake2b(
+                ",".join(
+                    str(sdoc_id)
+                    for sdoc_id in sorted(da.sdoc_id for da in cluster_doc_aspects[cid])
+                ).encode("utf-8"),
+                digest_size=16,
+            ).hexdigest()
+            for cid in cluster_ids
+        }
 
-        # Compute bag-of-words representation
-        vectorizer_model = CountVectorizer(
-            ngram_range=(1, 1), lowercase=True, stop_words="english"
-        )
-        X = vectorizer_model.fit_transform(documents)
+        def cluster_document(cid: int) -> str:
+            das = cluster_doc_aspects[cid]
+            return " ".join([da.content for da in das]) if len(das) > 0 else "emptydoc"
+
+        # 2. Load the cache, it is only valid if the documents did not change
+        aspect_cache = AspectCache(project_id=project_id, aspect_id=aspect_id)
+        cache = aspect_cache.load_ctfidf()
+        if cache is None or cache["corpus_key"] != corpus_key:
+            # Compute bag-of-words representation
+            # "emptydoc" is always part of the vocabulary, so that clusters can become empty later on
+            self._log_status_msg("Fitting a new CountVectorizer...")
+            vectorizer_model = CountVectorizer(
+                ngram_range=(1, 1), lowercase=True, stop_words="english"
+            )
+            vectorizer_model.fit(
+                self.__preprocess_text(
+                    [cluster_document(cid) for cid in cluster_ids] + ["emptydoc"]
+                )
+            )
+            cache = {
+                "corpus_key": corpus_key,
+                "vectorizer": vectorizer_model,
+                "cluster_keys": {},
+                "rows": {},
+            }
+        vectorizer_model = cache["vectorizer"]
+
+        # 3. Only vectorize the clusters whose members changed
+        changed_cluster_ids = [
+            cid
+            for cid in cluster_ids
+            if cache["cluster_keys"].get(cid) != cluster_keys[cid]
+        ]
+        if len(changed_cluster_ids) > 0:
+            self._log_status_msg(
+                f"Vectorizing {len(changed_cluster_ids)}/{len(cluster_ids)} changed clusters..."
+            )
+            X_changed = sp.csr_matrix(
+                vectorizer_model.transform(
+                    self.__preprocess_text(
+                        [cluster_document(cid) for cid in changed_cluster_ids]
+                    )
+                )
+            )
+            for i, cid in enumerate(changed_cluster_ids):
+                cache["rows"][cid] = X_changed[i]
+                cache["cluster_keys"][cid] = cluster_keys[cid]
+
+        # drop rows of clusters that do not exist anymore & persist the cache
+        cache["rows"] = {cid: cache["rows"][cid] for cid in cluster_ids}
+        cache["cluster_keys"] = {cid: cluster_keys[cid] for cid in cluster_ids}
+        aspect_cache.store_ctfidf(cache)
+
+        X = sp.csr_matrix(sp.vstack([cache["rows"][cid] for cid in cluster_ids]))
         words = vectorizer_model.get_feature_names_out().tolist()
 
-        # Compute the class-based TF-IDF
+        # 4. Compute the class-based TF-IDF
         ctfidf_model = ClassTfidfTransformer(
             bm25_weighting=True, reduce_frequent_words=True
         )
-        c_tf_idf = ctfidf_model.fit_transform(X)
-        c_tf_idf = np.array(c_tf_idf.todense())  # type: ignore
+        c_tf_idf = sp.csr_matrix(ctfidf_model.fit_transform(X))
 
         return c_tf_idf, words
 
     def __compute_top_words(
         self,
         db: Session,
+        project_id: int,
+        aspect_id: int,
         num_words: int,
         all_cluster_ids: list[int],
         doc_aspects: list[DocumentAspectORM],
@@ -762,12 +960,6 @@ class PerspectivesService:
         }
         for da, cluster_id in zip(doc_aspects, assigned_clusters):
             cluster_to_doc_aspects[cluster_id].append(da)
-        cluster_to_clusterdoc: dict[int, str] = {
-            cid: " ".join([da.content for da in cluster_to_doc_aspects[cid]])
-            if len(cluster_to_doc_aspects[cid]) > 0
-            else "emptydoc"
-            for cid in all_cluster_ids
-        }
 
         # 1.2 Compute the c-TF-IDF
         # The first row in c-TF-IDF corresponds to the first cluster in tids, the second row to the second cluster, etc.
@@ -775,26 +967,20 @@ class PerspectivesService:
             f"Computing c-TF-IDF for {len(all_cluster_ids)} clusters..."
         )
         c_tf_idf, words = self.__c_tf_idf(
-            documents_per_cluster=[
-                cluster_to_clusterdoc[cid] for cid in all_cluster_ids
-            ]
+            project_id=project_id,
+            aspect_id=aspect_id,
+            cluster_ids=all_cluster_ids,
+            cluster_doc_aspects=cluster_to_doc_aspects,
         )
 
-        # 1.3. Find the most important words for each cluster
-        # Use numpy to get top-k values and indices for each cluster (row)
-        k = num_words
+        # 1.3. Find the most important words for each cluster (top-k per sparse row)
         top_words: dict[int, list[str]] = {}
         top_word_scores: dict[int, list[float]] = {}
-        for row, cluster_id in zip(c_tf_idf, all_cluster_ids):
-            # Get indices of top-k elements in descending order
-            if len(row) < k:
-                topk_idx = np.argsort(row)[::-1]
-            else:
-                topk_idx = np.argpartition(row, -k)[-k:]
-                # Sort these top-k indices by value descending
-                topk_idx = topk_idx[np.argsort(row[topk_idx])[::-1]]
+        for (topk_idx, topk_scores), cluster_id in zip(
+            top_k_per_row(c_tf_idf, k=num_words), all_cluster_ids
+        ):
             top_words[cluster_id] = [words[i] for i in topk_idx]
-            top_word_scores[cluster_id] = [float(row[i]) for i in topk_idx]
+            top_word_scores[cluster_id] = [float(score) for score in topk_scores]
 
         self._log_status_msg("Extracted top words and scores for each cluster!")
 
@@ -908,6 +1094,8 @@ class PerspectivesService:
         # 1. Identify key words for each cluster
         top_words, top_word_scores = self.__compute_top_words(
             db=db,
+            project_id=aspect.project_id,
+            aspect_id=aspect_id,
             num_words=aspect_dto.pipeline_settings.num_keywords,
             all_cluster_ids=[c.id for c in all_clusters],
             doc_aspects=doc_aspects,
@@ -959,7 +1147,7 @@ class PerspectivesService:
         distance_update_ids: list[
             tuple[int, int]
         ] = []  # List of (sdoc_id, cluster_id) tuples
-        distance_update_dtos: list[DocumentClusterUpdate] = []
+        distance_update_similarities: list[float] = []
         for cluster_id in cluster_ids_to_update:
             doc_coordinates = coordinates[assigned_clusters_arr == cluster_id]
             doc_embeddings = embeddings[assigned_clusters_arr == cluster_id]
@@ -985,11 +1173,10 @@ class PerspectivesService:
             top_docs[cluster_id] = [sdoc_ids[i].item() for i in top_doc_indices]
 
             # ... update the distances of the document clusters
-            for sdoc_id, similarity in zip(sdoc_ids, similarities):
-                distance_update_ids.append((sdoc_id.item(), cluster_id))
-                distance_update_dtos.append(
-                    DocumentClusterUpdate(similarity=similarity.item())
-                )
+            distance_update_ids.extend(
+                (sdoc_id, cluster_id) for sdoc_id in sdoc_ids.tolist()
+            )
+            distance_update_similarities.extend(similarities.tolist())
 
         self._log_status_msg(
             f"Computed cluster embeddings & top documents for {len(cluster_centroids)} clusters."
@@ -1035,12 +1222,12 @@ class PerspectivesService:
         )
 
         # ... update the document clusters with the new distances
-        if len(distance_update_dtos) > 0:
+        if len(distance_update_ids) > 0:
             # Update the distances of the document clusters
-            crud_document_cluster.update_multi(
+            crud_document_cluster.update_multi_values(
                 db=db,
                 ids=distance_update_ids,
-                update_dtos=distance_update_dtos,
+                values_by_column={"similarity": distance_update_similarities},
             )
 
         self._log_status_msg(
@@ -1168,8 +1355,8 @@ class PerspectivesService:
             # - For all source documents in the aspect, decide whether to assign the new cluster or not. Track the changes/affected clusters!
             # - Do not reassign documents that are accepted
             self._log_status_step(1)
-            update_dtos: list[DocumentClusterUpdate] = []
             update_ids: list[tuple[int, int]] = []
+            update_similarities: list[float] = []
             modified_clusters: set[int] = set()
             results = crud_aspect_embedding.search_near_vector_in_aspect(
                 client=client,
@@ -1190,23 +1377,23 @@ class PerspectivesService:
                 # assign the new cluster if the similarity is larger than the current cluster's distance
                 if result.score > doc_cluster.similarity:
                     update_ids.append((doc_cluster.sdoc_id, doc_cluster.cluster_id))
-                    update_dtos.append(
-                        DocumentClusterUpdate(
-                            cluster_id=new_cluster.id,
-                            similarity=result.score,
-                        )
-                    )
+                    update_similarities.append(result.score)
                     # track changes
                     modified_clusters.add(doc_cluster.cluster_id)
                     modified_clusters.add(new_cluster.id)
 
             # - Store the new cluster assignments in the database
-            if len(update_dtos) > 0:
-                crud_document_cluster.update_multi(
-                    db=db, ids=update_ids, update_dtos=update_dtos
+            if len(update_ids) > 0:
+                crud_document_cluster.update_multi_values(
+                    db=db,
+                    ids=update_ids,
+                    values_by_column={
+                        "cluster_id": [new_cluster.id] * len(update_ids),
+                        "similarity": update_similarities,
+                    },
                 )
                 self._log_status_msg(
-                    f"Updated {len(update_dtos)} document-cluster assignments with the new cluster {new_cluster.id}."
+                    f"Updated {len(update_ids)} document-cluster assignments with the new cluster {new_cluster.id}."
                 )
 
             # 3. Cluster Extraction
@@ -1377,24 +1564,26 @@ class PerspectivesService:
                 modified_clusters.add(most_similar_cluster_id)
 
             # - Update the document-cluster assignments in the database
-            update_dtos: list[DocumentClusterUpdate] = []
-            update_ids: list[tuple[int, int]] = []
-            for dt in document_clusters:
-                update_dtos.append(
-                    DocumentClusterUpdate(
-                        cluster_id=sdoc_id2new_cluster_id[dt.sdoc_id],
-                        similarity=sdoc_id2new_cluster_distance[dt.sdoc_id],
-                        is_accepted=False,  # Reset acceptance status
-                    )
-                )
-                update_ids.append((dt.sdoc_id, dt.cluster_id))
-
-            if len(update_dtos) > 0:
-                crud_document_cluster.update_multi(
-                    db=db, ids=update_ids, update_dtos=update_dtos
+            update_ids = [(dt.sdoc_id, dt.cluster_id) for dt in document_clusters]
+            if len(update_ids) > 0:
+                crud_document_cluster.update_multi_values(
+                    db=db,
+                    ids=update_ids,
+                    values_by_column={
+                        "cluster_id": [
+                            sdoc_id2new_cluster_id[dt.sdoc_id]
+                            for dt in document_clusters
+                        ],
+                        "similarity": [
+                            sdoc_id2new_cluster_distance[dt.sdoc_id]
+                            for dt in document_clusters
+                        ],
+                        # Reset acceptance status
+                        "is_accepted": [False] * len(update_ids),
+                    },
                 )
                 self._log_status_msg(
-                    f"Updated {len(update_dtos)} document-cluster assignments to the most similar clusters."
+                    f"Updated {len(update_ids)} document-cluster assignments to the most similar clusters."
                 )
 
             # 2. Cluster Removal: Remove the cluster from the database
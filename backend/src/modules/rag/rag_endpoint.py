@@ -1,14 +1,14 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.auth.authz_user import AuthzUser
 from modules.rag.rag_dto import ChatSessionResponse
 from modules.rag.rag_service import RAGService
 from repos.llm_repo import LLMRepo
 
 router = APIRouter(
-    prefix="/rag", dependencies=[Depends(get_current_user)], tags=["rag"]
+    prefix="/rag", dependencies=[Depends(get_current_principal)], tags=["rag"]
 )
 
 
@@ -1,5 +1,3 @@
-from collections import defaultdict
-
 from loguru import logger
 from sqlalchemy.orm import Session
 
@@ -36,22 +34,21 @@ class RAGService(metaclass=SingletonMeta):
             threshold=threshold,
         )
 
-        # Group hits by source document ID
-        sdoc_to_hits = defaultdict(list)
-        for hit in similar_sentences:
-            sdoc_to_hits[hit.sdoc_id].append(hit)
+        # Read only the hit sentences, not the whole documents
+        sentences = crud_sdoc_data.read_sentences(
+            db=db,
+            sentence_ids=[(hit.sdoc_id, hit.sentence_id) for hit in similar_sentences],
+        )
 
         extracted_sentences = []
-        for sdoc_id, hits in sdoc_to_hits.items():
-            sdoc_data = crud_sdoc_data.read(db=db, id=sdoc_id)
-            for hit in hits:
-                try:
-                    sentence_text = sdoc_data.sentences[hit.sentence_id]
-                    extracted_sentences.append(sentence_text)
-                except IndexError:
-                    logger.warning(
-                        f"Invalid sentence_id={hit.sentence_id} for sdoc_id={sdoc_id}"
-                    )
+        for hit in similar_sentences:
+            sentence_text = sentences.get((hit.sdoc_id, hit.sentence_id))
+            if sentence_text is None:
+                logger.warning(
+                    f"Invalid sentence_id={hit.sentence_id} for sdoc_id={hit.sdoc_id}"
+                )
+                continue
+            extracted_sentences.append(sentence_text)
 
         context = "\n".join(extracted_sentences)
 
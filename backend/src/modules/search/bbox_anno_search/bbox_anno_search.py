@@ -14,6 +14,7 @@ from modules.search.search_dto import BBoxAnnotationRow, BBoxAnnotationSearchRes
 from repos.filesystem_repo import FilesystemRepo
 from systems.search_system.column_info import ColumnInfo
 from systems.search_system.filtering import Filter
+from systems.search_system.pagination import CountMode
 from systems.search_system.search_builder import SearchBuilder
 from systems.search_system.sorting import Sort
 
@@ -48,6 +49,9 @@ def find_bbox_annotations(
     sorts: list[Sort[BBoxColumns]],
     page: int | None = None,
     page_size: int | None = None,
+    cursor: str | None = None,
+    use_cursor: bool = False,
+    count_mode: CountMode = CountMode.EXACT,
 ) -> BBoxAnnotationSearchResult:
     builder = SearchBuilder(db, filter, sorts)
     subquery = builder.init_subquery(
@@ -80,6 +84,9 @@ def find_bbox_annotations(
     result_rows, total_results = builder.execute_query(
         page_number=page,
         page_size=page_size,
+        cursor=cursor,
+        use_cursor=use_cursor,
+        count_mode=count_mode,
     )
 
     data = []
@@ -107,4 +114,6 @@ def find_bbox_annotations(
                 memo=None,
             )
         )
-    return BBoxAnnotationSearchResult(total_results=total_results, data=data)
+    return BBoxAnnotationSearchResult(
+        total_results=total_results, data=data, next_cursor=builder.next_cursor
+    )
@@ -23,6 +23,10 @@ class SpanAnnotationSearchResult(BaseModel):
     total_results: int = Field(
         description="The total number of span_annotation_ids. Used for pagination."
     )
+    next_cursor: str | None = Field(
+        default=None,
+        description="The cursor of the next page (keyset pagination only). None on the last page.",
+    )
     data: list[SpanAnnotationRow] = Field(description="The Annotations.")
 
 
@@ -42,6 +46,10 @@ class SentenceAnnotationSearchResult(BaseModel):
     total_results: int = Field(
         description="The total number of sentence_annotation_ids. Used for pagination."
     )
+    next_cursor: str | None = Field(
+        default=None,
+        description="The cursor of the next page (keyset pagination only). None on the last page.",
+    )
     data: list[SentenceAnnotationRow] = Field(description="The Annotations.")
 
 
@@ -65,6 +73,10 @@ class BBoxAnnotationSearchResult(BaseModel):
     total_results: int = Field(
         description="The total number of bbox_annotation_ids. Used for pagination."
     )
+    next_cursor: str | None = Field(
+        default=None,
+        description="The cursor of the next page (keyset pagination only). None on the last page.",
+    )
     data: list[BBoxAnnotationRow] = Field(description="The Annotations.")
 
 
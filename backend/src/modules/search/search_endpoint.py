@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.auth.authz_user import AuthzUser
 from modules.search.bbox_anno_search.bbox_anno_search import (
     find_bbox_annotations,
@@ -34,10 +34,11 @@ from modules.search.span_anno_search.span_anno_search_columns import SpanColumns
 from repos.elastic.elastic_dto_base import PaginatedElasticSearchHits
 from systems.search_system.column_info import ColumnInfo
 from systems.search_system.filtering import Filter
+from systems.search_system.pagination import CountMode
 from systems.search_system.sorting import Sort
 
 router = APIRouter(
-    prefix="/search", dependencies=[Depends(get_current_user)], tags=["search"]
+    prefix="/search", dependencies=[Depends(get_current_principal)], tags=["search"]
 )
 
 
@@ -165,6 +166,9 @@ def search_span_annotations(
     filter: Filter[SpanColumns],
     page: int | None = None,
     page_size: int | None = None,
+    cursor: str | None = None,
+    use_cursor: bool = False,
+    count_mode: CountMode = CountMode.EXACT,
     sorts: list[Sort[SpanColumns]],
     authz_user: AuthzUser = Depends(),
 ) -> SpanAnnotationSearchResult:
@@ -176,6 +180,9 @@ def search_span_annotations(
         filter=filter,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        use_cursor=use_cursor,
+        count_mode=count_mode,
         sorts=sorts,
     )
 
@@ -210,6 +217,9 @@ def search_sentence_annotations(
     filter: Filter[SentAnnoColumns],
     page: int | None = None,
     page_size: int | None = None,
+    cursor: str | None = None,
+    use_cursor: bool = False,
+    count_mode: CountMode = CountMode.EXACT,
     sorts: list[Sort[SentAnnoColumns]],
     authz_user: AuthzUser = Depends(),
 ) -> SentenceAnnotationSearchResult:
@@ -221,6 +231,9 @@ def search_sentence_annotations(
         filter=filter,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        use_cursor=use_cursor,
+        count_mode=count_mode,
         sorts=sorts,
     )
 
@@ -255,6 +268,9 @@ def search_bbox_annotations(
     filter: Filter[BBoxColumns],
     page: int | None = None,
     page_size: int | None = None,
+    cursor: str | None = None,
+    use_cursor: bool = False,
+    count_mode: CountMode = CountMode.EXACT,
     sorts: list[Sort[BBoxColumns]],
     authz_user: AuthzUser = Depends(),
 ) -> BBoxAnnotationSearchResult:
@@ -266,5 +282,8 @@ def search_bbox_annotations(
         filter=filter,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        use_cursor=use_cursor,
+        count_mode=count_mode,
         sorts=sorts,
     )
@@ -14,6 +14,7 @@ from modules.search.search_dto import SpanAnnotationRow, SpanAnnotationSearchRes
 from modules.search.span_anno_search.span_anno_search_columns import SpanColumns
 from systems.search_system.column_info import ColumnInfo
 from systems.search_system.filtering import Filter
+from systems.search_system.pagination import CountMode
 from systems.search_system.search_builder import SearchBuilder
 from systems.search_system.sorting import Sort
 
@@ -44,6 +45,9 @@ def find_span_annotations(
     sorts: list[Sort[SpanColumns]],
     page: int | None = None,
     page_size: int | None = None,
+    cursor: str | None = None,
+    use_cursor: bool = False,
+    count_mode: CountMode = CountMode.EXACT,
 ) -> SpanAnnotationSearchResult:
     builder = SearchBuilder(db, filter, sorts)
     # build the initial subquery that queries all necessary data for the desired output
@@ -81,6 +85,9 @@ def find_span_annotations(
     result_rows, total_results = builder.execute_query(
         page_number=page,
         page_size=page_size,
+        cursor=cursor,
+        use_cursor=use_cursor,
+        count_mode=count_mode,
     )
 
     data = []
@@ -97,4 +104,6 @@ def find_span_annotations(
                 memo=None,
             )
         )
-    return SpanAnnotationSearchResult(total_results=total_results, data=data)
+    return SpanAnnotationSearchResult(
+        total_results=total_results, data=data, next_cursor=builder.next_cursor
+    )
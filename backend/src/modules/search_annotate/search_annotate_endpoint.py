@@ -1,14 +1,14 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.auth.authz_user import AuthzUser
 from modules.search_annotate.search_annotate import search_and_auto_annotate
 from modules.search_annotate.search_annotate_dto import PaginatedSpanAnnotationHits
 
 router = APIRouter(
     prefix="/search_annotate",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
     tags=["search_annotate"],
 )
 
@@ -0,0 +1,41 @@
+from pydantic import Field
+
+from common.job_type import JobType
+from core.doc.document_embedding_crud import crud_document_embedding
+from core.doc.image_embedding_crud import crud_image_embedding
+from core.doc.sentence_embedding_crud import crud_sentence_embedding
+from repos.vector import local_knn_index
+from repos.vector.weaviate_repo import WeaviateRepo
+from systems.job_system.job_dto import Job, JobInputBase, JobPriority
+from systems.job_system.job_register_decorator import register_job
+
+# embedding CRUDs with a local kNN index by their collection name
+LOCAL_KNN_CRUDS = {
+    crud.collection_class.get_collection_name(): crud
+    for crud in [
+        crud_document_embedding,
+        crud_sentence_embedding,
+        crud_image_embedding,
+    ]
+}
+
+
+class LocalKnnIndexJobInput(JobInputBase):
+    collection_name: str = Field(description="Weaviate collection of the index")
+
+
+@register_job(
+    job_type=JobType.LOCAL_KNN_INDEX,
+    input_type=LocalKnnIndexJobInput,
+    priority=JobPriority.LOW,
+)
+def handle_local_knn_index_job(payload: LocalKnnIndexJobInput, job: Job) -> None:
+    """
+    Builds the local kNN index of a project, requested by a search that found the index missing or stale.
+    Searches are answered by Weaviate until the build finished.
+    """
+    crud = LOCAL_KNN_CRUDS[payload.collection_name]
+    with WeaviateRepo.weaviate_session() as client:
+        local_knn_index.build_index(
+            crud=crud, client=client, project_id=payload.project_id
+        )
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.auth.authz_user import AuthzUser
 from modules.search.sdoc_search.sdoc_search_columns import SdocColumns
 from modules.simsearch.simsearch_dto import SimSearchImageHit, SimSearchSentenceHit
@@ -9,7 +9,9 @@ from modules.simsearch.simsearch_service import SimSearchService
 from systems.search_system.filtering import Filter
 
 router = APIRouter(
-    prefix="/simsearch", dependencies=[Depends(get_current_user)], tags=["simsearch"]
+    prefix="/simsearch",
+    dependencies=[Depends(get_current_principal)],
+    tags=["simsearch"],
 )
 
 
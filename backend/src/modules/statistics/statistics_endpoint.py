@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from common.crud_enum import Crud
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.auth.authz_user import AuthzUser
 from modules.statistics.statistics_dto import KeywordStat, SpanEntityStat, TagStat
 from modules.statistics.statistics_service import (
@@ -12,7 +12,9 @@ from modules.statistics.statistics_service import (
 )
 
 router = APIRouter(
-    prefix="/statistics", dependencies=[Depends(get_current_user)], tags=["statistics"]
+    prefix="/statistics",
+    dependencies=[Depends(get_current_principal)],
+    tags=["statistics"],
 )
 
 
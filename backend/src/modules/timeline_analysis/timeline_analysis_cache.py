@@ -0,0 +1,147 @@
+import hashlib
+
+import srsly
+from fastapi.encoders import jsonable_encoder
+from loguru import logger
+from redis.exceptions import RedisError
+from sqlalchemy import func, literal_column
+from sqlalchemy.orm import Session
+
+from core.annotation.annotation_document_orm import AnnotationDocumentORM
+from core.annotation.bbox_annotation_orm import BBoxAnnotationORM
+from core.annotation.sentence_annotation_orm import SentenceAnnotationORM
+from core.annotation.span_annotation_orm import SpanAnnotationORM
+from core.code.code_orm import CodeORM
+from core.doc.source_document_orm import SourceDocumentORM
+from core.memo.memo_orm import MemoORM
+from core.metadata.project_metadata_orm import ProjectMetadataORM
+from core.metadata.source_document_metadata_orm import SourceDocumentMetadataORM
+from core.tag.tag_orm import SourceDocumentTagLinkTable, TagORM
+from modules.timeline_analysis.timeline_analysis_dto import (
+    TimelineAnalysisConcept,
+    TimelineAnalysisConceptUpdate,
+    TimelineAnalysisResult,
+    TimelineAnalysisSettings,
+)
+from repos.redis_repo import RedisRepo
+
+# cached results expire if they were not read for this long
+CACHE_TTL_S = 7 * 24 * 60 * 60
+CACHE_KEY_PREFIX = "timeline_analysis"
+
+# tables with a project_id column, whose rows can influence the results of a concept
+PROJECT_TABLES = [
+    SourceDocumentORM,
+    ProjectMetadataORM,
+    SpanAnnotationORM,
+    SentenceAnnotationORM,
+    BBoxAnnotationORM,
+    CodeORM,
+    TagORM,
+    MemoORM,
+]
+# tables that belong to the project via the source document
+SDOC_TABLES = [
+    (SourceDocumentMetadataORM, SourceDocumentMetadataORM.source_document_id),
+    (SourceDocumentTagLinkTable, SourceDocumentTagLinkTable.source_document_id),
+    (AnnotationDocumentORM, AnnotationDocumentORM.source_document_id),
+]
+
+
+def _table_fingerprint(table):
+    # cheap aggregates instead of hashing the rows: the count changes if rows are added or removed,
+    # the sum of the row versions (xmin, the id of the inserting / last updating transaction)
+    # changes if any row is inserted or updated - also in tables without an updated column
+    return (
+        func.count(),
+        func.coalesce(
+            func.sum(literal_column(f"{table.__tablename__}.xmin::text::bigint")), 0
+        ),
+    )
+
+
+def project_data_version(db: Session, project_id: int) -> str:
+    """
+    Returns a watermark of the project data (documents, metadata, tags, annotations, codes, memos).
+    It changes whenever the data changes, so that cached concept results are invalidated precisely.
+    It only aggregates the row count and row versions per table, the rows are not serialized or hashed.
+    """
+    fingerprints = []
+    for table in PROJECT_TABLES:
+        fingerprints.append(
+            tuple(
+                db.query(*_table_fingerprint(table))
+                .filter(table.project_id == project_id)
+                .one()
+            )
+        )
+    for table, sdoc_id_column in SDOC_TABLES:
+        fingerprints.append(
+            tuple(
+                db.query(*_table_fingerprint(table))
+                .join(SourceDocumentORM, SourceDocumentORM.id == sdoc_id_column)
+                .filter(SourceDocumentORM.project_id == project_id)
+                .one()
+            )
+        )
+    return hashlib.blake2b(
+        repr(fingerprints).encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+def concept_hash(
+    concept: TimelineAnalysisConcept | TimelineAnalysisConceptUpdate,
+    settings: TimelineAnalysisSettings,
+    data_version: str,
+) -> int:
+    """
+    Stable (across processes) hash of everything the results of a concept depend on.
+    It is limited to 52 bits, so that it can be represented exactly in JavaScript.
+    """
+    key = srsly.json_dumps(
+        jsonable_encoder(
+            {
+                "filter": concept.ta_specific_filter,
+                "settings": settings,
+                "data_version": data_version,
+            }
+        ),
+        sort_keys=True,
+    )
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") & ((1 << 52) - 1)
+
+
+def _cache_key(project_id: int, filter_hash: int) -> str:
+    return f"{CACHE_KEY_PREFIX}:{project_id}:{filter_hash}"
+
+
+def read_cached_results(
+    project_id: int, filter_hash: int
+) -> list[TimelineAnalysisResult] | None:
+    try:
+        # reading refreshes the TTL, so that frequently used results stay cached
+        data = (
+            RedisRepo()
+            .redis_connection()
+            .getex(_cache_key(project_id, filter_hash), ex=CACHE_TTL_S)
+        )
+    except RedisError as e:
+        logger.warning(f"Could not read cached timeline analysis results: {e}")
+        return None
+    if data is None:
+        return None
+    return [TimelineAnalysisResult.model_validate(r) for r in srsly.json_loads(data)]
+
+
+def store_cached_results(
+    project_id: int, filter_hash: int, results: list[TimelineAnalysisResult]
+) -> None:
+    try:
+        RedisRepo().redis_connection().set(
+            _cache_key(project_id, filter_hash),
+            srsly.json_dumps(jsonable_encoder(results)),
+            ex=CACHE_TTL_S,
+        )
+    except RedisError as e:
+        logger.warning(f"Could not cache timeline analysis results: {e}")
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from common.crud_enum import Crud
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.auth.authz_user import AuthzUser
 from modules.timeline_analysis.timeline_analysis_crud import (
     crud_timeline_analysis,
@@ -20,7 +20,7 @@ from modules.timeline_analysis.timeline_analysis_service import (
 
 router = APIRouter(
     prefix="/timelineAnalysis",
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
     tags=["timelineAnalysis"],
 )
 
@@ -7,17 +7,22 @@ from fastapi.encoders import jsonable_encoder
 from loguru import logger
 from sqlalchemy import and_, func
 from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql.elements import ColumnElement
 
 from core.annotation.annotation_document_orm import AnnotationDocumentORM
 from core.annotation.bbox_annotation_orm import BBoxAnnotationORM
-from core.annotation.sentence_annotation_crud import crud_sentence_anno
 from core.annotation.sentence_annotation_orm import SentenceAnnotationORM
-from core.annotation.span_annotation_crud import crud_span_anno
 from core.annotation.span_annotation_orm import SpanAnnotationORM
 from core.doc.source_document_orm import SourceDocumentORM
 from core.metadata.source_document_metadata_orm import SourceDocumentMetadataORM
 from modules.analysis.analysis_dto import DateGroupBy
 from modules.search.sdoc_search.sdoc_search_columns import SdocColumns
+from modules.timeline_analysis.timeline_analysis_cache import (
+    concept_hash,
+    project_data_version,
+    read_cached_results,
+    store_cached_results,
+)
 from modules.timeline_analysis.timeline_analysis_crud import (
     crud_timeline_analysis,
 )
@@ -35,8 +40,9 @@ from modules.timeline_analysis.timeline_analysis_dto import (
     TimelineAnalysisUpdateIntern,
 )
 from modules.timeline_analysis.timeline_analysis_orm import TimelineAnalysisORM
+from repos.db.crud_base import BATCH_SIZE
 from repos.db.sql_utils import aggregate_ids
-from systems.search_system.filtering import Filter
+from systems.search_system.filtering import Filter, LogicalOperator
 from systems.search_system.search_builder import SearchBuilder
 
 
@@ -79,6 +85,7 @@ def update_timeline_analysis(
     current_concepts: dict[str, TimelineAnalysisConcept] = {
         concept.id: concept for concept in ta.concepts
     }
+    data_version = project_data_version(db=db, project_id=ta.project_id)
     new_concepts: dict[str, TimelineAnalysisConcept] = {
         concept.id: TimelineAnalysisConcept(
             id=concept.id,
@@ -88,15 +95,10 @@ def update_timeline_analysis(
             visible=concept.visible,
             ta_specific_filter=concept.ta_specific_filter,
             color=concept.color,
-            filter_hash=hash(
-                srsly.json_dumps(
-                    jsonable_encoder(
-                        {
-                            "filter": concept.ta_specific_filter.filter,
-                            "settings": ta.settings,
-                        }
-                    )
-                )
+            filter_hash=concept_hash(
+                concept=concept,
+                settings=ta.settings,
+                data_version=data_version,
             ),
             results=[],
         )
@@ -104,28 +106,22 @@ def update_timeline_analysis(
     }
 
     # compute new results (if necessary)
+    changed_concepts: list[TimelineAnalysisConcept] = []
     for concept_id, new_concept in new_concepts.items():
         old_concept = current_concepts.get(concept_id)
-        if old_concept is None:
-            # this is a new concept, we need to compute the results
-            result = __compute_timeline_analysis(
-                db=db,
-                timeline_analysis=ta,
-                concept=new_concept,
-            )
+        if (
+            old_concept is not None
+            and old_concept.filter_hash == new_concept.filter_hash
+        ):
+            # neither the filter, the settings nor the project data has changed, we can keep the old results
+            new_concept.results = old_concept.results
         else:
-            if old_concept.filter_hash != new_concept.filter_hash:
-                # the filter has changed, we need to recompute the results
-                result = __compute_timeline_analysis(
-                    db=db,
-                    timeline_analysis=ta,
-                    concept=new_concept,
-                )
-            else:
-                # the filter has not changed, we can keep the old results
-                result = old_concept.results
-
-        new_concept.results = result
+            changed_concepts.append(new_concept)
+    __read_or_compute_timeline_analysis(
+        db=db,
+        timeline_analysis=ta,
+        concepts=changed_concepts,
+    )
 
     # update the concepts
     db_obj = crud_timeline_analysis.update(
@@ -147,14 +143,27 @@ def recompute_timeline_analysis(db: Session, id: int) -> TimelineAnalysisORM:
     ta = TimelineAnalysisRead.model_validate(db_obj)
 
     # compute new results
+    data_version = project_data_version(db=db, project_id=ta.project_id)
     concepts: dict[str, TimelineAnalysisConcept] = {
         concept.id: concept for concept in ta.concepts
     }
-    for concept_id, concept in concepts.items():
-        concept.results = __compute_timeline_analysis(
-            db=db,
-            timeline_analysis=ta,
+    for concept in concepts.values():
+        concept.filter_hash = concept_hash(
             concept=concept,
+            settings=ta.settings,
+            data_version=data_version,
+        )
+    results = __compute_timeline_analysis(
+        db=db,
+        timeline_analysis=ta,
+        concepts=list(concepts.values()),
+    )
+    for concept, result in zip(concepts.values(), results):
+        concept.results = result
+        store_cached_results(
+            project_id=ta.project_id,
+            filter_hash=concept.filter_hash,
+            results=result,
         )
 
     # update the concepts
@@ -169,32 +178,77 @@ def recompute_timeline_analysis(db: Session, id: int) -> TimelineAnalysisORM:
     return db_obj
 
 
+def __read_or_compute_timeline_analysis(
+    db: Session,
+    timeline_analysis: TimelineAnalysisRead,
+    concepts: list[TimelineAnalysisConcept],
+) -> None:
+    """Sets the results of the concepts. Concepts that are not cached are computed together."""
+    missing_concepts: list[TimelineAnalysisConcept] = []
+    for concept in concepts:
+        # the same concept may have been computed before (e.g. by another timeline analysis or before an undo)
+        result = read_cached_results(
+            project_id=timeline_analysis.project_id, filter_hash=concept.filter_hash
+        )
+        if result is not None:
+            logger.info(f"Using cached timeline analysis for concept {concept.id}")
+            concept.results = result
+        else:
+            missing_concepts.append(concept)
+
+    results = __compute_timeline_analysis(
+        db=db,
+        timeline_analysis=timeline_analysis,
+        concepts=missing_concepts,
+    )
+    for concept, result in zip(missing_concepts, results):
+        concept.results = result
+        store_cached_results(
+            project_id=timeline_analysis.project_id,
+            filter_hash=concept.filter_hash,
+            results=result,
+        )
+
+
 def __compute_timeline_analysis(
     db: Session,
     timeline_analysis: TimelineAnalysisRead,
-    concept: TimelineAnalysisConcept,
-) -> list[TimelineAnalysisResult]:
-    logger.info(f"Computing timeline analysis for concept {concept.id}")
+    concepts: list[TimelineAnalysisConcept],
+) -> list[list[TimelineAnalysisResult]]:
+    """
+    Computes the results of all concepts in a single query: The query considers all rows that match
+    at least one concept filter, each concept aggregates its own rows with FILTER (WHERE <concept filter>).
+    Returns the results in the order of the concepts.
+    """
+    if len(concepts) == 0:
+        return []
+
+    logger.info(
+        f"Computing timeline analysis for concepts {[concept.id for concept in concepts]}"
+    )
 
     if timeline_analysis.settings.date_metadata_id is None:
-        return []
+        return [[] for _ in concepts]
 
-    match concept.timeline_analysis_type:
+    filters = [concept.ta_specific_filter.filter for concept in concepts]
+    match timeline_analysis.timeline_analysis_type:
         case TimelineAnalysisType.DOCUMENT:
-            assert isinstance(concept.ta_specific_filter, SdocTimelineAnalysisFilter), (
-                "Invalid filter type, expected SdocTimelineAnalysisFilter"
-            )
+            for concept in concepts:
+                assert isinstance(
+                    concept.ta_specific_filter, SdocTimelineAnalysisFilter
+                ), "Invalid filter type, expected SdocTimelineAnalysisFilter"
             result_rows = __sdoc_timeline_analysis(
                 db=db,
                 project_id=timeline_analysis.project_id,
                 group_by=timeline_analysis.settings.group_by,
                 project_metadata_id=timeline_analysis.settings.date_metadata_id,
-                filter=concept.ta_specific_filter.filter,
+                filters=filters,
             )
         case TimelineAnalysisType.SENT_ANNO:
-            assert isinstance(
-                concept.ta_specific_filter, SentAnnoTimelineAnalysisFilter
-            ), "Invalid filter type, expected SentAnnoTimelineAnalysisFilter"
+            for concept in concepts:
+                assert isinstance(
+                    concept.ta_specific_filter, SentAnnoTimelineAnalysisFilter
+                ), "Invalid filter type, expected SentAnnoTimelineAnalysisFilter"
             assert timeline_analysis.settings.annotation_aggregation_type is not None, (
                 "Annotation aggregation type is required for SentAnnoTimelineAnalysis"
                 " but not provided in the settings"
@@ -204,13 +258,14 @@ def __compute_timeline_analysis(
                 project_id=timeline_analysis.project_id,
                 group_by=timeline_analysis.settings.group_by,
                 project_metadata_id=timeline_analysis.settings.date_metadata_id,
-                filter=concept.ta_specific_filter.filter,
+                filters=filters,
                 annotation_aggregation_type=timeline_analysis.settings.annotation_aggregation_type,
             )
         case TimelineAnalysisType.SPAN_ANNO:
-            assert isinstance(
-                concept.ta_specific_filter, SpanAnnoTimelineAnalysisFilter
-            ), "Invalid filter type, expected SpanAnnoTimelineAnalysisFilter"
+            for concept in concepts:
+                assert isinstance(
+                    concept.ta_specific_filter, SpanAnnoTimelineAnalysisFilter
+                ), "Invalid filter type, expected SpanAnnoTimelineAnalysisFilter"
             assert timeline_analysis.settings.annotation_aggregation_type is not None, (
                 "Annotation aggregation type is required for SpanAnnoTimelineAnalysis"
                 " but not provided in the settings"
@@ -220,13 +275,14 @@ def __compute_timeline_analysis(
                 project_id=timeline_analysis.project_id,
                 group_by=timeline_analysis.settings.group_by,
                 project_metadata_id=timeline_analysis.settings.date_metadata_id,
-                filter=concept.ta_specific_filter.filter,
+                filters=filters,
                 annotation_aggregation_type=timeline_analysis.settings.annotation_aggregation_type,
             )
         case TimelineAnalysisType.BBOX_ANNO:
-            assert isinstance(
-                concept.ta_specific_filter, BBoxAnnoTimelineAnalysisFilter
-            ), "Invalid filter type, expected BBoxAnnoTimelineAnalysisFilter"
+            for concept in concepts:
+                assert isinstance(
+                    concept.ta_specific_filter, BBoxAnnoTimelineAnalysisFilter
+                ), "Invalid filter type, expected BBoxAnnoTimelineAnalysisFilter"
             assert timeline_analysis.settings.annotation_aggregation_type is not None, (
                 "Annotation aggregation type is required for BBoxAnnoTimelineAnalysis"
                 " but not provided in the settings"
@@ -236,13 +292,10 @@ def __compute_timeline_analysis(
                 project_id=timeline_analysis.project_id,
                 group_by=timeline_analysis.settings.group_by,
                 project_metadata_id=timeline_analysis.settings.date_metadata_id,
-                filter=concept.ta_specific_filter.filter,
+                filters=filters,
                 annotation_aggregation_type=timeline_analysis.settings.annotation_aggregation_type,
             )
 
-    # map from date (YYYY, YYYY-MM, or YYYY-MM-DD) to list of rows
-    result_dict = {row["date"]: row for row in result_rows}
-
     # find the date range (earliest and latest date)
     date_results = (
         db.query(
@@ -257,7 +310,7 @@ def __compute_timeline_analysis(
         .one()
     )
     if len(date_results) == 0:
-        return []
+        return [[] for _ in concepts]
     earliest_date, latest_date = date_results
 
     # create a date range from earliest to latest (used for x-axis)
@@ -277,31 +330,69 @@ def __compute_timeline_analysis(
     date_list.append(datetime.strftime(date_results[-1], parse_str))
     date_list = sorted(list(set(date_list)))
 
-    # create the result, mapping dates to sdoc counts
-    result = [
-        TimelineAnalysisResult(
-            data_ids=result_dict[date]["data_ids"] if date in result_dict else [],
-            date=date,
-            count=result_dict[date]["count"] if date in result_dict else 0,
+    results: list[list[TimelineAnalysisResult]] = []
+    for concept_rows in result_rows:
+        # map from date (YYYY, YYYY-MM, or YYYY-MM-DD) to list of rows
+        result_dict = {row["date"]: row for row in concept_rows}
+
+        # create the result, mapping dates to sdoc counts
+        results.append(
+            [
+                TimelineAnalysisResult(
+                    data_ids=result_dict[date]["data_ids"]
+                    if date in result_dict
+                    else [],
+                    date=date,
+                    count=result_dict[date]["count"] if date in result_dict else 0,
+                )
+                for date in date_list
+            ]
         )
-        for date in date_list
-    ]
 
-    return result
+    return results
 
 
 def preprend_zero(x: int):
     return "0" + str(x) if x < 10 else str(x)
 
 
+def __format_date(date_parts) -> str:
+    return "-".join(map(lambda x: preprend_zero(x), date_parts))
+
+
+def __concepts_filter(filters: list[Filter]) -> Filter:
+    """Combines the concept filters, so that the query only considers rows that match at least one concept"""
+    if len(filters) == 1:
+        return filters[0]
+    for filter in filters:
+        if len(filter.items) == 0:
+            # this concept matches everything
+            return filter
+    return Filter.model_construct(
+        id="timeline_analysis_concepts",
+        items=list(filters),
+        logic_operator=LogicalOperator.or_,
+    )
+
+
+def __concept_conditions(filters: list[Filter], subquery_dict) -> list:
+    """The conditions of the FILTER (WHERE ...) clauses of the concept aggregations (None = all rows)"""
+    return [
+        filter.get_sqlalchemy_expression(subquery_dict)
+        if len(filter.items) > 0
+        else None
+        for filter in filters
+    ]
+
+
 def __sdoc_timeline_analysis(
     db: Session,
     project_id: int,
     group_by: DateGroupBy,
     project_metadata_id: int,
-    filter: Filter[SdocColumns],
-) -> list[TimelineAnalysisRow]:
-    builder = SearchBuilder(db, filter, sorts=[])
+    filters: list[Filter[SdocColumns]],
+) -> list[list[TimelineAnalysisRow]]:
+    builder = SearchBuilder(db, __concepts_filter(filters), sorts=[])
 
     date_metadata = aliased(SourceDocumentMetadataORM)
     subquery = (
@@ -324,10 +415,13 @@ def __sdoc_timeline_analysis(
         .build_subquery()
     )
 
-    sdoc_ids_agg = aggregate_ids(SourceDocumentORM.id, label="sdoc_ids")
+    conditions = __concept_conditions(filters, subquery.c)
     builder.init_query(
         db.query(
-            sdoc_ids_agg,
+            *[
+                aggregate_ids(SourceDocumentORM.id, label=f"sdoc_ids_{i}", where=cond)
+                for i, cond in enumerate(conditions)
+            ],
             *group_by.apply(subquery.c["date"]),  # type: ignore
         )
         .join(subquery, SourceDocumentORM.id == subquery.c.id)
@@ -339,14 +433,19 @@ def __sdoc_timeline_analysis(
         page_size=None,
     )
 
-    # convert the result to a list of TimelineAnalysisRow
+    # convert the result to a list of TimelineAnalysisRow per concept
+    n = len(filters)
     return [
-        TimelineAnalysisRow(
-            data_ids=row[0],
-            date="-".join(map(lambda x: preprend_zero(x), row[1:])),
-            count=len(row[0]),
-        )
-        for row in result_rows
+        [
+            TimelineAnalysisRow(
+                data_ids=row[i],
+                date=__format_date(row[n:]),
+                count=len(row[i]),
+            )
+            for row in result_rows
+            if row[i]
+        ]
+        for i in range(n)
     ]
 
 
@@ -355,87 +454,24 @@ def __sent_anno_timeline_analysis(
     project_id: int,
     group_by: DateGroupBy,
     project_metadata_id: int,
-    filter: Filter,
+    filters: list[Filter],
     annotation_aggregation_type: TAAnnotationAggregationType,
-) -> list[TimelineAnalysisRow]:
+) -> list[list[TimelineAnalysisRow]]:
     # project_metadata_id has to refer to a DATE metadata
     match annotation_aggregation_type:
         case TAAnnotationAggregationType.UNIT:
             # UNIT = Count sentences
-
-            builder = SearchBuilder(db, filter, sorts=[])
-            date_metadata = aliased(SourceDocumentMetadataORM)
-            subquery = (
-                builder.init_subquery(
-                    db.query(
-                        SentenceAnnotationORM.id,
-                        date_metadata.date_value.label("date"),
-                    )
-                    .group_by(SentenceAnnotationORM.id, date_metadata.date_value)
-                    .filter(
-                        SourceDocumentORM.project_id == project_id,
-                    )
-                )
-                ._join_subquery(
-                    AnnotationDocumentORM,
-                    AnnotationDocumentORM.id
-                    == SentenceAnnotationORM.annotation_document_id,
-                )
-                ._join_subquery(
-                    SourceDocumentORM,
-                    SourceDocumentORM.id == AnnotationDocumentORM.source_document_id,
-                )
-                ._join_subquery(
-                    date_metadata,
-                    (SourceDocumentORM.id == date_metadata.source_document_id)
-                    & (date_metadata.project_metadata_id == project_metadata_id)
-                    & (date_metadata.date_value.isnot(None)),
-                )
-                .build_subquery()
-            )
-
-            sent_anno_ids = aggregate_ids(
-                SentenceAnnotationORM.id, label="sent_anno_ids"
-            )
-            builder.init_query(
-                db.query(
-                    sent_anno_ids,
-                    *group_by.apply(subquery.c["date"]),  # type: ignore
-                )
-                .join(subquery, SentenceAnnotationORM.id == subquery.c.id)
-                .group_by(*group_by.apply(column=subquery.c["date"]))  # type: ignore
-            ).build_query()
-
-            result_rows, _ = builder.execute_query(
-                page_number=None,
-                page_size=None,
+            return __anno_annotation_timeline_analysis(
+                db=db,
+                project_id=project_id,
+                group_by=group_by,
+                project_metadata_id=project_metadata_id,
+                filters=filters,
+                annotation_orm=SentenceAnnotationORM,
+                unit_length=SentenceAnnotationORM.sentence_id_end
+                - SentenceAnnotationORM.sentence_id_start
+                + 1,
             )
-            result = [
-                TimelineAnalysisRow(
-                    data_ids=row[0],
-                    date="-".join(map(lambda x: preprend_zero(x), row[1:])),
-                    count=-1,  # we need to update this in the next step
-                )
-                for row in result_rows
-            ]
-
-            # Create a mapping of sent_anno_id to number of sentences
-            sent_anno_ids = [data_id for row in result for data_id in row["data_ids"]]
-            sent_annos = crud_sentence_anno.read_by_ids(db=db, ids=sent_anno_ids)
-            sent_annos2num_sents = {
-                sent_anno.id: sent_anno.sentence_id_end
-                - sent_anno.sentence_id_start
-                + 1
-                for sent_anno in sent_annos
-            }
-
-            # Update the count of the result
-            for res in result:
-                res["count"] = sum(
-                    sent_annos2num_sents.get(sent_anno_id, 0)
-                    for sent_anno_id in res["data_ids"]
-                )
-            return result
 
         case TAAnnotationAggregationType.ANNOTATION:
             return __anno_annotation_timeline_analysis(
@@ -443,7 +479,7 @@ def __sent_anno_timeline_analysis(
                 project_id=project_id,
                 group_by=group_by,
                 project_metadata_id=project_metadata_id,
-                filter=filter,
+                filters=filters,
                 annotation_orm=SentenceAnnotationORM,
             )
 
@@ -453,7 +489,7 @@ def __sent_anno_timeline_analysis(
                 project_id=project_id,
                 group_by=group_by,
                 project_metadata_id=project_metadata_id,
-                filter=filter,
+                filters=filters,
                 annotation_orm=SentenceAnnotationORM,
             )
 
@@ -463,83 +499,24 @@ def __span_anno_timeline_analysis(
     project_id: int,
     group_by: DateGroupBy,
     project_metadata_id: int,
-    filter: Filter,
+    filters: list[Filter],
     annotation_aggregation_type: TAAnnotationAggregationType,
-) -> list[TimelineAnalysisRow]:
+) -> list[list[TimelineAnalysisRow]]:
     # project_metadata_id has to refer to a DATE metadata
     match annotation_aggregation_type:
         case TAAnnotationAggregationType.UNIT:
-            # UNIT = Count sentences
-
-            builder = SearchBuilder(db, filter, sorts=[])
-            date_metadata = aliased(SourceDocumentMetadataORM)
-            subquery = (
-                builder.init_subquery(
-                    db.query(
-                        SpanAnnotationORM.id,
-                        date_metadata.date_value.label("date"),
-                    )
-                    .group_by(SpanAnnotationORM.id, date_metadata.date_value)
-                    .filter(
-                        SourceDocumentORM.project_id == project_id,
-                    )
-                )
-                ._join_subquery(
-                    AnnotationDocumentORM,
-                    AnnotationDocumentORM.id
-                    == SpanAnnotationORM.annotation_document_id,
-                )
-                ._join_subquery(
-                    SourceDocumentORM,
-                    SourceDocumentORM.id == AnnotationDocumentORM.source_document_id,
-                )
-                ._join_subquery(
-                    date_metadata,
-                    (SourceDocumentORM.id == date_metadata.source_document_id)
-                    & (date_metadata.project_metadata_id == project_metadata_id)
-                    & (date_metadata.date_value.isnot(None)),
-                )
-                .build_subquery()
-            )
-
-            span_anno_ids = aggregate_ids(SpanAnnotationORM.id, label="span_anno_ids")
-            builder.init_query(
-                db.query(
-                    span_anno_ids,
-                    *group_by.apply(subquery.c["date"]),  # type: ignore
-                )
-                .join(subquery, SpanAnnotationORM.id == subquery.c.id)
-                .group_by(*group_by.apply(column=subquery.c["date"]))  # type: ignore
-            ).build_query()
-
-            result_rows, _ = builder.execute_query(
-                page_number=None,
-                page_size=None,
+            # UNIT = Count words
+            return __anno_annotation_timeline_analysis(
+                db=db,
+                project_id=project_id,
+                group_by=group_by,
+                project_metadata_id=project_metadata_id,
+                filters=filters,
+                annotation_orm=SpanAnnotationORM,
+                unit_length=SpanAnnotationORM.end_token
+                - SpanAnnotationORM.begin_token
+                + 1,
             )
-            result = [
-                TimelineAnalysisRow(
-                    data_ids=row[0],
-                    date="-".join(map(lambda x: preprend_zero(x), row[1:])),
-                    count=-1,  # we need to update this in the next step
-                )
-                for row in result_rows
-            ]
-
-            # Create a mapping of span_anno_id to number of words
-            span_anno_ids = [data_id for row in result for data_id in row["data_ids"]]
-            span_annos = crud_span_anno.read_by_ids(db=db, ids=span_anno_ids)
-            span_annos2num_sents = {
-                span_anno.id: span_anno.end_token - span_anno.begin_token + 1
-                for span_anno in span_annos
-            }
-
-            # Update the count of the result
-            for res in result:
-                res["count"] = sum(
-                    span_annos2num_sents.get(span_anno_id, 0)
-                    for span_anno_id in res["data_ids"]
-                )
-            return result
 
         case TAAnnotationAggregationType.ANNOTATION:
             return __anno_annotation_timeline_analysis(
@@ -547,7 +524,7 @@ def __span_anno_timeline_analysis(
                 project_id=project_id,
                 group_by=group_by,
                 project_metadata_id=project_metadata_id,
-                filter=filter,
+                filters=filters,
                 annotation_orm=SpanAnnotationORM,
             )
 
@@ -557,7 +534,7 @@ def __span_anno_timeline_analysis(
                 project_id=project_id,
                 group_by=group_by,
                 project_metadata_id=project_metadata_id,
-                filter=filter,
+                filters=filters,
                 annotation_orm=SpanAnnotationORM,
             )
 
@@ -567,29 +544,19 @@ def __bbox_anno_timeline_analysis(
     project_id: int,
     group_by: DateGroupBy,
     project_metadata_id: int,
-    filter: Filter,
+    filters: list[Filter],
     annotation_aggregation_type: TAAnnotationAggregationType,
-) -> list[TimelineAnalysisRow]:
+) -> list[list[TimelineAnalysisRow]]:
     # project_metadata_id has to refer to a DATE metadata
     match annotation_aggregation_type:
-        case TAAnnotationAggregationType.UNIT:
+        case TAAnnotationAggregationType.UNIT | TAAnnotationAggregationType.ANNOTATION:
             # UNIT = ANNO. What is Unit for BBox Annotations?
             return __anno_annotation_timeline_analysis(
                 db=db,
                 project_id=project_id,
                 group_by=group_by,
                 project_metadata_id=project_metadata_id,
-                filter=filter,
-                annotation_orm=BBoxAnnotationORM,
-            )
-
-        case TAAnnotationAggregationType.ANNOTATION:
-            return __anno_annotation_timeline_analysis(
-                db=db,
-                project_id=project_id,
-                group_by=group_by,
-                project_metadata_id=project_metadata_id,
-                filter=filter,
+                filters=filters,
                 annotation_orm=BBoxAnnotationORM,
             )
 
@@ -599,7 +566,7 @@ def __bbox_anno_timeline_analysis(
                 project_id=project_id,
                 group_by=group_by,
                 project_metadata_id=project_metadata_id,
-                filter=filter,
+                filters=filters,
                 annotation_orm=BBoxAnnotationORM,
             )
 
@@ -609,14 +576,15 @@ def __anno_annotation_timeline_analysis(
     project_id: int,
     group_by: DateGroupBy,
     project_metadata_id: int,
-    filter: Filter,
+    filters: list[Filter],
     annotation_orm: Type[SentenceAnnotationORM]
     | Type[SpanAnnotationORM]
     | Type[BBoxAnnotationORM],
-) -> list[TimelineAnalysisRow]:
-    # ANNOTATION = Count annotations
+    unit_length: ColumnElement[int] | None = None,
+) -> list[list[TimelineAnalysisRow]]:
+    # ANNOTATION = Count annotations, UNIT = Sum of the unit_length of the annotations
 
-    builder = SearchBuilder(db, filter, sorts=[])
+    builder = SearchBuilder(db, __concepts_filter(filters), sorts=[])
     date_metadata = aliased(SourceDocumentMetadataORM)
     subquery = (
         builder.init_subquery(
@@ -646,10 +614,13 @@ def __anno_annotation_timeline_analysis(
         .build_subquery()
     )
 
-    sent_anno_ids = aggregate_ids(annotation_orm.id, label="sent_anno_ids")
+    conditions = __concept_conditions(filters, subquery.c)
     builder.init_query(
         db.query(
-            sent_anno_ids,
+            *[
+                aggregate_ids(annotation_orm.id, label=f"anno_ids_{i}", where=cond)
+                for i, cond in enumerate(conditions)
+            ],
             *group_by.apply(subquery.c["date"]),  # type: ignore
         )
         .join(subquery, annotation_orm.id == subquery.c.id)
@@ -661,14 +632,46 @@ def __anno_annotation_timeline_analysis(
         page_size=None,
     )
 
-    return [
-        TimelineAnalysisRow(
-            data_ids=row[0],
-            date="-".join(map(lambda x: preprend_zero(x), row[1:])),
-            count=len(row[0]),
-        )
-        for row in result_rows
+    n = len(filters)
+    results = [
+        [
+            TimelineAnalysisRow(
+                data_ids=row[i],
+                date=__format_date(row[n:]),
+                count=len(row[i]),
+            )
+            for row in result_rows
+            if row[i]
+        ]
+        for i in range(n)
     ]
+    if unit_length is None:
+        return results
+
+    # Create a mapping of anno_id to number of units (once for all concepts, reading only the needed columns)
+    anno_ids = list(
+        {
+            data_id
+            for concept_rows in results
+            for row in concept_rows
+            for data_id in row["data_ids"]
+        }
+    )
+    anno_id2num_units: dict[int, int] = {}
+    for i in range(0, len(anno_ids), BATCH_SIZE):
+        anno_id2num_units.update(
+            db.query(annotation_orm.id, unit_length)
+            .filter(annotation_orm.id.in_(anno_ids[i : i + BATCH_SIZE]))
+            .all()  # type: ignore
+        )
+
+    # Update the count of the result
+    for concept_rows in results:
+        for row in concept_rows:
+            row["count"] = sum(
+                anno_id2num_units.get(anno_id, 0) for anno_id in row["data_ids"]
+            )
+    return results
 
 
 def __anno_document_timeline_analysis(
@@ -676,14 +679,14 @@ def __anno_document_timeline_analysis(
     project_id: int,
     group_by: DateGroupBy,
     project_metadata_id: int,
-    filter: Filter,
+    filters: list[Filter],
     annotation_orm: Type[SentenceAnnotationORM]
     | Type[SpanAnnotationORM]
     | Type[BBoxAnnotationORM],
-) -> list[TimelineAnalysisRow]:
+) -> list[list[TimelineAnalysisRow]]:
     # DOCUMENT = Count documents
 
-    builder = SearchBuilder(db, filter, sorts=[])
+    builder = SearchBuilder(db, __concepts_filter(filters), sorts=[])
     date_metadata = aliased(SourceDocumentMetadataORM)
     subquery = (
         builder.init_subquery(
@@ -718,14 +721,22 @@ def __anno_document_timeline_analysis(
         .build_subquery()
     )
 
-    sdoc_ids_agg = aggregate_ids(
-        AnnotationDocumentORM.source_document_id, label="sdoc_ids"
-    )
-    sent_anno_ids = aggregate_ids(annotation_orm.id, label="sent_anno_ids")
+    conditions = __concept_conditions(filters, subquery.c)
+    aggregations = []
+    for i, cond in enumerate(conditions):
+        aggregations.append(
+            aggregate_ids(
+                AnnotationDocumentORM.source_document_id,
+                label=f"sdoc_ids_{i}",
+                where=cond,
+            )
+        )
+        aggregations.append(
+            aggregate_ids(annotation_orm.id, label=f"anno_ids_{i}", where=cond)
+        )
     builder.init_query(
         db.query(
-            sdoc_ids_agg,
-            sent_anno_ids,
+            *aggregations,
             *group_by.apply(subquery.c["date"]),  # type: ignore
         ).group_by(*group_by.apply(column=subquery.c["date"]))  # type: ignore
     )._join_query(
@@ -744,11 +755,16 @@ def __anno_document_timeline_analysis(
         page_size=None,
     )
 
+    n = len(filters)
     return [
-        TimelineAnalysisRow(
-            data_ids=row[1],
-            date="-".join(map(lambda x: preprend_zero(x), row[2:])),
-            count=len(row[0]),
-        )
-        for row in result_rows
+        [
+            TimelineAnalysisRow(
+                data_ids=row[2 * i + 1],
+                date=__format_date(row[2 * n :]),
+                count=len(row[2 * i]),
+            )
+            for row in result_rows
+            if row[2 * i + 1]
+        ]
+        for i in range(n)
     ]
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from common.crud_enum import Crud
-from common.dependencies import get_current_user, get_db_session
+from common.dependencies import get_current_principal, get_db_session
 from core.auth.authz_user import AuthzUser
 from modules.whiteboard.whiteboard_crud import crud_whiteboard
 from modules.whiteboard.whiteboard_dto import (
@@ -15,7 +15,9 @@ from modules.whiteboard.whiteboard_dto import (
 )
 
 router = APIRouter(
-    prefix="/whiteboard", dependencies=[Depends(get_current_user)], tags=["whiteboard"]
+    prefix="/whiteboard",
+    dependencies=[Depends(get_current_principal)],
+    tags=["whiteboard"],
 )
 
 
@@ -50,6 +50,16 @@ class CRUDWordFrequency(
         )
         return [WordFrequencyRead.model_validate(wf) for wf in wf_orms]
 
+    def read_by_sdoc_ids(
+        self, db: Session, *, sdoc_ids: list[int]
+    ) -> list[WordFrequencyRead]:
+        wf_orms = (
+            db.query(WordFrequencyORM)
+            .filter(WordFrequencyORM.sdoc_id.in_(sdoc_ids))
+            .all()
+        )
+        return [WordFrequencyRead.model_validate(wf) for wf in wf_orms]
+
     ### UPDATE OPERATIONS ###
 
     def update(self, db: Session, *, id: int, update_dto):
@@ -1,9 +1,12 @@
-from typing import Generic, Type, TypeVar
+import datetime
+import io
+from typing import Any, Generic, Type, TypeVar
 
 from fastapi import status
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import delete
+from sqlalchemy import and_, bindparam, cast, delete, func, insert, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session
 
 from common.exception_handler import exception_handler
@@ -21,6 +24,45 @@ class UpdateNotAllowed(BaseModel):
     pass
 
 
+def _copy_text(value: Any) -> str:
+    """Formats a value for the text format of Postgres' COPY"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        value = _array_literal(value)
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _array_literal(values: list[Any] | tuple[Any, ...]) -> str:
+    """Formats a (nested) list as Postgres array literal, e.g. [1, None, 3] -> {1,NULL,3}"""
+    elements: list[str] = []
+    for value in values:
+        if value is None:
+            elements.append("NULL")
+        elif isinstance(value, (list, tuple)):
+            elements.append(_array_literal(value))
+        elif isinstance(value, bool):
+            elements.append("t" if value else "f")
+        elif isinstance(value, (int, float)):
+            elements.append(str(value))
+        else:
+            if isinstance(value, (datetime.date, datetime.time)):
+                value = value.isoformat()
+            escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+            elements.append(f'"{escaped}"')
+    return "{" + ",".join(elements) + "}"
+
+
 @exception_handler(status.HTTP_404_NOT_FOUND)
 class NoSuchElementError(Exception):
     def __init__(self, model: Type[ORMModelType], **kwargs):
@@ -117,6 +159,82 @@ class CRUDBase(Generic[ORMModelType, CreateDTOType, UpdateDTOType]):
         db.flush()
         return db_objs
 
+    def create_multi_ids(
+        self,
+        db: Session,
+        *,
+        create_dtos: list[CreateDTOType],
+    ) -> list[int]:
+        """
+        Bulk variant of create_multi for many rows: Inserts the rows with multi-row INSERT ... RETURNING statements
+        without constructing ORM objects. Returns the ids of the created rows (in the order of the create_dtos).
+        """
+        return self._create_rows(db, rows=[dto.model_dump() for dto in create_dtos])
+
+    def _create_rows(self, db: Session, *, rows: list[dict[str, Any]]) -> list[int]:
+        if len(rows) == 0:
+            return []
+        result = db.execute(
+            insert(self.model).returning(self.model.id, sort_by_parameter_order=True),
+            rows,
+        )
+        return list(result.scalars())
+
+    def create_multi_copy(
+        self,
+        db: Session,
+        *,
+        create_dtos: list[CreateDTOType],
+    ) -> int:
+        """
+        Bulk variant of create_multi for very many rows, that are not needed afterwards (no ids are returned):
+        Streams the rows into the table with Postgres' COPY from an in-memory buffer.
+        Only server-side defaults are applied to missing columns. Returns the number of created rows.
+        """
+        if len(create_dtos) == 0:
+            return 0
+        rows = [dto.model_dump() for dto in create_dtos]
+        table = self.model.__table__
+        names = list(rows[0].keys())
+        unknown = [name for name in names if name not in table.columns]
+        if len(unknown) > 0:
+            raise ValueError(f"Model {self.model.__name__} has no columns {unknown}")
+        for table_column in table.columns:
+            if table_column.name not in names and table_column.default is not None:
+                raise ValueError(
+                    f"COPY does not apply the client-side default of {self.model.__name__}.{table_column.name}"
+                )
+
+        # convert the values like the ORM would (e.g. enums)
+        dialect = db.get_bind().dialect
+        processors = [
+            table.columns[name].type.bind_processor(dialect) for name in names
+        ]
+        buffer = io.StringIO()
+        for row in rows:
+            values = [row[name] for name in names]
+            buffer.write(
+                "\t".join(
+                    _copy_text(processor(value) if processor is not None else value)
+                    for processor, value in zip(processors, values)
+                )
+                + "\n"
+            )
+        buffer.seek(0)
+
+        # pending ORM changes (e.g. referenced rows) must be written before
+        db.flush()
+        columns = ", ".join(dialect.identifier_preparer.quote(name) for name in names)
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {dialect.identifier_preparer.format_table(table)} ({columns}) FROM STDIN",
+                buffer,
+            )
+        finally:
+            cursor.close()
+        return len(rows)
+
     def update(
         self,
         db: Session,
@@ -160,6 +278,131 @@ class CRUDBase(Generic[ORMModelType, CreateDTOType, UpdateDTOType]):
         db.flush()
         return db_objects
 
+    def update_multi_values(
+        self,
+        db: Session,
+        *,
+        ids: list[Any],
+        values_by_column: dict[str, list[Any]],
+    ) -> int:
+        """
+        Set-based variant of update_multi, that does not load the rows:
+        Updates the columns with one UPDATE ... FROM unnest(<arrays>) statement per batch.
+
+        **Parameters**
+
+        * `ids`: Primary keys of the rows to update (tuples in primary key column order for composite primary keys)
+        * `values_by_column`: The new values (one per id) by column name. Primary key columns can be updated, too.
+
+        Returns the number of updated rows.
+        """
+        for name, column_values in values_by_column.items():
+            if len(column_values) != len(ids):
+                raise ValueError(
+                    f"The number of IDs and values must equal! {len(ids)} IDs and {len(column_values)} values received for {name}."
+                )
+        if len(ids) == 0 or len(values_by_column) == 0:
+            return 0
+
+        # pending ORM changes of the rows must be written before
+        db.flush()
+        table = self.model.__table__
+        key_columns = list(table.primary_key.columns)
+        value_columns = [table.columns[name] for name in values_by_column.keys()]
+        keys = [id if isinstance(id, tuple) else (id,) for id in ids]
+        columns = [list(key_column) for key_column in zip(*keys)] + [
+            list(column_values) for column_values in values_by_column.values()
+        ]
+
+        # the arrays are bound as parameters, so that the statement is compiled (and cached) only once
+        key_names = [f"key_{j}" for j in range(len(key_columns))]
+        value_names = [f"value_{j}" for j in range(len(value_columns))]
+        new_values = (
+            func.unnest(
+                *[
+                    bindparam(name, type_=ARRAY(c.type))
+                    for name, c in zip(
+                        key_names + value_names, key_columns + value_columns
+                    )
+                ]
+            )
+            .table_valued(*key_names, *value_names)
+            .render_derived(name="new_values")
+        )
+        stmt = (
+            update(table)
+            .where(
+                and_(
+                    *[
+                        c == cast(new_values.c[name], c.type)
+                        for name, c in zip(key_names, key_columns)
+                    ]
+                )
+            )
+            .values(
+                {
+                    c: cast(new_values.c[name], c.type)
+                    for name, c in zip(value_names, value_columns)
+                }
+            )
+        )
+
+        total_updated_count = 0
+        for i in range(0, len(ids), BATCH_SIZE):
+            total_updated_count += db.execute(
+                stmt,
+                {
+                    name: column_values[i : i + BATCH_SIZE]
+                    for name, column_values in zip(key_names + value_names, columns)
+                },
+            ).rowcount
+
+        # the session does not know about the update: refresh the affected objects on their next access
+        updated_keys = set(keys)
+        changes_primary_key = any(c.primary_key for c in value_columns)
+        for identity_key, db_obj in list(db.identity_map.items()):
+            if identity_key[0] is self.model and identity_key[1] in updated_keys:
+                if changes_primary_key:
+                    db.expunge(db_obj)
+                else:
+                    db.expire(db_obj)
+
+        return total_updated_count
+
+    def update_multi_values_from_dtos(
+        self,
+        db: Session,
+        *,
+        ids: list[Any],
+        update_dtos: list[UpdateDTOType],
+    ) -> int:
+        """
+        Variant of update_multi_values that takes one update DTO per id (only the set fields are updated),
+        e.g. for the update_multi of models with composite primary keys.
+        Returns the number of updated rows.
+        """
+        if len(ids) != len(update_dtos):
+            raise ValueError(
+                f"The number of IDs and Update DTO objects must equal! {len(ids)} IDs and {len(update_dtos)} Update DTOs received."
+            )
+
+        # one update_multi_values per set of updated fields
+        update_datas = [dto.model_dump(exclude_unset=True) for dto in update_dtos]
+        fields2indices: dict[tuple[str, ...], list[int]] = {}
+        for i, update_data in enumerate(update_datas):
+            fields2indices.setdefault(tuple(sorted(update_data)), []).append(i)
+
+        total_updated_count = 0
+        for fields, indices in fields2indices.items():
+            total_updated_count += self.update_multi_values(
+                db,
+                ids=[ids[i] for i in indices],
+                values_by_column={
+                    field: [update_datas[i][field] for i in indices] for field in fields
+                },
+            )
+        return total_updated_count
+
     def delete(
         self,
         db: Session,
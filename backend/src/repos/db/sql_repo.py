@@ -1,3 +1,4 @@
+import os
 from contextlib import contextmanager
 from typing import Generator
 
@@ -28,6 +29,9 @@ class SQLRepo(metaclass=SingletonMeta):
             logger.info("Successfully established connection to PostgresSQL!")
             cls.engine: Engine = engine
             cls.session_maker = sessionmaker(autoflush=False, bind=engine)
+            # forked children (e.g. parallel import stages) must open their own connections,
+            # the pooled connections belong to the parent process
+            os.register_at_fork(after_in_child=lambda: engine.dispose(close=False))
 
             if kwargs.get("remove_if_exists") is True:
                 if database_exists(cls.engine.url):
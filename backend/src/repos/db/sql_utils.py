@@ -3,9 +3,13 @@ from sqlalchemy.dialects.postgresql import ARRAY, array_agg
 from sqlalchemy.orm import InstrumentedAttribute
 
 
-def aggregate_ids(column: InstrumentedAttribute, label: str):
+def aggregate_ids(column: InstrumentedAttribute, label: str, where=None):
+    """Aggregates the distinct ids of the group. If where is given, only the ids of rows matching it (FILTER (WHERE ...))"""
+    agg = array_agg(func.distinct(column), type_=ARRAY(Integer))
+    if where is not None:
+        agg = agg.filter(where)
     return func.array_remove(
-        array_agg(func.distinct(column), type_=ARRAY(Integer)),
+        agg,
         None,
         type_=ARRAY(Integer),
     ).label(label)
@@ -0,0 +1,105 @@
+import time
+from typing import Any
+
+from elasticsearch import Elasticsearch, helpers
+from loguru import logger
+
+from config import conf
+
+
+class ElasticBulkIndexingError(Exception):
+    def __init__(self, errors: list[dict[str, Any]]):
+        self.errors = errors
+        super().__init__(
+            f"{len(errors)} documents could not be indexed, e.g.: {errors[:3]}"
+        )
+
+
+class ElasticBulkIndexer:
+    """
+    Buffers documents and sends them to ElasticSearch with the bulk API instead of one request per document.
+    The buffer is flushed when it holds chunk_size documents, when the oldest buffered document
+    is older than flush_interval_s (checked whenever a document is added), and when the indexer is closed.
+
+    Usage:
+        with ElasticBulkIndexer(client) as indexer:
+            for ...:
+                indexer.index(index_name=..., id=..., document=...)
+    """
+
+    def __init__(
+        self,
+        client: Elasticsearch,
+        chunk_size: int = conf.elasticsearch.bulk.chunk_size,
+        max_chunk_bytes: int = conf.elasticsearch.bulk.max_chunk_bytes,
+        flush_interval_s: float = conf.elasticsearch.bulk.flush_interval_s,
+        thread_count: int = conf.elasticsearch.bulk.thread_count,
+    ):
+        self.client = client
+        self.chunk_size = chunk_size
+        self.max_chunk_bytes = max_chunk_bytes
+        self.flush_interval_s = flush_interval_s
+        self.thread_count = thread_count
+
+        self.num_indexed = 0
+        self._actions: list[dict[str, Any]] = []
+        self._buffered_since: float | None = None
+
+    def __enter__(self) -> "ElasticBulkIndexer":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # do not send the buffered documents if the indexing failed
+        if exc_type is None:
+            self.flush()
+
+    def index(self, index_name: str, id: int, document: dict[str, Any]) -> None:
+        self._actions.append(
+            {
+                "_op_type": "index",
+                "_index": index_name,
+                "_id": str(id),
+                "_source": document,
+            }
+        )
+        if self._buffered_since is None:
+            self._buffered_since = time.monotonic()
+
+        if (
+            len(self._actions) >= self.chunk_size
+            or time.monotonic() - self._buffered_since >= self.flush_interval_s
+        ):
+            self.flush()
+
+    def flush(self) -> int:
+        """Sends all buffered documents and returns their number. Raises if any document could not be indexed."""
+        if len(self._actions) == 0:
+            return 0
+        actions = self._actions
+        self._actions = []
+        self._buffered_since = None
+
+        if self.thread_count > 1:
+            results = helpers.parallel_bulk(
+                self.client,
+                actions,
+                thread_count=self.thread_count,
+                chunk_size=self.chunk_size,
+                max_chunk_bytes=self.max_chunk_bytes,
+                raise_on_error=False,
+            )
+        else:
+            results = helpers.streaming_bulk(
+                self.client,
+                actions,
+                chunk_size=self.chunk_size,
+                max_chunk_bytes=self.max_chunk_bytes,
+                raise_on_error=False,
+            )
+        errors = [info for ok, info in results if not ok]
+
+        self.num_indexed += len(actions) - len(errors)
+        if len(errors) > 0:
+            raise ElasticBulkIndexingError(errors)
+        logger.debug(f"Bulk indexed {len(actions)} documents")
+        return len(actions)
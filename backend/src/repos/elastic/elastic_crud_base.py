@@ -1,10 +1,13 @@
-from typing import Any, Generic, TypeVar
+from itertools import islice
+from typing import Any, Generic, Iterable, Iterator, TypeVar
 
-from elasticsearch import Elasticsearch, helpers
+from elasticsearch import Elasticsearch
 from fastapi import status
 from pydantic import BaseModel
 
 from common.exception_handler import exception_handler
+from config import conf
+from repos.elastic.elastic_bulk_indexer import ElasticBulkIndexer
 from repos.elastic.elastic_dto_base import (
     ElasticSearchHit,
     ElasticSearchModelBase,
@@ -17,6 +20,33 @@ CreateDTOType = TypeVar("CreateDTOType", bound=ElasticSearchModelBase)
 UpdateDTOType = TypeVar("UpdateDTOType", bound=BaseModel)
 IndexType = TypeVar("IndexType", bound=IndexBase)
 
+# ElasticSearch limits from + size of a search to index.max_result_window
+MAX_RESULT_WINDOW = 10000
+# ElasticSearch limits the number of terms of a terms query to index.max_terms_count
+MAX_TERMS_COUNT = 65536
+# how long a point in time is kept alive between two requests
+PIT_KEEP_ALIVE = "5m"
+
+
+def terms_filter(field: str, values: Iterable[int]) -> dict[str, Any]:
+    """
+    Returns a query that matches all documents whose field has one of the values.
+    Large sets of values are split into multiple terms queries, so that they are not limited by MAX_TERMS_COUNT.
+    Use it in filter context, so that it does not influence the scores.
+    """
+    values = list(values)
+    if len(values) <= MAX_TERMS_COUNT:
+        return {"terms": {field: values}}
+    return {
+        "bool": {
+            "should": [
+                {"terms": {field: values[i : i + MAX_TERMS_COUNT]}}
+                for i in range(0, len(values), MAX_TERMS_COUNT)
+            ],
+            "minimum_should_match": 1,
+        }
+    }
+
 
 @exception_handler(status.HTTP_404_NOT_FOUND)
 class NoSuchObjectInElasticSearchError(Exception):
@@ -42,6 +72,33 @@ class ElasticCrudBase(Generic[IndexType, ModelDTOType, CreateDTOType, UpdateDTOT
         )
         return int(res["_id"])
 
+    def create_multi(
+        self,
+        client: Elasticsearch,
+        create_dtos: Iterable[CreateDTOType],
+        proj_id: int,
+        chunk_size: int | None = None,
+        index_name: str | None = None,
+    ) -> int:
+        """
+        Indexes the objects with the bulk API and returns their number.
+        The objects are consumed lazily, so create_dtos can be a generator, e.g. streaming from the database.
+        Raises ElasticBulkIndexingError if any object could not be indexed.
+        chunk_size overrides the configured number of objects per bulk request.
+        index_name overrides the index of the project, e.g. to fill a new index (see IndexBase.rebuild_index).
+        """
+        index_name = index_name or self.index.get_index_name(proj_id)
+        with ElasticBulkIndexer(
+            client, chunk_size=chunk_size or conf.elasticsearch.bulk.chunk_size
+        ) as indexer:
+            for create_dto in create_dtos:
+                indexer.index(
+                    index_name=index_name,
+                    id=create_dto.get_id(),
+                    document=create_dto.model_dump(),
+                )
+        return indexer.num_indexed
+
     def read(self, client: Elasticsearch, id: int, proj_id: int) -> ModelDTOType:
         index_name = self.index.get_index_name(proj_id)
         res = client.get(index=index_name, id=str(id), _source=True)
@@ -78,57 +135,30 @@ class ElasticCrudBase(Generic[IndexType, ModelDTOType, CreateDTOType, UpdateDTOT
     ) -> PaginatedElasticSearchHits:
         """
         Helper function that can be reused to find SDocs or Memos with different queries.
+        Pages beyond the result window of ElasticSearch are fetched with search_after.
         :param query: The ElasticSearch query object in ES Query DSL
         :param skip: The number of skipped elements
         :param limit: The maximum number of returned elements
         :return: A (possibly empty) list of Memo matching the query
         :rtype: PaginatedElasticSearchHits
         """
-        index_name = self.index.get_index_name(proj_id)
-        if not client.indices.exists(index=index_name):
-            raise ValueError(f"ElasticSearch Index '{index_name}' does not exist!")
-
-        if query is None or len(query) < 1:
-            raise ValueError("Query DSL object must not be None or empty!")
+        index_name = self.__check_search(client, proj_id, query)
 
-        if isinstance(limit, int) and (limit > 10000 or limit < 1):
-            raise ValueError("Limit must be a positive Integer smaller than 10000!")
-        elif isinstance(skip, int) and (skip > 10000):
-            raise ValueError(
-                "Skip must be a zero or positive Integer smaller than 10000!"
-            )
+        if isinstance(limit, int) and limit < 1:
+            raise ValueError("Limit must be a positive Integer!")
+        elif isinstance(skip, int) and skip < 0:
+            raise ValueError("Skip must be a zero or positive Integer!")
 
         if limit is None or skip is None:
-            # use scroll api
-            res = list(
-                helpers.scan(
-                    index=index_name,
-                    query={
-                        "query": query,
-                        "_source": False,
-                        "highlight": highlight,
-                    },
-                    client=client,
-                    scroll="10m",
-                    size=10000,
-                    preserve_order=True,
+            # all results
+            hits = list(
+                self.search_iter(
+                    client=client, proj_id=proj_id, query=query, highlight=highlight
                 )
             )
-
-            hits = []
-            for document in res:
-                highlights = (
-                    document["highlight"]["content"] if "highlight" in document else []
-                )
-                es_hit = ElasticSearchHit(
-                    id=document["_id"],
-                    score=document["_score"],
-                    highlights=highlights,
-                )
-                hits.append(es_hit)
             total_results = len(hits)
 
-        else:
+        elif skip + limit <= MAX_RESULT_WINDOW:
             # use search_api
             client_response = client.search(
                 index=index_name,
@@ -137,14 +167,103 @@ class ElasticCrudBase(Generic[IndexType, ModelDTOType, CreateDTOType, UpdateDTOT
                 from_=skip,
                 _source=False,
                 highlight=highlight,
+                track_total_hits=True,
             )
-            hits = []
-            for hit in client_response["hits"]["hits"]:
-                highlights = hit["highlight"]["content"] if "highlight" in hit else []
-                document = ElasticSearchHit(
-                    id=hit["_id"], score=hit["_score"], highlights=highlights
-                )
-                hits.append(document)
+            hits = [self.__to_hit(hit) for hit in client_response["hits"]["hits"]]
             total_results = client_response["hits"]["total"]["value"]
 
+        else:
+            # deep pagination: from + size must not exceed the result window
+            total_results = client.count(index=index_name, body={"query": query})[
+                "count"
+            ]
+            hits = list(
+                islice(
+                    self.search_iter(
+                        client=client,
+                        proj_id=proj_id,
+                        query=query,
+                        highlight=highlight,
+                        skip=skip,
+                        page_size=min(limit, MAX_RESULT_WINDOW),
+                    ),
+                    limit,
+                )
+            )
+
         return PaginatedElasticSearchHits(hits=hits, total_results=total_results)
+
+    def search_iter(
+        self,
+        client: Elasticsearch,
+        proj_id: int,
+        query: dict[str, Any],
+        highlight: dict[str, Any] | None = None,
+        skip: int = 0,
+        page_size: int = MAX_RESULT_WINDOW,
+    ) -> Iterator[ElasticSearchHit]:
+        """
+        Streams all hits of the query ordered by score, e.g. for exports.
+        The hits are fetched page by page with search_after on a point in time,
+        so that the results are consistent, even if the index changes meanwhile.
+        :param query: The ElasticSearch query object in ES Query DSL
+        :param skip: The number of skipped elements
+        :param page_size: The number of hits that are fetched per request
+        """
+        index_name = self.__check_search(client, proj_id, query)
+
+        pit_id = client.open_point_in_time(index=index_name, keep_alive=PIT_KEEP_ALIVE)[
+            "id"
+        ]
+        try:
+            search_after: list[Any] | None = None
+            while True:
+                # skipped hits are fetched in large pages without highlights
+                skipping = skip > 0
+                size = min(skip, MAX_RESULT_WINDOW) if skipping else page_size
+                body: dict[str, Any] = {
+                    "query": query,
+                    "size": size,
+                    "_source": False,
+                    "track_total_hits": False,
+                    "pit": {"id": pit_id, "keep_alive": PIT_KEEP_ALIVE},
+                    # _shard_doc is the cheapest unique tiebreaker within a point in time
+                    "sort": [{"_score": "desc"}, {"_shard_doc": "asc"}],
+                }
+                if highlight is not None and not skipping:
+                    body["highlight"] = highlight
+                if search_after is not None:
+                    body["search_after"] = search_after
+
+                client_response = client.search(body=body)
+                pit_id = client_response.get("pit_id", pit_id)
+                page = client_response["hits"]["hits"]
+                if skipping:
+                    skip -= len(page)
+                else:
+                    for hit in page:
+                        yield self.__to_hit(hit)
+                if len(page) < size:
+                    return
+                search_after = page[-1]["sort"]
+        finally:
+            client.close_point_in_time(body={"id": pit_id})
+
+    def __check_search(
+        self, client: Elasticsearch, proj_id: int, query: dict[str, Any]
+    ) -> str:
+        index_name = self.index.get_index_name(proj_id)
+        if not client.indices.exists(index=index_name):
+            raise ValueError(f"ElasticSearch Index '{index_name}' does not exist!")
+
+        if query is None or len(query) < 1:
+            raise ValueError("Query DSL object must not be None or empty!")
+
+        return index_name
+
+    @staticmethod
+    def __to_hit(hit: dict[str, Any]) -> ElasticSearchHit:
+        highlights = hit["highlight"]["content"] if "highlight" in hit else []
+        return ElasticSearchHit(
+            id=hit["_id"], score=hit["_score"], highlights=highlights
+        )
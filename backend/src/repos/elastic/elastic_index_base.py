@@ -1,4 +1,6 @@
-from typing import Any
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
 
 from elasticsearch import Elasticsearch
 
@@ -15,6 +17,17 @@ class IndexBase:
     def get_index_name(cls, proj_id: int) -> str:
         return f"{conf.elasticsearch.index_prefix}_project_{proj_id}_{cls.name}"
 
+    @classmethod
+    def get_concrete_index_names(cls, client: Elasticsearch, proj_id: int) -> list[str]:
+        """
+        Returns the indices behind the index name of the project: the index itself or,
+        after a rebuild (see rebuild_index), the index the alias points to.
+        """
+        index_name = cls.get_index_name(proj_id)
+        if not client.indices.exists(index=index_name):
+            return []
+        return list(client.indices.get(index=index_name).keys())
+
     @classmethod
     def create_index(
         cls,
@@ -23,8 +36,8 @@ class IndexBase:
         replace_if_exists: bool = False,
     ):
         index_name = cls.get_index_name(proj_id)
-        if replace_if_exists and client.indices.exists(index=index_name):
-            client.indices.delete(index=index_name)
+        if replace_if_exists:
+            cls.delete_index(client, proj_id)
         if not client.indices.exists(index=index_name):
             client.indices.create(
                 index=index_name, mappings=cls.mappings, settings=cls.settings
@@ -32,6 +45,78 @@ class IndexBase:
 
     @classmethod
     def delete_index(cls, client: Elasticsearch, proj_id: int):
-        index_name = cls.get_index_name(proj_id)
-        if client.indices.exists(index=index_name):
+        # an alias cannot be deleted like an index, its index has to be deleted
+        for index_name in cls.get_concrete_index_names(client, proj_id):
             client.indices.delete(index=index_name)
+
+    @classmethod
+    @contextmanager
+    def rebuild_index(cls, client: Elasticsearch, proj_id: int) -> Iterator[str]:
+        """
+        Rebuilds the index of the project while the old index stays searchable.
+        Yields the name of a new, versioned index that has to be filled (its refresh interval is relaxed).
+        Afterwards, the index name of the project is switched to the new index atomically (it becomes an alias)
+        and the old index is deleted. If filling the new index fails, it is deleted and the old index stays in use.
+        """
+        alias = cls.get_index_name(proj_id)
+        new_index_name = f"{alias}_{time.time_ns()}"
+        client.indices.create(
+            index=new_index_name, mappings=cls.mappings, settings=cls.settings
+        )
+        client.indices.put_settings(
+            index=new_index_name,
+            body={
+                "index": {"refresh_interval": conf.elasticsearch.bulk.refresh_interval}
+            },
+        )
+        try:
+            yield new_index_name
+        except BaseException:
+            client.indices.delete(index=new_index_name)
+            raise
+        client.indices.put_settings(
+            index=new_index_name, body={"index": {"refresh_interval": None}}
+        )
+        client.indices.refresh(index=new_index_name)
+
+        old_index_names = cls.get_concrete_index_names(client, proj_id)
+        actions: list[dict[str, Any]] = [
+            {"add": {"index": new_index_name, "alias": alias}}
+        ]
+        if alias in old_index_names:
+            # the old index was created with the name of the alias: it is replaced by the alias
+            actions.append({"remove_index": {"index": alias}})
+        else:
+            actions.extend(
+                {"remove": {"index": index_name, "alias": alias}}
+                for index_name in old_index_names
+            )
+        client.indices.update_aliases(body={"actions": actions})
+        for index_name in old_index_names:
+            if index_name != alias:
+                client.indices.delete(index=index_name)
+
+    @classmethod
+    @contextmanager
+    def bulk_indexing(cls, client: Elasticsearch, proj_id: int) -> Iterator[str]:
+        """
+        Relaxes the refresh interval of the index during large imports, so that ElasticSearch does not
+        create a new segment every second. Afterwards, the default refresh interval is restored and
+        the index is refreshed, so that all documents are searchable immediately.
+        """
+        cls.create_index(client, proj_id)
+        index_name = cls.get_index_name(proj_id)
+        client.indices.put_settings(
+            index=index_name,
+            body={
+                "index": {"refresh_interval": conf.elasticsearch.bulk.refresh_interval}
+            },
+        )
+        try:
+            yield index_name
+        finally:
+            # None resets the setting to the default
+            client.indices.put_settings(
+                index=index_name, body={"index": {"refresh_interval": None}}
+            )
+            client.indices.refresh(index=index_name)
@@ -1,3 +1,5 @@
+import os
+
 from elasticsearch import Elasticsearch
 from loguru import logger
 
@@ -5,27 +7,31 @@ from common.singleton_meta import SingletonMeta
 from config import conf
 
 
+def _connect() -> Elasticsearch:
+    return Elasticsearch(
+        [
+            {
+                "host": conf.elasticsearch.host,
+                "port": conf.elasticsearch.port,
+            }
+        ],
+        use_ssl=conf.elasticsearch.use_ssl,
+        verify_certs=conf.elasticsearch.verify_certs,
+        retry_on_timeout=True,
+        maxsize=25,
+        # DO NOT SNIFF WHEN ES IS NOT IN LOCAL NETWORK! This will cause timeout errors
+        # sniff before doing anything
+        sniff_on_start=conf.elasticsearch.sniff_on_start,
+        sniff_on_connection_fail=conf.elasticsearch.sniff_on_connection_fail,
+        sniffer_timeout=conf.elasticsearch.sniffer_timeout,
+    )
+
+
 class ElasticSearchRepo(metaclass=SingletonMeta):
     def __new__(cls, remove_if_exists: bool = False):
         try:
             # ElasticSearch Connection
-            esc = Elasticsearch(
-                [
-                    {
-                        "host": conf.elasticsearch.host,
-                        "port": conf.elasticsearch.port,
-                    }
-                ],
-                use_ssl=conf.elasticsearch.use_ssl,
-                verify_certs=conf.elasticsearch.verify_certs,
-                retry_on_timeout=True,
-                maxsize=25,
-                # DO NOT SNIFF WHEN ES IS NOT IN LOCAL NETWORK! This will cause timeout errors
-                # sniff before doing anything
-                sniff_on_start=conf.elasticsearch.sniff_on_start,
-                sniff_on_connection_fail=conf.elasticsearch.sniff_on_connection_fail,
-                sniffer_timeout=conf.elasticsearch.sniffer_timeout,
-            )
+            esc = _connect()
 
             if not esc.ping():
                 raise Exception(
@@ -33,6 +39,8 @@ class ElasticSearchRepo(metaclass=SingletonMeta):
                 )
 
             cls.client = esc
+            # forked children (e.g. parallel import stages) must not share the pooled connections of the parent
+            os.register_at_fork(after_in_child=cls._reconnect)
 
         except Exception as e:
             msg = f"Cannot instantiate ElasticSearchService - Error '{e}'"
@@ -47,6 +55,10 @@ class ElasticSearchRepo(metaclass=SingletonMeta):
 
         return super(ElasticSearchRepo, cls).__new__(cls)
 
+    @classmethod
+    def _reconnect(cls) -> None:
+        cls.client = _connect()
+
     @classmethod
     def elastic_search_session(cls):
         """Return the ElasticSearch client instance"""
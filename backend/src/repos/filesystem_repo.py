@@ -4,9 +4,10 @@ import shutil
 import urllib.parse as url
 import uuid
 import zipfile
+from contextlib import contextmanager
 from http.client import BAD_REQUEST
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 from zipfile import ZipFile
 
 import magic
@@ -389,6 +390,18 @@ class FilesystemRepo(metaclass=SingletonMeta):
 
         return temp_file
 
+    @contextmanager
+    def open_temp_zip_file(
+        self, fn: str | None = None
+    ) -> Iterator[tuple[Path, zipfile.ZipFile]]:
+        """Opens a new temporary zip file, so that large exports can be streamed into it."""
+        temp_file = self.create_temp_file(fn=fn)
+        temp_file = temp_file.parent / (temp_file.name + ".zip")
+
+        logger.info(f"Writing Files to {temp_file} !")
+        with zipfile.ZipFile(temp_file, mode="w") as zipf:
+            yield temp_file, zipf
+
     def write_df_to_temp_file(
         self,
         df: pd.DataFrame,
@@ -6,10 +6,15 @@ import numpy as np
 from litellm import batch_completion
 from loguru import logger
 from openai import OpenAI
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
 from common.singleton_meta import SingletonMeta
 from config import conf
+from repos.llm_response_cache import (
+    read_cached_responses,
+    response_digest,
+    store_cached_responses,
+)
 
 T = TypeVar("T", bound=BaseModel)
 
@@ -176,36 +181,96 @@ class LLMRepo(metaclass=SingletonMeta):
         system_prompt: str,
         user_prompt: str,
         response_model: Type[T],
+        use_cache: bool = True,
     ) -> T:
-        model = self.__validate_llm_name(model)
-
-        response = self.__llm_conn.chat.completions.create(
+        """
+        Responses are cached by model, prompts and response schema.
+        With use_cache=False, the LLM is always called (and the cached response is replaced).
+        """
+        return self.llm_batch_chat(
             model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": system_prompt.strip(),
-                },
-                {
-                    "role": "user",
-                    "content": user_prompt.strip(),
-                },
-            ],
-            extra_body={"guided_json": response_model.model_json_schema()},
-        )
-        msg = response.choices[0].message
-        if msg.content is None:
-            raise Exception(f"LLM response is None: {response}")
-
-        return response_model.model_validate_json(msg.content)
+            messages=[LLMMessage(system_prompt=system_prompt, user_prompt=user_prompt)],
+            response_model=response_model,
+            use_cache=use_cache,
+        )[0]
 
     def llm_batch_chat(
         self,
         model: str,
         messages: list[LLMMessage],
         response_model: Type[T],
+        use_cache: bool = True,
     ) -> list[T]:
+        """
+        Responses are cached by model, prompts and response schema, so that only new prompts are sent to the LLM.
+        With use_cache=False, the LLM is always called (and the cached responses are replaced).
+        """
         model = self.__validate_llm_name(model)
+        response_schema = response_model.model_json_schema()
+
+        # look up the cached responses
+        digests = [
+            response_digest(
+                model=model,
+                system_prompt=message.system_prompt.strip(),
+                user_prompt=message.user_prompt.strip(),
+                response_schema=response_schema,
+            )
+            for message in messages
+        ]
+        digest2response: dict[str, T] = {}
+        if use_cache:
+            for digest, cached in zip(digests, read_cached_responses(digests)):
+                if cached is None:
+                    continue
+                try:
+                    digest2response[digest] = response_model.model_validate_json(cached)
+                except ValidationError:
+                    logger.warning(f"Ignoring invalid cached LLM response {digest}")
+
+        # prompts that are not cached (each only once)
+        digest2message = {
+            digest: message
+            for digest, message in zip(digests, messages)
+            if digest not in digest2response
+        }
+        if len(digest2message) > 0:
+            contents = self.__llm_batch_completion(
+                model=model,
+                messages=list(digest2message.values()),
+                response_schema=response_schema,
+            )
+            for digest, content in zip(digest2message.keys(), contents):
+                digest2response[digest] = response_model.model_validate_json(content)
+            store_cached_responses(dict(zip(digest2message.keys(), contents)))
+
+        return [digest2response[digest] for digest in digests]
+
+    def __llm_batch_completion(
+        self,
+        model: str,
+        messages: list[LLMMessage],
+        response_schema: dict,
+    ) -> list[str]:
+        if len(messages) == 1:
+            response = self.__llm_conn.chat.completions.create(
+                model=model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": messages[0].system_prompt.strip(),
+                    },
+                    {
+                        "role": "user",
+                        "content": messages[0].user_prompt.strip(),
+                    },
+                ],
+                extra_body={"guided_json": response_schema},
+            )
+            msg = response.choices[0].message
+            if msg.content is None:
+                raise Exception(f"LLM response is None: {response}")
+            return [msg.content]
 
         # prepare batch messages
         batch_messages = [
@@ -230,20 +295,20 @@ class LLMRepo(metaclass=SingletonMeta):
             api_key=self.__llm_conn.api_key,
             # temperature=self.sampling_parameters.temperature,
             # top_p=self.sampling_parameters.top_p,
-            extra_body={"guided_json": response_model.model_json_schema()},
+            extra_body={"guided_json": response_schema},
         )
 
         # parse responses
-        responses: list[T] = []
+        contents: list[str] = []
         for response in batch_responses:
             if response.get("choices", None) is None:
                 raise Exception(f"LLM response is invalid: {response}")
             msg = response.choices[0].message
             if msg.content is None:
                 raise Exception(f"LLM response is None: {response}")
-            responses.append(response_model.model_validate_json(msg.content))
+            contents.append(msg.content)
 
-        return responses
+        return contents
 
     def _start_vlm_chat_session(self) -> str:
         session_id = str(uuid4())
@@ -0,0 +1,95 @@
+import hashlib
+import time
+from typing import Any
+
+import srsly
+from loguru import logger
+from redis.exceptions import RedisError
+
+from config import conf
+from repos.redis_repo import RedisRepo
+
+CACHE_KEY_PREFIX = "llm_response"
+# sorted set of all cached keys, scored by their last access, used for the LRU eviction
+CACHE_LRU_KEY = f"{CACHE_KEY_PREFIX}:lru"
+# hash with the hit / miss counters
+CACHE_STATS_KEY = f"{CACHE_KEY_PREFIX}:stats"
+
+
+def response_digest(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    response_schema: dict[str, Any] | None,
+) -> str:
+    """Digest of everything a response depends on"""
+    key = srsly.json_dumps(
+        {
+            "model": model,
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
+            "response_schema": response_schema,
+        },
+        sort_keys=True,
+    )
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _cache_key(digest: str) -> str:
+    return f"{CACHE_KEY_PREFIX}:{digest}"
+
+
+def read_cached_responses(digests: list[str]) -> list[str | None]:
+    """Returns the cached responses of the given digests (None if not cached)"""
+    if not conf.llm_cache.enabled or len(digests) == 0:
+        return [None] * len(digests)
+    try:
+        redis = RedisRepo().redis_connection()
+        pipe = redis.pipeline()
+        for digest in digests:
+            # reading refreshes the TTL, so that frequently used responses stay cached
+            pipe.getex(_cache_key(digest), ex=conf.llm_cache.ttl_s)
+        data = pipe.execute()
+
+        hits = {_cache_key(d): time.time() for d, r in zip(digests, data) if r}
+        pipe = redis.pipeline()
+        if len(hits) > 0:
+            pipe.zadd(CACHE_LRU_KEY, hits)
+        pipe.hincrby(CACHE_STATS_KEY, "hits", len(hits))
+        pipe.hincrby(CACHE_STATS_KEY, "misses", len(digests) - len(hits))
+        pipe.zcard(CACHE_LRU_KEY)
+        total_hits, total_misses, size = pipe.execute()[-3:]
+    except RedisError as e:
+        logger.warning(f"Could not read cached LLM responses: {e}")
+        return [None] * len(digests)
+
+    logger.info(
+        f"LLM response cache: {len(hits)} hits, {len(digests) - len(hits)} misses "
+        f"(in total {total_hits} hits, {total_misses} misses, {size} cached responses)"
+    )
+    return [r.decode("utf-8") if r else None for r in data]
+
+
+def store_cached_responses(responses: dict[str, str]) -> None:
+    """Caches the responses (digest -> response) and evicts the least recently used responses"""
+    if not conf.llm_cache.enabled or len(responses) == 0:
+        return
+    try:
+        redis = RedisRepo().redis_connection()
+        now = time.time()
+        pipe = redis.pipeline()
+        for digest, response in responses.items():
+            pipe.set(_cache_key(digest), response, ex=conf.llm_cache.ttl_s)
+        pipe.zadd(CACHE_LRU_KEY, {_cache_key(d): now for d in responses})
+        # forget the keys that expired meanwhile
+        pipe.zremrangebyscore(CACHE_LRU_KEY, "-inf", now - conf.llm_cache.ttl_s)
+        pipe.zcard(CACHE_LRU_KEY)
+        num_cached = pipe.execute()[-1]
+
+        if num_cached > conf.llm_cache.max_entries:
+            evicted = redis.zpopmin(
+                CACHE_LRU_KEY, num_cached - conf.llm_cache.max_entries
+            )
+            redis.delete(*[key for key, _ in evicted])
+    except RedisError as e:
+        logger.warning(f"Could not cache LLM responses: {e}")
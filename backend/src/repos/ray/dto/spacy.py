@@ -1,3 +1,5 @@
+import enum
+
 from pydantic import BaseModel, Field
 
 
@@ -53,6 +55,13 @@ class SpacyInput(BaseModel):
     language: str = Field(examples=["en"])
 
 
+class SpacyBatchInput(BaseModel):
+    documents: list[SpacyInput] = Field(
+        description="The documents to process. Documents are grouped by language internally, the order is preserved.",
+        examples=[[SpacyInput(text="I love Hamburg!", language="en")]],
+    )
+
+
 class SpacyPipelineOutput(BaseModel):
     tokens: list[SpacyToken] = Field(
         examples=[
@@ -130,3 +139,78 @@ class SpacyPipelineOutput(BaseModel):
         ],
         default_factory=list,
     )
+
+
+class SpacyBatchPipelineOutput(BaseModel):
+    outputs: list[SpacyPipelineOutput] = Field(
+        description="The pipeline outputs, one per input document (same order)",
+        default_factory=list,
+    )
+
+
+class SpacyTokenFlag(enum.IntFlag):
+    STOPWORD = 1
+    PUNCTUATION = 2
+    ALPHA = 4
+    DIGIT = 8
+
+
+class SpacyColumnarOutput(BaseModel):
+    """
+    Columnar representation of the spaCy pipeline output: every attribute is a parallel array.
+    Token and span texts are not transferred, they are slices of the input text.
+    POS tags, lemmas and entity labels are interned, the arrays contain indices into the vocabularies.
+    """
+
+    token_starts: list[int] = Field(
+        description="Start character index per token", examples=[[0, 2, 7, 14]]
+    )
+    token_ends: list[int] = Field(
+        description="End character index per token", examples=[[1, 6, 14, 15]]
+    )
+    token_pos: list[int] = Field(
+        description="Index into pos_vocab per token", examples=[[0, 1, 2, 3]]
+    )
+    token_lemmas: list[int] = Field(
+        description="Index into lemma_vocab per token", examples=[[0, 1, 2, 3]]
+    )
+    token_flags: list[int] = Field(
+        description="Bit-packed SpacyTokenFlag per token", examples=[[5, 4, 4, 2]]
+    )
+    pos_vocab: list[str] = Field(
+        description="Interned POS tags", examples=[["PRON", "VERB", "PROPN", "PUNCT"]]
+    )
+    lemma_vocab: list[str] = Field(
+        description="Interned lemmas", examples=[["I", "love", "Hamburg", "!"]]
+    )
+    sent_starts: list[int] = Field(
+        description="Start character index per sentence", examples=[[0]]
+    )
+    sent_ends: list[int] = Field(
+        description="End character index per sentence", examples=[[15]]
+    )
+    ent_starts: list[int] = Field(
+        description="Start character index per entity", examples=[[7]]
+    )
+    ent_ends: list[int] = Field(
+        description="End character index per entity", examples=[[14]]
+    )
+    ent_start_tokens: list[int] = Field(
+        description="Start token index per entity", examples=[[2]]
+    )
+    ent_end_tokens: list[int] = Field(
+        description="End token index per entity", examples=[[3]]
+    )
+    ent_labels: list[int] = Field(
+        description="Index into label_vocab per entity", examples=[[0]]
+    )
+    label_vocab: list[str] = Field(
+        description="Interned entity labels", examples=[["GPE"]]
+    )
+
+
+class SpacyBatchColumnarOutput(BaseModel):
+    outputs: list[SpacyColumnarOutput] = Field(
+        description="The columnar pipeline outputs, one per input document (same order)",
+        default_factory=list,
+    )
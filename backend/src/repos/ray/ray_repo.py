@@ -15,7 +15,14 @@ from repos.ray.dto.coref import CorefJobInput, CorefJobOutput
 from repos.ray.dto.detr import DETRImageInput, DETRObjectDetectionOutput
 from repos.ray.dto.glotlid import GlotLIDInput, GlotLIDOutput
 from repos.ray.dto.quote import QuoteJobInput, QuoteJobOutput
-from repos.ray.dto.spacy import SpacyInput, SpacyPipelineOutput
+from repos.ray.dto.spacy import (
+    SpacyBatchColumnarOutput,
+    SpacyBatchInput,
+    SpacyBatchPipelineOutput,
+    SpacyColumnarOutput,
+    SpacyInput,
+    SpacyPipelineOutput,
+)
 from repos.ray.dto.whisper import WhisperTranscriptionOutput
 
 
@@ -106,6 +113,26 @@ class RayRepo(metaclass=SingletonMeta):
         )
         return SpacyPipelineOutput.model_validate(response.json())
 
+    def spacy_pipeline_columnar(self, input: SpacyInput) -> SpacyColumnarOutput:
+        response = self._make_post_request_with_json_data(
+            "/spacy/pipeline_columnar", input.model_dump()
+        )
+        return SpacyColumnarOutput.model_validate(response.json())
+
+    def spacy_pipeline_batch(self, input: SpacyBatchInput) -> SpacyBatchPipelineOutput:
+        response = self._make_post_request_with_json_data(
+            "/spacy/pipeline_batch", input.model_dump()
+        )
+        return SpacyBatchPipelineOutput.model_validate(response.json())
+
+    def spacy_pipeline_batch_columnar(
+        self, input: SpacyBatchInput
+    ) -> SpacyBatchColumnarOutput:
+        response = self._make_post_request_with_json_data(
+            "/spacy/pipeline_batch_columnar", input.model_dump()
+        )
+        return SpacyBatchColumnarOutput.model_validate(response.json())
+
     def whisper_transcribe(
         self,
         audio_bytes: bytes,
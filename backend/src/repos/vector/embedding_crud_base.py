@@ -1,11 +1,15 @@
-from typing import Any, Generic, Type, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Generator, Generic, Sequence, Type, TypeVar
 
+import numpy as np
 from loguru import logger
 from weaviate import WeaviateClient
-from weaviate.classes.query import MetadataQuery
+from weaviate.classes.query import Filter, MetadataQuery, Sort
 from weaviate.collections.classes.filters import _Filters
 from weaviate.types import UUID
 
+from config import conf
+from repos.vector import local_knn_index
 from repos.vector.collection_base import BaseCollection
 from repos.vector.weaviate_exceptions import (
     WeaviateBatchImportError,
@@ -13,14 +17,21 @@ from repos.vector.weaviate_exceptions import (
     WeaviateObjectUUIDNotFoundException,
 )
 from repos.vector.weaviate_models import (
+    EmbeddingBlock,
     EmbeddingSearchResult,
     ObjectIdentifier,
     SimSearchResult,
 )
+from repos.vector.weaviate_repo import WeaviateRepo
 
 ID = TypeVar("ID", bound=ObjectIdentifier)
 COLLECTION = TypeVar("COLLECTION", bound=BaseCollection)
 
+# number of objects fetched per request when iterating over embeddings
+ITER_PAGE_SIZE = 1000
+# number of kNN queries sent concurrently in batched searches
+SEARCH_CONCURRENCY = 16
+
 
 class CRUDBase(Generic[ID, COLLECTION]):
     """
@@ -30,6 +41,9 @@ class CRUDBase(Generic[ID, COLLECTION]):
     be a subclass of ObjectIdentifier
     """
 
+    # whether searches may be answered by the in-process kNN index (if enabled in the config, see local_knn_index)
+    local_knn: bool = False
+
     def __init__(
         self,
         collection_class: Type[COLLECTION],
@@ -59,6 +73,13 @@ class CRUDBase(Generic[ID, COLLECTION]):
         tenant_name = self.collection_class.get_tenant_name(project_id)
         return collection.tenants.exists(tenant=tenant_name)
 
+    def _invalidate_local_index(self, project_id: int) -> None:
+        """Must be called after the embeddings of the project were modified"""
+        if self.local_knn:
+            local_knn_index.mark_stale(
+                self.collection_class.get_collection_name(), project_id
+            )
+
     def _validate_properties(
         self, properties: dict[str, Any], must_identify_object: bool
     ) -> None:
@@ -107,6 +128,7 @@ class CRUDBase(Generic[ID, COLLECTION]):
             references=None,
             vector=embedding,
         )
+        self._invalidate_local_index(project_id)
 
     def add_embedding_batch(
         self,
@@ -151,6 +173,7 @@ class CRUDBase(Generic[ID, COLLECTION]):
             logger.error(f"First failed object: {failed_objects[0]}")
             raise WeaviateBatchImportError()
 
+        self._invalidate_local_index(project_id)
         return uuids
 
     def remove_embedding(self, client: WeaviateClient, project_id: int, id: ID) -> bool:
@@ -160,7 +183,9 @@ class CRUDBase(Generic[ID, COLLECTION]):
             id: Object identifier
         """
         collection = self._get_collection(client=client, project_id=project_id)
-        return collection.data.delete_by_id(id.uuidv5())
+        deleted = collection.data.delete_by_id(id.uuidv5())
+        self._invalidate_local_index(project_id)
+        return deleted
 
     def remove_embeddings_by_project(
         self, client: WeaviateClient, project_id: int
@@ -174,6 +199,10 @@ class CRUDBase(Generic[ID, COLLECTION]):
         client.collections.get(
             self.collection_class.get_collection_name()
         ).tenants.remove([f"Project{project_id}"])
+        if self.local_knn:
+            local_knn_index.remove_index(
+                self.collection_class.get_collection_name(), project_id
+            )
 
     def get_embedding(
         self, client: WeaviateClient, project_id: int, id: ID
@@ -235,36 +264,94 @@ class CRUDBase(Generic[ID, COLLECTION]):
         Returns:
             List of embeddings
         """
-        collection = self._get_collection(client=client, project_id=project_id)
-
-        # Query to find the objects with vector
-        result = collection.query.fetch_objects(
-            filters=filters,
-            include_vector=True,
-        )
-
-        # TODO: How can I circumvent the limit?
-
-        # Map each result to its ID and embedding
-        embeddings: list[EmbeddingSearchResult[ID]] = []
-        for obj in result.objects:
-            obj_id = self.object_identifier.model_validate(obj.properties)
-            vector = obj.vector["default"]
-            assert isinstance(vector, list), (
-                f"Expected embedding to be a list, got {type(vector)}"
-            )
-            assert isinstance(vector[0], float), (
-                "Expected all elements of embedding to be float"
+        return [
+            EmbeddingSearchResult[ID](uuid=uuid, id=id, embedding=embedding.tolist())
+            for block in self.iter_embeddings(
+                client=client, project_id=project_id, filters=filters
             )
-            embeddings.append(
-                EmbeddingSearchResult[ID](
-                    uuid=obj.uuid,
-                    id=obj_id,
-                    embedding=vector,  # type: ignore
+            for uuid, id, embedding in zip(block.uuids, block.ids, block.embeddings)
+        ]
+
+    def iter_embeddings(
+        self,
+        client: WeaviateClient,
+        project_id: int,
+        filters: _Filters | None = None,
+        page_size: int = ITER_PAGE_SIZE,
+    ) -> Generator[EmbeddingBlock[ID], None, None]:
+        """
+        Iterates over all (matching) embeddings of the project in pages, with bounded memory.
+        Without filters, the Weaviate cursor API is used. The cursor API does not support filters,
+        so filtered iterations page by keyset over the (integer) identifier properties instead.
+        Args:
+            project_id: ID of the project
+            filters: Optional Weaviate filters to apply
+            page_size: Number of objects per page
+        Returns:
+            Generator of EmbeddingBlocks with contiguous float32 embeddings
+        """
+        collection = self._get_collection(client=client, project_id=project_id)
+        if not self._tenant_exists(client=client, project_id=project_id):
+            return
+
+        keys = [p.name for p in self.collection_class.properties.values()]
+        sort = Sort.by_property(keys[0])
+        for key in keys[1:]:
+            sort = sort.by_property(key)
+
+        last_obj = None
+        while True:
+            if filters is None:
+                result = collection.query.fetch_objects(
+                    limit=page_size,
+                    after=last_obj.uuid if last_obj is not None else None,
+                    include_vector=True,
                 )
+            else:
+                page_filters = filters
+                if last_obj is not None:
+                    page_filters = filters & self._keyset_filter(
+                        keys, last_obj.properties
+                    )
+                result = collection.query.fetch_objects(
+                    limit=page_size,
+                    filters=page_filters,
+                    sort=sort,
+                    include_vector=True,
+                )
+
+            objects = result.objects
+            if len(objects) == 0:
+                return
+
+            yield EmbeddingBlock[ID](
+                uuids=[obj.uuid for obj in objects],
+                ids=[
+                    self.object_identifier.model_construct(**obj.properties)
+                    for obj in objects
+                ],
+                embeddings=np.asarray(
+                    [obj.vector["default"] for obj in objects], dtype=np.float32
+                ),
             )
 
-        return embeddings
+            if len(objects) < page_size:
+                return
+            last_obj = objects[-1]
+
+    def _keyset_filter(self, keys: list[str], last: dict[str, Any]) -> _Filters:
+        """Matches all objects that come after the last object in the (keys) sort order"""
+        return Filter.any_of(
+            [
+                Filter.all_of(
+                    [Filter.by_property(key).equal(last[key]) for key in keys[:i]]
+                    + [Filter.by_property(keys[i]).greater_than(last[keys[i]])]
+                )
+                if i > 0
+                else Filter.by_property(keys[i]).greater_than(last[keys[i]])
+                for i in range(len(keys))
+            ]
+        )
 
     def search_near_object(
         self,
@@ -285,6 +372,16 @@ class CRUDBase(Generic[ID, COLLECTION]):
         Returns:
             List of objects found
         """
+        local_results = self._search_local(
+            project_id=project_id,
+            k=k,
+            threshold=threshold,
+            filters=filters,
+            ids=[id],
+        )
+        if local_results is not None:
+            return local_results[0]
+
         collection = self._get_collection(client=client, project_id=project_id)
         uuid = id.uuidv5()
 
@@ -301,14 +398,7 @@ class CRUDBase(Generic[ID, COLLECTION]):
             return_properties=True,
         )
 
-        return [
-            SimSearchResult[ID](
-                uuid=obj.uuid,
-                id=self.object_identifier.model_validate(obj.properties),
-                score=obj.metadata.certainty or 0.0,
-            )
-            for obj in query_result.objects
-        ]
+        return self._to_search_results(query_result)
 
     def search_near_vector(
         self,
@@ -329,6 +419,16 @@ class CRUDBase(Generic[ID, COLLECTION]):
         Returns:
             List of objects found
         """
+        local_results = self._search_local(
+            project_id=project_id,
+            k=k,
+            threshold=threshold,
+            filters=filters,
+            vectors=np.asarray([vector], dtype=np.float32),
+        )
+        if local_results is not None:
+            return local_results[0]
+
         collection = self._get_collection(client=client, project_id=project_id)
 
         query_result = collection.query.near_vector(
@@ -340,6 +440,161 @@ class CRUDBase(Generic[ID, COLLECTION]):
             return_properties=True,
         )
 
+        return self._to_search_results(query_result)
+
+    def search_near_objects(
+        self,
+        client: WeaviateClient,
+        project_id: int,
+        ids: list[ID],
+        k: int,
+        threshold: float | None = None,
+        filters: _Filters | None = None,
+    ) -> list[list[SimSearchResult[ID]]]:
+        """
+        Batched variant of search_near_object: Finds up-to k objects near each of the given objects.
+        The queries are sent concurrently (SEARCH_CONCURRENCY at a time).
+        Args:
+            ids: Object identifiers to search near
+            k: Number of similar objects to find per query
+            threshold: Minimum similarity score to consider an object as similar
+            filters: Optional filters to apply (to all queries)
+        Returns:
+            List of found objects per query, in the order of the ids (empty for objects that do not exist)
+        """
+        local_results = self._search_local(
+            project_id=project_id,
+            k=k,
+            threshold=threshold,
+            filters=filters,
+            ids=ids,
+        )
+        if local_results is not None:
+            return local_results
+
+        collection = self._get_collection(client=client, project_id=project_id)
+        uuids = [id.uuidv5() for id in ids]
+
+        # objects that do not exist (e.g. not yet embedded) have no neighbors
+        existing: set[str] = set()
+        for i in range(0, len(uuids), ITER_PAGE_SIZE):
+            existing.update(
+                str(obj.uuid)
+                for obj in collection.query.fetch_objects_by_ids(
+                    ids=uuids[i : i + ITER_PAGE_SIZE],
+                    limit=ITER_PAGE_SIZE,
+                    return_properties=[],
+                ).objects
+            )
+        if len(existing) < len(uuids):
+            logger.warning(
+                f"{len(uuids) - len(existing)} of {len(uuids)} objects to search near do not exist in {collection.name}"
+            )
+
+        def search(collection, uuid: UUID) -> list[SimSearchResult[ID]]:
+            if str(uuid) not in existing:
+                return []
+            return self._to_search_results(
+                collection.query.near_object(
+                    near_object=uuid,
+                    filters=filters,
+                    limit=k,
+                    certainty=threshold,
+                    return_metadata=MetadataQuery(certainty=True),
+                    return_properties=True,
+                )
+            )
+
+        return self._search_concurrently(
+            client=client, project_id=project_id, search=search, queries=uuids
+        )
+
+    def search_near_vectors(
+        self,
+        client: WeaviateClient,
+        project_id: int,
+        vectors: np.ndarray,
+        k: int,
+        threshold: float | None = None,
+        filters: _Filters | None = None,
+    ) -> list[list[SimSearchResult[ID]]]:
+        """
+        Batched variant of search_near_vector: Finds up-to k objects near each row of the vectors matrix.
+        The queries are sent concurrently (SEARCH_CONCURRENCY at a time).
+        Args:
+            vectors: Matrix of query vectors, shape (num_queries, dim)
+            k: Number of similar objects to find per query
+            threshold: Minimum similarity score to consider an object as similar
+            filters: Optional filters to apply (to all queries)
+        Returns:
+            List of found objects per query, in the order of the rows
+        """
+        local_results = self._search_local(
+            project_id=project_id,
+            k=k,
+            threshold=threshold,
+            filters=filters,
+            vectors=vectors,
+        )
+        if local_results is not None:
+            return local_results
+
+        def search(collection, vector: np.ndarray) -> list[SimSearchResult[ID]]:
+            return self._to_search_results(
+                collection.query.near_vector(
+                    near_vector=np.asarray(vector, dtype=np.float32).tolist(),
+                    filters=filters,
+                    limit=k,
+                    certainty=threshold,
+                    return_metadata=MetadataQuery(certainty=True),
+                    return_properties=True,
+                )
+            )
+
+        return self._search_concurrently(
+            client=client, project_id=project_id, search=search, queries=list(vectors)
+        )
+
+    def _search_concurrently(
+        self,
+        client: WeaviateClient,
+        project_id: int,
+        search: Callable[[Any, Any], list[SimSearchResult[ID]]],
+        queries: Sequence[Any],
+    ) -> list[list[SimSearchResult[ID]]]:
+        """
+        The gRPC API answers one query per request, so the queries are sent concurrently
+        (SEARCH_CONCURRENCY at a time). The sync client must not be shared between threads:
+        the calling thread uses the given client, every other thread checks out its own client from the pool,
+        so the number of threads is capped at the pool size. Returns the results in the order of the queries.
+        """
+        num_threads = min(SEARCH_CONCURRENCY, WeaviateRepo.pool.max_size, len(queries))
+        results: list[list[SimSearchResult[ID]]] = [[] for _ in queries]
+
+        def search_all(indices: range, client: WeaviateClient) -> None:
+            collection = self._get_collection(client=client, project_id=project_id)
+            for i in indices:
+                results[i] = search(collection, queries[i])
+
+        def search_all_pooled(indices: range) -> None:
+            with WeaviateRepo.weaviate_session() as pooled_client:
+                search_all(indices, pooled_client)
+
+        # every thread answers every num_threads-th query
+        chunks = [range(i, len(queries), num_threads) for i in range(num_threads)]
+        if num_threads <= 1:
+            search_all(range(len(queries)), client)
+            return results
+        with ThreadPoolExecutor(max_workers=num_threads - 1) as executor:
+            futures = [
+                executor.submit(search_all_pooled, chunk) for chunk in chunks[1:]
+            ]
+            search_all(chunks[0], client)
+            for future in futures:
+                future.result()
+        return results
+
+    def _to_search_results(self, query_result) -> list[SimSearchResult[ID]]:
         return [
             SimSearchResult[ID](
                 uuid=obj.uuid,
@@ -348,3 +603,56 @@ class CRUDBase(Generic[ID, COLLECTION]):
             )
             for obj in query_result.objects
         ]
+
+    def _search_local(
+        self,
+        project_id: int,
+        k: int,
+        threshold: float | None,
+        filters: _Filters | None,
+        ids: list[ID] | None = None,
+        vectors: np.ndarray | None = None,
+    ) -> list[list[SimSearchResult[ID]]] | None:
+        """
+        Answers the queries (near the given objects or vectors) with the in-process kNN index.
+        Returns None if the queries must be answered by Weaviate instead, e.g. because the index is
+        disabled, not built yet, outdated, the filters are not supported or a query object is not (yet) in the index.
+        """
+        if not (self.local_knn and conf.weaviate.local_knn.enabled):
+            return None
+        index = local_knn_index.get_local_index(crud=self, project_id=project_id)
+        if index is None:
+            return None
+
+        try:
+            mask = index.filter_rows(filters)
+        except local_knn_index.UnsupportedFilterError as e:
+            logger.debug(f"Using Weaviate instead of the local kNN index: {e}")
+            return None
+
+        if ids is not None:
+            rows = index.rows_of(
+                np.asarray(
+                    [[getattr(id, key) for key in index.properties] for id in ids],
+                    dtype=np.int64,
+                ).reshape(len(ids), len(index.properties))
+            )
+            if (rows < 0).any():
+                return None
+            vectors = np.asarray(index.vectors[rows], dtype=np.float32)
+        assert vectors is not None, "Either ids or vectors must be given"
+
+        results: list[list[SimSearchResult[ID]]] = []
+        for rows, scores in index.search(
+            queries=vectors, k=k, threshold=threshold, mask=mask
+        ):
+            found = []
+            for row, score in zip(rows, scores):
+                id = self.object_identifier.model_validate(
+                    dict(zip(index.properties, index.keys[row].tolist()))
+                )
+                found.append(
+                    SimSearchResult[ID](uuid=id.uuidv5(), id=id, score=float(score))
+                )
+            results.append(found)
+        return results
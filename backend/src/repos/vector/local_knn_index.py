@@ -0,0 +1,415 @@
+import fcntl
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import srsly
+from loguru import logger
+from weaviate import WeaviateClient
+from weaviate.collections.classes.filters import (
+    _FilterAnd,
+    _FilterOr,
+    _Filters,
+    _FilterValue,
+)
+
+from common.job_type import JobType
+from config import conf
+from repos.filesystem_repo import FilesystemRepo
+
+if TYPE_CHECKING:
+    from repos.vector.embedding_crud_base import CRUDBase
+
+META_FILE = "meta.json"
+STALE_FILE = "stale"
+LOCK_FILE = "lock"
+REQUESTED_FILE = "requested"
+
+# combined sort key of two identifier properties: (first << 32) | second
+SECOND_KEY_BITS = 32
+
+# comparison operators of Weaviate filters that can be evaluated on the identifier properties
+COMPARISONS = {
+    "Equal": np.equal,
+    "NotEqual": np.not_equal,
+    "GreaterThan": np.greater,
+    "GreaterThanEqual": np.greater_equal,
+    "LessThan": np.less,
+    "LessThanEqual": np.less_equal,
+}
+
+
+class UnsupportedFilterError(Exception):
+    pass
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_int_list(value: Any) -> bool:
+    return isinstance(value, list) and all(_is_int(v) for v in value)
+
+
+def _index_dir(collection_name: str, project_id: int) -> Path:
+    return FilesystemRepo().get_model_dir(
+        proj_id=project_id, model_prefix="knn_", model_name=collection_name
+    )
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _sort_key(keys: np.ndarray) -> np.ndarray:
+    """Combines the identifier properties (at most two) into a single int64, that sorts like the tuple"""
+    if keys.shape[1] == 1:
+        return keys[:, 0].astype(np.int64)
+    return (keys[:, 0].astype(np.int64) << SECOND_KEY_BITS) | keys[:, 1].astype(
+        np.int64
+    )
+
+
+def mark_stale(collection_name: str, project_id: int) -> None:
+    """
+    Marks the index of the project as outdated. Must be called AFTER the embeddings were modified in Weaviate:
+    a concurrent build removes the marker before it starts reading, so it either sees the modification or is marked stale.
+    """
+    index_dir = _index_dir(collection_name, project_id)
+    if index_dir.exists():
+        (index_dir / STALE_FILE).touch()
+
+
+def remove_index(collection_name: str, project_id: int) -> None:
+    FilesystemRepo().remove_dir(_index_dir(collection_name, project_id))
+
+
+class LocalKnnIndex:
+    """
+    Exact kNN index of all embeddings of one tenant (= project) of a collection.
+    The embeddings are L2-normalized and stored as (float16 or float32) matrix in a .npy file,
+    that is memory-mapped, so that it is shared between all processes of the machine.
+    Rows are stored in the order of the Weaviate cursor, the identifier properties of each row
+    are stored alongside together with a sorted key index (id -> row).
+    """
+
+    def __init__(self, meta: dict[str, Any], index_dir: Path):
+        build = meta["build_id"]
+        self.properties: list[str] = meta["properties"]
+        # identifier properties of every row, shape (rows, len(properties))
+        self.keys: np.ndarray = np.load(index_dir / f"{build}.keys.npy")
+        # rows sorted by their identifier properties
+        self.order: np.ndarray = np.load(index_dir / f"{build}.order.npy")
+        self.sorted_keys: np.ndarray = _sort_key(self.keys)[self.order]
+        self.vectors: np.ndarray = np.load(
+            index_dir / f"{build}.vectors.npy", mmap_mode="r"
+        )[: meta["rows"]]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def rows_of(self, keys: np.ndarray) -> np.ndarray:
+        """Returns the rows of the given identifier properties, shape (n, len(properties)), or -1 if missing"""
+        if len(self.sorted_keys) == 0:
+            return np.full(len(keys), -1, dtype=np.int64)
+        query = _sort_key(keys)
+        pos = np.searchsorted(self.sorted_keys, query)
+        pos = np.minimum(pos, len(self.sorted_keys) - 1)
+        return np.where(self.sorted_keys[pos] == query, self.order[pos], -1)
+
+    def filter_rows(self, filters: _Filters | None) -> np.ndarray | None:
+        """
+        Evaluates a Weaviate filter (built with weaviate.classes.query.Filter) on the identifier properties.
+        Returns a boolean mask of the matching rows or None if all rows match.
+        Raises UnsupportedFilterError if the filter cannot be evaluated locally.
+        """
+        if filters is None:
+            return None
+        if isinstance(filters, _FilterAnd):
+            mask = None
+            for operand in filters.filters:
+                operand_mask = self.filter_rows(operand)
+                if operand_mask is not None:
+                    mask = operand_mask if mask is None else mask & operand_mask
+            return mask
+        if isinstance(filters, _FilterOr):
+            masks = [self.filter_rows(operand) for operand in filters.filters]
+            if any(mask is None for mask in masks):
+                return None
+            return np.logical_or.reduce(masks)
+        if not isinstance(filters, _FilterValue):
+            raise UnsupportedFilterError(f"Unsupported filter {filters}")
+
+        if not isinstance(filters.target, str) or filters.target not in self.properties:
+            raise UnsupportedFilterError(f"Unsupported filter target {filters.target}")
+        column = self.properties.index(filters.target)
+        operator = filters.operator.value
+        value = filters.value
+
+        if operator == "ContainsAny" and _is_int_list(value):
+            values = np.asarray(value, dtype=np.int64)
+            if column == 0:
+                # the rows of a value of the first property are a contiguous range of the sorted key index
+                if len(self.properties) > 1:
+                    lo = np.searchsorted(self.sorted_keys, values << SECOND_KEY_BITS)
+                    hi = np.searchsorted(
+                        self.sorted_keys, (values + 1) << SECOND_KEY_BITS
+                    )
+                else:
+                    lo = np.searchsorted(self.sorted_keys, values)
+                    hi = np.searchsorted(self.sorted_keys, values, side="right")
+                mask = np.zeros(len(self), dtype=bool)
+                for start, end in zip(lo, hi):
+                    mask[self.order[start:end]] = True
+                return mask
+            return np.isin(self.keys[:, column], values)
+        if operator in COMPARISONS and _is_int(value):
+            return COMPARISONS[operator](self.keys[:, column], value)
+        raise UnsupportedFilterError(f"Unsupported filter {filters}")
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        threshold: float | None,
+        mask: np.ndarray | None,
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+        Finds the k rows with the highest cosine similarity for each query (blocked matmul, exact).
+        Scores are Weaviate certainties: (1 + cosine similarity) / 2.
+        Returns a tuple of rows and scores (descending) per query.
+        """
+        queries = _normalize(queries)
+        num_queries = len(queries)
+        candidates = np.flatnonzero(mask) if mask is not None else None
+        num_candidates = len(self) if candidates is None else len(candidates)
+        k = min(k, num_candidates)
+        if num_queries == 0 or k <= 0:
+            return [(np.empty(0, np.int64), np.empty(0, np.float32))] * num_queries
+
+        block_size = conf.weaviate.local_knn.block_rows
+        best_scores = np.empty((num_queries, 0), dtype=np.float32)
+        best_rows = np.empty((num_queries, 0), dtype=np.int64)
+        for start in range(0, num_candidates, block_size):
+            end = min(start + block_size, num_candidates)
+            if candidates is None:
+                rows = np.arange(start, end)
+                block = self.vectors[start:end]
+            else:
+                rows = candidates[start:end]
+                block = self.vectors[rows]
+            scores = queries @ np.asarray(block, dtype=np.float32).T
+
+            # keep a running top-k per query
+            scores = np.concatenate([best_scores, scores], axis=1)
+            rows = np.concatenate(
+                [best_rows, np.broadcast_to(rows, (num_queries, len(rows)))], axis=1
+            )
+            if scores.shape[1] > k:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, top, axis=1)
+                rows = np.take_along_axis(rows, top, axis=1)
+            best_scores, best_rows = scores, rows
+
+        certainties = (1.0 + best_scores) / 2.0
+        results = []
+        for query_rows, query_certainties in zip(best_rows, certainties):
+            ranking = np.argsort(-query_certainties, kind="stable")
+            query_rows, query_certainties = (
+                query_rows[ranking],
+                query_certainties[ranking],
+            )
+            if threshold is not None:
+                keep = query_certainties >= threshold
+                query_rows, query_certainties = (
+                    query_rows[keep],
+                    query_certainties[keep],
+                )
+            results.append((query_rows, query_certainties))
+        return results
+
+
+# loaded indices of this process: index dir -> (build id, index)
+_loaded: dict[Path, tuple[str, LocalKnnIndex]] = {}
+
+
+def get_local_index(crud: "CRUDBase", project_id: int) -> LocalKnnIndex | None:
+    """
+    Returns the up-to-date index of the project or None, if the search must be answered by Weaviate.
+    Missing or stale indices are (re-)built by a background job, which is requested here,
+    unless the embeddings were modified recently (to avoid rebuilding over and over again while documents are processed).
+    Until the build finished, Weaviate answers the searches.
+    """
+    collection_name = crud.collection_class.get_collection_name()
+    index_dir = _index_dir(collection_name, project_id)
+    meta_path = index_dir / META_FILE
+
+    if (index_dir / STALE_FILE).exists() or not meta_path.exists():
+        if _needs_build(index_dir):
+            _request_build(collection_name, project_id, index_dir)
+        return None
+
+    try:
+        meta = srsly.read_json(meta_path)
+        if meta.get("disabled", False):
+            return None
+        cached = _loaded.get(index_dir)
+        if cached is not None and cached[0] == meta["build_id"]:
+            return cached[1]
+        index = LocalKnnIndex(meta, index_dir)
+    except (OSError, ValueError, KeyError) as e:
+        # e.g. the files were replaced by a concurrent build
+        logger.warning(f"Could not load kNN index {index_dir}: {e}")
+        return None
+    _loaded[index_dir] = (meta["build_id"], index)
+    return index
+
+
+def _needs_build(index_dir: Path) -> bool:
+    """Whether the index is missing or stale, and the embeddings were not modified recently"""
+    try:
+        stale_mtime = (index_dir / STALE_FILE).stat().st_mtime
+    except FileNotFoundError:
+        return not (index_dir / META_FILE).exists()
+    return time.time() - stale_mtime >= conf.weaviate.local_knn.rebuild_delay_s
+
+
+def _request_build(collection_name: str, project_id: int, index_dir: Path) -> None:
+    """Starts a build job, unless one was requested recently (that did not start yet)"""
+    index_dir.mkdir(parents=True, exist_ok=True)
+    requested_path = index_dir / REQUESTED_FILE
+    try:
+        requested_mtime = requested_path.stat().st_mtime
+        if time.time() - requested_mtime < conf.weaviate.local_knn.build_request_ttl_s:
+            return
+    except FileNotFoundError:
+        pass
+    requested_path.touch()
+    _start_build_job(collection_name, project_id)
+
+
+def _start_build_job(collection_name: str, project_id: int) -> None:
+    # the job module imports the embedding CRUDs, which import this module
+    from modules.simsearch.local_knn_index_job import LocalKnnIndexJobInput
+    from systems.job_system.job_service import JobService
+
+    JobService().start_job(
+        JobType.LOCAL_KNN_INDEX,
+        LocalKnnIndexJobInput(project_id=project_id, collection_name=collection_name),
+    )
+
+
+def build_index(crud: "CRUDBase", client: WeaviateClient, project_id: int) -> None:
+    """Builds the index of the project, if it is (still) missing or stale. Called by the build job."""
+    index_dir = _index_dir(crud.collection_class.get_collection_name(), project_id)
+    # searches request a new build, if the index becomes stale from now on
+    (index_dir / REQUESTED_FILE).unlink(missing_ok=True)
+    if not _needs_build(index_dir):
+        return
+    if not _build(crud, client, project_id, index_dir):
+        logger.info(
+            f"kNN index {index_dir} is not built: another process is building it or it cannot be built"
+        )
+
+
+def _write_meta(index_dir: Path, meta: dict[str, Any]) -> None:
+    tmp_path = index_dir / f"{META_FILE}.tmp"
+    srsly.write_json(tmp_path, meta)
+    os.replace(tmp_path, index_dir / META_FILE)
+
+
+def _remove_old_builds(index_dir: Path, build_id: str) -> None:
+    # processes that still use an old build keep their (unlinked) memory maps
+    for path in index_dir.glob("*.npy"):
+        if not path.name.startswith(build_id):
+            path.unlink(missing_ok=True)
+
+
+def _build(
+    crud: "CRUDBase", client: WeaviateClient, project_id: int, index_dir: Path
+) -> bool:
+    """Materializes the embeddings of the project. Returns False if the index is being built by another process."""
+    properties = [p.name for p in crud.collection_class.properties.values()]
+    if len(properties) > 2:
+        return False
+
+    index_dir.mkdir(parents=True, exist_ok=True)
+    with open(index_dir / LOCK_FILE, "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+
+        (index_dir / STALE_FILE).unlink(missing_ok=True)
+        if not crud._tenant_exists(client=client, project_id=project_id):
+            return False
+        collection = crud._get_collection(client=client, project_id=project_id)
+        total = collection.aggregate.over_all(total_count=True).total_count or 0
+        build_id = uuid.uuid4().hex
+        if total > conf.weaviate.local_knn.max_rows:
+            _write_meta(index_dir, {"build_id": build_id, "disabled": True})
+            _remove_old_builds(index_dir, build_id)
+            return True
+
+        start = time.perf_counter()
+        dtype = np.dtype(conf.weaviate.local_knn.dtype)
+        keys = np.zeros((total, len(properties)), dtype=np.int64)
+        vectors_path = index_dir / f"{build_id}.vectors.npy"
+        vectors = None
+        rows = 0
+        for block in crud.iter_embeddings(client=client, project_id=project_id):
+            if vectors is None:
+                vectors = np.lib.format.open_memmap(
+                    vectors_path,
+                    mode="w+",
+                    dtype=dtype,
+                    shape=(total, block.embeddings.shape[1]),
+                )
+            # embeddings that were added during the build are picked up by the next build (they marked the index stale)
+            block_rows = min(len(block.ids), total - rows)
+            vectors[rows : rows + block_rows] = _normalize(
+                block.embeddings[:block_rows]
+            )
+            keys[rows : rows + block_rows] = [
+                [getattr(id, p) for p in properties] for id in block.ids[:block_rows]
+            ]
+            rows += block_rows
+            if rows == total:
+                break
+        if vectors is None:
+            vectors = np.lib.format.open_memmap(
+                vectors_path, mode="w+", dtype=dtype, shape=(0, 0)
+            )
+        vectors.flush()
+        del vectors
+
+        keys = keys[:rows]
+        if len(properties) > 1 and (
+            (keys < 0).any() or (keys[:, 1] >= (1 << SECOND_KEY_BITS)).any()
+        ):
+            logger.warning(
+                f"Identifiers of {index_dir} do not fit the key index, using Weaviate instead"
+            )
+            vectors_path.unlink(missing_ok=True)
+            _write_meta(index_dir, {"build_id": build_id, "disabled": True})
+            _remove_old_builds(index_dir, build_id)
+            return True
+        np.save(index_dir / f"{build_id}.keys.npy", keys)
+        np.save(
+            index_dir / f"{build_id}.order.npy",
+            np.argsort(_sort_key(keys), kind="stable"),
+        )
+        _write_meta(
+            index_dir,
+            {"build_id": build_id, "properties": properties, "rows": rows},
+        )
+        _remove_old_builds(index_dir, build_id)
+        logger.info(
+            f"Built kNN index {index_dir} with {rows} rows in {time.perf_counter() - start:.2f}s"
+        )
+    return True
@@ -1,7 +1,9 @@
 import uuid
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import Generic, TypeVar
 
+import numpy as np
 from pydantic import BaseModel
 from weaviate.types import UUID
 
@@ -48,3 +50,12 @@ class EmbeddingSearchResult(BaseModel, Generic[T]):
     uuid: UUID
     id: T
     embedding: list[float]
+
+
+@dataclass
+class EmbeddingBlock(Generic[T]):
+    """A page of embeddings: row i of embeddings belongs to uuids[i] and ids[i]"""
+
+    uuids: list[UUID]
+    ids: list[T]
+    embeddings: np.ndarray  # float32, shape (len(ids), dim)
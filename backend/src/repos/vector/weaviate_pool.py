@@ -0,0 +1,213 @@
+import os
+import queue
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncGenerator, Callable, Generator, TypedDict
+
+from anyio import to_thread
+from loguru import logger
+from weaviate import WeaviateClient
+from weaviate.exceptions import (
+    WeaviateClosedClientError,
+    WeaviateConnectionError,
+    WeaviateGRPCUnavailableError,
+)
+
+# errors that indicate a broken connection: clients raising them are not returned to the pool
+CONNECTION_ERRORS = (
+    WeaviateClosedClientError,
+    WeaviateConnectionError,
+    WeaviateGRPCUnavailableError,
+)
+
+
+class WeaviatePoolStats(TypedDict):
+    size: int
+    idle: int
+    checkouts: int
+    created: int
+    discarded: int
+    total_wait_s: float
+    max_wait_s: float
+
+
+class WeaviateClientPool:
+    """
+    Process-wide pool of connected Weaviate clients.
+    Clients are checked out exclusively (the sync client is not meant to be shared between threads)
+    and returned to the pool instead of being closed. Broken clients are replaced transparently:
+    clients that were idle for health_check_after_idle_s are checked with a liveness request
+    (within health_check_timeout) before they are handed out.
+    The pool is reset in forked children (e.g. RQ WorkerPool), because gRPC channels must not be shared across processes.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], WeaviateClient],
+        max_size: int,
+        checkout_timeout: float,
+        health_check_timeout: float,
+        health_check_after_idle_s: float,
+    ):
+        self.connect = connect
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.health_check_timeout = health_check_timeout
+        self.health_check_after_idle_s = health_check_after_idle_s
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        # do not close inherited clients: their sockets belong to the parent process
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        # idle clients with the time they were returned
+        self._idle: queue.LifoQueue[tuple[WeaviateClient, float]] = queue.LifoQueue()
+        self._size = 0
+        self._checkouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._total_wait_s = 0.0
+        self._max_wait_s = 0.0
+
+    def _create(self) -> WeaviateClient:
+        try:
+            client = self.connect()
+        except Exception:
+            with self._lock:
+                self._size -= 1
+            raise
+        with self._lock:
+            self._created += 1
+        return client
+
+    def _discard(self, client: WeaviateClient) -> None:
+        with self._lock:
+            self._size -= 1
+            self._discarded += 1
+        try:
+            client.close()
+        except Exception as e:
+            logger.debug(f"Error while closing discarded Weaviate client: {e}")
+
+    def _is_healthy(self, client: WeaviateClient, idle_s: float) -> bool:
+        # is_connected only reads the local connection state
+        if not client.is_connected():
+            return False
+        # a client that was used recently (without connection errors) is not checked again
+        if idle_s < self.health_check_after_idle_s:
+            return True
+
+        # is_live cannot be given a timeout, so it runs in a separate thread
+        result: list[bool] = []
+
+        def check_live() -> None:
+            try:
+                result.append(client.is_live())
+            except Exception:
+                result.append(False)
+
+        thread = threading.Thread(target=check_live, daemon=True)
+        thread.start()
+        thread.join(timeout=self.health_check_timeout)
+        return len(result) > 0 and result[0]
+
+    def checkout(self) -> WeaviateClient:
+        if self._pid != os.getpid():
+            self._reset()
+
+        start = time.perf_counter()
+        while True:
+            # 1. reuse an idle client
+            idle_since = time.monotonic()
+            try:
+                client, idle_since = self._idle.get_nowait()
+            except queue.Empty:
+                client = None
+
+            # 2. or create a new one, if the pool is not exhausted
+            if client is None:
+                with self._lock:
+                    can_create = self._size < self.max_size
+                    if can_create:
+                        self._size += 1
+                if can_create:
+                    client = self._create()
+                else:
+                    # 3. or wait for a client to be returned
+                    remaining = self.checkout_timeout - (time.perf_counter() - start)
+                    try:
+                        client, idle_since = self._idle.get(timeout=max(remaining, 0.0))
+                    except queue.Empty:
+                        raise TimeoutError(
+                            f"Could not check out a Weaviate client within {self.checkout_timeout}s (pool size {self.max_size})"
+                        )
+
+            if self._is_healthy(client, idle_s=time.monotonic() - idle_since):
+                break
+            logger.warning("Discarding unhealthy Weaviate client, reconnecting ...")
+            self._discard(client)
+
+        wait_s = time.perf_counter() - start
+        if wait_s > 1.0:
+            logger.warning(f"Waited {wait_s:.2f}s to check out a Weaviate client!")
+        with self._lock:
+            self._checkouts += 1
+            self._total_wait_s += wait_s
+            self._max_wait_s = max(self._max_wait_s, wait_s)
+        return client
+
+    def checkin(self, client: WeaviateClient, broken: bool = False) -> None:
+        if self._pid != os.getpid():
+            # the client was checked out before a fork, it belongs to the parent
+            return
+        if broken:
+            self._discard(client)
+        else:
+            self._idle.put((client, time.monotonic()))
+
+    @contextmanager
+    def session(self) -> Generator[WeaviateClient, None, None]:
+        client = self.checkout()
+        broken = False
+        try:
+            yield client
+        except CONNECTION_ERRORS:
+            broken = True
+            raise
+        finally:
+            self.checkin(client, broken=broken)
+
+    @asynccontextmanager
+    async def async_session(self) -> AsyncGenerator[WeaviateClient, None]:
+        # checking out may block until a client is returned, so do not block the event loop
+        client = await to_thread.run_sync(self.checkout)
+        broken = False
+        try:
+            yield client
+        except CONNECTION_ERRORS:
+            broken = True
+            raise
+        finally:
+            self.checkin(client, broken=broken)
+
+    def close_all(self) -> None:
+        while True:
+            try:
+                client, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(client)
+
+    def stats(self) -> WeaviatePoolStats:
+        with self._lock:
+            return {
+                "size": self._size,
+                "idle": self._idle.qsize(),
+                "checkouts": self._checkouts,
+                "created": self._created,
+                "discarded": self._discarded,
+                "total_wait_s": self._total_wait_s,
+                "max_wait_s": self._max_wait_s,
+            }
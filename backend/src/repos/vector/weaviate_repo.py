@@ -3,9 +3,29 @@ from loguru import logger
 
 from common.singleton_meta import SingletonMeta
 from config import conf
+from repos.vector.weaviate_pool import WeaviateClientPool, WeaviatePoolStats
+
+
+def _connect() -> weaviate.WeaviateClient:
+    return weaviate.connect_to_custom(
+        http_host=conf.weaviate.host,
+        http_port=conf.weaviate.port,
+        http_secure=False,
+        grpc_host=conf.weaviate.host,
+        grpc_port=conf.weaviate.grpc_port,
+        grpc_secure=False,
+    )
 
 
 class WeaviateRepo(metaclass=SingletonMeta):
+    pool = WeaviateClientPool(
+        connect=_connect,
+        max_size=conf.weaviate.pool.max_size,
+        checkout_timeout=conf.weaviate.pool.checkout_timeout,
+        health_check_timeout=conf.weaviate.pool.health_check_timeout,
+        health_check_after_idle_s=conf.weaviate.pool.health_check_after_idle_s,
+    )
+
     def __new__(cls, remove_if_exists: bool = False):
         try:
             with cls.weaviate_session() as client:
@@ -28,15 +48,17 @@ class WeaviateRepo(metaclass=SingletonMeta):
 
     @classmethod
     def weaviate_session(cls):
-        """Return the Weaviate client instance"""
-        return weaviate.connect_to_custom(
-            http_host=conf.weaviate.host,
-            http_port=conf.weaviate.port,
-            http_secure=False,
-            grpc_host=conf.weaviate.host,
-            grpc_port=conf.weaviate.grpc_port,
-            grpc_secure=False,
-        )
+        """Check out a pooled Weaviate client. The client is returned to the pool when the context exits."""
+        return cls.pool.session()
+
+    @classmethod
+    def weaviate_async_session(cls):
+        """Async variant of weaviate_session that does not block the event loop while waiting for a client"""
+        return cls.pool.async_session()
+
+    @classmethod
+    def pool_stats(cls) -> WeaviatePoolStats:
+        return cls.pool.stats()
 
     @classmethod
     def drop_indices(cls) -> None:
@@ -61,7 +61,11 @@ class Job:
         steps: list[str] | None = None,
         finished: datetime | None = None,
         device: str | None = None,
+        completed_stages: list[str] | None = None,
     ):
+        # the job can be updated from several processes (e.g. the stages of a project import),
+        # so the current meta is read first to not overwrite their updates
+        self.job.meta = self.job.get_meta(refresh=True)
         if steps is not None:
             self.job.meta["steps"] = steps
         if status_message is not None:
@@ -70,6 +74,8 @@ class Job:
             self.job.meta["current_step"] = current_step
         if finished is not None:
             self.job.meta["finished"] = finished
+        if completed_stages is not None:
+            self.job.meta["completed_stages"] = completed_stages
         self.job.save_meta()
 
     def get_id(self) -> str:
@@ -84,6 +90,10 @@ class Job:
     def get_current_step(self) -> int:
         return self.job.meta["current_step"]
 
+    def get_completed_stages(self) -> list[str]:
+        """Checkpoint of multi-stage jobs: the stages that were completed (by a previous run, if the job is retried)"""
+        return self.job.meta.get("completed_stages", [])
+
     def get_created(self) -> datetime:
         return self.job.meta["created"]
 
@@ -3,7 +3,7 @@ from typing import Type
 from fastapi import APIRouter, Depends
 from pydantic import create_model
 
-from common.dependencies import get_current_user
+from common.dependencies import get_current_principal
 from common.job_type import JobType
 from core.auth.authz_user import AuthzUser
 from systems.job_system.job_dto import (
@@ -15,7 +15,7 @@ from systems.job_system.job_dto import (
 from systems.job_system.job_service import JobService
 
 router = APIRouter(
-    prefix="/job", dependencies=[Depends(get_current_user)], tags=["job"]
+    prefix="/job", dependencies=[Depends(get_current_principal)], tags=["job"]
 )
 
 
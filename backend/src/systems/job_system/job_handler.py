@@ -1,8 +1,14 @@
 from datetime import datetime
+from typing import Callable
+
+from loguru import logger
 
 from common.job_type import JobType
 from config import conf
 from modules.doc_processing.doc_processing_pipeline import (
+    handle_batch_job_error,
+    handle_batch_job_finished,
+    handle_batch_job_started,
     handle_job_error,
     handle_job_finished,
     handle_job_started,
@@ -11,20 +17,24 @@ from systems.job_system.job_dto import Job, JobInputBase
 from utils.gpu_utils import find_unused_cuda_device, set_cuda_memory_limit
 
 
+def run_on_device(job: Job, fn: Callable):
+    # figure whether to run the job on gpu
+    if job.job.origin == "gpu":
+        import torch
+
+        cuda_device = find_unused_cuda_device()
+        with torch.cuda.device(cuda_device):
+            set_cuda_memory_limit(conf.rq.gpu_memory_limit)
+            return fn()
+    else:
+        return fn()
+
+
 def rq_job_handler(jobtype: JobType, handler, payload: JobInputBase):
     job = Job()
     handle_job_started(jobtype, input=payload)
     try:
-        # figure whether to run the job on gpu
-        if job.job.origin == "gpu":
-            import torch
-
-            cuda_device = find_unused_cuda_device()
-            with torch.cuda.device(cuda_device):
-                set_cuda_memory_limit(conf.rq.gpu_memory_limit)
-                output = handler(payload=payload, job=job)
-        else:
-            output = handler(payload=payload, job=job)
+        output = run_on_device(job, lambda: handler(payload=payload, job=job))
     except Exception as e:
         # erroneous job:
         job.update(status_message=str(e))
@@ -37,3 +47,36 @@ def rq_job_handler(jobtype: JobType, handler, payload: JobInputBase):
     # successfully finished job:
     handle_job_finished(jobtype, input=payload, output=output)
     return output
+
+
+def rq_batch_job_handler(jobtype: JobType, batch_handler, payloads: list[JobInputBase]):
+    job = Job()
+    handle_batch_job_started(jobtype, inputs=payloads)
+    try:
+        outputs = run_on_device(job, lambda: batch_handler(payloads=payloads, job=job))
+        if len(outputs) != len(payloads):
+            raise ValueError(
+                f"Batch handler returned {len(outputs)} outputs for {len(payloads)} payloads!"
+            )
+    except Exception as e:
+        # erroneous batch: RQ retries it (if configured), after the last attempt
+        # it falls back to one job per payload, so that failures are tracked per document
+        retries_left = job.job.retries_left or 0
+        if retries_left > 0:
+            job.update(status_message=f"Batch failed, {retries_left} retries left: {e}")
+        else:
+            logger.warning(
+                f"Batch job '{jobtype}' with {len(payloads)} payloads failed, retrying as single jobs: {e}"
+            )
+            job.update(
+                status_message=f"Batch failed, split into {len(payloads)} single jobs: {e}"
+            )
+            handle_batch_job_error(jobtype, inputs=payloads)
+        raise e
+    finally:
+        # always set the time the job ended
+        job.update(finished=datetime.now())
+
+    # successfully finished job:
+    handle_batch_job_finished(jobtype, inputs=payloads, outputs=outputs)
+    return outputs
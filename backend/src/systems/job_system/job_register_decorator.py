@@ -28,7 +28,14 @@ def register_job(
     retry: tuple[int, int] | None = None,
     timeout: JobTiming = JobTiming.ONE_HOUR,  # (RQ default is 3 min [180])
     enricher: Callable[[InputT], InputT] | None = None,
+    preload_modules: list[str] | None = None,
 ):
+    """
+    Registers a job handler. Handlers should import heavy dependencies (e.g. torch) lazily,
+    so that the API and the worker pools of other devices do not load them.
+    preload_modules lists such modules, the worker pool of the device imports them once before forking its workers.
+    """
+
     def decorator(func: Callable[[InputT, Job], OutputT | None]):
         from systems.job_system.job_service import JobService
 
@@ -45,7 +52,24 @@ def register_job(
             retry=retry,
             timeout=timeout,
             enricher=enricher,
+            preload_modules=preload_modules,
         )
         return func
 
     return decorator
+
+
+def register_batch_job(job_type: JobType):
+    """
+    Registers a batch handler for an already registered job type.
+    The batch handler receives a list of payloads and must return one output per payload (in the same order).
+    Batch handlers must be all-or-nothing: if they raise, every payload is retried as a single job.
+    """
+
+    def decorator(func: Callable[[list[InputT], Job], list[OutputT | None]]):
+        from systems.job_system.job_service import JobService
+
+        JobService().register_batch_handler(job_type, func)
+        return func
+
+    return decorator
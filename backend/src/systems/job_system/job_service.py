@@ -1,5 +1,6 @@
 import inspect
 from datetime import datetime
+from types import ModuleType
 from typing import Callable, Dict, Literal, TypedDict, TypeVar
 
 import rq
@@ -24,6 +25,7 @@ from systems.job_system.job_dto import (
     JobOutputBase,
     JobPriority,
 )
+from utils.import_utils import import_by_names
 
 InputT = TypeVar("InputT", bound=JobInputBase)
 OutputT = TypeVar("OutputT", bound=JobOutputBase)
@@ -44,6 +46,10 @@ class RegisteredJob(TypedDict):
     retry: tuple[int, int] | None
     timeout: int  # maximum runtime before the job is interrupted and marked as failed (in seconds)
     enricher: Callable | None
+    batch_handler: (
+        Callable | None
+    )  # optional handler that processes a list of payloads at once
+    preload_modules: list[str]  # lazily imported modules, preloaded by the worker pool
 
 
 class JobService(metaclass=SingletonMeta):
@@ -83,6 +89,7 @@ class JobService(metaclass=SingletonMeta):
         retry: tuple[int, int] | None,
         timeout: int,
         enricher: Callable[[InputT], InputT] | None = None,
+        preload_modules: list[str] | None = None,
     ) -> None:
         # Enforce that the only parameter is named 'payload'
         sig = inspect.signature(handler_func)
@@ -112,20 +119,57 @@ class JobService(metaclass=SingletonMeta):
             "retry": retry,
             "timeout": timeout,
             "enricher": enricher,
+            "batch_handler": None,
+            "preload_modules": preload_modules or [],
         }
 
-    def start_job(
+    def register_batch_handler(
         self,
         job_type: JobType,
-        payload: JobInputBase,
-    ) -> Job:
-        from systems.job_system.job_handler import rq_job_handler
+        batch_handler_func: Callable[[list[InputT], Job], list[OutputT | None]],
+    ) -> None:
+        # Enforce that the parameters are named 'payloads, job'
+        sig = inspect.signature(batch_handler_func)
+        params = list(sig.parameters.values())
+        if (
+            not params
+            or len(params) != 2
+            or params[0].name != "payloads"
+            or params[1].name != "job"
+        ):
+            raise ValueError(
+                f"The parameters of function '{batch_handler_func.__name__}' must be named 'payloads, job'."
+            )
 
         job_info = self.job_registry.get(job_type)
-        if not job_info:
-            raise ValueError(f"Unknown job type: {job_type}")
-        retry = job_info["retry"]
+        if job_info is None:
+            raise ValueError(
+                f"JobType {job_type} must be registered before adding a batch handler!"
+            )
+        if job_info["batch_handler"] is not None:
+            raise ValueError(f"JobType {job_type} already has a batch handler!")
+
+        job_info["batch_handler"] = batch_handler_func
 
+    def import_preload_modules(
+        self, device: Literal["gpu", "cpu", "api"]
+    ) -> list[ModuleType]:
+        """Imports the preload modules of all jobs of the device (in the worker pool, before forking the workers)"""
+        module_names = {
+            module_name
+            for job_info in self.job_registry.values()
+            if job_info["device"] == device
+            for module_name in job_info["preload_modules"]
+        }
+        return import_by_names(sorted(module_names))
+
+    def supports_batching(self, job_type: JobType) -> bool:
+        job_info = self.job_registry.get(job_type)
+        return job_info is not None and job_info["batch_handler"] is not None
+
+    def _validate_payload(
+        self, job_type: JobType, job_info: RegisteredJob, payload: JobInputBase
+    ) -> JobInputBase:
         # Validate payload is of correct subclass type
         input_type = job_info["input_type"]
         try:
@@ -143,6 +187,20 @@ class JobService(metaclass=SingletonMeta):
                     ) from enrich_e
             else:
                 raise ValueError(f"Invalid payload for job type {job_type}: {e}")
+        return input_obj
+
+    def start_job(
+        self,
+        job_type: JobType,
+        payload: JobInputBase,
+    ) -> Job:
+        from systems.job_system.job_handler import rq_job_handler
+
+        job_info = self.job_registry.get(job_type)
+        if not job_info:
+            raise ValueError(f"Unknown job type: {job_type}")
+        retry = job_info["retry"]
+        input_obj = self._validate_payload(job_type, job_info, payload)
 
         # Enqueue the job
         queue = self.queues[(job_info["device"], job_info["priority"])]
@@ -171,6 +229,61 @@ class JobService(metaclass=SingletonMeta):
         )
         return Job(rq_job)
 
+    def start_batch_job(
+        self,
+        job_type: JobType,
+        payloads: list[JobInputBase],
+    ) -> Job:
+        """
+        Enqueues a single RQ job that processes all payloads with the registered batch handler.
+        All payloads must belong to the same project.
+        """
+        from systems.job_system.job_handler import rq_batch_job_handler
+
+        job_info = self.job_registry.get(job_type)
+        if not job_info:
+            raise ValueError(f"Unknown job type: {job_type}")
+        if job_info["batch_handler"] is None:
+            raise ValueError(f"JobType {job_type} does not support batching!")
+        if len(payloads) == 0:
+            raise ValueError("Cannot start a batch job without payloads!")
+        retry = job_info["retry"]
+
+        input_objs = [
+            self._validate_payload(job_type, job_info, payload) for payload in payloads
+        ]
+        project_ids = {input_obj.project_id for input_obj in input_objs}
+        if len(project_ids) != 1:
+            raise ValueError("All payloads of a batch job must share one project!")
+
+        # Enqueue the job
+        queue = self.queues[(job_info["device"], job_info["priority"])]
+        rq_job = queue.enqueue(
+            rq_batch_job_handler,
+            # Our function parameters
+            kwargs={
+                "jobtype": job_type,
+                "batch_handler": job_info["batch_handler"],
+                "payloads": input_objs,
+            },
+            # RQ Parameters
+            meta={
+                "type": job_type,
+                "status_message": f"Batch of {len(input_objs)} enqueued",
+                "project_id": input_objs[0].project_id,
+                "current_step": 0,
+                "steps": ["Initial step"],
+                "created": datetime.now(),
+                "finished": None,
+                "device": job_info["device"],
+                "batch_size": len(input_objs),
+            },
+            result_ttl=job_info["result_ttl"],
+            retry=rq.Retry(max=retry[0], interval=retry[1]) if retry else None,
+            job_timeout=job_info["timeout"],
+        )
+        return Job(rq_job)
+
     def get_job(self, job_id: str) -> Job:
         return Job(rq.job.Job.fetch(job_id, connection=self.redis_conn))
 
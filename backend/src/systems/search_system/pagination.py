@@ -1,12 +1,38 @@
+import base64
+import hashlib
+import json
 import math
-from collections import namedtuple
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
 
+from fastapi import status
+from sqlalchemy import and_, false, or_
+from sqlalchemy.orm import Query, Session
 
+from common.exception_handler import exception_handler
+from systems.search_system.sorting import SortDirection
+
+
+@exception_handler(status.HTTP_400_BAD_REQUEST)
 class InvalidPage(Exception):
     pass
 
 
-def apply_pagination(query, page_number=None, page_size=None):
+class CountMode(str, Enum):
+    """How the total number of results is computed"""
+
+    EXACT = "exact"
+    # exact count, cached for COUNT_CACHE_TTL_S seconds per query (filter, sorting, project)
+    CACHED = "cached"
+    # row estimate of the Postgres query planner, exact count for small results
+    ESTIMATED = "estimated"
+
+
+def apply_pagination(query, page_number=None, page_size=None, total_results=None):
     """Apply pagination to a SQLAlchemy query object.
 
     :param page_number:
@@ -16,6 +42,10 @@ def apply_pagination(query, page_number=None, page_size=None):
         Maximum number of results to be returned in the page (defaults
         to the total results).
 
+    :param total_results:
+        The total number of results, if it is already known (e.g. estimated).
+        Defaults to ``query.count()``.
+
     :returns:
         A 2-tuple with the paginated SQLAlchemy query object and
         a pagination namedtuple.
@@ -40,7 +70,8 @@ def apply_pagination(query, page_number=None, page_size=None):
         22
         >>> page_size, page_number, num_pages, total_results = pagination
     """
-    total_results = query.count()
+    if total_results is None:
+        total_results = query.count()
     query = _limit(query, page_size)
 
     # Page size defaults to total results
@@ -86,3 +117,196 @@ def _calculate_num_pages(page_number, page_size, total_results):
         return 0
 
     return math.ceil(float(total_results) / float(page_size))
+
+
+# --- TOTAL COUNTS --- #
+
+COUNT_CACHE_TTL_S = 60.0
+COUNT_CACHE_MAX_SIZE = 1024
+# planner estimates below this threshold are replaced by an exact count (which is cheap then)
+ESTIMATE_EXACT_THRESHOLD = 10_000
+
+_count_cache: OrderedDict[str, tuple[float, int]] = OrderedDict()
+_count_cache_lock = threading.Lock()
+
+
+def _compile(db: Session, query: Query):
+    return query.statement.compile(
+        dialect=db.get_bind().dialect, compile_kwargs={"render_postcompile": True}
+    )
+
+
+def _query_key(db: Session, query: Query) -> str:
+    compiled = _compile(db, query)
+    return hashlib.blake2b(
+        (str(compiled) + repr(sorted(compiled.params.items()))).encode("utf-8"),
+        digest_size=16,
+    ).hexdigest()
+
+
+def _cached_count(db: Session, query: Query) -> int:
+    key = _query_key(db, query)
+    now = time.monotonic()
+    with _count_cache_lock:
+        cached = _count_cache.get(key)
+        if cached is not None and now - cached[0] < COUNT_CACHE_TTL_S:
+            _count_cache.move_to_end(key)
+            return cached[1]
+
+    total_results = query.count()
+    with _count_cache_lock:
+        _count_cache[key] = (now, total_results)
+        _count_cache.move_to_end(key)
+        while len(_count_cache) > COUNT_CACHE_MAX_SIZE:
+            _count_cache.popitem(last=False)
+    return total_results
+
+
+def _estimated_count(db: Session, query: Query) -> int:
+    compiled = _compile(db, query)
+    plan = (
+        db.connection()
+        .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+        .scalar()
+    )
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+    if estimate < ESTIMATE_EXACT_THRESHOLD:
+        return query.count()
+    return estimate
+
+
+def count_results(db: Session, query: Query, count_mode: CountMode) -> int:
+    """Counts the results of the (unpaginated) query"""
+    match count_mode:
+        case CountMode.EXACT:
+            return query.count()
+        case CountMode.CACHED:
+            return _cached_count(db, query)
+        case CountMode.ESTIMATED:
+            return _estimated_count(db, query)
+
+
+# --- KEYSET PAGINATION --- #
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"date": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "datetime" in value:
+            return datetime.fromisoformat(value["datetime"])
+        if "date" in value:
+            return date.fromisoformat(value["date"])
+    return value
+
+
+def _keys_fingerprint(keys: list[tuple[Any, SortDirection]]) -> str:
+    return hashlib.blake2b(
+        repr([(str(column), direction.value) for column, direction in keys]).encode(
+            "utf-8"
+        ),
+        digest_size=8,
+    ).hexdigest()
+
+
+def encode_cursor(keys: list[tuple[Any, SortDirection]], values: list[Any]) -> str:
+    """Encodes the sort key values of the last row of a page as an opaque cursor"""
+    data = {
+        "k": _keys_fingerprint(keys),
+        "v": [_encode_value(v) for v in values],
+    }
+    return base64.urlsafe_b64encode(json.dumps(data).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(keys: list[tuple[Any, SortDirection]], cursor: str) -> list[Any]:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        fingerprint, values = data["k"], data["v"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidPage(f"Invalid cursor: {cursor}") from e
+    if fingerprint != _keys_fingerprint(keys) or len(values) != len(keys):
+        raise InvalidPage("The cursor does not belong to the requested sorting!")
+    try:
+        values = [_decode_value(v) for v in values]
+    except (ValueError, TypeError) as e:
+        raise InvalidPage(f"Invalid cursor: {cursor}") from e
+    # only scalar sort key values can be compared with the sort columns
+    if not all(isinstance(v, (str, int, float, date, type(None))) for v in values):
+        raise InvalidPage(f"Invalid cursor: {cursor}")
+    return values
+
+
+def _is_after(column, direction: SortDirection, value: Any):
+    # sorting is always NULLS LAST: nothing but NULLs comes after a NULL
+    if value is None:
+        return false()
+    match direction:
+        case SortDirection.ASC:
+            return or_(column > value, column.is_(None))
+        case SortDirection.DESC:
+            return or_(column < value, column.is_(None))
+
+
+def _is_equal(column, value: Any):
+    return column.is_(None) if value is None else column == value
+
+
+def apply_keyset_pagination(
+    query: Query,
+    keys: list[tuple[Any, SortDirection]],
+    cursor: str | None,
+    page_size: int,
+) -> Query:
+    """Apply keyset (seek) pagination to a SQLAlchemy query object.
+
+    Instead of skipping (page_number - 1) * page_size rows with OFFSET, the page starts
+    right after the row the cursor points to. This is as fast for the last page as for the first one.
+
+    :param keys:
+        The sort columns and their directions. The last key must be unique (e.g. the id),
+        so that the order is total.
+
+    :param cursor:
+        The cursor returned with the previous page or None for the first page.
+
+    :returns:
+        The paginated query. It selects the values of the keys as additional
+        (trailing) columns, which are used to compute the cursor of the next page.
+    """
+    if page_size < 0:
+        raise InvalidPage("Page size should not be negative: {}".format(page_size))
+
+    if cursor is not None:
+        values = decode_cursor(keys, cursor)
+        # lexicographic comparison: (k0, k1, ...) > (v0, v1, ...)
+        query = query.filter(
+            or_(
+                *[
+                    and_(
+                        *[
+                            _is_equal(column, value)
+                            for (column, _), value in zip(keys[:i], values[:i])
+                        ],
+                        _is_after(keys[i][0], keys[i][1], values[i]),
+                    )
+                    for i in range(len(keys))
+                ]
+            )
+        )
+
+    return (
+        query.add_columns(
+            *[column.label(f"keyset_{i}") for i, (column, _) in enumerate(keys)]
+        )
+        .order_by(None)
+        .order_by(*[direction.apply(column) for column, direction in keys])
+        .limit(page_size)
+    )
@@ -1,12 +1,13 @@
 from typing import TYPE_CHECKING, Any, TypeVar
 
 from sqlalchemy import desc
-from sqlalchemy.orm import Query, Session, aliased
+from sqlalchemy.orm import Query, QueryableAttribute, Session, aliased
 from sqlalchemy.sql._typing import (
     _ColumnExpressionArgument,  # type: ignore
     _JoinTargetArgument,  # type: ignore
     _OnClauseArgument,  # type: ignore
 )
+from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.sql.selectable import Subquery
 
 from common.meta_type import MetaType
@@ -19,9 +20,17 @@ from systems.search_system.filtering import (
     apply_filtering,
     get_columns_affected_by_filter,
 )
-from systems.search_system.pagination import apply_pagination
+from systems.search_system.pagination import (
+    CountMode,
+    InvalidPage,
+    apply_keyset_pagination,
+    apply_pagination,
+    count_results,
+    encode_cursor,
+)
 from systems.search_system.sorting import (
     Sort,
+    SortDirection,
     apply_sorting,
     get_columns_affected_by_sorts,
 )
@@ -52,6 +61,8 @@ class SearchBuilder:
         self.selected_columns: list[str] = []
         self.subquery: Query | Subquery | None = None
         self.query: Query | None = None
+        # cursor of the next page, set by execute_query in keyset pagination mode (None on the last page)
+        self.next_cursor: str | None = None
 
         affected_columns = get_columns_affected_by_filter(self.filter)
         affected_columns.update(get_columns_affected_by_sorts(self.sorts))
@@ -209,9 +220,35 @@ class SearchBuilder:
 
         return self.query
 
+    def _get_keyset(
+        self, query: Query, subquery_dict
+    ) -> list[tuple[Any, SortDirection]]:
+        # the sort columns + the first selected column (the id) as unique tie-breaker
+        keys = [
+            (sort.get_sort_column(subquery_dict=subquery_dict), sort.direction)
+            for sort in self.sorts or []
+        ]
+        keys.append((query.column_descriptions[0]["expr"], SortDirection.DESC))
+        for column, _ in keys:
+            if not isinstance(column, (ColumnElement, QueryableAttribute)):
+                raise InvalidPage(
+                    f"Keyset pagination is not supported for sorting by {column}!"
+                )
+        return keys
+
     def execute_query(
-        self, page_number: int | None, page_size: int | None
+        self,
+        page_number: int | None,
+        page_size: int | None,
+        cursor: str | None = None,
+        use_cursor: bool = False,
+        count_mode: CountMode = CountMode.EXACT,
     ) -> tuple[list, int]:
+        """
+        Executes the query and returns the result rows (of the requested page) and the total number of results.
+        Pagination is either offset based (page_number & page_size) or, if use_cursor is True, keyset based
+        (cursor & page_size): The cursor of the next page is stored in self.next_cursor.
+        """
         if self.query is None:
             raise ValueError("Query is not initialized")
 
@@ -227,6 +264,24 @@ class SearchBuilder:
             subquery_dict=subquery_dict,
         )
 
+        # keyset pagination
+        if use_cursor and page_size is not None:
+            keys = self._get_keyset(query, subquery_dict)
+            num_columns = len(query.column_descriptions)
+            total_results = count_results(self.db, query, count_mode)
+            rows = apply_keyset_pagination(
+                query=query, keys=keys, cursor=cursor, page_size=page_size
+            ).all()
+            self.next_cursor = (
+                encode_cursor(keys, list(rows[-1][num_columns:]))
+                if len(rows) == page_size and len(rows) > 0
+                else None
+            )
+            return [row[:num_columns] for row in rows], total_results
+
+        # the count does not depend on the sorting
+        filtered_query = query
+
         # with sorting
         if self.sorts is not None and len(self.sorts) > 0:
             query = apply_sorting(
@@ -242,7 +297,10 @@ class SearchBuilder:
         # with pagination
         if page_number is not None and page_size is not None:
             query, pagination = apply_pagination(
-                query=query, page_number=page_number + 1, page_size=page_size
+                query=query,
+                page_number=page_number + 1,
+                page_size=page_size,
+                total_results=count_results(self.db, filtered_query, count_mode),
             )
             total_results = pagination.total_results
             result_rows = query.all()
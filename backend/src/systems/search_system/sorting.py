@@ -28,12 +28,15 @@ class Sort(BaseModel, Generic[T]):
     column: T | int
     direction: SortDirection
 
-    def get_sqlalchemy_expression(self, subquery_dict):
+    def get_sort_column(self, subquery_dict):
         if isinstance(self.column, int):
-            return self.direction.apply(subquery_dict[f"METADATA-{self.column}"])
+            return subquery_dict[f"METADATA-{self.column}"]
 
         # This is a regular column
-        return self.direction.apply(self.column.get_sort_column())
+        return self.column.get_sort_column()
+
+    def get_sqlalchemy_expression(self, subquery_dict):
+        return self.direction.apply(self.get_sort_column(subquery_dict=subquery_dict))
 
 
 def apply_sorting(query, sorts: list[Sort], subquery_dict):
@@ -1,14 +1,66 @@
 import glob
 import importlib
 import os
+import resource
+import sys
+import time
 from types import ModuleType
 
+from loguru import logger
+
+# heavy (ML) dependencies that should only be loaded by the jobs that need them
+HEAVY_MODULES = [
+    "torch",
+    "pytorch_lightning",
+    "transformers",
+    "sentence_transformers",
+    "setfit",
+    "datasets",
+    "sklearn",
+    "umap",
+    "hdbscan",
+    "matplotlib",
+    "scipy",
+]
+
+# import time of every module imported by import_by_suffix / import_by_names (in seconds)
+_import_times: dict[str, float] = {}
+
 
 def import_by_suffix(suffix: str) -> list[ModuleType]:
     root_dir = os.path.dirname(os.path.dirname(__file__))
-    modules = [
-        importlib.import_module(module.replace("/", ".").replace(".py", ""))
-        for module in glob.iglob(rf"**/*{suffix}", recursive=True, root_dir=root_dir)
-    ]
+    return import_by_names(
+        [
+            module.replace("/", ".").replace(".py", "")
+            for module in glob.iglob(
+                rf"**/*{suffix}", recursive=True, root_dir=root_dir
+            )
+        ]
+    )
+
+
+def import_by_names(module_names: list[str]) -> list[ModuleType]:
+    modules = []
+    for module_name in module_names:
+        start = time.perf_counter()
+        modules.append(importlib.import_module(module_name))
+        _import_times.setdefault(module_name, time.perf_counter() - start)
 
     return modules
+
+
+def log_startup_profile(name: str, top_k: int = 10) -> None:
+    """
+    Logs the startup profile of this process: the total import time, the slowest imported modules
+    (including the time of their own imports), the loaded heavy dependencies and the peak memory usage.
+    """
+    slowest = sorted(_import_times.items(), key=lambda x: x[1], reverse=True)[:top_k]
+    loaded_heavy_modules = [m for m in HEAVY_MODULES if m in sys.modules]
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    logger.info(
+        f"Startup profile of {name}: imported {len(_import_times)} modules in "
+        f"{sum(_import_times.values()):.2f}s, peak RSS {max_rss_mb:.0f} MB, "
+        f"heavy dependencies loaded: {loaded_heavy_modules or 'none'}\n"
+        + "\n".join(f"  {t:6.2f}s {m}" for m, t in slowest)
+    )
@@ -9,7 +9,7 @@ from rq import SimpleWorker, Worker
 from rq.worker_pool import WorkerPool
 
 from repos.redis_repo import RedisRepo
-from utils.import_utils import import_by_suffix
+from utils.import_utils import import_by_suffix, log_startup_profile
 
 redis_conn = RedisRepo().redis_connection()
 
@@ -30,9 +30,10 @@ def do_healthcheck():
 
 
 def do_work(device: str):
-    # import all expensive stuff before forking, so that imports are only done once
+    # import the shared stuff before forking, so that imports are only done once.
+    # Services are imported on first use, heavy dependencies (e.g. torch) are preloaded
+    # only by the pools of the devices whose jobs need them (see create_pool)
     import_by_suffix("_repo.py")
-    import_by_suffix("_service.py")
     import_by_suffix("_orm.py")
     import_by_suffix("_dto.py")
     import_by_suffix("_crud.py")
@@ -40,6 +41,13 @@ def do_work(device: str):
     # import doc_processing_pipeline
     import modules.doc_processing.doc_processing_pipeline  # noqa: F401
 
+    # close connections opened during the imports, forked children open their own ones
+    from repos.vector.weaviate_repo import WeaviateRepo
+
+    WeaviateRepo.pool.close_all()
+
+    log_startup_profile("worker")
+
     ctx = mp.get_context("fork")
 
     if device not in ["cpu", "gpu", "dev"]:
@@ -92,6 +100,12 @@ def do_work(device: str):
 def create_pool(queue_name: str, num_workers: int):
     from rq import Queue
 
+    from systems.job_system.job_service import JobService
+
+    # import the lazily imported modules of this device's jobs before forking the workers
+    JobService().import_preload_modules(device=queue_name)  # type: ignore
+    log_startup_profile(f"worker pool '{queue_name}'")
+
     queues = [
         Queue(f"{queue_name}-high", connection=redis_conn),
         Queue(f"{queue_name}-default", connection=redis_conn),
@@ -0,0 +1,105 @@
+"""
+Benchmark of CRUDBase.update_multi (loads & updates ORM objects) vs. CRUDBase.update_multi_values (UPDATE ... FROM unnest).
+
+Creates a temporary table in the configured Postgres database (see configs/default.yaml), fills it with --rows rows,
+updates two float columns of every row with each method and checks the written values.
+
+Usage (from backend/src):
+    python ../test/benchmarks/benchmark_update_multi_values.py --rows 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+from pydantic import BaseModel
+from sqlalchemy import Float, Integer, String, select, text
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from repos.db.crud_base import CRUDBase
+from repos.db.orm_base import ORMBase
+from repos.db.sql_repo import SQLRepo
+
+
+class BenchmarkRowORM(ORMBase):
+    __tablename__ = "benchmark_update_multi_values"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    content: Mapped[str] = mapped_column(String)
+    x: Mapped[float | None] = mapped_column(Float, nullable=True)
+    y: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+
+class BenchmarkRowUpdate(BaseModel):
+    x: float
+    y: float
+
+
+crud = CRUDBase[BenchmarkRowORM, BaseModel, BenchmarkRowUpdate](BenchmarkRowORM)  # type: ignore
+
+
+def reset(engine, rows: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {BenchmarkRowORM.__tablename__}"))
+        conn.execute(
+            text(
+                f"INSERT INTO {BenchmarkRowORM.__tablename__} (id, content) "
+                f"SELECT g, 'some content ' || g FROM generate_series(0, {rows - 1}) g"
+            )
+        )
+
+
+def run(engine, method: str, rows: int, coords: np.ndarray) -> float:
+    reset(engine, rows)
+    ids = list(range(rows))
+    start = time.perf_counter()
+    with Session(engine) as db:
+        if method == "update_multi":
+            crud.update_multi(
+                db,
+                ids=ids,
+                update_dtos=[
+                    BenchmarkRowUpdate(x=float(x), y=float(y)) for x, y in coords
+                ],
+            )
+        else:
+            crud.update_multi_values(
+                db,
+                ids=ids,
+                values_by_column={
+                    "x": coords[:, 0].tolist(),
+                    "y": coords[:, 1].tolist(),
+                },
+            )
+        db.commit()
+    elapsed = time.perf_counter() - start
+
+    with Session(engine) as db:
+        written = db.execute(
+            select(BenchmarkRowORM.x, BenchmarkRowORM.y).order_by(BenchmarkRowORM.id)
+        ).all()
+    assert np.allclose(np.asarray(written, dtype=np.float64), coords), method
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument(
+        "--methods", nargs="+", default=["update_multi", "update_multi_values"]
+    )
+    args = parser.parse_args()
+
+    engine = SQLRepo().engine
+    table = BenchmarkRowORM.__table__
+    ORMBase.metadata.create_all(engine, tables=[table])  # type: ignore
+    try:
+        coords = np.random.default_rng(0).normal(size=(args.rows, 2))
+        for method in args.methods:
+            elapsed = run(engine, method, args.rows, coords)
+            print(f"{method}: {elapsed:.2f}s for {args.rows} rows")
+    finally:
+        ORMBase.metadata.drop_all(engine, tables=[table])  # type: ignore
+
+
+if __name__ == "__main__":
+    main()
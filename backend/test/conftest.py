@@ -223,8 +223,9 @@ def app(db_session: Session, test_user: UserORM) -> FastAPI:
     from psycopg2.errors import UniqueViolation
     from sqlalchemy.exc import IntegrityError
 
-    from common.dependencies import get_current_user
+    from common.dependencies import get_current_principal, get_current_user
     from common.exception_handler import exception_handler, exception_handlers
+    from core.auth.principal_dto import Principal
     from core.user.user_crud import crud_user
     from utils.import_utils import import_by_suffix
 
@@ -234,6 +235,16 @@ def app(db_session: Session, test_user: UserORM) -> FastAPI:
     app.dependency_overrides[get_current_user] = lambda: crud_user.read_by_email(
         db=db_session, email=test_user.email
     )
+    app.dependency_overrides[get_current_principal] = lambda: Principal(
+        id=test_user.id,
+        email=test_user.email,
+        project_ids={
+            project.id
+            for project in crud_user.read_by_email(
+                db=db_session, email=test_user.email
+            ).projects
+        },
+    )
 
     # import & register all endpoints dynamically
     modules = import_by_suffix("_endpoint.py")
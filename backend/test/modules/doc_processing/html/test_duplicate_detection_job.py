@@ -0,0 +1,95 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from sqlalchemy.orm import Session
+
+from common.doc_type import DocType
+from core.doc.source_document_crud import crud_sdoc
+from core.doc.source_document_dto import SourceDocumentCreate
+from core.project.project_orm import ProjectORM
+from modules.doc_processing.doc_processing_dto import ProcessingSettings
+from modules.doc_processing.html import duplicate_detection_job
+from modules.doc_processing.html.duplicate_detection_job import (
+    TextDuplicateDetectionJobInput,
+    handle_text_duplicate_detection_job,
+)
+from modules.word_frequency.word_frequency_crud import crud_word_frequency
+from modules.word_frequency.word_frequency_dto import WordFrequencyCreate
+
+
+def _create_sdoc(db: Session, project_id: int, filename: str, words: list[str]) -> int:
+    sdoc = crud_sdoc.create(
+        db=db,
+        create_dto=SourceDocumentCreate(
+            filename=filename,
+            name=filename,
+            doctype=DocType.text,
+            project_id=project_id,
+            folder_id=None,
+        ),
+    )
+    crud_word_frequency.create_multi(
+        db=db,
+        create_dtos=[
+            WordFrequencyCreate(sdoc_id=sdoc.id, word=word, count=1) for word in words
+        ],
+    )
+    return sdoc.id
+
+
+def test_concurrent_near_duplicates_are_detected(
+    db_session: Session, test_project: ProjectORM, monkeypatch
+):
+    words = [f"word{i}" for i in range(200)]
+    sdoc_ids = [
+        _create_sdoc(db_session, test_project.id, "a.txt", words),
+        _create_sdoc(db_session, test_project.id, "b.txt", words[:-1] + ["other"]),
+    ]
+    db_session.commit()
+
+    # both jobs compute their signatures before either one updates the LSH index
+    barrier = threading.Barrier(len(sdoc_ids), timeout=30)
+    minhash_signature = duplicate_detection_job.minhash_signature
+
+    def synchronized_minhash_signature(word_hashes):
+        signature = minhash_signature(word_hashes)
+        barrier.wait()
+        return signature
+
+    monkeypatch.setattr(
+        duplicate_detection_job, "minhash_signature", synchronized_minhash_signature
+    )
+
+    settings = ProcessingSettings(
+        model="default",
+        language="en",
+        extract_images=False,
+        pages_per_chunk=1,
+        keyword_number=5,
+        keyword_deduplication_threshold=0.1,
+        keyword_max_ngram_size=3,
+        duplicate_max_different_words=2,
+    )
+    with ThreadPoolExecutor(max_workers=len(sdoc_ids)) as executor:
+        outputs = list(
+            executor.map(
+                lambda sdoc_id: handle_text_duplicate_detection_job(
+                    payload=TextDuplicateDetectionJobInput(
+                        project_id=test_project.id, sdoc_id=sdoc_id, settings=settings
+                    ),
+                    job=MagicMock(),
+                ),
+                sdoc_ids,
+            )
+        )
+
+    # the job that updated the LSH index last found the other document
+    sdoc_id2duplicates = {
+        sdoc_id: output.duplicate_sdoc_ids for sdoc_id, output in zip(sdoc_ids, outputs)
+    }
+    flagged = [sdoc_id for sdoc_id, dups in sdoc_id2duplicates.items() if len(dups) > 0]
+    assert len(flagged) == 1
+    assert sdoc_id2duplicates[flagged[0]] == [
+        sdoc_id for sdoc_id in sdoc_ids if sdoc_id != flagged[0]
+    ]
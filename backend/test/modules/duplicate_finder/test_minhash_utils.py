@@ -0,0 +1,96 @@
+import numpy as np
+
+from modules.duplicate_finder.minhash_utils import (
+    NUM_BANDS,
+    NUM_PERM,
+    band_keys,
+    fingerprint,
+    hash_words,
+    minhash_signature,
+    signature_from_bytes,
+    signature_to_bytes,
+)
+
+
+def _words(prefix: str, n: int) -> list[str]:
+    return [f"{prefix}{i}" for i in range(n)]
+
+
+def _shared_bands(a: np.ndarray, b: np.ndarray) -> int:
+    return len(set(band_keys(a)) & set(band_keys(b)))
+
+
+def test_hash_words_is_deterministic_and_case_insensitive():
+    hashes = hash_words(["Hello", "world", "hello"])
+
+    assert np.array_equal(hashes, hash_words(["WORLD", "hello"]))
+    assert len(hashes) == 2
+
+
+def test_minhash_signature_is_deterministic():
+    word_hashes = hash_words(_words("word", 100))
+
+    signature = minhash_signature(word_hashes)
+
+    assert signature.shape == (NUM_PERM,)
+    assert signature.dtype == np.uint32
+    assert np.array_equal(signature, minhash_signature(word_hashes))
+    # the order of the words does not matter
+    assert np.array_equal(
+        signature, minhash_signature(hash_words(reversed(_words("word", 100))))
+    )
+
+
+def test_minhash_signature_of_empty_set():
+    signature = minhash_signature(hash_words([]))
+
+    assert signature.shape == (NUM_PERM,)
+    assert np.array_equal(signature, minhash_signature(hash_words([])))
+
+
+def test_signature_bytes_round_trip():
+    signature = minhash_signature(hash_words(_words("word", 50)))
+
+    data = signature_to_bytes(signature)
+    restored = signature_from_bytes(data)
+
+    assert len(data) == NUM_PERM * 4
+    assert restored.dtype == np.uint32
+    assert np.array_equal(signature, restored)
+    assert band_keys(restored) == band_keys(signature)
+
+
+def test_band_keys_are_deterministic_63_bit_ints():
+    signature = minhash_signature(hash_words(_words("word", 50)))
+
+    keys = band_keys(signature)
+
+    assert len(keys) == NUM_BANDS
+    assert keys == band_keys(signature.copy())
+    assert all(0 <= key < (1 << 63) for key in keys)
+
+
+def test_lsh_near_duplicates_collide():
+    words = _words("word", 200)
+    near_duplicate = words[:-5] + _words("other", 5)  # Jaccard similarity ~0.95
+
+    a = minhash_signature(hash_words(words))
+    b = minhash_signature(hash_words(near_duplicate))
+
+    assert _shared_bands(a, b) > 0
+
+
+def test_lsh_unrelated_documents_do_not_collide():
+    a = minhash_signature(hash_words(_words("word", 200)))
+    b = minhash_signature(hash_words(_words("other", 200)))
+
+    assert _shared_bands(a, b) == 0
+
+
+def test_fingerprint():
+    word_hashes = hash_words(_words("word", 100))
+
+    assert fingerprint(word_hashes) == fingerprint(word_hashes[::-1].copy())
+    assert fingerprint(word_hashes) != fingerprint(word_hashes[:-1])
+    assert 0 <= fingerprint(word_hashes) < (1 << 63)
+    assert fingerprint(hash_words([])) == 0
@@ -0,0 +1,45 @@
+import numpy as np
+import scipy.sparse as sp
+
+from modules.perspectives.ctfidf import top_k_per_row
+
+
+def test_top_k_per_row_matches_dense_sort():
+    rng = np.random.RandomState(0)
+    dense = rng.rand(20, 50) * (rng.rand(20, 50) > 0.7)
+
+    result = top_k_per_row(sp.csr_matrix(dense), k=5)
+
+    assert len(result) == 20
+    for row, (indices, values) in zip(dense, result):
+        expected = np.argsort(-row, kind="stable")[:5]
+        expected = expected[row[expected] > 0]
+        assert np.array_equal(indices, expected)
+        assert np.allclose(values, row[expected])
+
+
+def test_top_k_per_row_ties():
+    X = sp.csr_matrix(np.array([[0.5, 0.0, 0.5, 0.9, 0.5, 0.1]]))
+
+    indices, values = top_k_per_row(X, k=3)[0]
+
+    # ties at the boundary are broken by the column index
+    assert indices.tolist() == [3, 0, 2]
+    assert values.tolist() == [0.9, 0.5, 0.5]
+
+
+def test_top_k_per_row_rows_with_less_than_k_non_zeros():
+    X = sp.csr_matrix(
+        np.array(
+            [
+                [0.0, 0.2, 0.0, 0.0],
+                [0.0, 0.0, 0.0, 0.0],
+                [0.3, 0.0, 0.7, 0.0],
+            ]
+        )
+    )
+
+    result = top_k_per_row(X, k=3)
+
+    assert [indices.tolist() for indices, _ in result] == [[1], [], [2, 0]]
+    assert [values.tolist() for _, values in result] == [[0.2], [], [0.7, 0.3]]
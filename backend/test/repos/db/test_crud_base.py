@@ -0,0 +1,224 @@
+from typing import Any, Generator
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import ARRAY, Float, Integer, String, inspect, select
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from repos.db import crud_base
+from repos.db.crud_base import CRUDBase
+from repos.db.orm_base import ORMBase
+
+
+class CrudBaseTestRowORM(ORMBase):
+    __tablename__ = "crud_base_test_row"
+    sdoc_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    aspect_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    content: Mapped[str] = mapped_column(String)
+    x: Mapped[float | None] = mapped_column(Float, nullable=True)
+    y: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+
+class CrudBaseTestArrayRowORM(ORMBase):
+    __tablename__ = "crud_base_test_array_row"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    offsets: Mapped[list[int] | None] = mapped_column(ARRAY(Integer), nullable=True)
+    words: Mapped[list[str] | None] = mapped_column(ARRAY(String), nullable=True)
+    matrix: Mapped[list[list[float]] | None] = mapped_column(
+        ARRAY(Float, dimensions=2), nullable=True
+    )
+
+
+class CrudBaseTestArrayRowCreate(BaseModel):
+    id: int
+    offsets: list[int] | None
+    words: list[str | None] | None
+    matrix: list[list[float]] | None
+
+
+crud = CRUDBase[CrudBaseTestRowORM, BaseModel, BaseModel](CrudBaseTestRowORM)  # type: ignore
+crud_array = CRUDBase[CrudBaseTestArrayRowORM, CrudBaseTestArrayRowCreate, BaseModel](  # type: ignore
+    CrudBaseTestArrayRowORM
+)
+
+
+@pytest.fixture
+def rows(db_session: Session) -> Generator[Session, Any, None]:
+    table = CrudBaseTestRowORM.__table__
+    engine = db_session.get_bind()
+    ORMBase.metadata.create_all(engine, tables=[table])  # type: ignore
+    db_session.add_all(
+        [
+            CrudBaseTestRowORM(sdoc_id=sdoc_id, aspect_id=aspect_id, content="text")
+            for sdoc_id in range(5)
+            for aspect_id in range(2)
+        ]
+    )
+    db_session.commit()
+    db_session.expunge_all()
+    try:
+        yield db_session
+    finally:
+        db_session.rollback()
+        ORMBase.metadata.drop_all(engine, tables=[table])  # type: ignore
+
+
+def _read_all(db: Session) -> dict[tuple[int, int], tuple[float | None, float | None]]:
+    return {
+        (row.sdoc_id, row.aspect_id): (row.x, row.y)
+        for row in db.execute(
+            select(
+                CrudBaseTestRowORM.sdoc_id,
+                CrudBaseTestRowORM.aspect_id,
+                CrudBaseTestRowORM.x,
+                CrudBaseTestRowORM.y,
+            )
+        )
+    }
+
+
+@pytest.mark.parametrize("batch_size", [2, 1000])
+def test_update_multi_values_writes_values(rows, monkeypatch, batch_size):
+    monkeypatch.setattr(crud_base, "BATCH_SIZE", batch_size)
+
+    updated = crud.update_multi_values(
+        rows,
+        ids=[(0, 1), (3, 0), (4, 1)],
+        values_by_column={"x": [1.5, -2.0, None], "y": [0.0, 3.25, 4.0]},
+    )
+
+    assert updated == 3
+    written = _read_all(rows)
+    assert written[(0, 1)] == (1.5, 0.0)
+    assert written[(3, 0)] == (-2.0, 3.25)
+    assert written[(4, 1)] == (None, 4.0)
+    # all other rows are unchanged
+    assert all(
+        values == (None, None)
+        for key, values in written.items()
+        if key not in {(0, 1), (3, 0), (4, 1)}
+    )
+
+
+def test_update_multi_values_expires_loaded_objects(rows):
+    updated_obj = rows.get(CrudBaseTestRowORM, (1, 0))
+    other_obj = rows.get(CrudBaseTestRowORM, (1, 1))
+    assert updated_obj is not None and other_obj is not None
+    assert updated_obj.x is None
+
+    crud.update_multi_values(rows, ids=[(1, 0)], values_by_column={"x": [7.0]})
+
+    assert "x" in inspect(updated_obj).expired_attributes
+    assert len(inspect(other_obj).expired_attributes) == 0
+    # the next access reloads the row
+    assert updated_obj.x == 7.0
+
+
+def test_update_multi_values_flushes_pending_changes(rows):
+    obj = rows.get(CrudBaseTestRowORM, (2, 0))
+    assert obj is not None
+    obj.y = 9.0
+
+    crud.update_multi_values(rows, ids=[(2, 0)], values_by_column={"x": [8.0]})
+
+    assert _read_all(rows)[(2, 0)] == (8.0, 9.0)
+    assert (obj.x, obj.y) == (8.0, 9.0)
+
+
+def test_update_multi_values_expunges_objects_with_changed_primary_key(rows):
+    obj = rows.get(CrudBaseTestRowORM, (3, 1))
+    assert obj is not None
+
+    crud.update_multi_values(rows, ids=[(3, 1)], values_by_column={"aspect_id": [5]})
+
+    assert obj not in rows
+    assert rows.get(CrudBaseTestRowORM, (3, 5)) is not None
+    assert rows.get(CrudBaseTestRowORM, (3, 1)) is None
+
+
+def test_update_multi_values_validates_lengths(rows):
+    with pytest.raises(ValueError):
+        crud.update_multi_values(
+            rows, ids=[(0, 0), (0, 1)], values_by_column={"x": [1.0]}
+        )
+
+    assert crud.update_multi_values(rows, ids=[], values_by_column={"x": []}) == 0
+
+
+class CrudBaseTestRowUpdate(BaseModel):
+    aspect_id: int | None = None
+    x: float | None = None
+    y: float | None = None
+
+
+def test_update_multi_values_from_dtos_updates_the_set_fields(rows):
+    updated = crud.update_multi_values_from_dtos(
+        rows,
+        ids=[(0, 0), (1, 0), (2, 0), (3, 0)],
+        update_dtos=[
+            CrudBaseTestRowUpdate(x=1.0),
+            CrudBaseTestRowUpdate(x=2.0, y=3.0),
+            CrudBaseTestRowUpdate(y=4.0),
+            CrudBaseTestRowUpdate(aspect_id=7),
+        ],
+    )
+
+    assert updated == 4
+    written = _read_all(rows)
+    assert written[(0, 0)] == (1.0, None)
+    assert written[(1, 0)] == (2.0, 3.0)
+    assert written[(2, 0)] == (None, 4.0)
+    assert (3, 0) not in written
+    assert written[(3, 7)] == (None, None)
+
+    with pytest.raises(ValueError):
+        crud.update_multi_values_from_dtos(
+            rows,
+            ids=[(0, 0)],
+            update_dtos=[CrudBaseTestRowUpdate(), CrudBaseTestRowUpdate()],
+        )
+
+
+def test_create_multi_copy_writes_array_columns(db_session: Session):
+    table = CrudBaseTestArrayRowORM.__table__
+    engine = db_session.get_bind()
+    ORMBase.metadata.create_all(engine, tables=[table])  # type: ignore
+    create_dtos = [
+        CrudBaseTestArrayRowCreate(
+            id=0,
+            offsets=[0, 5, 12],
+            words=[
+                "plain",
+                'with "quotes"',
+                "back\\slash",
+                "tab\tand\nnewline",
+                "{,}",
+                None,
+                "",
+            ],
+            matrix=[[1.5, -2.0], [0.0, 3.25]],
+        ),
+        CrudBaseTestArrayRowCreate(id=1, offsets=[], words=None, matrix=None),
+    ]
+    try:
+        assert crud_array.create_multi_copy(db_session, create_dtos=create_dtos) == 2
+
+        written = {
+            row.id: row
+            for row in db_session.execute(
+                select(
+                    CrudBaseTestArrayRowORM.id,
+                    CrudBaseTestArrayRowORM.offsets,
+                    CrudBaseTestArrayRowORM.words,
+                    CrudBaseTestArrayRowORM.matrix,
+                )
+            )
+        }
+        for create_dto in create_dtos:
+            row = written[create_dto.id]
+            assert row.offsets == create_dto.offsets
+            assert row.words == create_dto.words
+            assert row.matrix == create_dto.matrix
+    finally:
+        db_session.rollback()
+        ORMBase.metadata.drop_all(engine, tables=[table])  # type: ignore
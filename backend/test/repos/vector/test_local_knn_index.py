@@ -0,0 +1,212 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import srsly
+from weaviate.classes.query import Filter
+
+from repos.vector import local_knn_index
+from repos.vector.local_knn_index import (
+    META_FILE,
+    LocalKnnIndex,
+    UnsupportedFilterError,
+    _sort_key,
+    get_local_index,
+    mark_stale,
+)
+
+PROPERTIES = ["sdoc_id", "sentence_id"]
+
+
+def _build_index(path: Path, keys: np.ndarray, vectors: np.ndarray) -> LocalKnnIndex:
+    # the files as written by local_knn_index._build
+    build_id = "test"
+    np.save(path / f"{build_id}.keys.npy", keys)
+    np.save(path / f"{build_id}.order.npy", np.argsort(_sort_key(keys), kind="stable"))
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.save(path / f"{build_id}.vectors.npy", normalized.astype(np.float32))
+    return LocalKnnIndex(
+        {"build_id": build_id, "properties": PROPERTIES, "rows": len(keys)}, path
+    )
+
+
+@pytest.fixture
+def rng() -> np.random.Generator:
+    return np.random.default_rng(0)
+
+
+@pytest.fixture
+def keys(rng) -> np.ndarray:
+    keys = np.array(
+        [(sdoc_id, sentence_id) for sdoc_id in range(30) for sentence_id in range(5)],
+        dtype=np.int64,
+    )
+    # rows are stored in the (arbitrary) order of the Weaviate cursor
+    return keys[rng.permutation(len(keys))]
+
+
+@pytest.fixture
+def vectors(rng, keys) -> np.ndarray:
+    return rng.normal(size=(len(keys), 16)).astype(np.float32)
+
+
+@pytest.fixture
+def index(tmp_path, keys, vectors) -> LocalKnnIndex:
+    return _build_index(tmp_path, keys, vectors)
+
+
+def _brute_force(
+    vectors: np.ndarray, query: np.ndarray, k: int, mask: np.ndarray | None
+) -> tuple[np.ndarray, np.ndarray]:
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    certainties = (1.0 + normalized @ (query / np.linalg.norm(query))) / 2.0
+    rows = np.arange(len(vectors)) if mask is None else np.flatnonzero(mask)
+    rows = rows[np.argsort(-certainties[rows], kind="stable")][:k]
+    return rows, certainties[rows]
+
+
+@pytest.mark.parametrize("k", [1, 10, 1000])
+def test_search_is_exact(index, vectors, rng, k):
+    queries = rng.normal(size=(5, vectors.shape[1])).astype(np.float32)
+
+    results = index.search(queries=queries, k=k, threshold=None, mask=None)
+
+    assert len(results) == len(queries)
+    for query, (rows, scores) in zip(queries, results):
+        expected_rows, expected_scores = _brute_force(vectors, query, k, None)
+        assert rows.tolist() == expected_rows.tolist()
+        assert np.allclose(scores, expected_scores, atol=1e-5)
+
+
+def test_search_with_mask_and_threshold(index, keys, vectors, rng):
+    queries = rng.normal(size=(5, vectors.shape[1])).astype(np.float32)
+    mask = keys[:, 0] % 3 == 0
+
+    results = index.search(queries=queries, k=10, threshold=0.55, mask=mask)
+
+    for query, (rows, scores) in zip(queries, results):
+        expected_rows, expected_scores = _brute_force(vectors, query, 10, mask)
+        keep = expected_scores >= 0.55
+        assert rows.tolist() == expected_rows[keep].tolist()
+        assert np.allclose(scores, expected_scores[keep], atol=1e-5)
+
+
+def test_search_without_candidates(index, vectors):
+    results = index.search(
+        queries=vectors[:2],
+        k=5,
+        threshold=None,
+        mask=np.zeros(len(vectors), dtype=bool),
+    )
+
+    assert [len(rows) for rows, _ in results] == [0, 0]
+
+
+def test_rows_of(index, keys):
+    rows = index.rows_of(np.array([keys[7], keys[42], [999, 0]]))
+
+    assert rows.tolist() == [7, 42, -1]
+
+
+@pytest.mark.parametrize(
+    "filters, expected",
+    [
+        (None, None),
+        (
+            Filter.by_property("sdoc_id").contains_any([3, 5, 29]),
+            lambda keys: np.isin(keys[:, 0], [3, 5, 29]),
+        ),
+        (
+            Filter.by_property("sentence_id").contains_any([0, 4]),
+            lambda keys: np.isin(keys[:, 1], [0, 4]),
+        ),
+        (
+            Filter.by_property("sdoc_id").equal(7),
+            lambda keys: keys[:, 0] == 7,
+        ),
+        (
+            Filter.by_property("sentence_id").not_equal(2),
+            lambda keys: keys[:, 1] != 2,
+        ),
+        (
+            Filter.by_property("sdoc_id").contains_any([1, 2, 3])
+            & Filter.by_property("sentence_id").less_than(2),
+            lambda keys: np.isin(keys[:, 0], [1, 2, 3]) & (keys[:, 1] < 2),
+        ),
+        (
+            Filter.by_property("sdoc_id").greater_or_equal(28)
+            | Filter.by_property("sentence_id").less_or_equal(0),
+            lambda keys: (keys[:, 0] >= 28) | (keys[:, 1] <= 0),
+        ),
+        (
+            Filter.by_property("sdoc_id").greater_than(10)
+            & (
+                Filter.by_property("sdoc_id").contains_any([12, 20])
+                | Filter.by_property("sentence_id").equal(3)
+            ),
+            lambda keys: (
+                (keys[:, 0] > 10) & (np.isin(keys[:, 0], [12, 20]) | (keys[:, 1] == 3))
+            ),
+        ),
+    ],
+)
+def test_filter_rows(index, keys, filters, expected):
+    mask = index.filter_rows(filters)
+
+    if expected is None:
+        assert mask is None
+    else:
+        assert mask is not None
+        assert mask.tolist() == expected(keys).tolist()
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        Filter.by_property("text").equal(1),
+        Filter.by_property("sdoc_id").equal("1"),
+        Filter.by_property("sdoc_id").contains_any(["1"]),
+        Filter.by_property("sdoc_id").like("1*"),
+        Filter.by_id().equal("00000000-0000-0000-0000-000000000000"),
+        Filter.not_(Filter.by_property("sdoc_id").equal(1)),
+    ],
+)
+def test_filter_rows_unsupported(index, filters):
+    with pytest.raises(UnsupportedFilterError):
+        index.filter_rows(filters)
+
+
+def test_get_local_index_requests_build(tmp_path, monkeypatch, keys, vectors):
+    started = []
+    monkeypatch.setattr(
+        local_knn_index, "_index_dir", lambda collection_name, project_id: tmp_path
+    )
+    monkeypatch.setattr(
+        local_knn_index,
+        "_start_build_job",
+        lambda collection_name, project_id: started.append(
+            (collection_name, project_id)
+        ),
+    )
+    crud = SimpleNamespace(
+        collection_class=SimpleNamespace(get_collection_name=lambda: "Sentence")
+    )
+
+    # Weaviate answers the searches until the index is built, the build is requested once
+    assert get_local_index(crud, project_id=1) is None
+    assert get_local_index(crud, project_id=1) is None
+    assert started == [("Sentence", 1)]
+
+    _build_index(tmp_path, keys, vectors)
+    srsly.write_json(
+        tmp_path / META_FILE,
+        {"build_id": "test", "properties": PROPERTIES, "rows": len(keys)},
+    )
+    index = get_local_index(crud, project_id=1)
+    assert index is not None and len(index) == len(keys)
+
+    # recently modified embeddings are not indexed yet
+    mark_stale("Sentence", 1)
+    assert get_local_index(crud, project_id=1) is None
+    assert started == [("Sentence", 1)]
@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+from repos.vector.weaviate_pool import WeaviateClientPool
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.live = True
+        self.hanging = False
+        self.closed = False
+
+    def is_connected(self) -> bool:
+        return not self.closed
+
+    def is_live(self) -> bool:
+        if self.hanging:
+            time.sleep(5)
+        return self.live
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def pool() -> WeaviateClientPool:
+    return WeaviateClientPool(
+        connect=FakeClient,  # type: ignore
+        max_size=2,
+        checkout_timeout=1,
+        health_check_timeout=0.2,
+        health_check_after_idle_s=0.1,
+    )
+
+
+def test_recently_used_client_is_reused(pool: WeaviateClientPool):
+    client = pool.checkout()
+    pool.checkin(client)
+    client.live = False  # type: ignore
+
+    # the client is not checked, because it was used just now
+    assert pool.checkout() is client
+
+
+def test_idle_dead_client_is_replaced(pool: WeaviateClientPool):
+    client = pool.checkout()
+    pool.checkin(client)
+    client.live = False  # type: ignore
+    time.sleep(0.15)
+
+    new_client = pool.checkout()
+
+    assert new_client is not client
+    assert client.closed  # type: ignore
+    assert pool.stats()["discarded"] == 1
+
+
+def test_idle_unresponsive_client_is_replaced_after_timeout(pool: WeaviateClientPool):
+    client = pool.checkout()
+    pool.checkin(client)
+    client.hanging = True  # type: ignore
+    time.sleep(0.15)
+
+    start = time.perf_counter()
+    new_client = pool.checkout()
+
+    assert time.perf_counter() - start < 1
+    assert new_client is not client
+    assert client.closed  # type: ignore
@@ -0,0 +1,102 @@
+import base64
+import json
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import Integer, String, create_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from systems.search_system.pagination import (
+    InvalidPage,
+    apply_keyset_pagination,
+    decode_cursor,
+    encode_cursor,
+)
+from systems.search_system.sorting import SortDirection
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Row(Base):
+    __tablename__ = "row"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str | None] = mapped_column(String, nullable=True)
+
+
+KEYS = [(Row.name, SortDirection.ASC), (Row.id, SortDirection.ASC)]
+
+
+def _tamper(cursor: str, **changes) -> str:
+    data = json.loads(base64.urlsafe_b64decode(cursor))
+    data.update(changes)
+    return base64.urlsafe_b64encode(json.dumps(data).encode("utf-8")).decode("ascii")
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ["abc", 1],
+        [None, 2],
+        [1.5, 3],
+        [datetime(2024, 1, 2, 3, 4, 5), 4],
+        [date(2024, 1, 2), 5],
+    ],
+)
+def test_cursor_round_trip(values):
+    cursor = encode_cursor(KEYS, values)
+
+    assert decode_cursor(KEYS, cursor) == values
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "äöü", "W10="])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidPage):
+        decode_cursor(KEYS, cursor)
+
+
+def test_tampered_cursor():
+    cursor = encode_cursor(KEYS, ["abc", 1])
+
+    # cursor of another sorting
+    with pytest.raises(InvalidPage):
+        decode_cursor([(Row.id, SortDirection.DESC)], cursor)
+    # modified fingerprint
+    with pytest.raises(InvalidPage):
+        decode_cursor(KEYS, _tamper(cursor, k="0000000000000000"))
+    # wrong number of values
+    with pytest.raises(InvalidPage):
+        decode_cursor(KEYS, _tamper(cursor, v=["abc"]))
+    # non-scalar values
+    with pytest.raises(InvalidPage):
+        decode_cursor(KEYS, _tamper(cursor, v=[["abc"], 1]))
+    with pytest.raises(InvalidPage):
+        decode_cursor(KEYS, _tamper(cursor, v=[{"datetime": "no date"}, 1]))
+
+
+def test_keyset_pagination_tie_break():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    names = ["b", "a", "b", None, "a", "b", None, "a", "b"]
+    with Session(engine) as db:
+        db.add_all([Row(id=i + 1, name=name) for i, name in enumerate(names)])
+        db.commit()
+
+        # pages of 2 split the groups of equal names, the id breaks the ties
+        seen: list[int] = []
+        cursor = None
+        while True:
+            rows = apply_keyset_pagination(
+                db.query(Row.id), KEYS, cursor, page_size=2
+            ).all()
+            if len(rows) == 0:
+                break
+            seen.extend(row[0] for row in rows)
+            cursor = encode_cursor(KEYS, list(rows[-1][1:]))
+
+    expected = sorted(
+        range(1, len(names) + 1),
+        key=lambda id: (names[id - 1] is None, names[id - 1] or "", id),
+    )
+    assert seen == expected
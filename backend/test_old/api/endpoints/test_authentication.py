@@ -42,7 +42,7 @@ def test_authentication_required():
                 dep
                 for dep in route.dependencies
                 if inspect.isfunction(dep.dependency)
-                and dep.dependency.__qualname__ == "get_current_user"
+                and dep.dependency.__qualname__ == "get_current_principal"
             ]
 
             assert len(auth_dep) == 1, (
@@ -5,7 +5,14 @@ from ray import serve
 from ray.serve.handle import DeploymentHandle
 
 from config import build_ray_api_deployment_config
-from dto.spacy import SpacyInput, SpacyPipelineOutput
+from dto.spacy import (
+    SpacyBatchColumnarOutput,
+    SpacyBatchInput,
+    SpacyBatchPipelineOutput,
+    SpacyColumnarOutput,
+    SpacyInput,
+    SpacyPipelineOutput,
+)
 from models.spacy import SpacyModel
 from utils import init_glitchtip
 
@@ -26,6 +33,23 @@ class SpacyApi:
         predict_result = await self.spacy.pipeline.remote(input)  # type: ignore
         return predict_result
 
+    @api.post("/pipeline_columnar", response_model=SpacyColumnarOutput)
+    async def pipeline_columnar(self, input: SpacyInput) -> SpacyColumnarOutput:
+        predict_result = await self.spacy.pipeline_columnar.remote(input)  # type: ignore
+        return predict_result
+
+    @api.post("/pipeline_batch", response_model=SpacyBatchPipelineOutput)
+    async def pipeline_batch(self, input: SpacyBatchInput) -> SpacyBatchPipelineOutput:
+        predict_result = await self.spacy.pipeline_batch.remote(input)  # type: ignore
+        return predict_result
+
+    @api.post("/pipeline_batch_columnar", response_model=SpacyBatchColumnarOutput)
+    async def pipeline_batch_columnar(
+        self, input: SpacyBatchInput
+    ) -> SpacyBatchColumnarOutput:
+        predict_result = await self.spacy.pipeline_batch_columnar.remote(input)  # type: ignore
+        return predict_result
+
 
 app = SpacyApi.bind(
     spacy_model_handle=SpacyModel.bind(),
@@ -1,11 +1,23 @@
 import logging
+from collections import defaultdict
 
 import spacy
 from ray import serve
 from spacy.language import Language
+from spacy.tokens import Doc
 
 from config import build_ray_model_deployment_config, conf
-from dto.spacy import SpacyInput, SpacyPipelineOutput, SpacySpan, SpacyToken
+from dto.spacy import (
+    SpacyBatchColumnarOutput,
+    SpacyBatchInput,
+    SpacyBatchPipelineOutput,
+    SpacyColumnarOutput,
+    SpacyInput,
+    SpacyPipelineOutput,
+    SpacySpan,
+    SpacyToken,
+    SpacyTokenFlag,
+)
 from utils import init_glitchtip
 
 cc = conf.spacy
@@ -14,6 +26,10 @@ DEVICE = cc.device
 MODEL_DIR = cc.model_dir
 MODELS = cc.models
 MAX_TEXT_LENGTH = cc.max_text_length
+PIPE_BATCH_SIZE = cc.pipe.batch_size
+PIPE_N_PROCESS = cc.pipe.n_process
+MAX_BATCH_SIZE = cc.batching.max_batch_size
+BATCH_WAIT_TIMEOUT_S = cc.batching.batch_wait_timeout_s
 
 
 logger = logging.getLogger("ray.serve")
@@ -59,9 +75,111 @@ class SpacyModel:
             else self.spacy_models["default"]
         )
 
-    def pipeline(self, input: SpacyInput) -> SpacyPipelineOutput:
-        model = self._get_language_specific_model(input.language)
-        doc = model(input.text)
+    def _process(self, inputs: list[SpacyInput]) -> list[Doc]:
+        # group the texts by language, so that every model streams its texts with nlp.pipe
+        lang2idxs: dict[str, list[int]] = defaultdict(list)
+        for idx, input in enumerate(inputs):
+            lang2idxs[input.language].append(idx)
+
+        docs: list[Doc | None] = [None] * len(inputs)
+        for language, idxs in lang2idxs.items():
+            model = self._get_language_specific_model(language)
+            piped_docs = model.pipe(
+                (inputs[idx].text for idx in idxs),
+                batch_size=PIPE_BATCH_SIZE,
+                n_process=PIPE_N_PROCESS,
+            )
+            for idx, doc in zip(idxs, piped_docs):
+                docs[idx] = doc
+
+        # the outputs have to be aligned with the inputs, so a missing doc is an error
+        result: list[Doc] = []
+        for idx, doc in enumerate(docs):
+            if doc is None:
+                raise RuntimeError(f"spaCy returned no result for input {idx}")
+            result.append(doc)
+        assert len(result) == len(inputs)
+        return result
+
+    @serve.batch(
+        max_batch_size=MAX_BATCH_SIZE, batch_wait_timeout_s=BATCH_WAIT_TIMEOUT_S
+    )
+    async def pipeline(self, inputs: list[SpacyInput]) -> list[SpacyPipelineOutput]:
+        logger.info("spaCy coalesced %d single-doc requests", len(inputs))
+        return [self._doc_to_output(doc) for doc in self._process(inputs)]
+
+    @serve.batch(
+        max_batch_size=MAX_BATCH_SIZE, batch_wait_timeout_s=BATCH_WAIT_TIMEOUT_S
+    )
+    async def pipeline_columnar(
+        self, inputs: list[SpacyInput]
+    ) -> list[SpacyColumnarOutput]:
+        logger.info("spaCy coalesced %d single-doc columnar requests", len(inputs))
+        return [self._doc_to_columnar(doc) for doc in self._process(inputs)]
+
+    def pipeline_batch(self, input: SpacyBatchInput) -> SpacyBatchPipelineOutput:
+        logger.info("spaCy batch with %d docs", len(input.documents))
+        return SpacyBatchPipelineOutput(
+            outputs=[self._doc_to_output(doc) for doc in self._process(input.documents)]
+        )
+
+    def pipeline_batch_columnar(
+        self, input: SpacyBatchInput
+    ) -> SpacyBatchColumnarOutput:
+        logger.info("spaCy columnar batch with %d docs", len(input.documents))
+        return SpacyBatchColumnarOutput(
+            outputs=[
+                self._doc_to_columnar(doc) for doc in self._process(input.documents)
+            ]
+        )
+
+    def _doc_to_columnar(self, doc: Doc) -> SpacyColumnarOutput:
+        pos_vocab: dict[str, int] = {}
+        lemma_vocab: dict[str, int] = {}
+        label_vocab: dict[str, int] = {}
+
+        token_starts: list[int] = []
+        token_ends: list[int] = []
+        token_pos: list[int] = []
+        token_lemmas: list[int] = []
+        token_flags: list[int] = []
+        for token in doc:
+            token_starts.append(token.idx)
+            token_ends.append(token.idx + len(token.text))
+            token_pos.append(pos_vocab.setdefault(token.pos_, len(pos_vocab)))
+            token_lemmas.append(lemma_vocab.setdefault(token.lemma_, len(lemma_vocab)))
+            flags = 0
+            if token.is_stop:
+                flags |= SpacyTokenFlag.STOPWORD
+            if token.is_punct:
+                flags |= SpacyTokenFlag.PUNCTUATION
+            if token.is_alpha:
+                flags |= SpacyTokenFlag.ALPHA
+            if token.is_digit:
+                flags |= SpacyTokenFlag.DIGIT
+            token_flags.append(int(flags))
+
+        return SpacyColumnarOutput(
+            token_starts=token_starts,
+            token_ends=token_ends,
+            token_pos=token_pos,
+            token_lemmas=token_lemmas,
+            token_flags=token_flags,
+            pos_vocab=list(pos_vocab.keys()),
+            lemma_vocab=list(lemma_vocab.keys()),
+            sent_starts=[sent.start_char for sent in doc.sents],
+            sent_ends=[sent.end_char for sent in doc.sents],
+            ent_starts=[ent.start_char for ent in doc.ents],
+            ent_ends=[ent.end_char for ent in doc.ents],
+            ent_start_tokens=[ent.start for ent in doc.ents],
+            ent_end_tokens=[ent.end for ent in doc.ents],
+            ent_labels=[
+                label_vocab.setdefault(ent.label_, len(label_vocab)) for ent in doc.ents
+            ],
+            label_vocab=list(label_vocab.keys()),
+        )
+
+    def _doc_to_output(self, doc: Doc) -> SpacyPipelineOutput:
         tokens: list[SpacyToken] = [
             SpacyToken(
                 text=token.text,